@@ -1,12 +1,18 @@
 from flask import Flask
 import os
 
+from gaia_chain.tooling.monitoring.structured_log import configure_logging
+
 app = Flask(__name__)
 
 @app.route('/')
 def home():
     return "Hello from GaiaChain!"
 
+# Runtime metrics are served by the processes hosting agents, not this app: see
+# ExecutionContext(metrics_port=...) and AgentWorkerPool(metrics_port=...).
+
 if __name__ == "__main__":
+    configure_logging()  # JSON lines at $GAIA_LOG_LEVEL (default WARNING)
     port = int(os.environ.get("PORT", 5000))
     app.run(host="0.0.0.0", port=port)
\ No newline at end of file
@@ -7,82 +7,328 @@ This module implements the symbolic reasoning component for decentralized AI age
 It enables agents to perform symbolic reasoning, complementing neural-based learning with logic-driven inference.
 """
 
-import logging
-from typing import List, Dict, Any, Union
+import sys
+from bisect import insort
+from dataclasses import dataclass
+from typing import List, Dict, Any, Union, Tuple, Iterable, IO, Callable, Optional
+from gaia_chain.dsl.parser.parser import parse_script, iter_statements, Program, FactNode, RuleNode, GoalNode
+from gaia_chain.tooling.monitoring import telemetry
+from gaia_chain.tooling.monitoring.structured_log import get_logger
 
 # Logger setup
-logging.basicConfig(level=logging.INFO)
-logger = logging.getLogger(__name__)
+logger = get_logger(__name__)
+
+# Process-wide metrics (exported at /metrics)
+KNOWLEDGE_ITEMS = telemetry.gauge("gaia_knowledge_base_items", "Items held across all knowledge bases, by kind.", ("kind",))
+RULES_FIRED = telemetry.counter("gaia_rules_fired_total", "Rule activations in Rete networks.")
+INFERENCE_SECONDS = telemetry.histogram("gaia_inference_seconds", "Time spent making a decision from the knowledge base.")
+_KNOWLEDGE_ITEMS = {kind: KNOWLEDGE_ITEMS.labels(kind) for kind in ("facts", "rules", "goals")}
 
 # Symbolic Representation
 
+@dataclass(frozen=True, slots=True)
 class Fact:
     """Represents a propositional fact in the agent's knowledge base."""
-    def __init__(self, proposition: str):
-        self.proposition = proposition
+    proposition: str
 
+@dataclass(frozen=True, slots=True)
 class Rule:
     """Represents a logical rule in the agent's knowledge base."""
-    def __init__(self, antecedent: List[str], consequent: str):
-        self.antecedent = antecedent
-        self.consequent = consequent
+    antecedent: Tuple[str, ...]
+    consequent: str
+
+    def __post_init__(self):
+        # Accept any sequence of antecedents but store an immutable tuple so rules stay hashable
+        if not isinstance(self.antecedent, tuple):
+            object.__setattr__(self, "antecedent", tuple(self.antecedent))
 
+@dataclass(frozen=True, slots=True)
 class Goal:
     """Represents a goal the agent aims to achieve."""
-    def __init__(self, description: str):
-        self.description = description
+    description: str
 
 class KnowledgeBase:
-    """Stores facts, rules, and goals for symbolic reasoning."""
-    def __init__(self):
-        self.facts = []
+    """Stores facts, rules, and goals for symbolic reasoning.
+
+    Propositions are indexed by hash, so membership checks and duplicate detection are O(1); rule
+    and goal propositions are also interned. Rules are also indexed by each antecedent they reference, which answers "which rules
+    could fire now that this fact holds" without scanning the rule list. The `rules` and `goals`
+    lists keep insertion order for existing callers; `facts` is an insertion-ordered read-only view
+    over the fact index, so each fact costs one index entry and no separate list slot.
+
+    With `columnar=True`, facts are kept in a `FactColumnStore` as integer symbol IDs instead of
+    `Fact` objects; `facts` then is a read-only sequence that materializes facts on access.
+    """
+    def __init__(self, columnar: bool = False):
+        self.columnar = False
+        self.fact_index: Dict[str, Fact] = {}
+        self.fact_columns = None  # FactColumnStore when columnar
         self.rules = []
         self.goals = []
+        if columnar:
+            self.set_columnar(True)
+        self.rules_by_antecedent: Dict[str, List[Rule]] = {}
+        self.rule_index = set()
+        self.goal_index: Dict[str, Goal] = {}
+        self.listeners = []  # Incremental consumers (e.g. ReteNetwork) notified on every add
 
-    def add_fact(self, fact: Fact):
-        logger.info(f"Adding fact: {fact.proposition}")
-        self.facts.append(fact)
+    @property
+    def facts(self):
+        """Stored facts in insertion order (read-only)."""
+        return self.fact_columns if self.columnar else self.fact_index.values()
 
-    def add_rule(self, rule: Rule):
-        logger.info(f"Adding rule: {rule.antecedent} -> {rule.consequent}")
+    def set_columnar(self, columnar: bool):
+        """Switch the fact representation, keeping the facts already stored (listeners are not re-notified)."""
+        if columnar == self.columnar:
+            return
+        propositions = [fact.proposition for fact in self.facts]
+        self.columnar = columnar
+        if columnar:
+            from gaia_chain.agents.neuro_symbolic.fact_store import FactColumnStore
+            self.fact_columns = FactColumnStore()
+            self.fact_index = {}
+        else:
+            self.fact_columns = None
+        for proposition in propositions:
+            self._insert_fact(Fact(proposition))
+
+    def add_listener(self, listener):
+        """Register a listener exposing add_fact/add_rule to receive knowledge deltas."""
+        self.listeners.append(listener)
+
+    def has_fact(self, proposition: str) -> bool:
+        """Check whether a proposition is a known fact."""
+        if self.columnar:
+            return proposition in self.fact_columns
+        return proposition in self.fact_index
+
+    def get_fact(self, proposition: str) -> Union[Fact, None]:
+        """Look up the fact stored for a proposition."""
+        if self.columnar:
+            return Fact(proposition) if proposition in self.fact_columns else None
+        return self.fact_index.get(proposition)
+
+    def rules_for(self, proposition: str) -> List[Rule]:
+        """Return the rules that reference a proposition in their antecedent."""
+        return self.rules_by_antecedent.get(proposition, [])
+
+    def add_fact(self, fact: Fact) -> bool:
+        """Add a fact, returning False if the proposition is already known."""
+        if not self._store_fact(fact):
+            return False
+        _KNOWLEDGE_ITEMS["facts"].inc()
+        logger.debug("Adding fact", proposition=fact.proposition)
+        return True
+
+    def add_rule(self, rule: Rule) -> bool:
+        """Add a rule, returning False if an identical rule is already known."""
+        if not self._store_rule(rule):
+            return False
+        _KNOWLEDGE_ITEMS["rules"].inc()
+        logger.debug("Adding rule", antecedent=rule.antecedent, consequent=rule.consequent)
+        return True
+
+    def add_goal(self, goal: Goal) -> bool:
+        """Add a goal, returning False if the goal is already known."""
+        if not self._store_goal(goal):
+            return False
+        _KNOWLEDGE_ITEMS["goals"].inc()
+        logger.debug("Adding goal", goal=goal.description)
+        return True
+
+    # Bulk Loading
+
+    def add_facts(self, facts: Iterable[Fact]) -> int:
+        """Bulk-load facts from any iterable in one pass, logging a single summary line."""
+        return self._bulk_load("facts", self._store_fact, facts)
+
+    def add_rules(self, rules: Iterable[Rule]) -> int:
+        """Bulk-load rules from any iterable in one pass, logging a single summary line."""
+        return self._bulk_load("rules", self._store_rule, rules)
+
+    def add_goals(self, goals: Iterable[Goal]) -> int:
+        """Bulk-load goals from any iterable in one pass, logging a single summary line."""
+        return self._bulk_load("goals", self._store_goal, goals)
+
+    def _bulk_load(self, kind: str, store, items: Iterable) -> int:
+        seen = added = 0
+        for item in items:
+            seen += 1
+            added += store(item)
+        _KNOWLEDGE_ITEMS[kind].inc(added)
+        if seen:
+            logger.info("Loaded knowledge", kind=kind, added=added, duplicates=seen - added)
+        return added
+
+    # Indexing
+
+    def _store_fact(self, fact: Fact) -> bool:
+        fact = self._insert_fact(fact)
+        if fact is None:
+            return False
+        for listener in self.listeners:
+            listener.add_fact(fact)
+        return True
+
+    def _insert_fact(self, fact: Fact) -> Optional[Fact]:
+        """Store a fact; return the stored fact, or None if the proposition is already known."""
+        if self.columnar:
+            return fact if self.fact_columns.add(fact.proposition) else None
+        # Not sys.intern'ed: the index key is already the one canonical copy, and an interned-table
+        # entry would add ~30 bytes per fact
+        if fact.proposition in self.fact_index:
+            return None
+        self.fact_index[fact.proposition] = fact
+        return fact
+
+    def _store_rule(self, rule: Rule) -> bool:
+        rule = Rule(tuple(sys.intern(antecedent) for antecedent in rule.antecedent), sys.intern(rule.consequent))
+        if rule in self.rule_index:
+            return False
+        self.rule_index.add(rule)
         self.rules.append(rule)
+        for antecedent in set(rule.antecedent):
+            self.rules_by_antecedent.setdefault(antecedent, []).append(rule)
+        for listener in self.listeners:
+            listener.add_rule(rule)
+        return True
 
-    def add_goal(self, goal: Goal):
-        logger.info(f"Adding goal: {goal.description}")
+    def _store_goal(self, goal: Goal) -> bool:
+        description = sys.intern(goal.description)
+        if description in self.goal_index:
+            return False
+        if description is not goal.description:
+            goal = Goal(description)
+        self.goal_index[description] = goal
         self.goals.append(goal)
+        return True
+
+# Incremental Inference Network
+
+class BetaNode:
+    """Beta node tracking how many distinct antecedents of a rule are still unmatched."""
+    __slots__ = ("index", "rule", "missing")
+
+    def __init__(self, index: int, rule: Rule):
+        self.index = index
+        self.rule = rule
+        self.missing = 0
+
+class ReteNetwork:
+    """Propositional Rete/TREAT network that propagates knowledge deltas incrementally.
+
+    The alpha memory maps every proposition that is not yet known to the rule nodes waiting on it.
+    Each rule node counts its unmatched antecedents; when the count drops to zero the rule enters
+    the conflict set and its consequent is asserted as an inferred fact, so chains fire transitively.
+    Adding a fact or rule therefore only touches the rules that reference it.
+
+    `on_inferred`, if given, receives each consequent once a delta has been fully propagated, in
+    the order the rules fired; ReasoningEngine uses it to write inferences back to the knowledge base.
+    """
+    def __init__(self, on_inferred: Optional[Callable[[str], None]] = None):
+        self.working_memory = set()  # Asserted and inferred propositions
+        self.alpha_memory: Dict[str, List[BetaNode]] = {}
+        self.conflict_set: List[Tuple[int, str]] = []  # (rule index, consequent), in rule order
+        self.rule_count = 0
+        self.rules_fired = 0
+        self.on_inferred = on_inferred
+        self._inferences = []
+        self._derived: List[str] = []  # Consequents not yet reported to on_inferred
+
+    def add_fact(self, fact: Fact):
+        """Assert a fact and propagate it through the network."""
+        self._propagate([fact.proposition])
+
+    def add_rule(self, rule: Rule):
+        """Compile a rule into the network, activating it at once if already satisfied."""
+        node = BetaNode(self.rule_count, rule)
+        self.rule_count += 1
+        for antecedent in set(rule.antecedent):
+            if antecedent not in self.working_memory:
+                self.alpha_memory.setdefault(antecedent, []).append(node)
+                node.missing += 1
+        if node.missing == 0:
+            self._propagate(self._activate(node))
+
+    def inferences(self) -> List[str]:
+        """Return the consequents of all activated rules, in rule order."""
+        if len(self._inferences) != len(self.conflict_set):
+            self._inferences = [consequent for _, consequent in self.conflict_set]
+        return self._inferences
+
+    def _activate(self, node: BetaNode) -> List[str]:
+        insort(self.conflict_set, (node.index, node.rule.consequent))
+        self.rules_fired += 1
+        RULES_FIRED.inc()
+        if self.on_inferred is not None:
+            self._derived.append(node.rule.consequent)
+        return [node.rule.consequent]
+
+    def _propagate(self, pending: List[str]):
+        while pending:
+            proposition = pending.pop()
+            if proposition in self.working_memory:
+                continue
+            self.working_memory.add(proposition)
+            for node in self.alpha_memory.pop(proposition, ()):
+                node.missing -= 1
+                if node.missing == 0:
+                    pending.extend(self._activate(node))
+        # Report after propagating, so the callback re-entering add_fact finds the network settled
+        derived, self._derived = self._derived, []
+        for proposition in derived:
+            self.on_inferred(proposition)
 
 # Reasoning Engine
 
 class ReasoningEngine:
-    """Implements logic for inference, decision-making, and planning based on symbolic knowledge."""
+    """Implements logic for inference, decision-making, and planning based on symbolic knowledge.
+
+    Consequents of fired rules are stored back in the knowledge base as facts, so
+    `kb.has_fact(inferred)` holds and other consumers of the knowledge base see them.
+    """
     def __init__(self, knowledge_base: KnowledgeBase):
         self.kb = knowledge_base
+        self.network = ReteNetwork(on_inferred=self._store_inference)
+        for fact in self.kb.facts:
+            self.network.add_fact(fact)
+        for rule in self.kb.rules:
+            self.network.add_rule(rule)
+        self.kb.add_listener(self.network)
+
+    def _store_inference(self, proposition: str):
+        # A consequent that is already a fact (asserted, or inferred by another rule) is skipped
+        self.kb.add_fact(Fact(proposition))
 
     def infer(self) -> List[str]:
-        """Draw inferences based on the knowledge base."""
-        inferences = []
-        for rule in self.kb.rules:
-            if all(antecedent in [fact.proposition for fact in self.kb.facts] for antecedent in rule.antecedent):
-                inferences.append(rule.consequent)
-        return inferences
+        """Draw inferences based on the knowledge base.
+
+        Deltas are propagated as facts and rules are added, so this only reads the current
+        conflict set. Consequents of fired rules are chained into further inferences.
+        """
+        return self.network.inferences()
 
     def make_decision(self) -> str:
         """Make a decision based on the inferred knowledge."""
-        inferences = self.infer()
+        with INFERENCE_SECONDS.time():
+            inferences = self.infer()
         if inferences:
             decision = inferences[0]  # Simplified decision logic
-            logger.info(f"Decision made: {decision}")
+            logger.info("Decision made", decision=decision)
             return decision
         else:
-            logger.info("No decision could be made.")
+            logger.info("No decision could be made")
             return "No decision"
 
 # Interaction with agent_core.py
 
 class SymbolicReasoner:
-    """Encapsulates symbolic reasoning and interacts with the agent core."""
-    def __init__(self):
-        self.kb = KnowledgeBase()
+    """Encapsulates symbolic reasoning and interacts with the agent core.
+
+    `columnar=True` keeps facts in a `FactColumnStore` (see KnowledgeBase).
+    """
+    def __init__(self, columnar: bool = False):
+        self.kb = KnowledgeBase(columnar=columnar)
         self.engine = ReasoningEngine(self.kb)
 
     def update_knowledge(self, facts: List[Fact], rules: List[Rule], goals: List[Goal]):
@@ -94,6 +340,21 @@ class SymbolicReasoner:
         for goal in goals:
             self.kb.add_goal(goal)
 
+    def load_knowledge(self, facts: Iterable[Fact] = (), rules: Iterable[Rule] = (), goals: Iterable[Goal] = (),
+                       columnar: Optional[bool] = None) -> Dict[str, int]:
+        """Bulk-load facts, rules, and goals from iterables or generators without per-item logging.
+
+        `columnar`, if given, switches the fact representation first (see KnowledgeBase.set_columnar).
+        Returns the number of new (non-duplicate) items added per kind.
+        """
+        if columnar is not None:
+            self.kb.set_columnar(columnar)
+        return {
+            "facts": self.kb.add_facts(facts),
+            "rules": self.kb.add_rules(rules),
+            "goals": self.kb.add_goals(goals),
+        }
+
     def get_decision(self) -> str:
         """Get a decision from the reasoning engine."""
         return self.engine.make_decision()
@@ -115,29 +376,73 @@ class DSLInterpreter:
         self.reasoner = reasoner
 
     def interpret_dsl(self, dsl_script: str):
-        """Interpret DSL script and update the symbolic reasoner's knowledge base."""
-        # Simplified DSL parsing logic
-        # Example DSL constructs:
-        # fact: "stock_price > 100"
-        # rule: "if stock_price > 100 then buy_stock"
-        # goal: "maximize_profit"
-
-        lines = dsl_script.splitlines()
+        """Interpret DSL script and update the symbolic reasoner's knowledge base.
+
+        The script is parsed with the Gaia DSL parser (cached by script hash); facts, rules and
+        goals are loaded into the knowledge base, other statements are left to the agent runtime.
+        """
+        self.interpret_program(parse_script(dsl_script))
+
+    def interpret_program(self, program: Program):
+        """Update the knowledge base from an already parsed DSL program."""
         facts, rules, goals = [], [], []
 
-        for line in lines:
-            if line.startswith("fact:"):
-                facts.append(Fact(line[len("fact:"):].strip()))
-            elif line.startswith("rule:"):
-                parts = line[len("rule:"):].strip().split("then")
-                antecedent = parts[0].strip().split("and")
-                consequent = parts[1].strip()
-                rules.append(Rule(antecedent, consequent))
-            elif line.startswith("goal:"):
-                goals.append(Goal(line[len("goal:"):].strip()))
+        for statement in program.statements:
+            if isinstance(statement, FactNode):
+                facts.append(Fact(statement.proposition))
+            elif isinstance(statement, RuleNode):
+                rules.append(Rule(statement.antecedent, statement.consequent))
+            elif isinstance(statement, GoalNode):
+                goals.append(Goal(statement.description))
 
         self.reasoner.update_knowledge(facts, rules, goals)
 
+    def interpret_stream(self, source: Union[str, IO[str]], batch_size: int = 10000,
+                         progress: Callable[[Dict[str, int]], None] = None) -> Dict[str, int]:
+        """Stream a DSL script from a path or text file object into the knowledge base.
+
+        Statements are parsed as their lines arrive and facts, rules and goals are bulk-loaded in batches of
+        at most `batch_size` statements, so peak memory is bounded by the batch rather than the
+        script. After every batch `progress` (if given) receives the running totals.
+        """
+        if isinstance(source, str):
+            with open(source, "r") as dsl_file:
+                return self.interpret_stream(dsl_file, batch_size, progress)
+
+        totals = {"lines": 0, "facts": 0, "rules": 0, "goals": 0}
+        facts, rules, goals = [], [], []
+
+        def flush():
+            loaded = self.reasoner.load_knowledge(facts, rules, goals)
+            for kind, count in loaded.items():
+                totals[kind] += count
+            facts.clear()
+            rules.clear()
+            goals.clear()
+            if progress is not None:
+                progress(dict(totals))
+
+        def numbered_lines():
+            for line_number, text in enumerate(source, 1):
+                totals["lines"] = line_number
+                yield text
+
+        for statement in iter_statements(numbered_lines()):
+            if isinstance(statement, FactNode):
+                facts.append(Fact(statement.proposition))
+            elif isinstance(statement, RuleNode):
+                rules.append(Rule(statement.antecedent, statement.consequent))
+            elif isinstance(statement, GoalNode):
+                goals.append(Goal(statement.description))
+            else:
+                continue
+            if len(facts) + len(rules) + len(goals) >= batch_size:
+                flush()
+        flush()
+
+        logger.info("Streamed DSL script", **totals)
+        return totals
+
 # Example usage (for illustration purposes, not part of the module)
 if __name__ == "__main__":
     reasoner = SymbolicReasoner()
@@ -8,14 +8,23 @@ It includes the agent lifecycle, interaction with the Gaia DSL, service interact
 basic behaviors, state management, and error handling.
 """
 
-import logging
+import itertools
+import json
+import os
 from dataclasses import dataclass, field
 from enum import Enum
 from typing import Any, Dict, List
+from gaia_chain.dsl.parser.parser import parse_script, AgentNode, Program
+from gaia_chain.dsl.parser.interpreter import Bytecode, compile_program, execute
+from gaia_chain.dsl.rules.core_rules import Action, GaiaAction
+from gaia_chain.dsl.rules.economic_rules import Dispute, Payment, from_units, to_units
+from gaia_chain.agents.runtime.agent_metrics import AgentMetrics
+from gaia_chain.registry.service_discovery import bind_provider, requested_provider
+from gaia_chain.tooling.monitoring import telemetry
+from gaia_chain.tooling.monitoring.structured_log import get_logger
 
-# Logger setup
-logging.basicConfig(level=logging.INFO)
-logger = logging.getLogger(__name__)
+# Logger setup (events are level-guarded and formatted off-thread; see tooling/monitoring/structured_log.py)
+logger = get_logger(__name__)
 
 # Agent States
 class AgentState(Enum):
@@ -31,6 +40,16 @@ class AgentLifecycleEvent(Enum):
     DEACTIVATE = "deactivate"
     PRUNE = "prune"
 
+_LIFECYCLE_OPERATIONS = {event: f"lifecycle_{event.value}" for event in AgentLifecycleEvent}
+
+# Process-wide metrics (exported at /metrics)
+LIFECYCLE_TRANSITIONS = telemetry.counter("gaia_agent_lifecycle_transitions_total",
+                                          "Agent lifecycle events handled, by event and outcome.", ("event", "outcome"))
+DSL_INTERPRET_SECONDS = telemetry.histogram("gaia_dsl_interpret_seconds", "Time spent executing DSL bytecode.")
+
+# Ledger hold IDs for service payments awaiting their receipt
+_SERVICE_HOLD_IDS = itertools.count()
+
 # Agent Core Class
 @dataclass
 class AgentCore:
@@ -41,145 +60,316 @@ class AgentCore:
     current_task: str = ""
     goals: List[str] = field(default_factory=list)
     resources: Dict[str, Any] = field(default_factory=dict)
+    disputes: List[Dispute] = field(default_factory=list, repr=False)  # Raised by DSL `dispute` blocks
+    dsl_program: Any = field(default=None, repr=False)  # Parsed AST of dsl_script
+    dsl_bytecode: Any = field(default=None, repr=False)  # Compiled form of dsl_program
+    reasoner: Any = field(default=None, repr=False, compare=False)  # Created on demand by the DSL VM
+    dsl_step_budget: int = 100000
+    service_pipeline: Any = field(default=None, repr=False, compare=False)  # See agents/runtime/service_pipeline.py
+    service_discovery: Any = field(default=None, repr=False, compare=False)  # See registry/service_discovery.py
+    ledger: Any = field(default=None, repr=False, compare=False)  # GAIA balances; see economy/ledger.py
+    metrics: AgentMetrics = field(default_factory=AgentMetrics, repr=False, compare=False)
     
     def __post_init__(self):
         # Initialize the agent with default resources (e.g., GAIA balance)
         self.resources['GAIA_balance'] = 0
 
+    def __getstate__(self):
+        # The service pipeline owns threads and sockets, discovery and the ledger process-local
+        # state; they stay with the process that created them
+        state = self.__dict__.copy()
+        state['service_pipeline'] = None
+        state['service_discovery'] = None
+        state['ledger'] = None
+        return state
+
     # Lifecycle Management
     def handle_lifecycle_event(self, event: AgentLifecycleEvent):
-        logger.info(f"Handling lifecycle event: {event}")
-        try:
-            if event == AgentLifecycleEvent.INITIALIZE:
-                self.initialize()
-            elif event == AgentLifecycleEvent.ACTIVATE:
-                self.activate()
-            elif event == AgentLifecycleEvent.DEACTIVATE:
-                self.deactivate()
-            elif event == AgentLifecycleEvent.PRUNE:
-                self.prune()
+        logger.info("Handling lifecycle event", agent=self.id, event=getattr(event, "value", event))
+        with self.metrics.measure(_LIFECYCLE_OPERATIONS.get(event, "lifecycle_invalid")) as measurement:
+            try:
+                if event == AgentLifecycleEvent.INITIALIZE:
+                    self.initialize()
+                elif event == AgentLifecycleEvent.ACTIVATE:
+                    self.activate()
+                elif event == AgentLifecycleEvent.DEACTIVATE:
+                    self.deactivate()
+                elif event == AgentLifecycleEvent.PRUNE:
+                    self.prune()
+                else:
+                    raise ValueError(f"Invalid lifecycle event: {event}")
+            except Exception as e:
+                measurement.fail()
+                LIFECYCLE_TRANSITIONS.labels(getattr(event, "value", "invalid"), "error").inc()
+                self.handle_error(e)
             else:
-                raise ValueError(f"Invalid lifecycle event: {event}")
-        except Exception as e:
-            self.handle_error(e)
+                LIFECYCLE_TRANSITIONS.labels(event.value, "ok").inc()
 
     def initialize(self):
-        logger.info("Initializing agent...")
+        logger.info("Initializing agent", agent=self.id)
         if self.state != AgentState.PROPOSED:
             raise ValueError("Agent can only be initialized from the PROPOSED state.")
         # Load configurations, prepare resources, etc.
         self.state = AgentState.PROPOSED
-        logger.info("Agent initialized.")
+        logger.info("Agent initialized", agent=self.id)
 
     def activate(self):
-        logger.info("Activating agent...")
+        logger.info("Activating agent", agent=self.id)
         if self.state != AgentState.PROPOSED:
             raise ValueError("Agent can only be activated from the PROPOSED state.")
         # Set agent to active state
         self.state = AgentState.ACTIVE
-        logger.info("Agent activated.")
+        logger.info("Agent activated", agent=self.id)
 
     def deactivate(self):
-        logger.info("Deactivating agent...")
+        logger.info("Deactivating agent", agent=self.id)
         if self.state != AgentState.ACTIVE:
             raise ValueError("Agent can only be deactivated from the ACTIVE state.")
         # Perform cleanup, save state, etc.
         self.state = AgentState.DEACTIVATED
-        logger.info("Agent deactivated.")
+        logger.info("Agent deactivated", agent=self.id)
 
     def prune(self):
-        logger.info("Pruning agent...")
+        logger.info("Pruning agent", agent=self.id)
         if self.state == AgentState.PRUNED:
             raise ValueError("Agent is already pruned.")
         # Remove agent from registry, release resources, etc.
         self.state = AgentState.PRUNED
-        logger.info("Agent pruned.")
+        logger.info("Agent pruned", agent=self.id)
 
     # DSL Interaction
     def load_dsl_script(self, script: str):
-        logger.info("Loading DSL script...")
+        logger.info("Loading DSL script", agent=self.id)
         self.dsl_script = script
-        # Parse DSL script (using ANTLR4 or similar)
-        # lexer = GaiaDSLLexer(InputStream(script))
-        # stream = CommonTokenStream(lexer)
-        # parser = GaiaDSLParser(stream)
-        # tree = parser.start()
-        # self.interpret_dsl(tree)
-        logger.info("DSL script loaded.")
+        with self.metrics.measure("load_dsl_script") as measurement:
+            try:
+                # Identical scripts share one cached AST across agents (see dsl/parser/parser.py)
+                self.dsl_program = parse_script(script)
+                self.interpret_dsl(self.dsl_program)
+                logger.info("DSL script loaded", agent=self.id)
+            except Exception as e:
+                measurement.fail()
+                self.handle_error(e)
+
+    def load_bytecode(self, data: bytes):
+        """Load a precompiled DSL program, skipping parsing and compilation."""
+        logger.info("Loading DSL bytecode", agent=self.id)
+        try:
+            self.interpret_dsl(Bytecode.from_bytes(data))
+            logger.info("DSL bytecode loaded", agent=self.id)
+        except Exception as e:
+            self.handle_error(e)
 
     def interpret_dsl(self, tree):
-        logger.info("Interpreting DSL script...")
-        # Implement DSL interpretation logic
-        # Translate DSL constructs into executable actions
-        logger.info("DSL script interpreted.")
+        logger.info("Interpreting DSL script", agent=self.id)
+        # Compile the parsed program to bytecode (unless already compiled) and run it on the VM
+        self.dsl_bytecode = compile_program(tree) if isinstance(tree, Program) else tree
+        with DSL_INTERPRET_SECONDS.time():
+            result = execute(self.dsl_bytecode, self, step_budget=self.dsl_step_budget)
+        logger.info("DSL script interpreted", agent=self.id, steps=result.steps, cost=result.cost)
+        return result
+
+    def handle_event(self, event: str, trigger: Any = None) -> int:
+        """Run the actions of the loaded script's `on <event> [trigger]` agent behaviors.
+
+        Returns the number of behaviors that matched.
+        """
+        logger.info("Handling event", agent=self.id, event=event)
+        matched = 0
+        statements = self.dsl_program.statements if isinstance(self.dsl_program, Program) else ()
+        for statement in statements:
+            if not isinstance(statement, AgentNode):
+                continue
+            for behavior in statement.behaviors:
+                if behavior.event != event or (behavior.trigger is not None and behavior.trigger.value != trigger):
+                    continue
+                matched += 1
+                for action in behavior.actions:
+                    self.execute_action(action)
+        return matched
 
     # Service Interaction
     def request_service(self, service_id: str, payment: int, constraints: Dict[str, Any]):
-        logger.info(f"Requesting service {service_id} with payment {payment} GAIA...")
+        logger.info("Requesting service", agent=self.id, service_id=service_id, payment=payment)
+        with self.metrics.measure("request_service") as measurement:
+            started = False
+            hold_id = future = None
+            try:
+                if self.service_discovery is not None:
+                    # Pick the cheapest offering that satisfies the constraints within the payment
+                    offering = self.service_discovery.resolve(service_id, payment, constraints)
+                    if offering is None:
+                        raise LookupError(f"No service {service_id} satisfies the request constraints within {payment} GAIA.")
+                    logger.info("Service resolved", agent=self.id, service_id=offering.service_id,
+                                provider=offering.provider, cost=offering.cost)
+                    service_id = offering.service_id
+                    constraints = bind_provider(constraints, offering.provider)
+                if self.service_pipeline is None:
+                    logger.info("No service pipeline attached; request not sent", agent=self.id)
+                    return None
+                from gaia_chain.agents.runtime.service_pipeline import owner_dispatcher
+                dispatch = owner_dispatcher(self)
+                if self.ledger is not None and payment:
+                    # The payment stays reserved until the request is mined (captured) or fails (released)
+                    hold_id = self.ledger.hold(self.id, to_units(payment), f"service:{self.id}:{next(_SERVICE_HOLD_IDS)}")
+                # Returns immediately; the receipt is delivered to process_service_result when mined
+                self.metrics.task_started()
+                started = True
+                future = self.service_pipeline.submit(self, service_id, payment, constraints, dispatch=dispatch)
+                if hold_id is not None:
+                    payee = requested_provider(constraints) or self.service_pipeline.contract_address
+                    # Queued on the agent's thread behind the result delivery, which is dispatched first
+                    future.add_done_callback(lambda done: dispatch(self.settle_service_payment, hold_id, payee, done))
+                logger.info("Service requested", agent=self.id)
+                return future
+            except Exception as e:
+                measurement.fail()
+                if started:
+                    self.metrics.task_failed()
+                if hold_id is not None and future is None:
+                    self.ledger.release_hold(hold_id)  # Never submitted
+                self.handle_error(e)
+
+    def settle_service_payment(self, hold_id: str, payee: str, future):
+        """Pay a held service payment to `payee` once its request is mined; release it otherwise."""
         try:
-            # Implement service request logic (e.g., via smart contract calls)
-            # web3 = Web3(Web3.HTTPProvider('http://localhost:8545'))
-            # contract = web3.eth.contract(address='0x...', abi=...)
-            # tx_hash = contract.functions.requestService(service_id, payment, constraints).transact()
-            # result = web3.eth.waitForTransactionReceipt(tx_hash)
-            logger.info("Service requested.")
+            if future.cancelled() or future.exception() is not None:
+                released = self.ledger.release_hold(hold_id)
+                logger.info("Service payment released", agent=self.id, hold_id=hold_id, units=released)
+            else:
+                receipt = future.result()
+                self.ledger.capture_hold(hold_id, payee, memo=f"service request {receipt.get('transactionHash')}")
+                logger.info("Service payment captured", agent=self.id, hold_id=hold_id, payee=payee)
         except Exception as e:
             self.handle_error(e)
 
     def process_service_result(self, result):
-        logger.info("Processing service result...")
+        logger.info("Processing service result", agent=self.id)
+        with self.metrics.measure("process_service_result") as measurement:
+            try:
+                # Implement result processing logic
+                self.metrics.task_completed()
+                logger.info("Service result processed", agent=self.id)
+            except Exception as e:
+                measurement.fail()
+                self.metrics.task_failed()
+                self.handle_error(e)
+
+    def execute_action(self, action: Action):
+        logger.info("Executing action", agent=self.id, action=action.action_type.value)
         try:
-            # Implement result processing logic
-            logger.info("Service result processed.")
+            parameters = action.parameters
+            if action.action_type == GaiaAction.REQUEST_SERVICE:
+                payment = parameters['payment'].value
+                constraints = {name: value.value for name, value in parameters['constraints'].value.items()}
+                if 'provider' in parameters:
+                    constraints['provider'] = parameters['provider'].value
+                self.request_service(
+                    parameters['service_id'].value,
+                    getattr(payment, 'amount', payment),
+                    {'inputs': parameters['inputs'].value, 'constraints': constraints}
+                )
+            else:
+                self.current_task = action.action_type.value
+                self.respond_to_command(action.action_type.value)
         except Exception as e:
             self.handle_error(e)
 
-    # Basic Behaviors
-    def respond_to_command(self, command: str):
-        logger.info(f"Responding to command: {command}")
+    # Economic Interaction
+    def make_payment(self, payment: Payment):
+        logger.info("Making payment", agent=self.id, recipient=payment.recipient, amount=str(payment.amount))
         try:
-            # Implement command response logic
-            logger.info("Command responded to.")
+            payment.validate()
+            if self.ledger is not None:
+                self.ledger.transfer(self.id, payment.recipient, payment.units, memo="dsl payment")
+            else:
+                balance = self.resources.get('GAIA_balance', 0)
+                if balance < payment.amount:
+                    raise ValueError(f"Insufficient GAIA balance for a payment of {payment.amount}.")
+                self.resources['GAIA_balance'] = balance - payment.amount
+            logger.info("Payment made", agent=self.id)
         except Exception as e:
             self.handle_error(e)
 
+    def raise_dispute(self, dispute: Dispute):
+        logger.warning("Dispute raised", agent=self.id, initiator=dispute.initiator, target=dispute.target,
+                       reason=dispute.reason, resolution_method=dispute.resolution_method.value)
+        self.disputes.append(dispute)
+
+    # Basic Behaviors
+    def respond_to_command(self, command: str):
+        logger.info("Responding to command", agent=self.id, command=command)
+        self.metrics.task_started()
+        with self.metrics.measure("respond_to_command") as measurement:
+            try:
+                # Implement command response logic
+                self.metrics.task_completed()
+                logger.info("Command responded to", agent=self.id)
+            except Exception as e:
+                measurement.fail()
+                self.metrics.task_failed()
+                self.handle_error(e)
+
+    def report_metrics(self):
+        """Return this agent's resource and task accounting (see agents/runtime/agent_metrics.py)."""
+        return self.metrics.snapshot(self)
+
+    def export_metrics(self, directory: str) -> str:
+        """Write report_metrics() to `<directory>/<id>.metrics.json` for out-of-process monitors."""
+        path = os.path.join(directory, f"{self.id}.metrics.json")
+        temp_path = f"{path}.tmp"
+        with open(temp_path, 'w') as metrics_file:
+            json.dump(self.report_metrics(), metrics_file)
+        os.replace(temp_path, path)
+        return path
+
+    def gaia_balance(self):
+        """Available GAIA: from the attached ledger (as a Decimal) or the `GAIA_balance` resource."""
+        if self.ledger is not None:
+            return from_units(self.ledger.available(self.id))
+        return self.resources.get('GAIA_balance', 0)
+
     def report_status(self):
-        logger.info("Reporting status...")
+        logger.info("Reporting status", agent=self.id)
         try:
             # Implement status reporting logic
+            resources = self.resources
+            if self.ledger is not None:
+                resources = {**resources, 'GAIA_balance': str(self.gaia_balance())}
             status = {
                 "id": self.id,
                 "state": self.state.value,
                 "current_task": self.current_task,
                 "goals": self.goals,
-                "resources": self.resources
+                "resources": resources
             }
-            logger.info(f"Status: {status}")
+            logger.info("Status", agent=self.id, state=status["state"], current_task=status["current_task"])
             return status
         except Exception as e:
             self.handle_error(e)
 
     # State Management
     def update_state(self, key: str, value: Any):
-        logger.info(f"Updating state: {key} = {value}")
+        logger.info("Updating state", agent=self.id, key=key)
         try:
             self.resources[key] = value
-            logger.info("State updated.")
+            logger.info("State updated", agent=self.id)
         except Exception as e:
             self.handle_error(e)
 
     # Error Handling
     def handle_error(self, error: Exception):
-        logger.error(f"Error encountered: {error}")
+        logger.error("Error encountered", agent=self.id, error=repr(error))
+        self.metrics.errors += 1
         # Implement error handling logic
         # Log the error, update state, trigger disputes if necessary
-        logger.info("Error handled.")
+        logger.info("Error handled", agent=self.id)
 
 # Example usage (for illustration purposes, not part of the module)
 if __name__ == "__main__":
     agent = AgentCore(id="agent_001", owner="owner_001")
     agent.handle_lifecycle_event(AgentLifecycleEvent.INITIALIZE)
-    agent.load_dsl_script("agent FinancialAnalyst { ... }")
+    agent.load_dsl_script('fact: "market_open"\nrule: if market_open then analyze\ngoal: maximize_profit')
     agent.request_service("DataAnalysis", 10, {"risk_level": "low"})
     agent.respond_to_command("analyze")
     agent.report_status()
@@ -0,0 +1,219 @@
+# gaia-chain/agents/runtime/execution_context.py
+
+"""
+Execution Context for GaiaChain Agents
+
+This module hosts many `AgentCore` instances in a single process on one asyncio event loop. Each
+agent has its own task queue; a fixed pool of scheduler workers serves agents round-robin from a
+ready queue and runs at most `quantum` tasks for an agent before yielding it back, so busy agents
+cannot starve quiet ones. Agent methods are synchronous; they run inline on the loop, which keeps
+per-agent cost to a queue and a few bookkeeping fields instead of a process or thread.
+
+Lifecycle operations, commands and arbitrary agent calls are exposed as awaitables that resolve
+with the method's return value once the agent's turn comes. Other threads (such as the service
+request pipeline delivering receipts) queue work with `submit_threadsafe`; `current_context` tells
+a running agent method which context hosts it. With `metrics_port`, the context serves this
+process's runtime metrics at `/metrics` while it is running.
+"""
+
+import asyncio
+from collections import deque
+from contextvars import ContextVar
+from typing import Any, Callable, Deque, Dict, Iterable, Optional
+
+from gaia_chain.agents.runtime.agent_core import AgentCore, AgentLifecycleEvent
+from gaia_chain.tooling.monitoring import telemetry
+from gaia_chain.tooling.monitoring.structured_log import get_logger
+
+# Logger setup
+logger = get_logger(__name__)
+
+# The context whose worker is running the current agent method, if any
+current_context: ContextVar[Optional["ExecutionContext"]] = ContextVar("gaia_execution_context", default=None)
+
+class AgentSlot:
+    """Scheduling state for one hosted agent."""
+    __slots__ = ("agent", "queue", "scheduled", "events_processed")
+
+    def __init__(self, agent: AgentCore):
+        self.agent = agent
+        self.queue: Deque = deque()  # (callable, args, future)
+        self.scheduled = False  # True while the slot sits in the ready queue or is running
+        self.events_processed = 0
+
+class ExecutionContext:
+    """Cooperative scheduler running many agents on one event loop with fair time slicing."""
+    def __init__(self, workers: int = 4, quantum: int = 8, metrics_port: Optional[int] = None):
+        self.workers = workers
+        self.quantum = quantum
+        self.metrics_port = metrics_port
+        self.metrics_server = None
+        self.slots: Dict[str, AgentSlot] = {}
+        self.ready: Optional[asyncio.Queue] = None
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.tasks = []
+        self.events_processed = 0
+
+    # Agent Registration
+
+    def register(self, agent: AgentCore) -> AgentCore:
+        """Host an agent in this context."""
+        if agent.id in self.slots:
+            raise ValueError(f"Agent {agent.id} is already registered.")
+        self.slots[agent.id] = AgentSlot(agent)
+        return agent
+
+    def register_many(self, agents: Iterable[AgentCore]):
+        for agent in agents:
+            self.register(agent)
+
+    def unregister(self, agent_id: str) -> AgentCore:
+        """Stop hosting an agent; queued tasks are cancelled."""
+        slot = self.slots.pop(agent_id)
+        while slot.queue:
+            _, _, future = slot.queue.popleft()
+            future.cancel()
+        return slot.agent
+
+    def get_agent(self, agent_id: str) -> AgentCore:
+        return self._slot(agent_id).agent
+
+    # Scheduling
+
+    async def start(self):
+        """Start the scheduler workers on the running event loop."""
+        if self.tasks:
+            return
+        self.loop = asyncio.get_running_loop()
+        self.ready = asyncio.Queue()
+        for slot in self.slots.values():
+            if slot.queue and not slot.scheduled:
+                slot.scheduled = True
+                self.ready.put_nowait(slot)
+        self.tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+        if self.metrics_port is not None:
+            self.metrics_server = telemetry.start_metrics_server(self.metrics_port)
+        logger.info("Execution context started", workers=self.workers, agents=len(self.slots))
+
+    async def stop(self, drain: bool = True):
+        """Stop the scheduler, optionally waiting for queued tasks to finish first."""
+        if drain and self.ready is not None:
+            await self.ready.join()
+        for task in self.tasks:
+            task.cancel()
+        await asyncio.gather(*self.tasks, return_exceptions=True)
+        self.tasks = []
+        self.ready = None
+        self.loop = None
+        for slot in self.slots.values():
+            slot.scheduled = False
+        if self.metrics_server is not None:
+            server, self.metrics_server = self.metrics_server, None
+            await asyncio.to_thread(server.shutdown)
+            server.server_close()
+        logger.info("Execution context stopped", events=self.events_processed)
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.stop(drain=exc_type is None)
+
+    def submit(self, agent_id: str, method: Callable, *args) -> asyncio.Future:
+        """Queue `method(*args)` on an agent's task queue and return a future for its result."""
+        slot = self._slot(agent_id)
+        future = asyncio.get_running_loop().create_future()
+        slot.queue.append((method, args, future))
+        if not slot.scheduled and self.ready is not None:
+            slot.scheduled = True
+            self.ready.put_nowait(slot)
+        return future
+
+    def submit_threadsafe(self, agent_id: str, method: Callable, *args):
+        """Queue `method(*args)` on an agent's task queue from any thread, discarding the result.
+
+        `method` should handle its own errors; calls for agents unregistered meanwhile are dropped.
+        """
+        loop = self.loop
+        if loop is None:
+            raise RuntimeError("Execution context is not running.")
+        loop.call_soon_threadsafe(self._submit_detached, agent_id, method, args)
+
+    def _submit_detached(self, agent_id: str, method: Callable, args: tuple):
+        if agent_id in self.slots:
+            self.submit(agent_id, method, *args).add_done_callback(_log_detached_failure)
+
+    async def _worker(self):
+        current_context.set(self)
+        ready = self.ready
+        quantum = self.quantum
+        while True:
+            slot = await ready.get()
+            try:
+                queue = slot.queue
+                for _ in range(quantum):
+                    if not queue:
+                        break
+                    method, args, future = queue.popleft()
+                    if future.cancelled():
+                        continue
+                    try:
+                        future.set_result(method(*args))
+                    except Exception as e:
+                        future.set_exception(e)
+                    slot.events_processed += 1
+                    self.events_processed += 1
+                if queue and slot.agent.id in self.slots:
+                    ready.put_nowait(slot)  # Back of the line: round-robin time slicing
+                else:
+                    slot.scheduled = False
+            finally:
+                ready.task_done()
+            await asyncio.sleep(0)
+
+    def _slot(self, agent_id: str) -> AgentSlot:
+        slot = self.slots.get(agent_id)
+        if slot is None:
+            raise ValueError(f"Agent {agent_id} is not registered in this context.")
+        return slot
+
+    # Awaitable Agent Operations
+
+    async def handle_lifecycle_event(self, agent_id: str, event: AgentLifecycleEvent):
+        """Run a lifecycle transition on an agent and wait for it to complete."""
+        agent = self._slot(agent_id).agent
+        return await self.submit(agent_id, agent.handle_lifecycle_event, event)
+
+    async def respond_to_command(self, agent_id: str, command: str):
+        agent = self._slot(agent_id).agent
+        return await self.submit(agent_id, agent.respond_to_command, command)
+
+    async def request_service(self, agent_id: str, service_id: str, payment: int, constraints: Dict[str, Any]):
+        agent = self._slot(agent_id).agent
+        return await self.submit(agent_id, agent.request_service, service_id, payment, constraints)
+
+    async def call(self, agent_id: str, method_name: str, *args):
+        """Invoke any AgentCore method by name on the agent's queue."""
+        agent = self._slot(agent_id).agent
+        return await self.submit(agent_id, getattr(agent, method_name), *args)
+
+    async def broadcast_lifecycle_event(self, event: AgentLifecycleEvent):
+        """Apply a lifecycle event to every hosted agent concurrently."""
+        return await asyncio.gather(*(self.handle_lifecycle_event(agent_id, event) for agent_id in list(self.slots)))
+
+def _log_detached_failure(future: asyncio.Future):
+    if not future.cancelled() and future.exception() is not None:
+        logger.error("Detached agent call failed", error=repr(future.exception()))
+
+# Example usage (for illustration purposes, not part of the module)
+if __name__ == "__main__":
+    async def main():
+        context = ExecutionContext()
+        context.register_many(AgentCore(id=f"agent_{i:03d}", owner="owner_001") for i in range(3))
+        async with context:
+            await context.broadcast_lifecycle_event(AgentLifecycleEvent.ACTIVATE)
+            await context.respond_to_command("agent_001", "analyze")
+        print({agent_id: slot.agent.state.value for agent_id, slot in context.slots.items()})
+
+    asyncio.run(main())
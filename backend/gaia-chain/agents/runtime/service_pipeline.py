@@ -0,0 +1,359 @@
+# gaia-chain/agents/runtime/service_pipeline.py
+
+"""
+Service Request Pipeline for GaiaChain Agents
+
+This module makes `AgentCore.request_service` non-blocking. Submitting a request returns a
+`concurrent.futures.Future` immediately; a background thread coalesces queued requests into one
+batched `eth_sendTransaction` JSON-RPC call, then polls the receipts of every pending transaction
+in one batched `eth_getTransactionReceipt` call per poll interval. Mined receipts are handed to
+the requesting agent's `process_service_result` and resolve the future, so an agent never sits
+idle for a block while its request confirms.
+
+Agent code never runs on the pipeline thread when it can be avoided: results and failures
+(`process_service_result`, `handle_error` and the agent's metrics) are handed back to where the
+request was submitted from. Requests made inside an `ExecutionContext` are delivered through the
+agent's task queue, requests made in an `AgentWorkerPool` worker through the worker's inbox
+(`current_dispatcher`), and requests made on another asyncio loop with `call_soon_threadsafe`;
+only requests from plain threads, which have nothing to hand back to, are delivered inline. Delivery
+is queued before the future resolves, so work the caller queues after awaiting it sees the result.
+
+From asyncio code (e.g. inside an `ExecutionContext`), wrap the future with `asyncio.wrap_future`.
+"""
+
+import asyncio
+import json
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from functools import partial
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+from gaia_chain.agents.runtime.execution_context import current_context
+from gaia_chain.tooling.monitoring import telemetry
+from gaia_chain.tooling.rpc.json_rpc_client import JsonRpcClient, JsonRpcError
+from gaia_chain.tooling.monitoring.structured_log import get_logger
+
+# Logger setup
+logger = get_logger(__name__)
+
+# Process-wide metrics (exported at /metrics)
+SERVICE_REQUESTS = telemetry.counter("gaia_service_requests_total", "Service requests finished, by outcome.", ("outcome",))
+SERVICE_REQUEST_SECONDS = telemetry.histogram("gaia_service_request_seconds", "Time from submission to mined receipt.",
+                                              buckets=(0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0))
+
+RequestEncoder = Callable[[str, int, Dict[str, Any]], str]
+Dispatch = Callable[..., None]  # dispatch(fn, *args) runs fn(*args) on the agent's thread or loop
+
+class ServiceRequestFailed(RuntimeError):
+    """Raised when a service request transaction is mined but reverted."""
+    def __init__(self, receipt: dict):
+        super().__init__(f"Service request transaction {receipt.get('transactionHash')} reverted.")
+        self.receipt = receipt
+
+    def __reduce__(self):
+        # Rebuild from the receipt, not the message, when sent back from a worker process
+        return type(self), (self.receipt,)
+
+# Request Encoders
+
+def contract_request_encoder(contract, fn_name: str = "requestService") -> RequestEncoder:
+    """Encode requests as ABI calldata for a web3 contract's `requestService(id, request, payment)`."""
+    def encode(service_id: str, payment: int, constraints: Dict[str, Any]) -> str:
+        return contract.encode_abi(abi_element_identifier=fn_name, args=[service_id, json.dumps(constraints, sort_keys=True), payment])
+    return encode
+
+def json_request_encoder(service_id: str, payment: int, constraints: Dict[str, Any]) -> str:
+    """Encode requests as hex-encoded JSON calldata (for endpoints that accept raw payloads)."""
+    payload = json.dumps({"service_id": service_id, "payment": payment, "constraints": constraints}, sort_keys=True)
+    return "0x" + payload.encode("utf-8").hex()
+
+# Delivery
+
+def _call_inline(fn: Callable, *args):
+    fn(*args)
+
+# Set by hosts that drive agents from a thread of their own (e.g. AgentWorkerPool workers)
+current_dispatcher: ContextVar[Optional[Dispatch]] = ContextVar("gaia_service_dispatcher", default=None)
+
+def owner_dispatcher(agent) -> Dispatch:
+    """Return how to run code for `agent` where the calling thread drives it (see the module docstring)."""
+    context = current_context.get()
+    if context is not None and context.loop is not None:
+        return partial(context.submit_threadsafe, agent.id)
+    dispatcher = current_dispatcher.get()
+    if dispatcher is not None:
+        return dispatcher
+    try:
+        return asyncio.get_running_loop().call_soon_threadsafe
+    except RuntimeError:
+        return _call_inline
+
+# Pipeline
+
+@dataclass
+class ServiceRequest:
+    agent: Any
+    service_id: str
+    payment: int
+    constraints: Dict[str, Any]
+    dispatch: Dispatch = _call_inline
+    future: Future = field(default_factory=Future)
+    submitted_at: float = field(default_factory=time.monotonic)
+    tx_hash: Optional[str] = None
+
+class ServiceRequestPipeline:
+    """Batches service request transactions and their receipt polling over JSON-RPC."""
+    def __init__(self, client: JsonRpcClient, contract_address: str, encode_request: RequestEncoder,
+                 sender: Optional[str] = None, max_batch: int = 100, flush_interval: float = 0.005,
+                 poll_interval: float = 1.0, receipt_timeout: float = 300.0,
+                 deliver: Optional[Callable[[Any, dict], None]] = None):
+        if max_batch < 1:
+            raise ValueError("max_batch must be at least 1.")
+        self.client = client
+        self.contract_address = contract_address
+        self.encode_request = encode_request
+        self.sender = sender
+        self.max_batch = max_batch
+        self.flush_interval = flush_interval
+        self.poll_interval = poll_interval
+        self.receipt_timeout = receipt_timeout
+        # Called on the agent's thread or loop (see owner_dispatcher)
+        self.deliver = deliver or (lambda agent, receipt: agent.process_service_result(receipt))
+        self.outgoing: Deque[ServiceRequest] = deque()
+        self.in_flight: Dict[str, ServiceRequest] = {}
+        self.condition = threading.Condition()
+        self.thread: Optional[threading.Thread] = None
+        self.stopping = False
+        self.drain = True
+        self.drain_deadline: Optional[float] = None
+        self.stats = {"send_batches": 0, "receipt_polls": 0, "submitted": 0, "completed": 0, "failed": 0}
+
+    # Submission
+
+    def submit(self, agent, service_id: str, payment: int, constraints: Dict[str, Any],
+               dispatch: Optional[Dispatch] = None) -> Future:
+        """Queue a service request for `agent` and return a future for its receipt.
+
+        The result is delivered through `dispatch`, by default `owner_dispatcher(agent)`.
+        """
+        request = ServiceRequest(agent, service_id, payment, constraints, dispatch or owner_dispatcher(agent))
+        with self.condition:
+            if self.stopping:
+                raise RuntimeError("Service request pipeline is stopped.")
+            self.outgoing.append(request)
+            self.stats["submitted"] += 1
+            self.condition.notify()
+        self.start()
+        return request.future
+
+    def pending_count(self) -> int:
+        with self.condition:
+            return len(self.outgoing) + len(self.in_flight)
+
+    # Lifecycle
+
+    def start(self):
+        with self.condition:
+            if self.thread is not None:
+                return
+            self.stopping = False
+            self.thread = threading.Thread(target=self._run, name="gaia-service-pipeline", daemon=True)
+            self.thread.start()
+
+    def stop(self, drain: bool = True, timeout: Optional[float] = None):
+        """Stop the pipeline; with `drain`, wait for queued and in-flight requests to resolve first.
+
+        `timeout` bounds the drain: requests still unresolved after it are cancelled. Either way
+        this returns only once the background thread has exited, so no future is resolved after.
+        """
+        with self.condition:
+            if self.thread is None:
+                return
+            self.stopping = True
+            self.drain = drain
+            self.drain_deadline = None if timeout is None else time.monotonic() + timeout
+            self.condition.notify()
+            thread = self.thread
+        thread.join()
+        with self.condition:
+            self.thread = None
+        logger.info("Service request pipeline stopped", completed=self.stats['completed'], failed=self.stats['failed'])
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop(drain=exc_type is None)
+
+    # Background Loop
+
+    def _run(self):
+        try:
+            self._loop()
+        finally:
+            # Only this thread resolves futures, so cancel leftovers here rather than in stop()
+            with self.condition:
+                abandoned = list(self.outgoing) + list(self.in_flight.values())
+                self.outgoing.clear()
+                self.in_flight.clear()
+            for request in abandoned:
+                request.future.cancel()
+
+    def _draining(self) -> bool:
+        return self.drain and (self.drain_deadline is None or time.monotonic() < self.drain_deadline)
+
+    def _loop(self):
+        next_poll = 0.0
+        while True:
+            with self.condition:
+                if self.stopping and not self._draining():
+                    return
+                while not self.outgoing and not self.stopping:
+                    if self.in_flight:
+                        timeout = next_poll - time.monotonic()
+                        if timeout <= 0:
+                            break
+                        self.condition.wait(timeout)
+                    else:
+                        self.condition.wait()
+                if self.outgoing:
+                    # Linger briefly so concurrent submitters share one round trip
+                    deadline = time.monotonic() + self.flush_interval
+                    while len(self.outgoing) < self.max_batch and not self.stopping:
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0:
+                            break
+                        self.condition.wait(remaining)
+                batch = [self.outgoing.popleft() for _ in range(min(len(self.outgoing), self.max_batch))]
+                if self.stopping and not batch and not (self._draining() and self.in_flight):
+                    return
+            if batch:
+                self._send(batch)
+            if self.in_flight and time.monotonic() >= next_poll:
+                self._poll_receipts()
+                next_poll = time.monotonic() + self.poll_interval
+            elif self.stopping and self.in_flight and not batch:
+                wake_at = next_poll if self.drain_deadline is None else min(next_poll, self.drain_deadline)
+                time.sleep(max(0.0, wake_at - time.monotonic()))
+
+    def _send(self, batch: List[ServiceRequest]):
+        calls = []
+        encoded = []
+        for request in batch:
+            try:
+                data = self.encode_request(request.service_id, request.payment, request.constraints)
+            except Exception as e:
+                self._fail(request, e)
+                continue
+            tx = {"to": self.contract_address, "data": data}
+            if self.sender:
+                tx["from"] = self.sender
+            calls.append(("eth_sendTransaction", [tx]))
+            encoded.append(request)
+        if not calls:
+            return
+        batch = encoded
+        try:
+            results = self.client.batch(calls)
+        except Exception as e:
+            logger.error("Failed to send service requests", requests=len(batch), error=repr(e))
+            for request in batch:
+                self._fail(request, e)
+            return
+        self.stats["send_batches"] += 1
+        for request, result in zip(batch, results):
+            if isinstance(result, JsonRpcError):
+                self._fail(request, result)
+            else:
+                request.tx_hash = result
+                with self.condition:
+                    self.in_flight[result] = request
+
+    def _poll_receipts(self):
+        with self.condition:
+            tx_hashes = list(self.in_flight)
+        for start in range(0, len(tx_hashes), self.max_batch):
+            chunk = tx_hashes[start:start + self.max_batch]
+            try:
+                receipts = self.client.batch([("eth_getTransactionReceipt", [tx_hash]) for tx_hash in chunk])
+            except Exception as e:
+                logger.warning("Receipt poll failed", transactions=len(chunk), error=repr(e))
+                continue
+            self.stats["receipt_polls"] += 1
+            for tx_hash, receipt in zip(chunk, receipts):
+                if receipt is None or isinstance(receipt, JsonRpcError):
+                    continue
+                with self.condition:
+                    request = self.in_flight.pop(tx_hash)
+                self._complete(request, receipt)
+        now = time.monotonic()
+        with self.condition:
+            expired = [tx_hash for tx_hash, request in self.in_flight.items() if now - request.submitted_at > self.receipt_timeout]
+            expired = [self.in_flight.pop(tx_hash) for tx_hash in expired]
+        for request in expired:
+            self._fail(request, TimeoutError(f"No receipt for {request.tx_hash} after {self.receipt_timeout}s."))
+
+    def _complete(self, request: ServiceRequest, receipt: dict):
+        elapsed = time.monotonic() - request.submitted_at
+        SERVICE_REQUEST_SECONDS.observe(elapsed)
+        if receipt.get("status") in ("0x0", 0):
+            self._fail(request, ServiceRequestFailed(receipt), elapsed)
+            return
+        self.stats["completed"] += 1
+        SERVICE_REQUESTS.labels("completed").inc()
+        self._dispatch(request, self._deliver_result, request, receipt, elapsed)
+        request.future.set_result(receipt)
+
+    def _fail(self, request: ServiceRequest, error: Exception, elapsed: Optional[float] = None):
+        self.stats["failed"] += 1
+        SERVICE_REQUESTS.labels("failed").inc()
+        self._dispatch(request, self._deliver_failure, request.agent, error, elapsed)
+        request.future.set_exception(error)
+
+    def _dispatch(self, request: ServiceRequest, fn: Callable, *args):
+        try:
+            request.dispatch(fn, *args)
+        except Exception as e:
+            # E.g. the submitting loop has closed; the future still resolves
+            logger.error("Could not hand service result to its agent", tx_hash=request.tx_hash, error=repr(e))
+
+    # Delivery (runs on the agent's thread or loop)
+
+    def _deliver_result(self, request: ServiceRequest, receipt: dict, elapsed: float):
+        metrics = getattr(request.agent, "metrics", None)
+        if metrics is not None:
+            metrics.observe("service_request_roundtrip", elapsed)
+        try:
+            self.deliver(request.agent, receipt)
+        except Exception as e:
+            logger.error("Delivering service result failed", tx_hash=request.tx_hash, error=repr(e))
+
+    @staticmethod
+    def _deliver_failure(agent, error: Exception, elapsed: Optional[float]):
+        metrics = getattr(agent, "metrics", None)
+        if metrics is not None:
+            if elapsed is not None:
+                metrics.observe("service_request_roundtrip", elapsed)
+            metrics.task_failed()
+        agent.handle_error(error)
+
+# Example usage (for illustration purposes, not part of the module)
+if __name__ == "__main__":
+    from gaia_chain.agents.runtime.agent_core import AgentCore
+    from gaia_chain.testing.rpc.local_node import LocalJsonRpcNode
+
+    node = LocalJsonRpcNode()
+    node.start_mining(block_time=0.1)
+    pipeline = ServiceRequestPipeline(JsonRpcClient(node), "0x00000000000000000000000000000000000000aa",
+                                      json_request_encoder, poll_interval=0.05)
+    agents = [AgentCore(id=f"agent_{i:03d}", owner="owner_001", service_pipeline=pipeline) for i in range(5)]
+    futures = [agent.request_service("DataAnalysis", 10, {"risk_level": "low"}) for agent in agents]
+    print([future.result(timeout=5)["blockNumber"] for future in futures])
+    pipeline.stop()
+    node.stop_mining()
+    print(f"Round trips: {node.round_trips}, requests: {node.requests}, stats: {pipeline.stats}")
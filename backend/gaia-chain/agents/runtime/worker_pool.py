@@ -0,0 +1,375 @@
+# gaia-chain/agents/runtime/worker_pool.py
+
+"""
+Agent Worker Pool for GaiaChain
+
+This module spreads `AgentCore` instances across N worker processes so CPU-bound reasoning is not
+serialized by the GIL. Agents are placed on workers by consistent hashing of `AgentCore.id`, and
+every call for an agent (lifecycle events, `respond_to_command`, `request_service`, or any other
+method) is routed to its owning worker over a duplex pipe. Calls return futures immediately.
+
+Service pipelines, discovery and ledgers own threads, sockets and process-local state, so they
+are not pickled with an agent (see `AgentCore.__getstate__`). Instead `agent_services` is called
+once in each worker process and its result ({AgentCore field: object}) is attached to every agent
+the worker hosts. Within a worker, pipe requests and service deliveries share one inbox served by
+the main thread, so an agent never runs on two threads at once. A call that returns a future
+(`request_service`) is answered when it resolves, with the receipt rather than the future.
+
+When workers are added or removed only the agents whose ring owner changes are migrated: the
+old worker evicts the agent (after finishing its queued calls and in-flight service requests)
+and the new worker adopts it.
+
+Runtime metrics are recorded in the worker that hosts the agent. With `metrics_port`, worker N
+serves its own `/metrics` on `metrics_port + N`, so each worker is a separate scrape target.
+"""
+
+import hashlib
+import itertools
+import multiprocessing
+import queue
+import threading
+from bisect import bisect, insort
+from concurrent.futures import CancelledError, Future
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from gaia_chain.agents.runtime.agent_core import AgentCore, AgentLifecycleEvent
+from gaia_chain.agents.runtime.service_pipeline import current_dispatcher
+from gaia_chain.tooling.monitoring import telemetry
+from gaia_chain.tooling.monitoring.structured_log import get_logger
+
+# Logger setup
+logger = get_logger(__name__)
+
+# Consistent Hashing
+
+def _ring_hash(key: str) -> int:
+    return int.from_bytes(hashlib.blake2b(key.encode("utf-8"), digest_size=8).digest(), "big")
+
+class ConsistentHashRing:
+    """Maps keys to nodes with virtual replicas so membership changes move ~1/N of the keys."""
+    def __init__(self, replicas: int = 128):
+        self.replicas = replicas
+        self.points: List[Tuple[int, str]] = []
+        self.nodes = set()
+
+    def add_node(self, node: str):
+        if node in self.nodes:
+            return
+        self.nodes.add(node)
+        for replica in range(self.replicas):
+            insort(self.points, (_ring_hash(f"{node}#{replica}"), node))
+
+    def remove_node(self, node: str):
+        self.nodes.discard(node)
+        self.points = [point for point in self.points if point[1] != node]
+
+    def get_node(self, key: str) -> str:
+        if not self.points:
+            raise ValueError("The hash ring has no nodes.")
+        index = bisect(self.points, (_ring_hash(key), ""))
+        return self.points[index % len(self.points)][1]
+
+# Worker Process
+
+AgentServices = Callable[[], Dict[str, Any]]  # Per-process {AgentCore field: object}, e.g. service_pipeline
+
+class _Worker:
+    """Worker-side state: hosted agents, their in-flight service requests and the shared inbox."""
+    def __init__(self, conn, agent_services: Optional[AgentServices] = None):
+        self.conn = conn
+        self.agents: Dict[str, AgentCore] = {}
+        self.services = agent_services() if agent_services is not None else {}
+        self.inbox = queue.SimpleQueue()  # ("request", message) | ("deliver", fn, args) | ("settled", ...) | ("eof",)
+        self.in_flight: Dict[str, int] = {}  # agent_id -> unresolved futures returned by its calls
+        self.evictions: Dict[str, int] = {}  # agent_id -> evict request answered once in_flight drops to 0
+
+    def dispatch(self, fn: Callable, *args):
+        """Run `fn(*args)` on the worker's main thread (installed as the service pipeline dispatcher)."""
+        self.inbox.put(("deliver", fn, args))
+
+    def serve(self):
+        current_dispatcher.set(self.dispatch)
+        threading.Thread(target=self._read_requests, daemon=True).start()
+        while True:
+            kind, *item = self.inbox.get()
+            if kind == "request":
+                if not self._handle(*item[0]):
+                    break
+            elif kind == "eof":
+                break
+            else:
+                self._run(kind, item)
+        self.conn.close()
+
+    def _read_requests(self):
+        while True:
+            try:
+                message = self.conn.recv()
+            except (EOFError, OSError):
+                self.inbox.put(("eof",))
+                break
+            self.inbox.put(("request", message))
+            if message[1] == "stop":
+                break
+
+    def _run(self, kind: str, item: list):
+        if kind == "deliver":
+            fn, args = item
+            try:
+                fn(*args)
+            except Exception as e:
+                logger.error("Service delivery failed in worker", error=repr(e))
+        elif kind == "settled":
+            self._settled(*item)
+
+    def _handle(self, request_id: int, op: str, agent_id: Optional[str], payload: Any) -> bool:
+        """Serve one pipe request; return False once the worker should exit."""
+        try:
+            if op == "call":
+                method_name, args = payload
+                result = getattr(self.agents[agent_id], method_name)(*args)
+                if isinstance(result, Future):
+                    self._track(request_id, agent_id, result)
+                    return True
+            elif op == "host":
+                for name, service in self.services.items():
+                    if getattr(payload, name, None) is None:
+                        setattr(payload, name, service)
+                self.agents[agent_id] = payload
+                result = None
+            elif op == "get":
+                result = self.agents[agent_id]
+            elif op == "evict":
+                if agent_id in self.in_flight:
+                    self.evictions[agent_id] = request_id  # Handed over once its service requests settle
+                    return True
+                result = self.agents.pop(agent_id)
+            elif op == "count":
+                result = len(self.agents)
+            elif op == "stop":
+                self._stop_services()
+                self.conn.send((request_id, True, list(self.agents.values())))
+                return False
+            else:
+                raise ValueError(f"Unknown worker operation: {op}")
+            self.conn.send((request_id, True, result))
+        except Exception as e:
+            self.conn.send((request_id, False, e))
+        return True
+
+    def _track(self, request_id: int, agent_id: str, future: Future):
+        self.in_flight[agent_id] = self.in_flight.get(agent_id, 0) + 1
+        # Queued behind the delivery the pipeline dispatched before resolving the future
+        future.add_done_callback(lambda done: self.inbox.put(("settled", request_id, agent_id, done)))
+
+    def _settled(self, request_id: int, agent_id: str, future: Future):
+        if future.cancelled():
+            self.conn.send((request_id, False, CancelledError()))
+        elif future.exception() is not None:
+            self.conn.send((request_id, False, future.exception()))
+        else:
+            self.conn.send((request_id, True, future.result()))
+        self.in_flight[agent_id] -= 1
+        if not self.in_flight[agent_id]:
+            del self.in_flight[agent_id]
+            eviction = self.evictions.pop(agent_id, None)
+            if eviction is not None:
+                self.conn.send((eviction, True, self.agents.pop(agent_id)))
+
+    def _stop_services(self):
+        pipeline = self.services.get("service_pipeline")
+        if pipeline is None:
+            return
+        pipeline.stop(drain=True)
+        while True:  # Deliver what the drain resolved before handing the agents back
+            try:
+                kind, *item = self.inbox.get_nowait()
+            except queue.Empty:
+                break
+            self._run(kind, item)
+
+def _worker_main(conn, metrics_port: Optional[int] = None, agent_services: Optional[AgentServices] = None):
+    """Serve agent calls for the agents hosted on this worker until told to stop."""
+    telemetry.REGISTRY.reset()  # Forked workers start with a copy of the parent's counts
+    if metrics_port is not None:
+        telemetry.start_metrics_server(metrics_port)
+    _Worker(conn, agent_services).serve()
+
+class WorkerHandle:
+    """Parent-side handle for one worker process: its pipe, pending futures and reader thread."""
+    def __init__(self, worker_id: str, context, metrics_port: Optional[int] = None,
+                 agent_services: Optional[AgentServices] = None):
+        self.worker_id = worker_id
+        self.metrics_port = metrics_port
+        self.conn, child_conn = context.Pipe(duplex=True)
+        self.process = context.Process(target=_worker_main, args=(child_conn, metrics_port, agent_services),
+                                       name=f"gaia-agent-{worker_id}", daemon=True)
+        self.process.start()
+        child_conn.close()
+        self.pending: Dict[int, Future] = {}
+        self.send_lock = threading.Lock()
+        self.request_ids = itertools.count()
+        self.reader = threading.Thread(target=self._read_responses, daemon=True)
+        self.reader.start()
+
+    def send(self, op: str, agent_id: Optional[str] = None, payload: Any = None) -> Future:
+        future = Future()
+        with self.send_lock:
+            request_id = next(self.request_ids)
+            self.pending[request_id] = future
+            self.conn.send((request_id, op, agent_id, payload))
+        return future
+
+    def _read_responses(self):
+        while True:
+            try:
+                request_id, ok, result = self.conn.recv()
+            except (EOFError, OSError):
+                break
+            future = self.pending.pop(request_id)
+            if ok:
+                future.set_result(result)
+            else:
+                future.set_exception(result)
+        for future in self.pending.values():
+            future.set_exception(RuntimeError(f"Worker {self.worker_id} exited."))
+        self.pending.clear()
+
+    def stop(self, timeout: float = 5.0) -> List[AgentCore]:
+        """Stop the worker and return the agents it still hosted."""
+        agents = self.send("stop").result(timeout)
+        self.process.join(timeout)
+        self.reader.join(timeout)  # The reader exits on EOF once the worker closes its end
+        self.conn.close()
+        return agents
+
+# Worker Pool
+
+class AgentWorkerPool:
+    """Shards agents across worker processes by consistent hashing on agent ID.
+
+    `agent_services` must be picklable under the chosen start method (a module-level function).
+    """
+    def __init__(self, workers: int = None, replicas: int = 128, start_method: str = None,
+                 metrics_port: Optional[int] = None, agent_services: Optional[AgentServices] = None):
+        self.context = multiprocessing.get_context(start_method)
+        self.metrics_port = metrics_port
+        self.agent_services = agent_services
+        self.ring = ConsistentHashRing(replicas)
+        self.workers: Dict[str, WorkerHandle] = {}
+        self.placement: Dict[str, str] = {}  # agent_id -> worker_id
+        self.lock = threading.RLock()
+        self.worker_ids = itertools.count()
+        for _ in range(workers or multiprocessing.cpu_count()):
+            self.add_worker()
+
+    # Agent Placement
+
+    def register(self, agent: AgentCore) -> Future:
+        """Place an agent on its owning worker."""
+        with self.lock:
+            if agent.id in self.placement:
+                raise ValueError(f"Agent {agent.id} is already registered.")
+            worker_id = self.ring.get_node(agent.id)
+            self.placement[agent.id] = worker_id
+            return self.workers[worker_id].send("host", agent.id, agent)
+
+    def register_many(self, agents: Iterable[AgentCore]):
+        futures = [self.register(agent) for agent in agents]
+        for future in futures:
+            future.result()
+
+    def unregister(self, agent_id: str) -> AgentCore:
+        """Remove an agent from the pool and return its current state."""
+        with self.lock:
+            worker_id = self.placement.pop(agent_id)
+            return self.workers[worker_id].send("evict", agent_id).result()
+
+    def owner_of(self, agent_id: str) -> str:
+        return self.placement[agent_id]
+
+    # Rebalancing
+
+    def add_worker(self) -> str:
+        """Start a worker and migrate the agents that now hash to it."""
+        with self.lock:
+            sequence = next(self.worker_ids)
+            worker_id = f"worker-{sequence}"
+            metrics_port = None if self.metrics_port is None else self.metrics_port + sequence
+            self.workers[worker_id] = WorkerHandle(worker_id, self.context, metrics_port, self.agent_services)
+            self.ring.add_node(worker_id)
+            self._rebalance()
+            logger.info("Added worker", worker=worker_id, workers=len(self.workers))
+            return worker_id
+
+    def remove_worker(self, worker_id: str):
+        """Drain a worker, hand its agents to their new owners and stop it."""
+        with self.lock:
+            if len(self.workers) == 1:
+                raise ValueError("Cannot remove the last worker.")
+            self.ring.remove_node(worker_id)
+            self._rebalance()
+            self.workers.pop(worker_id).stop()
+            logger.info("Removed worker", worker=worker_id, workers=len(self.workers))
+
+    def _rebalance(self):
+        moves = [(agent_id, worker_id, self.ring.get_node(agent_id))
+                 for agent_id, worker_id in self.placement.items()
+                 if self.ring.get_node(agent_id) != worker_id]
+        evictions = [(agent_id, target, self.workers[source].send("evict", agent_id)) for agent_id, source, target in moves]
+        adoptions = []
+        for agent_id, target, eviction in evictions:
+            adoptions.append(self.workers[target].send("host", agent_id, eviction.result()))
+            self.placement[agent_id] = target
+        for adoption in adoptions:
+            adoption.result()
+        if moves:
+            logger.info("Rebalanced agents", moved=len(moves), agents=len(self.placement))
+
+    # Routed Calls
+
+    def submit(self, agent_id: str, method_name: str, *args) -> Future:
+        """Call `method_name(*args)` on an agent in its owning worker; returns a future."""
+        with self.lock:
+            worker = self.workers[self.placement[agent_id]]
+            return worker.send("call", agent_id, (method_name, args))
+
+    def handle_lifecycle_event(self, agent_id: str, event: AgentLifecycleEvent) -> Future:
+        return self.submit(agent_id, "handle_lifecycle_event", event)
+
+    def respond_to_command(self, agent_id: str, command: str) -> Future:
+        return self.submit(agent_id, "respond_to_command", command)
+
+    def request_service(self, agent_id: str, service_id: str, payment: int, constraints: Dict[str, Any]) -> Future:
+        """Resolves with the transaction receipt (None if the request was not sent)."""
+        return self.submit(agent_id, "request_service", service_id, payment, constraints)
+
+    def get_agent(self, agent_id: str) -> AgentCore:
+        """Fetch a snapshot copy of an agent's current state from its worker."""
+        with self.lock:
+            worker = self.workers[self.placement[agent_id]]
+        return worker.send("get", agent_id).result()
+
+    def shutdown(self):
+        """Stop every worker process."""
+        with self.lock:
+            for worker in self.workers.values():
+                worker.stop()
+            self.workers.clear()
+            self.placement.clear()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.shutdown()
+
+# Example usage (for illustration purposes, not part of the module)
+if __name__ == "__main__":
+    with AgentWorkerPool(workers=2) as pool:
+        pool.register_many(AgentCore(id=f"agent_{i:03d}", owner="owner_001") for i in range(10))
+        for agent_id in list(pool.placement):
+            pool.handle_lifecycle_event(agent_id, AgentLifecycleEvent.ACTIVATE).result()
+        pool.add_worker()
+        print({agent_id: pool.owner_of(agent_id) for agent_id in pool.placement})
+        print(pool.submit("agent_001", "report_status").result())
@@ -0,0 +1,50 @@
+# gaia-chain/agents/tests/test_agent_core.py
+
+"""
+Tests for DSL-driven behavior of the agent runtime core (agents/runtime/agent_core.py).
+"""
+
+from gaia_chain.agents.runtime.agent_core import AgentCore
+from gaia_chain.dsl.rules.core_rules import GaiaAction
+from gaia_chain.dsl.rules.economic_rules import DisputeResolutionMethod
+from gaia_chain.economy.ledger import Ledger
+
+SCRIPT = """
+agent Analyst {
+    identity: "FinBot"
+    on receive "market_data" {
+        compute "FinancialModel" with market_data
+        send "analysis_report" to requester
+    }
+}
+payment: 5 GAIA to provider
+if accuracy < 0.8 then {
+    dispute { initiator: "agent_1" target: "provider" reason: "Inaccurate" resolution_method: "Mediation" }
+}
+"""
+
+class Agent(AgentCore):
+    """AgentCore recording the actions it executes."""
+    def execute_action(self, action):
+        self.resources.setdefault("executed", []).append(action.action_type)
+        super().execute_action(action)
+
+def test_script_pays_disputes_and_registers_behaviors():
+    agent = Agent(id="agent_1", owner="owner_1")
+    agent.ledger = Ledger()
+    agent.ledger.deposit("agent_1", 10 * 10 ** 18)
+    agent.resources["accuracy"] = 0.5
+    agent.load_dsl_script(SCRIPT)
+    assert agent.ledger.balance("provider") == 5 * 10 ** 18
+    [dispute] = agent.disputes
+    assert (dispute.target, dispute.resolution_method) == ("provider", DisputeResolutionMethod.MEDIATION)
+    assert "executed" not in agent.resources  # Behaviors wait for their event
+    assert agent.handle_event("receive", "market_data") == 1
+    assert agent.resources["executed"] == [GaiaAction.COMPUTE, GaiaAction.SEND_MESSAGE]
+    assert agent.handle_event("receive", "other") == 0
+
+def test_payment_without_funds_is_an_error():
+    agent = AgentCore(id="agent_1", owner="owner_1")
+    agent.resources["accuracy"] = 1.0
+    agent.load_dsl_script(SCRIPT)
+    assert agent.metrics.errors == 1 and agent.resources["GAIA_balance"] == 0
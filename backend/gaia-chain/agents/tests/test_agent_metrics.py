@@ -0,0 +1,39 @@
+# gaia-chain/agents/tests/test_agent_metrics.py
+
+"""
+Tests for sampled per-agent metrics (agents/runtime/agent_metrics.py).
+"""
+
+import pytest
+
+from gaia_chain.agents.runtime.agent_core import AgentCore
+from gaia_chain.agents.runtime.agent_metrics import AgentMetrics
+
+def test_every_call_is_counted_but_only_sampled_calls_are_timed():
+    metrics = AgentMetrics(sample_every=4)
+    for _ in range(10):
+        with metrics.measure("op"):
+            pass
+    stats = metrics.operations["op"]
+    assert stats.calls == 10
+    assert stats.latency.count == stats.cpu_samples == 3  # Calls 1, 5 and 9
+    assert stats.latency_seconds() == pytest.approx(stats.latency.total * 10 / 3)
+
+def test_errors_are_counted_on_unsampled_calls():
+    metrics = AgentMetrics(sample_every=8)
+    for i in range(4):
+        with pytest.raises(ValueError):
+            with metrics.measure("op"):
+                raise ValueError(i)
+    with metrics.measure("op") as measurement:
+        measurement.fail()
+    assert metrics.operations["op"].errors == 5
+
+def test_disabled_metrics_record_nothing():
+    agent = AgentCore(id="agent_1", owner="owner_1", metrics=AgentMetrics(enabled=False))
+    agent.respond_to_command("status")
+    snapshot = agent.report_metrics()
+    assert snapshot["operations"] == {} and snapshot["sample_every"] is None
+    assert snapshot["tasks"]["completed"] == 1  # Task accounting stays on
+    assert set(snapshot["memory_estimate"]) == {"resources_sizeof_bytes", "goals_sizeof_bytes", "dsl_sizeof_bytes",
+                                                "knowledge_items"}
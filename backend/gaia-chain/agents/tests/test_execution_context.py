@@ -0,0 +1,160 @@
+# gaia-chain/agents/tests/test_execution_context.py
+
+"""
+Tests for fair scheduling, cancellation and shutdown of hosted agents (agents/runtime/execution_context.py).
+"""
+
+import asyncio
+
+import pytest
+
+from gaia_chain.agents.runtime.agent_core import AgentCore, AgentLifecycleEvent, AgentState
+from gaia_chain.agents.runtime.execution_context import ExecutionContext, current_context
+
+def hosted(*agent_ids, **options):
+    context = ExecutionContext(**options)
+    context.register_many(AgentCore(id=agent_id, owner="owner_1") for agent_id in agent_ids)
+    return context
+
+# Fairness
+
+def test_agents_take_turns_of_at_most_quantum_tasks():
+    context = hosted("a", "b", "c", workers=1, quantum=2)
+    order = []
+
+    async def main():
+        futures = [context.submit(agent_id, order.append, f"{agent_id}{i}")
+                   for agent_id, count in (("a", 5), ("b", 1), ("c", 3)) for i in range(1, count + 1)]
+        async with context:
+            await asyncio.gather(*futures)
+
+    asyncio.run(main())
+    # A busy agent goes to the back of the line after each quantum instead of running to completion
+    assert order == ["a1", "a2", "b1", "c1", "c2", "a3", "a4", "c3", "a5"]
+    assert context.slots["a"].events_processed == 5 and context.events_processed == 9
+
+def test_a_quiet_agent_is_not_starved_by_a_flood():
+    context = hosted("busy", "quiet", workers=2, quantum=4)
+    order = []
+
+    async def main():
+        async with context:
+            flood = [context.submit("busy", order.append, "busy") for _ in range(200)]
+            await asyncio.sleep(0)
+            await context.submit("quiet", order.append, "quiet")
+            await asyncio.gather(*flood)
+
+    asyncio.run(main())
+    assert order.index("quiet") < 20
+
+# Cancellation
+
+def test_unregister_cancels_queued_calls():
+    context = hosted("a", "b")
+
+    async def main():
+        queued = [context.submit("a", order.append, i) for i in range(3)]
+        other = context.submit("b", order.append, "b")
+        agent = context.unregister("a")
+        async with context:
+            assert await other is None
+        return agent, queued
+
+    order = []
+    agent, queued = asyncio.run(main())
+    assert agent.id == "a" and all(future.cancelled() for future in queued)
+    assert order == ["b"] and "a" not in context.slots
+    with pytest.raises(ValueError, match="not registered"):
+        context.get_agent("a")
+
+def test_unregister_during_a_turn_cancels_the_rest_of_it():
+    context = hosted("a", workers=1, quantum=8)
+    ran = []
+
+    async def main():
+        async with context:
+            first = context.submit("a", lambda: context.unregister("a"))
+            rest = [context.submit("a", ran.append, i) for i in range(3)]
+            assert (await first).id == "a"
+            await asyncio.sleep(0)
+            return rest
+
+    rest = asyncio.run(main())
+    assert ran == [] and all(future.cancelled() for future in rest)
+
+# Shutdown
+
+def test_stop_with_drain_runs_every_queued_call():
+    context = hosted(*(f"agent_{i}" for i in range(10)), workers=3, quantum=2)
+
+    async def main():
+        await context.start()
+        futures = [context.submit(f"agent_{i % 10}", lambda i=i: i * i) for i in range(100)]
+        await context.stop(drain=True)
+        return futures
+
+    futures = asyncio.run(main())
+    assert [future.result() for future in futures] == [i * i for i in range(100)]
+    assert context.tasks == [] and context.loop is None
+
+def test_stop_without_drain_keeps_queued_calls_for_the_next_start():
+    context = hosted("a", workers=1, quantum=1)
+
+    async def main():
+        await context.start()
+        futures = [context.submit("a", lambda i=i: i) for i in range(50)]
+        await asyncio.sleep(0)
+        await context.stop(drain=False)
+        pending = sum(not future.done() for future in futures)
+        async with context:
+            results = await asyncio.gather(*futures)
+        return pending, results
+
+    pending, results = asyncio.run(main())
+    assert 0 < pending < 50
+    assert results == list(range(50))
+
+# Errors
+
+def test_exceptions_reach_the_awaiting_caller():
+    context = hosted("a", "b")
+
+    def fail():
+        raise KeyError("missing input")
+
+    async def main():
+        async with context:
+            with pytest.raises(KeyError, match="missing input"):
+                await context.submit("a", fail)
+            with pytest.raises(AttributeError):
+                await context.call("a", "no_such_method")
+            # The failed calls did not take the agent (or its neighbours) down
+            await context.handle_lifecycle_event("a", AgentLifecycleEvent.ACTIVATE)
+            return await context.call("b", "report_metrics")
+
+    metrics = asyncio.run(main())
+    assert context.get_agent("a").state == AgentState.ACTIVE
+    assert metrics["tasks"]["failed"] == 0
+
+def test_detached_calls_run_on_the_loop_and_failures_do_not_escape():
+    context = hosted("a")
+    seen = []
+
+    def record():
+        seen.append(current_context.get())
+
+    def fail():
+        raise RuntimeError("detached")
+
+    async def main():
+        async with context:
+            await asyncio.to_thread(context.submit_threadsafe, "a", fail)
+            await asyncio.to_thread(context.submit_threadsafe, "a", record)
+            await asyncio.to_thread(context.submit_threadsafe, "gone", record)  # Dropped, not raised
+            while not seen:
+                await asyncio.sleep(0.001)
+
+    asyncio.run(main())
+    assert seen == [context]
+    with pytest.raises(RuntimeError, match="not running"):
+        context.submit_threadsafe("a", record)
@@ -0,0 +1,244 @@
+# gaia-chain/agents/tests/test_service_pipeline.py
+
+"""
+Tests for batched service request submission, receipt polling and delivery (agents/runtime/service_pipeline.py).
+"""
+
+import asyncio
+import threading
+import time
+from concurrent.futures import CancelledError
+
+import pytest
+
+from gaia_chain.agents.runtime.agent_core import AgentCore
+from gaia_chain.agents.runtime.execution_context import ExecutionContext
+from gaia_chain.agents.runtime.service_pipeline import (
+    ServiceRequestFailed, ServiceRequestPipeline, json_request_encoder
+)
+from gaia_chain.dsl.rules.economic_rules import to_units
+from gaia_chain.economy.ledger import InsufficientFunds, Ledger
+from gaia_chain.testing.rpc.local_node import LocalJsonRpcNode
+from gaia_chain.tooling.rpc.json_rpc_client import JsonRpcClient
+
+CONTRACT = "0x00000000000000000000000000000000000000aa"
+
+class RecordingTransport:
+    """Forwards to a LocalJsonRpcNode, recording the methods sent in each round trip."""
+    def __init__(self, node):
+        self.node = node
+        self.round_trips = []
+
+    def __call__(self, payload):
+        requests = payload if isinstance(payload, list) else [payload]
+        self.round_trips.append([request["method"] for request in requests])
+        return self.node(payload)
+
+    def trips(self, method):
+        return [trip for trip in self.round_trips if method in trip]
+
+class Agent(AgentCore):
+    """AgentCore recording results, errors and the threads they arrive on."""
+    def __post_init__(self):
+        super().__post_init__()
+        self.results, self.errors, self.threads = [], [], []
+
+    def process_service_result(self, result):
+        self.results.append(result)
+        self.threads.append(threading.get_ident())
+        super().process_service_result(result)
+
+    def handle_error(self, error):
+        self.errors.append(error)
+        self.threads.append(threading.get_ident())
+        super().handle_error(error)
+
+@pytest.fixture
+def node():
+    return LocalJsonRpcNode()
+
+@pytest.fixture
+def transport(node):
+    return RecordingTransport(node)
+
+def make_pipeline(transport, **options):
+    options.setdefault("poll_interval", 0.01)
+    return ServiceRequestPipeline(JsonRpcClient(transport), CONTRACT, json_request_encoder, **options)
+
+def funded_agent(pipeline, gaia=100):
+    ledger = Ledger()
+    ledger.deposit("agent_1", to_units(gaia))
+    return Agent(id="agent_1", owner="owner_1", service_pipeline=pipeline, ledger=ledger)
+
+def wait_for(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "condition not met in time"
+        time.sleep(0.005)
+
+# Batching
+
+def test_one_send_transaction_batch_per_flush(node, transport):
+    pipeline = make_pipeline(transport, max_batch=20, flush_interval=5.0)
+    agents = [Agent(id=f"agent_{i}", owner="owner_1") for i in range(20)]
+    futures = [pipeline.submit(agent, "DataAnalysis", 10, {"risk": "low"}) for agent in agents]
+    wait_for(lambda: len(node.transactions) == 20)  # A full batch flushes without waiting out the linger
+    [send] = transport.trips("eth_sendTransaction")
+    assert send == ["eth_sendTransaction"] * 20
+    node.mine()
+    assert all(future.result(timeout=5)["status"] == "0x1" for future in futures)
+    pipeline.stop()
+    assert pipeline.stats["send_batches"] == 1
+
+def test_one_receipt_poll_covers_every_pending_transaction(node, transport):
+    pipeline = make_pipeline(transport, max_batch=30, flush_interval=5.0)
+    futures = [pipeline.submit(Agent(id=f"agent_{i}", owner="owner_1"), "DataAnalysis", 10, {}) for i in range(30)]
+    wait_for(lambda: len(node.transactions) == 30)
+    node.mine()
+    for future in futures:
+        future.result(timeout=5)
+    pipeline.stop()
+    polls = transport.trips("eth_getTransactionReceipt")
+    assert polls and all(trip == ["eth_getTransactionReceipt"] * 30 for trip in polls)
+    assert pipeline.stats["receipt_polls"] == len(polls)
+
+# Failures
+
+def test_reverted_receipt_fails_the_future(node, transport):
+    pipeline = make_pipeline(transport)
+    agent = Agent(id="agent_1", owner="owner_1")
+    agent.metrics.task_started()
+    future = pipeline.submit(agent, "DataAnalysis", 10, {})
+    wait_for(lambda: node.transactions)
+    with node.lock:  # The pipeline cannot poll between mining and the revert
+        node.mine()
+        [tx_hash] = node.receipts
+        node.receipts[tx_hash]["status"] = "0x0"
+    with pytest.raises(ServiceRequestFailed) as error:
+        future.result(timeout=5)
+    pipeline.stop()
+    assert error.value.receipt["transactionHash"] == tx_hash
+    assert agent.errors == [error.value] and agent.results == []
+    assert agent.metrics.tasks_failed == 1
+    assert pipeline.stats["failed"] == 1
+
+def test_missing_receipt_times_out(node, transport):
+    pipeline = make_pipeline(transport, receipt_timeout=0.05)
+    agent = Agent(id="agent_1", owner="owner_1")
+    future = pipeline.submit(agent, "DataAnalysis", 10, {})
+    with pytest.raises(TimeoutError, match="No receipt"):
+        future.result(timeout=5)
+    pipeline.stop()
+    assert isinstance(agent.errors[0], TimeoutError)
+    assert pipeline.pending_count() == 0
+
+# Shutdown
+
+def test_stop_with_drain_waits_for_receipts(node, transport):
+    pipeline = make_pipeline(transport)
+    futures = [pipeline.submit(Agent(id=f"agent_{i}", owner="owner_1"), "DataAnalysis", 10, {}) for i in range(5)]
+    node.start_mining(block_time=0.02)
+    try:
+        pipeline.stop(drain=True)
+    finally:
+        node.stop_mining()
+    assert all(future.done() and future.result()["status"] == "0x1" for future in futures)
+    with pytest.raises(RuntimeError, match="stopped"):
+        pipeline.submit(Agent(id="late", owner="owner_1"), "DataAnalysis", 10, {})
+
+def test_stop_without_drain_cancels_pending_requests(node, transport):
+    pipeline = make_pipeline(transport)
+    future = pipeline.submit(Agent(id="agent_1", owner="owner_1"), "DataAnalysis", 10, {})
+    wait_for(lambda: node.transactions)
+    pipeline.stop(drain=False)
+    with pytest.raises(CancelledError):
+        future.result(timeout=0)
+
+# Delivery
+
+def test_results_are_delivered_on_the_submitting_loop(node, transport):
+    pipeline = make_pipeline(transport)
+    agent = Agent(id="agent_1", owner="owner_1")
+
+    async def main():
+        future = asyncio.wrap_future(pipeline.submit(agent, "DataAnalysis", 10, {}))
+        await asyncio.to_thread(wait_for, lambda: node.transactions)
+        node.mine()
+        await future
+        await asyncio.sleep(0)  # Delivery was queued before the future resolved
+        return threading.get_ident()
+
+    loop_thread = asyncio.run(main())
+    pipeline.stop()
+    assert len(agent.results) == 1 and agent.threads == [loop_thread]
+
+def test_results_are_delivered_through_the_execution_context(node, transport):
+    pipeline = make_pipeline(transport)
+    agent = Agent(id="agent_1", owner="owner_1", service_pipeline=pipeline)
+    context = ExecutionContext(workers=2)
+    context.register(agent)
+
+    async def main():
+        async with context:
+            future = await context.request_service("agent_1", "DataAnalysis", 10, {"risk": "low"})
+            await asyncio.to_thread(wait_for, lambda: node.transactions)
+            node.mine()
+            await asyncio.wrap_future(future)
+            # Queued behind the delivery on the agent's own task queue
+            return await context.call("agent_1", "report_metrics"), threading.get_ident()
+
+    metrics, loop_thread = asyncio.run(main())
+    pipeline.stop()
+    assert len(agent.results) == 1 and agent.threads == [loop_thread]
+    assert metrics["tasks"]["completed"] == 1
+
+# Payment Holds
+
+def test_payment_is_held_until_the_receipt_then_captured(node, transport):
+    pipeline = make_pipeline(transport)
+    agent = funded_agent(pipeline)
+    future = agent.request_service("DataAnalysis", 10, {"provider": "provider_1"})
+    assert agent.ledger.available("agent_1") == to_units(90)
+    assert agent.ledger.balance("agent_1") == to_units(100)
+    wait_for(lambda: node.transactions)
+    node.mine()
+    receipt = future.result(timeout=5)
+    wait_for(lambda: not agent.ledger.holds)  # Settled after the result is delivered
+    pipeline.stop()
+    assert agent.results == [receipt]
+    assert agent.ledger.balance("provider_1") == to_units(10)
+    assert agent.ledger.balance("agent_1") == agent.ledger.available("agent_1") == to_units(90)
+
+def test_payment_is_released_when_the_request_reverts(node, transport):
+    pipeline = make_pipeline(transport)
+    agent = funded_agent(pipeline)
+    future = agent.request_service("DataAnalysis", 10, {"provider": "provider_1"})
+    wait_for(lambda: node.transactions)
+    with node.lock:
+        node.mine()
+        [tx_hash] = node.receipts
+        node.receipts[tx_hash]["status"] = "0x0"
+    with pytest.raises(ServiceRequestFailed):
+        future.result(timeout=5)
+    wait_for(lambda: not agent.ledger.holds)
+    pipeline.stop()
+    assert agent.ledger.available("agent_1") == to_units(100)
+    assert agent.ledger.balance("provider_1") == 0
+
+def test_payment_is_released_when_the_request_is_abandoned(node, transport):
+    pipeline = make_pipeline(transport)
+    agent = funded_agent(pipeline)
+    future = agent.request_service("DataAnalysis", 10, {"provider": "provider_1"})
+    wait_for(lambda: node.transactions)
+    pipeline.stop(drain=False)
+    assert future.cancelled()
+    assert not agent.ledger.holds and agent.ledger.available("agent_1") == to_units(100)
+
+def test_request_without_funds_is_not_sent(node, transport):
+    pipeline = make_pipeline(transport)
+    agent = funded_agent(pipeline, gaia=5)
+    assert agent.request_service("DataAnalysis", 10, {"provider": "provider_1"}) is None
+    pipeline.stop()
+    assert isinstance(agent.errors[0], InsufficientFunds)
+    assert node.transactions == {} and agent.ledger.holds == {}
+    assert agent.metrics.tasks_started == 0
@@ -0,0 +1,91 @@
+# gaia-chain/agents/tests/test_symbolic_reasoner.py
+
+"""
+Tests for the knowledge base and incremental Rete inference (agents/neuro_symbolic/symbolic_reasoner.py).
+"""
+
+import pytest
+
+from gaia_chain.agents.neuro_symbolic.symbolic_reasoner import (
+    DSLInterpreter, Fact, KnowledgeBase, ReasoningEngine, ReteNetwork, Rule, SymbolicReasoner
+)
+
+@pytest.fixture(params=[False, True], ids=["indexed", "columnar"])
+def engine(request):
+    return ReasoningEngine(KnowledgeBase(columnar=request.param))
+
+# Incremental Inference
+
+def test_rule_fires_when_last_antecedent_arrives(engine):
+    engine.kb.add_rule(Rule(("a", "b"), "c"))
+    engine.kb.add_fact(Fact("a"))
+    assert engine.infer() == []
+    engine.kb.add_fact(Fact("b"))
+    assert engine.infer() == ["c"]
+    assert engine.network.rules_fired == 1
+
+def test_rule_added_after_its_facts_fires_at_once(engine):
+    engine.kb.add_facts([Fact("a"), Fact("b")])
+    engine.kb.add_rule(Rule(("a", "b"), "c"))
+    assert engine.infer() == ["c"]
+
+def test_inferences_chain_and_are_written_back(engine):
+    engine.kb.add_rules([Rule(("b",), "c"), Rule(("a",), "b"), Rule(("c", "a"), "d")])
+    engine.kb.add_fact(Fact("a"))
+    assert engine.infer() == ["c", "b", "d"]  # Rule order, not firing order
+    assert all(engine.kb.has_fact(proposition) for proposition in "abcd")
+    assert not engine.kb.add_fact(Fact("d"))
+
+def test_asserted_consequent_is_not_duplicated(engine):
+    engine.kb.add_fact(Fact("b"))
+    engine.kb.add_rules([Rule(("a",), "b"), Rule(("b",), "c")])
+    assert engine.infer() == ["c"]
+    engine.kb.add_fact(Fact("a"))
+    assert engine.infer() == ["b", "c"]
+    assert list(engine.kb.facts).count(Fact("b")) == 1
+    assert engine.network.rules_fired == 2
+
+def test_engine_built_over_existing_knowledge():
+    kb = KnowledgeBase()
+    kb.add_facts([Fact("a")])
+    kb.add_rules([Rule(("a",), "b"), Rule(("b",), "c")])
+    engine = ReasoningEngine(kb)
+    assert engine.infer() == ["b", "c"]
+    assert kb.has_fact("c")
+    kb.add_rule(Rule(("c",), "d"))
+    assert kb.has_fact("d")
+
+def test_network_reports_inferences_after_propagation():
+    reported = []
+    network = ReteNetwork(on_inferred=reported.append)
+    network.add_rule(Rule(("a",), "b"))
+    network.add_rule(Rule(("b",), "c"))
+    network.add_fact(Fact("a"))
+    assert reported == ["b", "c"]
+    assert network.working_memory == {"a", "b", "c"}
+
+# Fact Stores
+
+def test_load_knowledge_can_switch_to_columnar_facts():
+    reasoner = SymbolicReasoner()
+    reasoner.load_knowledge(facts=[Fact("a"), Fact("b")], rules=[Rule(("a", "c"), "d")])
+    assert reasoner.load_knowledge(facts=[Fact("b"), Fact("c")], columnar=True)["facts"] == 1
+    assert reasoner.kb.columnar and [fact.proposition for fact in reasoner.kb.facts] == ["a", "b", "c", "d"]
+    assert reasoner.engine.infer() == ["d"]  # Inferred after the switch: the network kept its state
+    reasoner.kb.set_columnar(False)
+    assert reasoner.kb.get_fact("d") == Fact("d") and len(reasoner.kb.facts) == 4
+
+def test_knowledge_base_pickles_with_its_facts():
+    import pickle
+    for reasoner in (SymbolicReasoner(), SymbolicReasoner(columnar=True)):
+        reasoner.load_knowledge(facts=[Fact("a"), Fact("b")])
+        restored = pickle.loads(pickle.dumps(reasoner.kb))
+        assert list(restored.facts) == [Fact("a"), Fact("b")] and restored.has_fact("b")
+
+# DSL Integration
+
+def test_decision_from_dsl_script():
+    reasoner = SymbolicReasoner()
+    DSLInterpreter(reasoner).interpret_dsl('fact: "stock_price > 100"\nrule: "if stock_price > 100 then buy_stock"\n')
+    assert reasoner.get_decision() == "buy_stock"
+    assert reasoner.kb.has_fact("buy_stock")
@@ -0,0 +1,80 @@
+# gaia-chain/agents/tests/test_worker_pool.py
+
+"""
+Tests for routing agent calls across worker processes (agents/runtime/worker_pool.py).
+"""
+
+import pytest
+
+from gaia_chain.agents.runtime.agent_core import AgentCore, AgentLifecycleEvent, AgentState
+from gaia_chain.agents.runtime.service_pipeline import ServiceRequestPipeline, json_request_encoder
+from gaia_chain.agents.runtime.worker_pool import AgentWorkerPool, ConsistentHashRing
+from gaia_chain.testing.rpc.local_node import LocalJsonRpcNode
+from gaia_chain.tooling.rpc.json_rpc_client import JsonRpcClient
+
+CONTRACT = "0x00000000000000000000000000000000000000aa"
+
+def worker_services():
+    """Each worker gets its own mining node and pipeline (forked, so no pickling is needed)."""
+    node = LocalJsonRpcNode()
+    node.start_mining(block_time=0.02)
+    pipeline = ServiceRequestPipeline(JsonRpcClient(node), CONTRACT, json_request_encoder, poll_interval=0.01)
+    return {"service_pipeline": pipeline}
+
+@pytest.fixture
+def pool():
+    with AgentWorkerPool(workers=2, start_method="fork", agent_services=worker_services) as pool:
+        yield pool
+
+def request_all(pool, agent_ids):
+    return {agent_id: pool.request_service(agent_id, "DataAnalysis", 10, {"risk": "low"}) for agent_id in agent_ids}
+
+# Consistent Hashing
+
+def test_adding_a_node_only_moves_keys_to_it():
+    ring = ConsistentHashRing()
+    for node in ("a", "b", "c"):
+        ring.add_node(node)
+    before = {f"key_{i}": ring.get_node(f"key_{i}") for i in range(1000)}
+    ring.add_node("d")
+    moved = {key for key, node in before.items() if ring.get_node(key) != node}
+    assert moved and all(ring.get_node(key) == "d" for key in moved)
+    assert len(moved) < 400
+
+# Routed Calls
+
+def test_calls_survive_adding_and_removing_workers(pool):
+    pool.register_many(AgentCore(id=f"agent_{i:02d}", owner="owner_1") for i in range(12))
+    agent_ids = sorted(pool.placement)
+    for agent_id in agent_ids:
+        pool.handle_lifecycle_event(agent_id, AgentLifecycleEvent.ACTIVATE).result(timeout=10)
+        pool.respond_to_command(agent_id, "status").result(timeout=10)
+    in_flight = request_all(pool, agent_ids)
+
+    before = dict(pool.placement)
+    pool.add_worker()  # Agents with requests in flight move once their receipts are delivered
+    assert {agent_id for agent_id in agent_ids if pool.owner_of(agent_id) != before[agent_id]}
+    for receipt in (future.result(timeout=10) for future in in_flight.values()):
+        assert receipt["status"] == "0x1"  # The receipt comes back, not the worker-side future
+
+    pool.remove_worker("worker-0")
+    assert "worker-0" not in set(pool.placement.values())
+    for receipt in (future.result(timeout=10) for future in request_all(pool, agent_ids).values()):
+        assert receipt["status"] == "0x1"  # Adopting workers attach their own pipeline
+
+    for agent_id in agent_ids:
+        agent = pool.get_agent(agent_id)
+        metrics = agent.report_metrics()
+        assert agent.state == AgentState.ACTIVE
+        assert metrics["tasks"] == {"started": 3, "completed": 3, "failed": 0, "pending": 0}
+        assert metrics["operations"]["service_request_roundtrip"]["calls"] == 2
+        assert agent.service_pipeline is None  # Process-local services never leave the worker
+
+def test_unregister_returns_the_agent_after_its_requests_settle(pool):
+    pool.register(AgentCore(id="agent_1", owner="owner_1")).result(timeout=10)
+    future = pool.request_service("agent_1", "DataAnalysis", 10, {})
+    agent = pool.unregister("agent_1")
+    assert future.done() and future.result()["status"] == "0x1"
+    assert agent.metrics.tasks_completed == 1
+    with pytest.raises(KeyError):
+        pool.respond_to_command("agent_1", "status")
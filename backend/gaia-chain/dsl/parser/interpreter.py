@@ -0,0 +1,426 @@
+# gaia-chain/dsl/parser/interpreter.py
+
+"""
+Gaia DSL Bytecode Compiler and Virtual Machine
+
+This module compiles a parsed DSL `Program` (see parser.py) into compact bytecode and executes it
+on a stack-based virtual machine bound to an `AgentCore`. Bytecode is a flat array of
+(opcode, argument) pairs plus a constant pool; it can be serialized so agents ship precompiled
+programs and skip parsing at startup.
+
+Execution semantics:
+- `fact`, `rule` and `goal` statements update the agent's symbolic reasoner (goals are also
+  recorded in `AgentCore.goals`).
+- Condition operands named by identifiers are read from `AgentCore.resources`; a named
+  `condition` statement stores its result back into `resources`.
+- Actions are dispatched through `AgentCore.execute_action`, with variable parameters bound
+  from `resources` first; `payment:` statements go to `AgentCore.make_payment` and `dispute`
+  blocks to `AgentCore.raise_dispute`. `if ... then { ... }` guards its block like `when`.
+- Agent, service and constraint definitions are declarations and compile to no instructions;
+  agent behaviors run from the parsed program through `AgentCore.handle_event`.
+
+Every instruction has a cost; the VM enforces a step budget and an optional cost budget.
+"""
+
+import json
+import operator
+import struct
+import sys
+from array import array
+from dataclasses import dataclass, field
+from enum import IntEnum
+from typing import Any, Dict, List, Optional
+
+from gaia_chain.dsl.parser.parser import (
+    ActionNode, AgentNode, ConditionNode, ConstraintNode, DisputeNode, FactNode, GoalNode, IfNode,
+    PaymentNode, Program, RuleNode, ServiceNode, WhenNode
+)
+from gaia_chain.dsl.rules.core_rules import (
+    Action, Condition, EconomicValue, GaiaAction, GaiaType, GaiaValue, LogicalOperator
+)
+from gaia_chain.dsl.rules.economic_rules import Dispute, DisputeResolutionMethod, Payment
+from gaia_chain.tooling.monitoring.structured_log import get_logger
+
+# Logger setup
+logger = get_logger(__name__)
+
+# Instruction Set
+
+class Opcode(IntEnum):
+    """Bytecode instructions. Each instruction is followed by one integer argument."""
+    HALT = 0
+    PUSH_CONST = 1            # push constants[arg]
+    LOAD_VAR = 2              # push resources[constants[arg]]
+    COMPARE_EQ = 3            # pop b, a; push a == b
+    COMPARE_GT = 4            # pop b, a; push a > b
+    COMPARE_LT = 5            # pop b, a; push a < b
+    JUMP = 6                  # pc = arg
+    JUMP_IF_FALSE = 7         # pop a; if not a: pc = arg
+    JUMP_IF_FALSE_OR_POP = 8  # if not top: pc = arg else pop (short-circuit and)
+    JUMP_IF_TRUE_OR_POP = 9   # if top: pc = arg else pop (short-circuit or)
+    POP = 10
+    ASSERT_FACT = 11          # assert constants[arg]
+    ADD_RULE = 12             # add rule constants[arg] = [antecedent, consequent]
+    ADD_GOAL = 13             # add goal constants[arg]
+    STORE_CONDITION = 14      # pop a; resources[constants[arg]] = a
+    ACTION = 15               # execute action constants[arg]
+    PAY = 16                  # make payment constants[arg] = {payment, recipient}
+    DISPUTE = 17              # raise dispute constants[arg] = {initiator, target, reason, resolution_method}
+
+# Cost charged per executed instruction
+INSTRUCTION_COSTS = {
+    Opcode.HALT: 0,
+    Opcode.PUSH_CONST: 1,
+    Opcode.LOAD_VAR: 1,
+    Opcode.COMPARE_EQ: 1,
+    Opcode.COMPARE_GT: 1,
+    Opcode.COMPARE_LT: 1,
+    Opcode.JUMP: 1,
+    Opcode.JUMP_IF_FALSE: 1,
+    Opcode.JUMP_IF_FALSE_OR_POP: 1,
+    Opcode.JUMP_IF_TRUE_OR_POP: 1,
+    Opcode.POP: 1,
+    Opcode.ASSERT_FACT: 5,
+    Opcode.ADD_RULE: 10,
+    Opcode.ADD_GOAL: 5,
+    Opcode.STORE_CONDITION: 2,
+    Opcode.ACTION: 50,
+    Opcode.PAY: 50,
+    Opcode.DISPUTE: 50,
+}
+
+_COST_TABLE = [INSTRUCTION_COSTS[opcode] for opcode in sorted(INSTRUCTION_COSTS)]
+
+_COMPARE_OPCODES = {
+    LogicalOperator.EQUAL: Opcode.COMPARE_EQ,
+    LogicalOperator.GREATER_THAN: Opcode.COMPARE_GT,
+    LogicalOperator.LESS_THAN: Opcode.COMPARE_LT,
+}
+
+class DSLRuntimeError(RuntimeError):
+    """Raised when bytecode fails during execution."""
+
+class ExecutionBudgetExceeded(DSLRuntimeError):
+    """Raised when a program exceeds its step or cost budget."""
+
+# Bytecode
+
+BYTECODE_MAGIC = b"GAIABC"
+BYTECODE_VERSION = 1
+_HEADER = struct.Struct("<6sHII")  # magic, version, constants length, code length
+
+@dataclass
+class Bytecode:
+    """A compiled DSL program: flat (opcode, argument) pairs and a JSON-serializable constant pool."""
+    code: array = field(default_factory=lambda: array("I"))
+    constants: List[Any] = field(default_factory=list)
+    source_hash: str = ""
+
+    def to_bytes(self) -> bytes:
+        """Serialize the program for shipping with an agent."""
+        constants = json.dumps({"source_hash": self.source_hash, "constants": self.constants}, separators=(",", ":")).encode("utf-8")
+        code = array("I", self.code)
+        if sys.byteorder != "little":
+            code.byteswap()
+        return _HEADER.pack(BYTECODE_MAGIC, BYTECODE_VERSION, len(constants), len(code)) + constants + code.tobytes()
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "Bytecode":
+        """Load a program serialized with to_bytes."""
+        magic, version, constants_length, code_length = _HEADER.unpack_from(data)
+        if magic != BYTECODE_MAGIC:
+            raise ValueError("Not a Gaia DSL bytecode file.")
+        if version != BYTECODE_VERSION:
+            raise ValueError(f"Unsupported bytecode version: {version}")
+        offset = _HEADER.size
+        payload = json.loads(data[offset:offset + constants_length].decode("utf-8"))
+        code = array("I")
+        code.frombytes(data[offset + constants_length:offset + constants_length + code_length * code.itemsize])
+        if sys.byteorder != "little":
+            code.byteswap()
+        return cls(code, payload["constants"], payload["source_hash"])
+
+    def disassemble(self) -> List[str]:
+        """Return a human-readable listing of the program."""
+        return [f"{pc:04d} {Opcode(self.code[pc]).name:<22} {self.code[pc + 1]}" for pc in range(0, len(self.code), 2)]
+
+# Constant encoding (JSON-compatible so bytecode stays portable)
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, GaiaValue):
+        return {"gaia": value.type.value, "value": _encode_value(value.value)}
+    if isinstance(value, EconomicValue):
+        return {"economic": value.amount, "currency": value.currency}
+    if isinstance(value, dict):
+        return {"dict": {key: _encode_value(item) for key, item in value.items()}}
+    if isinstance(value, (list, tuple)):
+        return [_encode_value(item) for item in value]
+    return value
+
+def _decode_value(value: Any) -> Any:
+    if isinstance(value, dict):
+        if "gaia" in value:
+            return GaiaValue(GaiaType(value["gaia"]), _decode_value(value["value"]))
+        if "economic" in value:
+            return EconomicValue(value["economic"], value["currency"])
+        return {key: _decode_value(item) for key, item in value["dict"].items()}
+    if isinstance(value, list):
+        return [_decode_value(item) for item in value]
+    return value
+
+def _encode_action(action: Action) -> Dict[str, Any]:
+    return {"action": action.action_type.value, "parameters": _encode_value(action.parameters)}
+
+def _decode_action(encoded: Dict[str, Any]) -> Action:
+    return Action(GaiaAction(encoded["action"]), _decode_value(encoded["parameters"]))
+
+# Compiler
+
+class Compiler:
+    """Compiles a parsed Program into Bytecode."""
+    def __init__(self):
+        self.bytecode = Bytecode()
+        self.constant_index: Dict[str, int] = {}
+
+    def compile(self, program: Program) -> Bytecode:
+        self.bytecode.source_hash = program.source_hash
+        for statement in program.statements:
+            self.compile_statement(statement)
+        self.emit(Opcode.HALT)
+        return self.bytecode
+
+    def emit(self, opcode: Opcode, argument: int = 0) -> int:
+        """Append an instruction and return its position."""
+        position = len(self.bytecode.code)
+        self.bytecode.code.extend((opcode, argument))
+        return position
+
+    def patch(self, position: int, target: int):
+        self.bytecode.code[position + 1] = target
+
+    def constant(self, value: Any) -> int:
+        """Add a constant to the pool (deduplicated) and return its index."""
+        key = json.dumps(value, sort_keys=True)
+        index = self.constant_index.get(key)
+        if index is None:
+            index = len(self.bytecode.constants)
+            self.bytecode.constants.append(value)
+            self.constant_index[key] = index
+        return index
+
+    def compile_statement(self, statement):
+        if isinstance(statement, FactNode):
+            self.emit(Opcode.ASSERT_FACT, self.constant(statement.proposition))
+        elif isinstance(statement, RuleNode):
+            self.emit(Opcode.ADD_RULE, self.constant([list(statement.antecedent), statement.consequent]))
+        elif isinstance(statement, GoalNode):
+            self.emit(Opcode.ADD_GOAL, self.constant(statement.description))
+        elif isinstance(statement, ConditionNode):
+            self.compile_condition(statement.condition)
+            if statement.name:
+                self.emit(Opcode.STORE_CONDITION, self.constant(statement.name))
+            else:
+                self.emit(Opcode.POP)
+        elif isinstance(statement, ActionNode):
+            self.emit(Opcode.ACTION, self.constant(_encode_action(statement.action)))
+        elif isinstance(statement, WhenNode):
+            self.compile_condition(statement.condition)
+            skip = self.emit(Opcode.JUMP_IF_FALSE)
+            self.emit(Opcode.ACTION, self.constant(_encode_action(statement.action)))
+            self.patch(skip, len(self.bytecode.code))
+        elif isinstance(statement, IfNode):
+            self.compile_condition(statement.condition)
+            skip = self.emit(Opcode.JUMP_IF_FALSE)
+            for inner in statement.body:
+                self.compile_statement(inner)
+            self.patch(skip, len(self.bytecode.code))
+        elif isinstance(statement, PaymentNode):
+            payment = statement.payment
+            self.emit(Opcode.PAY, self.constant({"payment": _encode_value(EconomicValue(payment.amount, payment.currency)),
+                                                 "recipient": payment.recipient}))
+        elif isinstance(statement, DisputeNode):
+            self.emit(Opcode.DISPUTE, self.constant({"initiator": statement.initiator, "target": statement.target,
+                                                     "reason": statement.reason,
+                                                     "resolution_method": statement.resolution_method.value}))
+        elif isinstance(statement, (AgentNode, ServiceNode, ConstraintNode)):
+            pass  # Declarations; see the module docstring
+        else:
+            raise ValueError(f"Unsupported statement: {statement!r}")
+
+    def compile_condition(self, node):
+        if isinstance(node, GaiaValue):
+            if node.type == GaiaType.CONDITION and isinstance(node.value, Condition):
+                return self.compile_condition(node.value)
+            if node.type == GaiaType.VARIABLE:
+                self.emit(Opcode.LOAD_VAR, self.constant(node.value))
+            else:
+                self.emit(Opcode.PUSH_CONST, self.constant(node.value))
+            return
+        if node.operator in _COMPARE_OPCODES:
+            self.compile_condition(node.left)
+            self.compile_condition(node.right)
+            self.emit(_COMPARE_OPCODES[node.operator])
+        elif node.operator in (LogicalOperator.AND, LogicalOperator.OR):
+            self.compile_condition(node.left)
+            opcode = Opcode.JUMP_IF_FALSE_OR_POP if node.operator == LogicalOperator.AND else Opcode.JUMP_IF_TRUE_OR_POP
+            jump = self.emit(opcode)
+            self.compile_condition(node.right)
+            self.patch(jump, len(self.bytecode.code))
+        else:
+            raise ValueError(f"Unsupported operator: {node.operator}")
+
+def compile_program(program: Program) -> Bytecode:
+    """Compile a parsed DSL program into bytecode."""
+    return Compiler().compile(program)
+
+# Virtual Machine
+
+@dataclass
+class ExecutionResult:
+    """Outcome of running a program: instructions executed, total cost and actions dispatched."""
+    steps: int = 0
+    cost: int = 0
+    actions: int = 0
+
+class VirtualMachine:
+    """Stack-based interpreter for DSL bytecode bound to an AgentCore."""
+    def __init__(self, agent, step_budget: int = 100000, cost_budget: Optional[int] = None):
+        self.agent = agent
+        self.step_budget = step_budget
+        self.cost_budget = cost_budget
+
+    def run(self, bytecode: Bytecode) -> ExecutionResult:
+        code = bytecode.code
+        constants = bytecode.constants
+        resources = self.agent.resources
+        costs = _COST_TABLE
+        step_budget = self.step_budget
+        cost_budget = self.cost_budget
+        stack = []
+        result = ExecutionResult()
+        facts, rules, goals = [], [], []
+        pc = steps = cost = 0
+
+        while True:
+            opcode = code[pc]
+            argument = code[pc + 1]
+            pc += 2
+            steps += 1
+            cost += costs[opcode]
+            if steps > step_budget or (cost_budget is not None and cost > cost_budget):
+                raise ExecutionBudgetExceeded(f"Budget exceeded after {steps} steps (cost {cost}).")
+
+            if opcode == Opcode.PUSH_CONST:
+                stack.append(constants[argument])
+            elif opcode == Opcode.LOAD_VAR:
+                name = constants[argument]
+                if name not in resources:
+                    raise DSLRuntimeError(f"Undefined variable: {name}")
+                stack.append(resources[name])
+            elif opcode == Opcode.COMPARE_EQ:
+                right = stack.pop()
+                stack.append(operator.eq(stack.pop(), right))
+            elif opcode == Opcode.COMPARE_GT:
+                right = stack.pop()
+                stack.append(operator.gt(stack.pop(), right))
+            elif opcode == Opcode.COMPARE_LT:
+                right = stack.pop()
+                stack.append(operator.lt(stack.pop(), right))
+            elif opcode == Opcode.JUMP:
+                pc = argument
+            elif opcode == Opcode.JUMP_IF_FALSE:
+                if not stack.pop():
+                    pc = argument
+            elif opcode == Opcode.JUMP_IF_FALSE_OR_POP:
+                if not stack[-1]:
+                    pc = argument
+                else:
+                    stack.pop()
+            elif opcode == Opcode.JUMP_IF_TRUE_OR_POP:
+                if stack[-1]:
+                    pc = argument
+                else:
+                    stack.pop()
+            elif opcode == Opcode.POP:
+                stack.pop()
+            elif opcode == Opcode.ASSERT_FACT:
+                facts.append(constants[argument])
+            elif opcode == Opcode.ADD_RULE:
+                rules.append(constants[argument])
+            elif opcode == Opcode.ADD_GOAL:
+                goals.append(constants[argument])
+            elif opcode == Opcode.STORE_CONDITION:
+                resources[constants[argument]] = stack.pop()
+            elif opcode == Opcode.ACTION:
+                # Knowledge declared earlier in the program must be visible to the action
+                self._flush_knowledge(facts, rules, goals)
+                self.agent.execute_action(self._bind(_decode_action(constants[argument])))
+                result.actions += 1
+            elif opcode == Opcode.PAY:
+                self._flush_knowledge(facts, rules, goals)
+                encoded = constants[argument]
+                amount = _decode_value(encoded["payment"])
+                self.agent.make_payment(Payment(amount.amount, amount.currency, encoded["recipient"]))
+                result.actions += 1
+            elif opcode == Opcode.DISPUTE:
+                self._flush_knowledge(facts, rules, goals)
+                encoded = constants[argument]
+                self.agent.raise_dispute(Dispute(encoded["initiator"], encoded["target"], encoded["reason"],
+                                                 DisputeResolutionMethod(encoded["resolution_method"])))
+                result.actions += 1
+            elif opcode == Opcode.HALT:
+                break
+            else:
+                raise DSLRuntimeError(f"Invalid opcode {opcode} at {pc - 2}")
+
+        self._flush_knowledge(facts, rules, goals)
+        result.steps = steps
+        result.cost = cost
+        return result
+
+    def _bind(self, action: Action) -> Action:
+        """Resolve VARIABLE parameters from the agent's resources, leaving unknown names as-is."""
+        resources = self.agent.resources
+        parameters = {}
+        for name, value in action.parameters.items():
+            if isinstance(value, GaiaValue) and value.type == GaiaType.VARIABLE and value.value in resources:
+                bound = resources[value.value]
+                value = bound if isinstance(bound, GaiaValue) else GaiaValue(GaiaType.STRING, bound)
+            parameters[name] = value
+        return Action(action.action_type, parameters)
+
+    def _flush_knowledge(self, facts: List[str], rules: List[list], goals: List[str]):
+        if not (facts or rules or goals):
+            return
+        from gaia_chain.agents.neuro_symbolic.symbolic_reasoner import SymbolicReasoner, Fact, Rule, Goal
+        if getattr(self.agent, "reasoner", None) is None:
+            self.agent.reasoner = SymbolicReasoner()
+        self.agent.reasoner.load_knowledge(
+            facts=(Fact(proposition) for proposition in facts),
+            rules=(Rule(antecedent, consequent) for antecedent, consequent in rules),
+            goals=(Goal(description) for description in goals),
+        )
+        for description in goals:
+            if description not in self.agent.goals:
+                self.agent.goals.append(description)
+        facts.clear()
+        rules.clear()
+        goals.clear()
+
+def execute(bytecode: Bytecode, agent, step_budget: int = 100000, cost_budget: Optional[int] = None) -> ExecutionResult:
+    """Run compiled bytecode against an agent."""
+    return VirtualMachine(agent, step_budget, cost_budget).run(bytecode)
+
+# Example usage (for illustration purposes, not part of the module)
+if __name__ == "__main__":
+    from gaia_chain.dsl.parser.parser import parse_script
+
+    program = parse_script("""
+    fact: market_open
+    rule: if market_open then analyze
+    condition bullish: price > 100 and volatility < 0.3
+    when bullish then request service DataAnalysis payment 5 GAIA with constraint risk: "low"
+    """)
+    bytecode = compile_program(program)
+    print("\n".join(bytecode.disassemble()))
+    assert Bytecode.from_bytes(bytecode.to_bytes()).code == bytecode.code
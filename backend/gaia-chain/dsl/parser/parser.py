@@ -0,0 +1,914 @@
+# gaia-chain/dsl/parser/parser.py
+
+"""
+Gaia DSL Parser
+
+This module tokenizes and parses Gaia DSL scripts into a typed abstract syntax tree (AST). A statement
+occupies one line, or runs from its first line to the `}` closing a block opened there. `//` starts a
+comment at the beginning of a line or after whitespace (so `http://host/path` stays intact), `/* ... */`
+comments may span lines, and a line whose first non-blank character is `#` is a comment. The grammar
+is in grammar.g4 and dsl/examples/ holds sample scripts.
+
+Supported statements:
+    fact: stock_price > 100
+    rule: if stock_price > 100 and "supply and demand balanced" then buy_stock
+    goal: maximize_profit
+    condition screen: price > 100 and (volatility < 0.3 or hedged = true)
+    action: compute "FinancialModel" with market_data
+    action: send "analysis_report" to requester
+    action: call "0xContract" "getServiceStatus" with service_id: "DataAnalysis"
+    action: request service DataAnalysis payment 5 GAIA with market_data: "latest", constraint risk: "low"
+    when report_accuracy < 0.8 then send "dispute" to dao
+    payment: 5 GAIA to FinancialAnalyst
+    agent FinancialAnalyst { identity: "FinBot"  on receive "analysis_request" { compute "FinancialModel" with data } }
+    service DataAnalysis { inputs: ["market_data"]  outputs: ["analysis_report"]  cost: 5 GAIA }
+    request service DataAnalysis from FinancialAnalyst with { market_data: "latest"  payment: 5 GAIA  constraint risk: "low" }
+    if report_accuracy < 0.8 then { dispute { initiator: "user_456"  target: "FinancialAnalyst"  reason: "..."  resolution_method: "DAO Vote" } }
+
+Actions may also stand alone (`send "report" to requester`), and the forms of grammar.g4 are accepted:
+`compute(Model with data)`, `sendMessage("text")`, `callContract("0xContract")`, `computation(...)`,
+`requestService X withPayment 5 GAIA`, `defineCost X costs 5 GAIA`, `constraint X { riskLevel: "low" }`
+and agent behaviors written `on <event> do <action>, <action>`. Entries inside a block are separated by
+whitespace or newlines; commas between them are optional.
+
+Propositions are either a quoted string or the raw text up to the next `and`/`then` keyword or the end
+of the line, so words such as "brand" or "demand" inside a proposition are never split; a rule has
+exactly one `then`, so quote a consequent that contains the word. Conditions compile to `Condition`
+trees and actions to `Action`s from `core_rules.py`.
+
+Parsed programs are cached by the SHA-256 hash of the script text in an in-memory LRU and,
+optionally, an on-disk directory, so agents deployed with identical scripts parse them once.
+"""
+
+import hashlib
+import os
+import pickle
+import re
+import tempfile
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple, Union
+
+from gaia_chain.tooling.monitoring import telemetry
+from gaia_chain.dsl.rules.core_rules import (
+    Action, AgentProperty, Condition, EconomicValue, GaiaType, GaiaValue, LogicalOperator,
+    ServiceInputOutput, call_contract, compute, request_service, send_message
+)
+from gaia_chain.dsl.rules.economic_rules import Dispute, DisputeResolutionMethod, Payment
+from gaia_chain.tooling.monitoring.structured_log import get_logger
+
+# Logger setup
+logger = get_logger(__name__)
+
+# Bump whenever the grammar or AST changes so stale on-disk cache entries are ignored
+PARSER_VERSION = "3"
+
+class DSLSyntaxError(ValueError):
+    """Raised when a DSL script does not match the grammar."""
+    def __init__(self, message: str, line: int, column: int = 0):
+        super().__init__(f"line {line}, column {column}: {message}")
+        self.line = line
+        self.column = column
+
+# Abstract Syntax Tree
+
+@dataclass(frozen=True, slots=True)
+class FactNode:
+    """A `fact:` statement."""
+    proposition: str
+    line: int = 0
+
+@dataclass(frozen=True, slots=True)
+class RuleNode:
+    """A `rule:` statement with one or more antecedent propositions."""
+    antecedent: Tuple[str, ...]
+    consequent: str
+    line: int = 0
+
+@dataclass(frozen=True, slots=True)
+class GoalNode:
+    """A `goal:` statement."""
+    description: str
+    line: int = 0
+
+@dataclass(frozen=True, slots=True)
+class ConditionNode:
+    """A named or anonymous `condition:` statement."""
+    name: Optional[str]
+    condition: Condition
+    line: int = 0
+
+@dataclass(frozen=True, slots=True)
+class ActionNode:
+    """An unconditional action: `action: ...`, a bare action or a `request service ... with { ... }` block."""
+    action: Action
+    line: int = 0
+
+@dataclass(frozen=True, slots=True)
+class WhenNode:
+    """A `when <condition> then <action>` statement."""
+    condition: Condition
+    action: Action
+    line: int = 0
+
+@dataclass(frozen=True, slots=True)
+class IfNode:
+    """An `if <condition> then { statements }` block."""
+    condition: Condition
+    body: Tuple["Statement", ...]
+    line: int = 0
+
+@dataclass(frozen=True, slots=True)
+class PaymentNode:
+    """A `payment: <amount> <currency> to <recipient>` statement."""
+    payment: Payment
+    line: int = 0
+
+@dataclass(frozen=True, slots=True)
+class DisputeNode:
+    """A `dispute { initiator, target, reason, resolution_method }` block."""
+    initiator: str
+    target: str
+    reason: str
+    resolution_method: DisputeResolutionMethod
+    line: int = 0
+
+    def dispute(self) -> Dispute:
+        """Return a new (pending) Dispute with this statement's details."""
+        return Dispute(self.initiator, self.target, self.reason, self.resolution_method)
+
+@dataclass(frozen=True, slots=True)
+class BehaviorNode:
+    """An agent behavior: `on <event> [trigger] { actions }` or `on <event> do <action>, ...`."""
+    event: str
+    trigger: Optional[GaiaValue]
+    actions: Tuple[Action, ...]
+    line: int = 0
+
+@dataclass(frozen=True, slots=True)
+class AgentNode:
+    """An `agent <name> { properties and behaviors }` definition."""
+    name: str
+    properties: Tuple[AgentProperty, ...]
+    behaviors: Tuple[BehaviorNode, ...]
+    line: int = 0
+
+@dataclass(frozen=True, slots=True)
+class ServiceNode:
+    """A `service <name> { ... }` definition, or the cost set by `defineCost <name> costs <amount>`."""
+    name: str
+    inputs: Tuple[str, ...] = ()
+    outputs: Tuple[str, ...] = ()
+    cost: Optional[EconomicValue] = None
+    properties: Tuple[AgentProperty, ...] = ()  # Other entries, e.g. provides, computedBy
+    actions: Tuple[Action, ...] = ()
+    line: int = 0
+
+@dataclass(frozen=True, slots=True)
+class ConstraintNode:
+    """A named `constraint <name> { riskLevel: ..., timeLimit: ... }` block."""
+    name: str
+    properties: Tuple[AgentProperty, ...]
+    line: int = 0
+
+Statement = Union[FactNode, RuleNode, GoalNode, ConditionNode, ActionNode, WhenNode, IfNode, PaymentNode,
+                  DisputeNode, AgentNode, ServiceNode, ConstraintNode]
+
+@dataclass(frozen=True, slots=True)
+class Program:
+    """A parsed DSL script."""
+    statements: Tuple[Statement, ...]
+    source_hash: str = ""
+
+# Tokenizer
+
+class Token(NamedTuple):
+    kind: str  # STRING, NUMBER, NAME, OP or OTHER
+    value: str
+    line: int
+    start: int
+    end: int
+
+_TOKEN_PATTERN = re.compile(r"""
+    (?P<WS>\s+)
+  | (?P<COMMENT>(?<!\S)//.*|(?<!\S)/\*.*?(?:\*/|$))
+  | (?P<STRING>"(?:[^"\\]|\\.)*")
+  | (?P<NAME>0x[0-9a-fA-F]+|[A-Za-z_][A-Za-z0-9_.]*)
+  | (?P<NUMBER>-?\d+(?:\.\d+)?)
+  | (?P<OP>[=<>:,(){}\[\]])
+  | (?P<OTHER>\S)
+""", re.VERBOSE)
+
+_ESCAPE_PATTERN = re.compile(r"\\(.)")
+
+def _tokenize(text: str, line: int, in_comment: bool = False) -> Tuple[List[Token], bool]:
+    """Tokenize one line, returning its tokens and whether a `/*` comment is still open at its end."""
+    position = 0
+    if in_comment:
+        close = text.find("*/")
+        if close < 0:
+            return [], True
+        position = close + 2
+    elif text.lstrip().startswith("#"):
+        return [], False
+    tokens = []
+    for match in _TOKEN_PATTERN.finditer(text, position):
+        kind = match.lastgroup
+        if kind == "COMMENT":
+            comment = match.group()
+            if comment.startswith("/*") and (len(comment) < 4 or not comment.endswith("*/")):
+                return tokens, True
+        elif kind != "WS":
+            tokens.append(Token(kind, match.group(), line, match.start(), match.end()))
+    return tokens, False
+
+def tokenize_line(text: str, line: int = 1) -> List[Token]:
+    """Split one line of DSL source into tokens, dropping whitespace and comments."""
+    return _tokenize(text, line)[0]
+
+def _unquote(token: Token) -> str:
+    return _ESCAPE_PATTERN.sub(r"\1", token.value[1:-1])
+
+def _iter_segments(lines: Iterable[str], first_line: int) -> Iterator[Tuple[List[Token], Dict[int, str]]]:
+    """Group source lines into statements: one line, or the lines up to the `}` closing its blocks.
+
+    Yields each statement's tokens with the text of the lines they came from.
+    """
+    tokens: List[Token] = []
+    source: Dict[int, str] = {}
+    depth = 0
+    in_comment = False
+    for line, text in enumerate(lines, first_line):
+        line_tokens, in_comment = _tokenize(text, line, in_comment)
+        if not line_tokens:
+            continue
+        source[line] = text
+        for token in line_tokens:
+            if token.kind == "OP" and token.value == "{":
+                depth += 1
+            elif token.kind == "OP" and token.value == "}":
+                depth -= 1
+                if depth < 0:
+                    raise DSLSyntaxError("unexpected '}'", line, token.start + 1)
+        tokens.extend(line_tokens)
+        if depth == 0:
+            yield tokens, source
+            tokens, source = [], {}
+    if tokens:
+        raise DSLSyntaxError("unterminated block: expected '}'", tokens[0].line, tokens[0].start + 1)
+
+# Parser
+
+_COMPARISON_OPERATORS = {
+    "=": LogicalOperator.EQUAL,
+    ">": LogicalOperator.GREATER_THAN,
+    "<": LogicalOperator.LESS_THAN,
+}
+
+_ACTION_WORDS = ("compute", "computation", "send", "sendMessage", "call", "callContract", "request", "requestService")
+
+# Words that may follow an amount on its line without being read as the currency
+_AMOUNT_FOLLOWERS = ("with", "to", "from")
+
+_DISPUTE_FIELDS = ("initiator", "target", "reason", "resolution_method")
+
+def _resolution_method(text: str) -> Optional[DisputeResolutionMethod]:
+    """Map "DAO Vote", "dao_vote", "Mediation", ... to a DisputeResolutionMethod."""
+    try:
+        return DisputeResolutionMethod(re.sub(r"[\s-]+", "_", text.strip().lower()))
+    except ValueError:
+        return None
+
+class _StatementParser:
+    """Recursive-descent parser for one DSL statement, which may span a block of several lines."""
+    def __init__(self, tokens: List[Token], source: Dict[int, str], line: int):
+        self.tokens = tokens
+        self.source = source
+        self.line = line
+        self.pos = 0
+
+    @classmethod
+    def for_line(cls, text: str, line: int) -> "_StatementParser":
+        return cls(tokenize_line(text, line), {line: text}, line)
+
+    # Token helpers
+
+    def peek(self, offset: int = 0) -> Optional[Token]:
+        index = self.pos + offset
+        return self.tokens[index] if index < len(self.tokens) else None
+
+    def advance(self) -> Token:
+        token = self.peek()
+        if token is None:
+            raise self.error("unexpected end of statement")
+        self.pos += 1
+        return token
+
+    def at_word(self, *words: str) -> bool:
+        token = self.peek()
+        return token is not None and token.kind == "NAME" and token.value in words
+
+    def at_op(self, op: str, offset: int = 0) -> bool:
+        token = self.peek(offset)
+        return token is not None and token.kind == "OP" and token.value == op
+
+    def at_entry(self) -> bool:
+        """True at a `name:` block entry."""
+        token = self.peek()
+        return token is not None and token.kind == "NAME" and self.at_op(":", 1)
+
+    def expect_word(self, word: str) -> Token:
+        if not self.at_word(word):
+            raise self.error(f"expected '{word}'")
+        return self.advance()
+
+    def expect_op(self, op: str) -> Token:
+        if not self.at_op(op):
+            raise self.error(f"expected '{op}'")
+        return self.advance()
+
+    def expect_identifier(self, what: str = "a name") -> str:
+        token = self.peek()
+        if token is None or token.kind != "NAME":
+            raise self.error(f"expected {what}")
+        return self.advance().value
+
+    def expect_end(self):
+        if self.peek() is not None:
+            raise self.error(f"unexpected '{self.peek().value}'")
+
+    def skip_comma(self):
+        if self.at_op(","):
+            self.advance()
+
+    def error(self, message: str) -> DSLSyntaxError:
+        token = self.peek()
+        if token is not None:
+            return DSLSyntaxError(message, token.line, token.start + 1)
+        line = self.tokens[-1].line if self.tokens else self.line
+        return DSLSyntaxError(message, line, len(self.source.get(line, "")) + 1)
+
+    # Statements
+
+    def parse_statement(self) -> Optional[Statement]:
+        if not self.tokens:
+            return None
+        node = self.parse_node()
+        self.expect_end()
+        return node
+
+    def parse_node(self) -> Statement:
+        keyword = self.peek()
+        if keyword is None or keyword.kind != "NAME":
+            raise self.error("expected a statement keyword")
+        line = keyword.line
+        if keyword.value == "when":
+            self.advance()
+            condition = self.parse_expression()
+            self.expect_word("then")
+            return WhenNode(condition, self.parse_action(), line)
+        if keyword.value == "condition":
+            self.advance()
+            name = self.advance().value if self.peek() is not None and self.peek().kind == "NAME" else None
+            self.expect_op(":")
+            return ConditionNode(name, self.parse_expression(), line)
+        if keyword.value in ("fact", "rule", "goal", "action", "payment"):
+            self.advance()
+            self.expect_op(":")
+            return getattr(self, f"parse_{keyword.value}_body")(line)
+        if keyword.value in ("agent", "service", "if", "dispute", "constraint", "defineCost"):
+            return getattr(self, f"parse_{keyword.value.lower()}")()
+        if keyword.value in _ACTION_WORDS:
+            return ActionNode(self.parse_action(), line)
+        raise self.error(f"unknown statement '{keyword.value}'")
+
+    def parse_fact_body(self, line: int) -> FactNode:
+        return FactNode(self.parse_proposition(), line)
+
+    def parse_goal_body(self, line: int) -> GoalNode:
+        return GoalNode(self.parse_proposition(), line)
+
+    def parse_action_body(self, line: int) -> ActionNode:
+        return ActionNode(self.parse_action(), line)
+
+    def parse_payment_body(self, line: int) -> PaymentNode:
+        amount = self.parse_amount()
+        self.expect_word("to")
+        return PaymentNode(Payment(amount.amount, amount.currency, self.parse_name()), line)
+
+    def parse_rule_body(self, line: int) -> RuleNode:
+        # Legacy scripts quote the whole rule: rule: "if a then b"
+        token = self.peek()
+        if token is not None and token.kind == "STRING" and self._ends_proposition(self.peek(1), (), token.line):
+            self.advance()
+            inner = _StatementParser.for_line(_unquote(token), token.line)
+            node = inner.parse_rule_clauses(line)
+            inner.expect_end()
+            return node
+        return self.parse_rule_clauses(line)
+
+    def parse_rule_clauses(self, line: int) -> RuleNode:
+        if self.at_word("if"):
+            self.advance()
+        antecedent = [self.parse_proposition(("and", "then"))]
+        while self.at_word("and"):
+            self.advance()
+            antecedent.append(self.parse_proposition(("and", "then")))
+        self.expect_word("then")
+        consequent = self.parse_proposition(("then",))
+        if self.at_word("then"):
+            raise self.error("a rule has a single 'then'; quote the consequent if it contains the word")
+        return RuleNode(tuple(antecedent), consequent, line)
+
+    def _ends_proposition(self, token: Optional[Token], stop_words: Tuple[str, ...], line: int) -> bool:
+        return (token is None or token.line != line or (token.kind == "OP" and token.value == "}")
+                or (token.kind == "NAME" and token.value in stop_words))
+
+    def parse_proposition(self, stop_words: Tuple[str, ...] = ()) -> str:
+        """Parse a quoted proposition or the raw source text up to a stop word or the end of the line."""
+        token = self.peek()
+        if token is None or (token.kind == "OP" and token.value == "}"):
+            raise self.error("expected a proposition")
+        if token.kind == "STRING" and self._ends_proposition(self.peek(1), stop_words, token.line):
+            self.advance()
+            return _unquote(token)
+        if self.at_word(*stop_words):
+            raise self.error("expected a proposition")
+        last = token
+        while not self._ends_proposition(self.peek(), stop_words, token.line):
+            last = self.advance()
+        return self.source[token.line][token.start:last.end]
+
+    # Blocks
+
+    def parse_if(self) -> IfNode:
+        line = self.expect_word("if").line
+        condition = self.parse_expression()
+        self.expect_word("then")
+        if not self.at_op("{"):
+            return IfNode(condition, (self.parse_node(),), line)
+        self.advance()
+        body = []
+        while not self.at_op("}"):
+            body.append(self.parse_node())
+        self.advance()
+        return IfNode(condition, tuple(body), line)
+
+    def parse_dispute(self) -> DisputeNode:
+        line = self.expect_word("dispute").line
+        self.expect_op("{")
+        fields = {}
+        while not self.at_op("}"):
+            name = self.expect_identifier("a dispute field")
+            if name not in _DISPUTE_FIELDS:
+                self.pos -= 1
+                raise self.error(f"unknown dispute field '{name}'")
+            self.expect_op(":")
+            fields[name] = self.parse_name()
+            if name == "resolution_method" and _resolution_method(fields[name]) is None:
+                self.pos -= 1
+                raise self.error(f"unknown resolution method '{fields[name]}'")
+            self.skip_comma()
+        missing = [name for name in _DISPUTE_FIELDS if name not in fields]
+        if missing:
+            raise self.error(f"dispute is missing {', '.join(missing)}")
+        self.advance()
+        return DisputeNode(fields["initiator"], fields["target"], fields["reason"],
+                           _resolution_method(fields["resolution_method"]), line)
+
+    def parse_agent(self) -> AgentNode:
+        line = self.expect_word("agent").line
+        name = self.expect_identifier("an agent name")
+        self.expect_op("{")
+        properties, behaviors = [], []
+        while not self.at_op("}"):
+            if self.at_word("on") and not self.at_op(":", 1):
+                behaviors.append(self.parse_behavior())
+            else:
+                properties.append(self.parse_property())
+        self.advance()
+        return AgentNode(name, tuple(properties), tuple(behaviors), line)
+
+    def parse_behavior(self) -> BehaviorNode:
+        line = self.expect_word("on").line
+        event = self.expect_identifier("an event")
+        trigger = None
+        if not (self.at_op("{") or self.at_word("do")):
+            trigger = self.parse_value()
+        actions = []
+        if self.at_word("do"):
+            self.advance()
+            actions.append(self.parse_action())
+            while self.at_op(","):
+                self.advance()
+                actions.append(self.parse_action())
+        else:
+            self.expect_op("{")
+            while not self.at_op("}"):
+                actions.append(self.parse_action())
+                self.skip_comma()
+            self.advance()
+        return BehaviorNode(event, trigger, tuple(actions), line)
+
+    def parse_service(self) -> ServiceNode:
+        line = self.expect_word("service").line
+        name = self.expect_identifier("a service name")
+        self.expect_op("{")
+        inputs, outputs, cost, properties, actions = (), (), None, [], []
+        while not self.at_op("}"):
+            if self.at_word("inputs", "outputs", "cost") and self.at_op(":", 1):
+                entry = self.advance().value
+                self.advance()
+                if entry == "cost":
+                    cost = self.parse_amount()
+                elif entry == "inputs":
+                    inputs = self.parse_names()
+                else:
+                    outputs = self.parse_names()
+                self.skip_comma()
+            elif self.at_entry():
+                properties.append(self.parse_property())
+            else:
+                actions.append(self.parse_action())
+                self.skip_comma()
+        self.advance()
+        return ServiceNode(name, inputs, outputs, cost, tuple(properties), tuple(actions), line)
+
+    def parse_definecost(self) -> ServiceNode:
+        line = self.expect_word("defineCost").line
+        name = self.expect_identifier("a service name")
+        self.expect_word("costs")
+        return ServiceNode(name, cost=self.parse_amount(), line=line)
+
+    def parse_constraint(self) -> ConstraintNode:
+        line = self.expect_word("constraint").line
+        name = self.expect_identifier("a constraint name")
+        self.expect_op("{")
+        properties = []
+        while not self.at_op("}"):
+            properties.append(self.parse_property())
+        self.advance()
+        return ConstraintNode(name, tuple(properties), line)
+
+    def parse_property(self) -> AgentProperty:
+        """Parse a `name: value[, value...]` block entry; several values form a LIST."""
+        name = self.expect_identifier("a property name")
+        self.expect_op(":")
+        values = [self.parse_value()]
+        while self.at_op(","):
+            self.advance()
+            values.append(self.parse_value())
+        return AgentProperty(name, values[0] if len(values) == 1 else GaiaValue(GaiaType.LIST, values))
+
+    def parse_names(self) -> Tuple[str, ...]:
+        """Parse a name or a `[name, ...]` list of names."""
+        value = self.parse_value()
+        items = value.value if value.type == GaiaType.LIST else (value,)
+        for item in items:
+            if item.type not in (GaiaType.STRING, GaiaType.VARIABLE):
+                self.pos -= 1
+                raise self.error("expected a list of names")
+        return tuple(item.value for item in items)
+
+    # Conditions
+
+    def parse_expression(self) -> Condition:
+        return self._as_condition(self.parse_or())
+
+    def parse_or(self):
+        left = self.parse_and()
+        while self.at_word("or"):
+            self.advance()
+            left = Condition(left, LogicalOperator.OR, self.parse_and())
+        return left
+
+    def parse_and(self):
+        left = self.parse_comparison()
+        while self.at_word("and"):
+            self.advance()
+            left = Condition(left, LogicalOperator.AND, self.parse_comparison())
+        return left
+
+    def parse_comparison(self):
+        if self.at_op("("):
+            self.advance()
+            inner = self.parse_or()
+            self.expect_op(")")
+            return inner
+        left = self.parse_value()
+        token = self.peek()
+        if token is not None and token.kind == "OP" and token.value in _COMPARISON_OPERATORS:
+            self.advance()
+            return Condition(left, _COMPARISON_OPERATORS[token.value], self.parse_value())
+        return left
+
+    def _as_condition(self, operand) -> Condition:
+        # A bare operand such as `hedged` is shorthand for `hedged = true`
+        if isinstance(operand, Condition):
+            return operand
+        return Condition(operand, LogicalOperator.EQUAL, GaiaValue(GaiaType.BOOLEAN, True))
+
+    def parse_value(self) -> GaiaValue:
+        """Parse a literal, a `[...]` list or a variable reference into a GaiaValue."""
+        token = self.advance()
+        if token.kind == "STRING":
+            return GaiaValue(GaiaType.STRING, _unquote(token))
+        if token.kind == "NUMBER":
+            if "." in token.value:
+                return GaiaValue(GaiaType.FLOAT, float(token.value))
+            return GaiaValue(GaiaType.INTEGER, int(token.value))
+        if token.kind == "NAME":
+            if token.value in ("true", "false"):
+                return GaiaValue(GaiaType.BOOLEAN, token.value == "true")
+            return GaiaValue(GaiaType.VARIABLE, token.value)
+        if token.kind == "OP" and token.value == "[":
+            items = []
+            while not self.at_op("]"):
+                items.append(self.parse_value())
+                if not self.at_op(","):
+                    break
+                self.advance()
+            self.expect_op("]")
+            return GaiaValue(GaiaType.LIST, items)
+        self.pos -= 1
+        raise self.error(f"expected a value, found '{token.value}'")
+
+    def parse_name(self) -> str:
+        """Parse an identifier or string used as a name (model, contract, service, ...)."""
+        value = self.parse_value()
+        if value.type not in (GaiaType.STRING, GaiaType.VARIABLE):
+            self.pos -= 1
+            raise self.error("expected a name")
+        return value.value
+
+    def parse_amount(self) -> EconomicValue:
+        """Parse `<number> [currency]`; the currency must be on the number's line."""
+        token = self.peek()
+        amount = self.parse_value()
+        if amount.type not in (GaiaType.INTEGER, GaiaType.FLOAT):
+            self.pos -= 1
+            raise self.error("amount must be a number")
+        following = self.peek()
+        if (following is not None and following.kind == "NAME" and following.line == token.line
+                and following.value not in _AMOUNT_FOLLOWERS):
+            self.advance()
+            return EconomicValue(amount.value, following.value)
+        return EconomicValue(amount.value)
+
+    # Actions
+
+    def parse_action(self) -> Action:
+        if self.at_word("compute", "computation"):
+            keyword = self.advance()
+            if self.at_op("("):
+                # grammar.g4 form: compute(Model [with data])
+                self.advance()
+                model = self.parse_name()
+                data = GaiaValue(GaiaType.DICT, {})
+                if self.at_word("with"):
+                    self.advance()
+                    data = self.parse_value()
+                self.expect_op(")")
+                return compute(model, data)
+            if keyword.value == "computation":
+                raise self.error("expected '('")
+            model = self.parse_name()
+            self.expect_word("with")
+            return compute(model, self.parse_value())
+        if self.at_word("send"):
+            self.advance()
+            message = self.parse_name()
+            self.expect_word("to")
+            return send_message(message, self.parse_name())
+        if self.at_word("sendMessage"):
+            self.advance()
+            self.expect_op("(")
+            message = self.parse_name()
+            recipient = "requester"
+            if self.at_word("to"):
+                self.advance()
+                recipient = self.parse_name()
+            self.expect_op(")")
+            return send_message(message, recipient)
+        if self.at_word("call"):
+            self.advance()
+            contract = self.parse_name()
+            function = self.parse_name()
+            params = {}
+            if self.at_word("with"):
+                self.advance()
+                params = {name: value for _, name, value in self.parse_arguments()}
+            return call_contract(contract, function, params)
+        if self.at_word("callContract"):
+            # grammar.g4 form: callContract("0xContract" [, "function"]) or callContract "0xContract"
+            self.advance()
+            parenthesized = self.at_op("(")
+            if parenthesized:
+                self.advance()
+            contract, function = self.parse_name(), ""
+            if parenthesized:
+                if self.at_op(","):
+                    self.advance()
+                    function = self.parse_name()
+                self.expect_op(")")
+            return call_contract(contract, function, {})
+        if self.at_word("requestService"):
+            self.advance()
+            service_id = self.parse_name()
+            self.expect_word("withPayment")
+            return request_service(service_id, [], self.parse_amount(), [])
+        if self.at_word("request"):
+            self.advance()
+            if self.at_word("service"):
+                self.advance()
+            service_id = self.parse_name()
+            provider = None
+            if self.at_word("from"):
+                self.advance()
+                provider = self.parse_name()
+            payment = EconomicValue(0)
+            if self.at_word("payment"):
+                self.advance()
+                payment = self.parse_amount()
+            inputs, constraints = [], []
+            if self.at_word("with"):
+                self.advance()
+                if self.at_op("{"):
+                    payment = self.parse_request_block(inputs, constraints, payment)
+                else:
+                    for argument in self.parse_arguments():
+                        self._add_argument(argument, inputs, constraints)
+            return request_service(service_id, inputs, payment, constraints, provider)
+        raise self.error("expected an action (compute, send, call or request)")
+
+    def parse_request_block(self, inputs: List[ServiceInputOutput], constraints: List[AgentProperty],
+                            payment: EconomicValue) -> EconomicValue:
+        """Parse `{ name: value  payment: N GAIA  constraint name: value ... }`, returning the payment."""
+        self.expect_op("{")
+        while not self.at_op("}"):
+            if self.at_word("payment") and self.at_op(":", 1):
+                self.advance()
+                self.advance()
+                payment = self.parse_amount()
+            else:
+                self._add_argument(self.parse_argument(), inputs, constraints)
+            self.skip_comma()
+        self.advance()
+        return payment
+
+    @staticmethod
+    def _add_argument(argument: Tuple[bool, str, GaiaValue], inputs: List[ServiceInputOutput],
+                      constraints: List[AgentProperty]):
+        is_constraint, name, value = argument
+        if is_constraint:
+            constraints.append(AgentProperty(name, value))
+        else:
+            inputs.append(ServiceInputOutput(name, value))
+
+    def parse_argument(self) -> Tuple[bool, str, GaiaValue]:
+        """Parse one `[constraint] name: value` pair."""
+        is_constraint = False
+        if self.at_word("constraint") and self.peek(1) is not None and self.peek(1).kind == "NAME":
+            self.advance()
+            is_constraint = True
+        token = self.advance()
+        if token.kind != "NAME":
+            self.pos -= 1
+            raise self.error("expected an argument name")
+        self.expect_op(":")
+        return is_constraint, token.value, self.parse_value()
+
+    def parse_arguments(self) -> List[Tuple[bool, str, GaiaValue]]:
+        """Parse `[constraint] name: value` pairs separated by commas."""
+        arguments = [self.parse_argument()]
+        while self.at_op(","):
+            self.advance()
+            arguments.append(self.parse_argument())
+        return arguments
+
+def parse_line(text: str, line: int = 1) -> Optional[Statement]:
+    """Parse a single line of DSL source, returning None for blank or comment-only lines.
+
+    Blocks must close on the same line; use iter_statements or parse_script for multi-line blocks.
+    """
+    return _StatementParser.for_line(text, line).parse_statement()
+
+def iter_statements(lines: Iterable[str], first_line: int = 1) -> Iterator[Statement]:
+    """Lazily parse an iterable of source lines, yielding statements as they are recognized."""
+    for tokens, source in _iter_segments(lines, first_line):
+        yield _StatementParser(tokens, source, tokens[0].line).parse_statement()
+
+# Parse Cache
+
+def script_hash(script: str) -> str:
+    """Return the cache key for a script: the SHA-256 of the parser version and script text."""
+    return hashlib.sha256(f"{PARSER_VERSION}\0{script}".encode("utf-8")).hexdigest()
+
+class ParseCache:
+    """Caches parsed programs by script hash in an in-memory LRU backed by an optional directory.
+
+    On-disk entries are pickles written atomically; only point `directory` at a location that
+    is not writable by untrusted users.
+    """
+    def __init__(self, maxsize: int = 256, directory: Optional[str] = None):
+        self.maxsize = maxsize
+        self.directory = directory
+        self.entries: "OrderedDict[str, Program]" = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Optional[Program]:
+        with self.lock:
+            program = self.entries.get(key)
+            if program is not None:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return program
+        program = self._load(key)
+        with self.lock:
+            if program is None:
+                self.misses += 1
+                return None
+            self.disk_hits += 1
+        self._remember(key, program)
+        return program
+
+    def put(self, key: str, program: Program):
+        self._remember(key, program)
+        self._store(key, program)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+    def _remember(self, key: str, program: Program):
+        with self.lock:
+            self.entries[key] = program
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.pickle")
+
+    def _load(self, key: str) -> Optional[Program]:
+        if not self.directory:
+            return None
+        try:
+            with open(self._path(key), "rb") as cache_file:
+                return pickle.load(cache_file)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning("Ignoring unreadable DSL cache entry", key=key, error=repr(e))
+            return None
+
+    def _store(self, key: str, program: Program):
+        if not self.directory:
+            return
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            with os.fdopen(fd, "wb") as cache_file:
+                pickle.dump(program, cache_file, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self._path(key))
+        except OSError as e:
+            logger.warning("Could not write DSL cache entry", key=key, error=repr(e))
+
+# Process-wide cache; set GAIA_DSL_CACHE_DIR to share parsed programs across processes
+default_cache = ParseCache(directory=os.environ.get("GAIA_DSL_CACHE_DIR"))
+telemetry.register_cache("dsl_parse", lambda: (default_cache.hits + default_cache.disk_hits, default_cache.misses))
+
+PARSE_SECONDS = telemetry.histogram("gaia_dsl_parse_seconds", "Time spent parsing DSL scripts (cache misses only).")
+
+def parse_script(script: str, cache: Optional[ParseCache] = default_cache) -> Program:
+    """Parse a DSL script into a Program, reusing a cached AST for identical scripts."""
+    key = script_hash(script)
+    if cache is not None:
+        program = cache.get(key)
+        if program is not None:
+            return program
+    with PARSE_SECONDS.time():
+        program = Program(tuple(iter_statements(script.splitlines())), key)
+    if cache is not None:
+        cache.put(key, program)
+    return program
+
+# Example usage (for illustration purposes, not part of the module)
+if __name__ == "__main__":
+    program = parse_script("""
+    fact: "stock_price > 100"
+    rule: "if stock_price > 100 then buy_stock"
+    goal: "maximize_profit"
+    condition screen: price > 100 and volatility < 0.3
+    when report_accuracy < 0.8 then send "dispute" to dao
+    payment: 5 GAIA to FinancialAnalyst
+    if report_accuracy < 0.8 then {
+        dispute { initiator: "user_456" target: "FinancialAnalyst" reason: "Inaccurate report" resolution_method: "DAO Vote" }
+    }
+    """)
+    for statement in program.statements:
+        print(statement)
@@ -0,0 +1,136 @@
+# gaia-chain/dsl/rules/batch_rules.py
+
+"""
+Batch Condition Evaluation for Gaia DSL
+
+This module evaluates Gaia DSL conditions against whole columns of inputs at once. Inputs are a
+columnar dict of NumPy arrays keyed by variable name (the `VARIABLE` operands of a condition),
+and the result is a boolean mask with one entry per row. It is intended for screening workloads
+where the same conditions run against hundreds of thousands of instruments per tick.
+
+Semantics follow `LogicalOperator`: `=`, `>` and `<` compare element-wise, while `and`/`or`
+combine the truthiness of their operands, matching `bool(evaluate_condition(...))` per row.
+"""
+
+import numpy as np
+from functools import lru_cache
+from typing import Any, Callable, Dict, Mapping, Tuple
+
+from gaia_chain.dsl.rules.core_rules import Condition, GaiaType, LogicalOperator
+from gaia_chain.tooling.monitoring.telemetry import register_cache
+
+Columns = Mapping[str, np.ndarray]
+
+_COMPARISONS = {
+    LogicalOperator.EQUAL: np.equal,
+    LogicalOperator.GREATER_THAN: np.greater,
+    LogicalOperator.LESS_THAN: np.less,
+}
+
+def evaluate_condition_batch(condition: Condition, columns: Columns) -> np.ndarray:
+    """Evaluate a condition against every row of a columnar input and return a boolean mask."""
+    return compile_condition_batch(condition)(columns)
+
+def evaluate_rule_set_batch(conditions: Mapping[str, Condition], columns: Columns) -> Dict[str, np.ndarray]:
+    """Evaluate a named set of conditions against the same columns, returning one mask per name."""
+    return {name: compile_condition_batch(condition)(columns) for name, condition in conditions.items()}
+
+def compile_condition_batch(condition: Condition) -> Callable[[Columns], np.ndarray]:
+    """Compile a condition tree into a function from columns to a boolean mask.
+
+    Literal-only subtrees are folded at compile time and compiled functions are cached per
+    condition. AND/OR skip their right operand when the left mask already decides every row.
+    """
+    try:
+        hash(condition)
+    except TypeError:
+        return _as_mask_function(*_compile_node(condition))
+    return _compile_cached(condition)
+
+@lru_cache(maxsize=4096)
+def _compile_cached(condition: Condition) -> Callable[[Columns], np.ndarray]:
+    return _as_mask_function(*_compile_node(condition))
+
+register_cache("batch_condition_compile", lambda: tuple(_compile_cached.cache_info()[:2]))
+
+def _row_count(columns: Columns) -> int:
+    for column in columns.values():
+        return len(column)
+    raise ValueError("Batch evaluation requires at least one input column.")
+
+def _as_mask_function(is_constant: bool, compiled) -> Callable[[Columns], np.ndarray]:
+    if is_constant:
+        value = bool(compiled)
+        return lambda columns: np.full(_row_count(columns), value, dtype=bool)
+    return lambda columns: np.asarray(compiled(columns), dtype=bool)
+
+def _compile_operand(operand) -> Tuple[bool, Any]:
+    """Compile an operand into (is_constant, value) or (False, columns -> array)."""
+    if isinstance(operand, Condition):
+        return _compile_node(operand)
+    if operand.type == GaiaType.CONDITION and isinstance(operand.value, Condition):
+        return _compile_node(operand.value)
+    if operand.type == GaiaType.VARIABLE:
+        name = operand.value
+        return False, lambda columns: columns[name]
+    return True, operand.value
+
+def _truthy(values) -> np.ndarray:
+    values = np.asarray(values)
+    return values if values.dtype == bool else values.astype(bool)
+
+def _compile_node(condition: Condition) -> Tuple[bool, Any]:
+    left_constant, left = _compile_operand(condition.left)
+    right_constant, right = _compile_operand(condition.right)
+    op = condition.operator
+
+    if op in _COMPARISONS:
+        compare = _COMPARISONS[op]
+        if left_constant and right_constant:
+            return True, bool(compare(left, right))
+        if left_constant:
+            return False, lambda columns: compare(left, right(columns))
+        if right_constant:
+            return False, lambda columns: compare(left(columns), right)
+        return False, lambda columns: compare(left(columns), right(columns))
+
+    if op == LogicalOperator.AND:
+        if left_constant:
+            return (right_constant, right) if left else (True, False)
+        if right_constant:
+            return (False, left) if right else (True, False)
+
+        def evaluate_and(columns):
+            mask = _truthy(left(columns))
+            if not mask.any():
+                return mask
+            return np.logical_and(mask, _truthy(right(columns)))
+        return False, evaluate_and
+
+    if op == LogicalOperator.OR:
+        if left_constant:
+            return (True, True) if left else (right_constant, right)
+        if right_constant:
+            return (True, True) if right else (False, left)
+
+        def evaluate_or(columns):
+            mask = _truthy(left(columns))
+            if mask.all():
+                return mask
+            return np.logical_or(mask, _truthy(right(columns)))
+        return False, evaluate_or
+
+    raise ValueError(f"Unsupported operator: {op}")
+
+# Example usage (for illustration purposes, not part of the module)
+if __name__ == "__main__":
+    from gaia_chain.dsl.rules.core_rules import GaiaValue
+
+    # Screen instruments with price > 100 and volatility < 0.3
+    screen = Condition(
+        left=Condition(GaiaValue(GaiaType.VARIABLE, "price"), LogicalOperator.GREATER_THAN, GaiaValue(GaiaType.FLOAT, 100)),
+        operator=LogicalOperator.AND,
+        right=Condition(GaiaValue(GaiaType.VARIABLE, "volatility"), LogicalOperator.LESS_THAN, GaiaValue(GaiaType.FLOAT, 0.3))
+    )
+    columns = {"price": np.array([90.0, 120.0, 150.0]), "volatility": np.array([0.1, 0.2, 0.5])}
+    print(f"Screen mask: {evaluate_condition_batch(screen, columns)}")
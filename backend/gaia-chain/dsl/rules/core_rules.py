@@ -12,14 +12,54 @@ This module provides the semantic foundation for the DSL’s syntax, forming the
 processing, and governance.
 
 Key Components:
-1. Basic Data Types
-2. Core Actions or Commands
-3. Core Logical Operators
+1. Immutable Containers
+2. Basic Data Types
+3. Core Actions or Commands
+4. Core Logical Operators
+5. Condition Compilation
+
+Value types are frozen and hashable: list, set and dict contents are converted to tuples,
+frozensets and `FrozenDict`s on construction (see `freeze`).
 """
 
+import operator
 from enum import Enum
 from dataclasses import dataclass
-from typing import Union, List, Dict, Any
+from functools import lru_cache
+from typing import Union, List, Dict, Any, Callable, Mapping, Optional, Tuple
+
+from gaia_chain.tooling.monitoring.telemetry import register_cache
+
+# Immutable Containers
+
+class FrozenDict(dict):
+    """Read-only, hashable dict for mapping values held by frozen DSL types."""
+    __slots__ = ()
+
+    def __hash__(self):
+        return hash(frozenset(self.items()))
+
+    def _readonly(self, *args, **kwargs):
+        raise TypeError(f"{type(self).__name__} is immutable")
+
+    __setitem__ = __delitem__ = __ior__ = clear = pop = popitem = setdefault = update = _readonly
+
+    def __reduce__(self):
+        return type(self), (dict(self),)
+
+_ATOMIC_TYPES = (str, int, float, bool, type(None), FrozenDict)
+
+def freeze(value: Any) -> Any:
+    """Return an immutable equivalent of `value`, converting nested lists, sets and dicts."""
+    if isinstance(value, _ATOMIC_TYPES):
+        return value
+    if isinstance(value, Mapping):
+        return FrozenDict((key, freeze(item)) for key, item in value.items())
+    if isinstance(value, list) or type(value) is tuple:
+        return tuple(freeze(item) for item in value)
+    if isinstance(value, (set, frozenset)):
+        return frozenset(freeze(item) for item in value)
+    return value
 
 # Basic Data Types
 
@@ -32,26 +72,32 @@ class GaiaType(Enum):
     AGENT_ID = 'agent_id'
     TOKEN_AMOUNT = 'token_amount'
     CONDITION = 'condition'
+    VARIABLE = 'variable'  # Named input resolved from bindings at evaluation time
+    DICT = 'dict'  # Mapping of names to GaiaValues
+    LIST = 'list'  # Tuple of GaiaValues
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class GaiaValue:
     """Class representing a value in Gaia DSL."""
     type: GaiaType
     value: Any
 
-@dataclass
+    def __post_init__(self):
+        object.__setattr__(self, "value", freeze(self.value))
+
+@dataclass(frozen=True, slots=True)
 class AgentProperty:
     """Class representing an agent property."""
     name: str
     value: GaiaValue
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class ServiceInputOutput:
     """Class representing input or output for a service."""
     name: str
     value: GaiaValue
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class EconomicValue:
     """Class representing an economic value, e.g., GAIA tokens."""
     amount: float
@@ -66,12 +112,15 @@ class GaiaAction(Enum):
     CALL_CONTRACT = 'call_contract'
     REQUEST_SERVICE = 'request_service'
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Action:
     """Class representing an action in Gaia DSL."""
     action_type: GaiaAction
     parameters: Dict[str, GaiaValue]
 
+    def __post_init__(self):
+        object.__setattr__(self, "parameters", freeze(self.parameters))
+
 def compute(model: str, data: GaiaValue) -> Action:
     """Define a compute action."""
     return Action(
@@ -93,17 +142,19 @@ def call_contract(contract: str, function: str, params: Dict[str, GaiaValue]) ->
         parameters={'contract': GaiaValue(GaiaType.STRING, contract), 'function': GaiaValue(GaiaType.STRING, function), 'params': params}
     )
 
-def request_service(service_id: str, inputs: List[ServiceInputOutput], payment: EconomicValue, constraints: List[AgentProperty]) -> Action:
-    """Define a request service action."""
-    return Action(
-        action_type=GaiaAction.REQUEST_SERVICE,
-        parameters={
-            'service_id': GaiaValue(GaiaType.STRING, service_id),
-            'inputs': GaiaValue(GaiaType.STRING, str(inputs)),  # Simplified for example
-            'payment': GaiaValue(GaiaType.TOKEN_AMOUNT, payment),
-            'constraints': GaiaValue(GaiaType.STRING, str(constraints))  # Simplified for example
-        }
-    )
+def request_service(service_id: str, inputs: List[ServiceInputOutput], payment: EconomicValue, constraints: List[AgentProperty],
+                    provider: Optional[str] = None) -> Action:
+    """Define a request service action, optionally addressed to one provider."""
+    parameters = {
+        'service_id': GaiaValue(GaiaType.STRING, service_id),
+        'inputs': GaiaValue(GaiaType.STRING, str(inputs)),  # Simplified for example
+        'payment': GaiaValue(GaiaType.TOKEN_AMOUNT, payment),
+        # Typed values by name, matched against service attributes (see registry/service_discovery.py)
+        'constraints': GaiaValue(GaiaType.DICT, {constraint.name: constraint.value for constraint in constraints})
+    }
+    if provider is not None:
+        parameters['provider'] = GaiaValue(GaiaType.AGENT_ID, provider)
+    return Action(action_type=GaiaAction.REQUEST_SERVICE, parameters=parameters)
 
 # Core Logical Operators
 
@@ -115,27 +166,94 @@ class LogicalOperator(Enum):
     AND = 'and'
     OR = 'or'
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Condition:
     """Class representing a condition in Gaia DSL."""
-    left: GaiaValue
+    left: Union[GaiaValue, 'Condition']
     operator: LogicalOperator
-    right: GaiaValue
-
-def evaluate_condition(condition: Condition) -> bool:
-    """Evaluate a condition."""
-    if condition.operator == LogicalOperator.EQUAL:
-        return condition.left.value == condition.right.value
-    elif condition.operator == LogicalOperator.GREATER_THAN:
-        return condition.left.value > condition.right.value
-    elif condition.operator == LogicalOperator.LESS_THAN:
-        return condition.left.value < condition.right.value
-    elif condition.operator == LogicalOperator.AND:
-        return condition.left.value and condition.right.value
-    elif condition.operator == LogicalOperator.OR:
-        return condition.left.value or condition.right.value
-    else:
-        raise ValueError(f"Unsupported operator: {condition.operator}")
+    right: Union[GaiaValue, 'Condition']
+
+def evaluate_condition(condition: Condition, bindings: Mapping[str, Any] = None) -> bool:
+    """Evaluate a condition, resolving VARIABLE operands from bindings.
+
+    The condition is compiled once (see compile_condition) and the cached closure is reused
+    on every subsequent evaluation.
+    """
+    return compile_condition(condition)(bindings if bindings is not None else {})
+
+# Condition Compilation
+
+_COMPARISONS = {
+    LogicalOperator.EQUAL: operator.eq,
+    LogicalOperator.GREATER_THAN: operator.gt,
+    LogicalOperator.LESS_THAN: operator.lt,
+}
+
+def compile_condition(condition: Condition) -> Callable[[Mapping[str, Any]], Any]:
+    """Compile a condition tree into a closure taking a mapping of variable bindings.
+
+    Operands may be literal GaiaValues, VARIABLE GaiaValues naming a binding, or nested
+    conditions (either directly or wrapped in a CONDITION GaiaValue). Operators are resolved at
+    compile time, literal-only subtrees are folded into constants, and AND/OR short-circuit.
+    Compiled closures are cached per condition; unhashable conditions are compiled each call.
+    """
+    try:
+        hash(condition)
+    except TypeError:
+        return _as_function(*_compile_node(condition))
+    return _compile_cached(condition)
+
+@lru_cache(maxsize=4096)
+def _compile_cached(condition: Condition) -> Callable[[Mapping[str, Any]], Any]:
+    return _as_function(*_compile_node(condition))
+
+register_cache("condition_compile", lambda: tuple(_compile_cached.cache_info()[:2]))
+
+def _as_function(is_constant: bool, compiled) -> Callable[[Mapping[str, Any]], Any]:
+    if is_constant:
+        return lambda bindings: compiled
+    return compiled
+
+def _compile_operand(operand) -> Tuple[bool, Any]:
+    """Compile an operand into (is_constant, value) or (False, bindings -> value)."""
+    if isinstance(operand, Condition):
+        return _compile_node(operand)
+    if operand.type == GaiaType.CONDITION and isinstance(operand.value, Condition):
+        return _compile_node(operand.value)
+    if operand.type == GaiaType.VARIABLE:
+        return False, operator.itemgetter(operand.value)
+    return True, operand.value
+
+def _compile_node(condition: Condition) -> Tuple[bool, Any]:
+    left_constant, left = _compile_operand(condition.left)
+    right_constant, right = _compile_operand(condition.right)
+    op = condition.operator
+
+    if op in _COMPARISONS:
+        compare = _COMPARISONS[op]
+        if left_constant and right_constant:
+            return True, compare(left, right)
+        if left_constant:
+            return False, lambda bindings: compare(left, right(bindings))
+        if right_constant:
+            return False, lambda bindings: compare(left(bindings), right)
+        return False, lambda bindings: compare(left(bindings), right(bindings))
+
+    if op == LogicalOperator.AND:
+        if left_constant:
+            return (right_constant, right) if left else (True, left)
+        if right_constant:
+            return False, lambda bindings: left(bindings) and right
+        return False, lambda bindings: left(bindings) and right(bindings)
+
+    if op == LogicalOperator.OR:
+        if left_constant:
+            return (True, left) if left else (right_constant, right)
+        if right_constant:
+            return False, lambda bindings: left(bindings) or right
+        return False, lambda bindings: left(bindings) or right(bindings)
+
+    raise ValueError(f"Unsupported operator: {op}")
 
 # Example usage (for illustration purposes, not part of the module)
 if __name__ == "__main__":
@@ -150,4 +268,12 @@ if __name__ == "__main__":
     
     # Evaluate condition
     result = evaluate_condition(condition)
-    print(f"Condition result: {result}")
\ No newline at end of file
+    print(f"Condition result: {result}")
+
+    # Example of compiling a nested condition over variables: price > 100 and volatility < 0.3
+    screen = compile_condition(Condition(
+        left=Condition(GaiaValue(GaiaType.VARIABLE, "price"), LogicalOperator.GREATER_THAN, GaiaValue(GaiaType.FLOAT, 100)),
+        operator=LogicalOperator.AND,
+        right=Condition(GaiaValue(GaiaType.VARIABLE, "volatility"), LogicalOperator.LESS_THAN, GaiaValue(GaiaType.FLOAT, 0.3))
+    ))
+    print(f"Screen result: {screen({'price': 120, 'volatility': 0.1})}")
\ No newline at end of file
@@ -19,26 +19,65 @@ Key Components:
 
 from enum import Enum
 from dataclasses import dataclass
+from decimal import Decimal, InvalidOperation, localcontext
 from typing import List, Dict, Union, Any
 
+from gaia_chain.dsl.rules.core_rules import freeze
+
 # Payments
 
+GAIA_DECIMALS = 18
+GAIA_UNIT = 10 ** GAIA_DECIMALS  # Base units per GAIA
+
+def to_units(amount: Union[int, Decimal, str, float]) -> int:
+    """Convert a GAIA amount to integer base units, exactly.
+
+    Floats are converted through their shortest decimal representation (0.1 -> 10**17 units);
+    amounts finer than one base unit raise ValueError.
+    """
+    try:
+        value = Decimal(amount) if isinstance(amount, (int, Decimal, str)) else Decimal(repr(float(amount)))
+    except (InvalidOperation, TypeError, ValueError):
+        raise ValueError(f"Invalid GAIA amount: {amount!r}")
+    if not value.is_finite():
+        raise ValueError(f"Invalid GAIA amount: {amount!r}")
+    with localcontext() as context:
+        context.prec = 80  # Exact for any uint256 amount
+        units = value.scaleb(GAIA_DECIMALS)
+    if units != units.to_integral_value():
+        raise ValueError(f"GAIA amount {amount!r} is finer than one base unit.")
+    return int(units)
+
+def from_units(units: int) -> Decimal:
+    """Convert integer base units back to a GAIA Decimal."""
+    with localcontext() as context:
+        context.prec = 80
+        return Decimal(units).scaleb(-GAIA_DECIMALS)
+
 class PaymentMethod(Enum):
     """Enum for payment methods in Gaia DSL."""
     DIRECT_TRANSFER = 'direct_transfer'
     CONTRACT_CALL = 'contract_call'
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Payment:
-    """Class representing a payment in Gaia DSL."""
-    amount: float
+    """Class representing a payment in Gaia DSL.
+
+    `amount` is in GAIA; use int or Decimal for exact values (floats are accepted for DSL
+    literals and converted by their decimal representation). `units` gives the integer base units.
+    """
+    amount: Union[int, Decimal, float]
     currency: str = 'GAIA'
     recipient: str = None  # ID of the agent or smart contract
     method: PaymentMethod = PaymentMethod.DIRECT_TRANSFER
 
+    @property
+    def units(self) -> int:
+        return to_units(self.amount)
+
     def validate(self) -> bool:
         """Validate the payment details."""
-        if self.amount <= 0:
+        if self.units <= 0:
             raise ValueError("Payment amount must be positive.")
         if not self.recipient:
             raise ValueError("Payment recipient must be specified.")
@@ -46,15 +85,21 @@ class Payment:
 
 # Service Agreements
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class ServiceTerm:
     """Class representing a term in a service agreement."""
     key: str
     value: Any
 
-@dataclass
+    def __post_init__(self):
+        object.__setattr__(self, "value", freeze(self.value))
+
+@dataclass(frozen=True, slots=True)
 class ServiceAgreement:
-    """Class representing a service agreement in Gaia DSL."""
+    """Class representing a service agreement in Gaia DSL.
+
+    Dict fields are stored as read-only `FrozenDict`s so agreements are hashable.
+    """
     service_id: str
     inputs: Dict[str, Any]
     outputs: Dict[str, Any]
@@ -62,6 +107,10 @@ class ServiceAgreement:
     compute_requirements: Dict[str, Any] = None
     sla: Dict[str, Any] = None  # Service-Level Agreements
 
+    def __post_init__(self):
+        for name in ("inputs", "outputs", "compute_requirements", "sla"):
+            object.__setattr__(self, name, freeze(getattr(self, name)))
+
     def validate(self) -> bool:
         """Validate the service agreement details."""
         if not self.service_id:
@@ -0,0 +1,149 @@
+# gaia-chain/dsl/tests/test_interpreter.py
+
+"""
+Tests for the Gaia DSL bytecode compiler, serialization and virtual machine (dsl/parser/interpreter.py).
+"""
+
+import os
+
+import pytest
+
+from gaia_chain.dsl.parser.interpreter import (
+    BYTECODE_MAGIC, Bytecode, DSLRuntimeError, ExecutionBudgetExceeded, INSTRUCTION_COSTS, Opcode,
+    compile_program, execute
+)
+from gaia_chain.dsl.parser.parser import parse_script
+from gaia_chain.dsl.rules.core_rules import GaiaAction, GaiaType, GaiaValue
+from gaia_chain.dsl.rules.economic_rules import Dispute, DisputeResolutionMethod, Payment
+
+EXAMPLES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "examples")
+
+class RecordingAgent:
+    """The parts of AgentCore the VM uses, recording dispatched actions."""
+    def __init__(self, **resources):
+        self.resources = dict(resources)
+        self.goals = []
+        self.reasoner = None
+        self.actions = []
+
+    def execute_action(self, action):
+        self.actions.append(action)
+
+    def make_payment(self, payment):
+        self.actions.append(payment)
+
+    def raise_dispute(self, dispute):
+        self.actions.append(dispute)
+
+def run(script, agent, **budgets):
+    return execute(compile_program(parse_script(script, cache=None)), agent, **budgets)
+
+SCRIPT = """
+fact: market_open
+rule: if market_open then analyze
+goal: "maximize_profit"
+condition bullish: price > 100 and (volatility < 0.3 or hedged)
+when bullish then compute "FinancialModel" with market_data
+action: request service DataAnalysis payment 5 GAIA with market_data: "latest", constraint risk: "low"
+"""
+
+# Compilation
+
+def test_compiled_program_ends_with_halt():
+    bytecode = compile_program(parse_script(SCRIPT, cache=None))
+    assert len(bytecode.code) % 2 == 0
+    assert Opcode(bytecode.code[-2]) == Opcode.HALT
+    assert bytecode.disassemble()[0].split()[1] == "ASSERT_FACT"
+
+def test_constants_are_deduplicated():
+    bytecode = compile_program(parse_script("fact: a\ngoal: a\ncondition: x > 1 and y > 1\n", cache=None))
+    assert bytecode.constants.count("a") == 1
+    assert bytecode.constants.count(1) == 1
+
+# Serialization
+
+def test_bytecode_round_trip():
+    bytecode = compile_program(parse_script(SCRIPT, cache=None))
+    data = bytecode.to_bytes()
+    assert data.startswith(BYTECODE_MAGIC)
+    loaded = Bytecode.from_bytes(data)
+    assert list(loaded.code) == list(bytecode.code)
+    assert loaded.source_hash == bytecode.source_hash
+    assert loaded.disassemble() == bytecode.disassemble()
+
+def test_round_tripped_bytecode_runs_the_same():
+    bytecode = compile_program(parse_script(SCRIPT, cache=None))
+    direct, loaded = (RecordingAgent(price=120, volatility=0.5, hedged=True, market_data="feed-1") for _ in range(2))
+    assert execute(bytecode, direct) == execute(Bytecode.from_bytes(bytecode.to_bytes()), loaded)
+    assert loaded.actions == direct.actions
+    assert loaded.resources == direct.resources
+
+@pytest.mark.parametrize("data, message", [
+    (b"NOTBC!" + bytes(10), "Not a Gaia DSL bytecode file"),
+    (BYTECODE_MAGIC + (99).to_bytes(2, "little") + bytes(8), "Unsupported bytecode version"),
+])
+def test_from_bytes_rejects_foreign_data(data, message):
+    with pytest.raises(ValueError, match=message):
+        Bytecode.from_bytes(data)
+
+# Execution
+
+def test_program_updates_knowledge_resources_and_dispatches_actions():
+    agent = RecordingAgent(price=120, volatility=0.5, hedged=True, market_data="feed-1")
+    result = run(SCRIPT, agent)
+    assert agent.resources["bullish"] is True
+    assert agent.goals == ["maximize_profit"]
+    assert agent.reasoner.kb.has_fact("market_open") and agent.reasoner.kb.has_fact("analyze")
+    compute, request = agent.actions
+    assert compute.action_type == GaiaAction.COMPUTE
+    assert compute.parameters["data"] == GaiaValue(GaiaType.STRING, "feed-1")  # Bound from resources
+    assert request.action_type == GaiaAction.REQUEST_SERVICE
+    assert request.parameters["constraints"].type == GaiaType.DICT
+    assert result.actions == 2
+
+@pytest.mark.parametrize("resources, bullish", [
+    ({"price": 90, "volatility": 0.5, "hedged": True}, False),   # `and` short-circuits
+    ({"price": 120, "volatility": 0.1, "hedged": False}, True),  # `or` short-circuits
+    ({"price": 120, "volatility": 0.5, "hedged": False}, False),
+])
+def test_guarded_action_follows_the_condition(resources, bullish):
+    agent = RecordingAgent(**resources)
+    run("condition bullish: price > 100 and (volatility < 0.3 or hedged)\nwhen bullish then send \"buy\" to broker\n", agent)
+    assert agent.resources["bullish"] is bullish
+    assert len(agent.actions) == int(bullish)
+
+@pytest.mark.parametrize("accuracy, disputed", [(0.5, True), (0.9, False)])
+def test_economic_example_pays_and_disputes(accuracy, disputed):
+    with open(os.path.join(EXAMPLES_DIR, "economic_example.gaia"), "r") as example:
+        bytecode = compile_program(parse_script(example.read(), cache=None))
+    agent = RecordingAgent(report_accuracy=accuracy)
+    execute(Bytecode.from_bytes(bytecode.to_bytes()), agent)
+    request, payment, *dispute = agent.actions
+    assert request.parameters["provider"] == GaiaValue(GaiaType.AGENT_ID, "FinancialAnalyst")
+    assert payment == Payment(5, "GAIA", "FinancialAnalyst")
+    assert dispute == ([Dispute("user_456", "FinancialAnalyst", "Inaccurate analysis report",
+                                DisputeResolutionMethod.DAO_VOTE)] if disputed else [])
+
+def test_knowledge_is_visible_to_actions():
+    class Agent(RecordingAgent):
+        def execute_action(self, action):
+            self.actions.append(self.reasoner.kb.has_fact("ready"))
+    agent = Agent()
+    run('fact: ready\naction: send "go" to peer\n', agent)
+    assert agent.actions == [True]
+
+def test_undefined_variable_raises():
+    with pytest.raises(DSLRuntimeError, match="Undefined variable: price"):
+        run("condition: price > 1\n", RecordingAgent())
+
+def test_step_and_cost_budgets():
+    script = 'fact: a\naction: send "x" to y\n'
+    result = run(script, RecordingAgent())
+    assert result.steps == 3
+    assert result.cost == INSTRUCTION_COSTS[Opcode.ASSERT_FACT] + INSTRUCTION_COSTS[Opcode.ACTION]
+    with pytest.raises(ExecutionBudgetExceeded):
+        run(script, RecordingAgent(), step_budget=2)
+    agent = RecordingAgent()
+    with pytest.raises(ExecutionBudgetExceeded):
+        run(script, agent, cost_budget=result.cost - 1)
+    assert agent.actions == []  # The action's cost is charged before it is dispatched
@@ -0,0 +1,250 @@
+# gaia-chain/dsl/tests/test_parser.py
+
+"""
+Tests for the Gaia DSL tokenizer, parser and parse cache (dsl/parser/parser.py).
+"""
+
+import os
+
+import pytest
+
+from gaia_chain.dsl.parser.parser import (
+    ActionNode, AgentNode, ConditionNode, ConstraintNode, DSLSyntaxError, DisputeNode, FactNode, GoalNode,
+    IfNode, ParseCache, PaymentNode, Program, RuleNode, ServiceNode, WhenNode, parse_line, parse_script,
+    script_hash, tokenize_line
+)
+from gaia_chain.dsl.rules.core_rules import (
+    AgentProperty, Condition, EconomicValue, GaiaAction, GaiaType, GaiaValue, LogicalOperator, compile_condition
+)
+from gaia_chain.dsl.rules.economic_rules import DisputeResolutionMethod, Payment
+
+EXAMPLES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "examples")
+
+# Tokenizer
+
+def test_tokenize_kinds_and_positions():
+    tokens = tokenize_line('when price > 10.5 then send "a \\"b\\"" to 0xAbC1', line=3)
+    assert [(token.kind, token.value) for token in tokens] == [
+        ("NAME", "when"), ("NAME", "price"), ("OP", ">"), ("NUMBER", "10.5"), ("NAME", "then"),
+        ("NAME", "send"), ("STRING", '"a \\"b\\""'), ("NAME", "to"), ("NAME", "0xAbC1"),
+    ]
+    assert all(token.line == 3 for token in tokens)
+    assert (tokens[1].start, tokens[1].end) == (5, 10)
+
+def test_tokenize_drops_comments():
+    assert tokenize_line("// a comment") == []
+    assert tokenize_line("   # a comment") == []
+    assert [token.value for token in tokenize_line('goal: "x"  // trailing')] == ["goal", ":", '"x"']
+
+@pytest.mark.parametrize("text, proposition", [
+    ("fact: issue #5", "issue #5"),
+    ("fact: http://x.com/a", "http://x.com/a"),
+    ("fact: a//b", "a//b"),
+    ("fact: a // note", "a"),
+])
+def test_comment_markers_inside_propositions(text, proposition):
+    assert parse_line(text) == FactNode(proposition, 1)
+
+# Statements
+
+def test_blank_lines_parse_to_none():
+    assert parse_line("") is None
+    assert parse_line("    // only a comment") is None
+
+def test_fact_goal_and_unquoted_keywords_inside_words():
+    assert parse_line("fact: stock_price > 100") == FactNode("stock_price > 100", 1)
+    assert parse_line('goal: "maximize_profit"') == GoalNode("maximize_profit", 1)
+    rule = parse_line("rule: if brand loyalty and demand rising then expand")
+    assert rule == RuleNode(("brand loyalty", "demand rising"), "expand", 1)
+
+def test_quoted_rule_and_quoted_clauses():
+    assert parse_line('rule: "if a then b"') == RuleNode(("a",), "b", 1)
+    rule = parse_line('rule: if "supply and demand balanced" then "hold then review"')
+    assert rule == RuleNode(("supply and demand balanced",), "hold then review", 1)
+
+@pytest.mark.parametrize("text", ["rule: if a then b then c", 'rule: "if a then b then c"'])
+def test_rule_rejects_second_then(text):
+    with pytest.raises(DSLSyntaxError, match="single 'then'"):
+        parse_line(text)
+
+def test_condition_statement_compiles():
+    node = parse_line("condition screen: price > 100 and (volatility < 0.3 or hedged)")
+    assert isinstance(node, ConditionNode) and node.name == "screen"
+    assert node.condition.operator == LogicalOperator.AND
+    screen = compile_condition(node.condition)
+    assert screen({"price": 120, "volatility": 0.5, "hedged": True})
+    assert not screen({"price": 120, "volatility": 0.5, "hedged": False})
+    assert not screen({"price": 90, "volatility": 0.1, "hedged": True})
+
+def test_when_statement():
+    node = parse_line('when report_accuracy < 0.8 then send "dispute" to dao')
+    assert isinstance(node, WhenNode)
+    assert node.condition == Condition(GaiaValue(GaiaType.VARIABLE, "report_accuracy"), LogicalOperator.LESS_THAN,
+                                       GaiaValue(GaiaType.FLOAT, 0.8))
+    assert node.action.action_type == GaiaAction.SEND_MESSAGE
+    assert node.action.parameters["recipient"] == GaiaValue(GaiaType.STRING, "dao")
+
+def test_request_service_action():
+    node = parse_line('action: request service DataAnalysis payment 5 GAIA with market_data: "latest", constraint risk: "low"')
+    assert isinstance(node, ActionNode)
+    parameters = node.action.parameters
+    assert parameters["service_id"] == GaiaValue(GaiaType.STRING, "DataAnalysis")
+    assert parameters["payment"].value.amount == 5
+    constraints = parameters["constraints"]
+    assert constraints.type == GaiaType.DICT
+    assert dict(constraints.value) == {"risk": GaiaValue(GaiaType.STRING, "low")}
+
+# Error Positions
+
+@pytest.mark.parametrize("text, column, message", [
+    ("fact: ", 7, "expected a proposition"),
+    ("fact stock", 6, "expected ':'"),
+    ("bogus: x", 1, "unknown statement 'bogus'"),
+    ("when price > : then send a to b", 14, "expected a value"),
+    ('action: send "a" "b"', 18, "expected 'to'"),
+    ("condition c: (a or b", 21, "expected ')'"),
+])
+def test_error_columns(text, column, message):
+    with pytest.raises(DSLSyntaxError) as error:
+        parse_line(text, line=4)
+    assert (error.value.line, error.value.column) == (4, column)
+    assert message in str(error.value)
+
+def test_script_errors_report_the_source_line():
+    with pytest.raises(DSLSyntaxError) as error:
+        parse_script('fact: a\n\n// comment\nwhen x then send "a" "b"\n', cache=None)
+    assert (error.value.line, error.value.column) == (4, 22)
+
+# Parse Cache
+
+SCRIPT = 'fact: "a"\nrule: if a then b\nwhen x > 1 then compute "Model" with x\n'
+
+def test_cache_returns_the_same_program():
+    cache = ParseCache()
+    program = parse_script(SCRIPT, cache=cache)
+    assert parse_script(SCRIPT, cache=cache) is program
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert program.source_hash == script_hash(SCRIPT)
+
+def test_cache_lru_eviction():
+    cache = ParseCache(maxsize=2)
+    for script in ("fact: a", "fact: b", "fact: c"):
+        parse_script(script, cache=cache)
+    assert script_hash("fact: a") not in cache.entries
+    assert len(cache.entries) == 2
+
+def test_disk_cache_round_trip(tmp_path):
+    program = parse_script(SCRIPT, cache=ParseCache(directory=str(tmp_path)))
+    fresh = ParseCache(directory=str(tmp_path))
+    loaded = parse_script(SCRIPT, cache=fresh)
+    assert loaded == program and loaded is not program
+    assert isinstance(loaded, Program)
+    assert (fresh.disk_hits, fresh.misses) == (1, 0)
+
+def test_unreadable_disk_entry_is_reparsed(tmp_path):
+    with open(tmp_path / f"{script_hash(SCRIPT)}.pickle", "wb") as cache_file:
+        cache_file.write(b"not a pickle")
+    cache = ParseCache(directory=str(tmp_path))
+    assert parse_script(SCRIPT, cache=cache) == parse_script(SCRIPT, cache=None)
+    assert cache.misses == 1
+
+# Blocks
+
+def test_block_comments_span_lines():
+    program = parse_script('fact: a /* inline */\n/* one\nfact: hidden\n*/ goal: b\n', cache=None)
+    assert program.statements == (FactNode("a", 1), GoalNode("b", 4))
+
+def test_agent_with_properties_and_behaviors():
+    agent = parse_script("""
+agent Analyst {
+    identity: "FinBot"
+    capabilities: "forecasting", "pricing"
+    on receive "market_data" {
+        compute "FinancialModel" with market_data
+        send "report" to requester
+    }
+    on alert do sendMessage("paged"), compute(RiskModel)
+}
+""", cache=None).statements[0]
+    assert isinstance(agent, AgentNode) and (agent.name, agent.line) == ("Analyst", 2)
+    assert agent.properties[0] == AgentProperty("identity", GaiaValue(GaiaType.STRING, "FinBot"))
+    assert agent.properties[1].value.type == GaiaType.LIST
+    receive, alert = agent.behaviors
+    assert (receive.event, receive.trigger, receive.line) == ("receive", GaiaValue(GaiaType.STRING, "market_data"), 5)
+    assert [action.action_type for action in receive.actions] == [GaiaAction.COMPUTE, GaiaAction.SEND_MESSAGE]
+    assert (alert.event, alert.trigger) == ("alert", None)
+    assert alert.actions[0].parameters["recipient"] == GaiaValue(GaiaType.STRING, "requester")
+
+def test_service_and_grammar_forms():
+    service, cost, constraint, request = parse_script("""
+service Forecast { inputs: ["history", "region"] outputs: ["forecast"] cost: 2.5 GAIA provides: "forecasts" }
+defineCost Forecast costs 3 GAIA
+constraint Fast { riskLevel: "low" timeLimit: 60 }
+requestService Forecast withPayment 3 GAIA
+""", cache=None).statements
+    assert (service.inputs, service.outputs, service.cost) == (("history", "region"), ("forecast",), EconomicValue(2.5))
+    assert service.properties == (AgentProperty("provides", GaiaValue(GaiaType.STRING, "forecasts")),)
+    assert cost == ServiceNode("Forecast", cost=EconomicValue(3), line=3)
+    assert isinstance(constraint, ConstraintNode) and [p.name for p in constraint.properties] == ["riskLevel", "timeLimit"]
+    assert request.action.parameters["payment"].value == EconomicValue(3)
+
+def test_request_block_with_provider_payment_and_constraints():
+    node = parse_script('request service DataAnalysis from Analyst with {\n  data: "latest"\n  payment: 5\n'
+                        '  constraint risk: "low", constraint time_limit: 300\n}\n', cache=None).statements[0]
+    parameters = node.action.parameters
+    assert parameters["provider"] == GaiaValue(GaiaType.AGENT_ID, "Analyst")
+    assert parameters["payment"].value == EconomicValue(5)  # `constraint` on the next line is not a currency
+    assert set(parameters["constraints"].value) == {"risk", "time_limit"}
+
+def test_payment_if_and_dispute():
+    payment, guarded = parse_script("""
+payment: 5 GAIA to Analyst
+if accuracy < 0.8 then {
+    dispute { initiator: "user_1", target: Analyst, reason: "Inaccurate", resolution_method: "DAO Vote" }
+    send "flagged" to dao
+}
+""", cache=None).statements
+    assert payment == PaymentNode(Payment(5, "GAIA", "Analyst"), 2)
+    assert isinstance(guarded, IfNode) and guarded.condition.operator == LogicalOperator.LESS_THAN
+    dispute, notice = guarded.body
+    assert dispute == DisputeNode("user_1", "Analyst", "Inaccurate", DisputeResolutionMethod.DAO_VOTE, 4)
+    assert dispute.dispute().status == "pending"
+    assert isinstance(notice, ActionNode)
+
+@pytest.mark.parametrize("script, line, column, message", [
+    ("agent A {\n  identity: \"x\"\n", 1, 1, "unterminated block"),
+    ("fact: a\n}\n", 2, 1, "unexpected '}'"),
+    ('dispute {\n  initiator: "a"\n  target: "b"\n}\n', 4, 1, "missing reason, resolution_method"),
+    ('dispute { reason: "r" resolution_method: "coin flip" }', 1, 42, "unknown resolution method"),
+    ("service S {\n  cost: cheap\n}", 2, 9, "amount must be a number"),
+])
+def test_block_errors(script, line, column, message):
+    with pytest.raises(DSLSyntaxError) as error:
+        parse_script(script, cache=None)
+    assert (error.value.line, error.value.column) == (line, column)
+    assert message in str(error.value)
+
+# Examples
+
+def test_compute_example():
+    with open(os.path.join(EXAMPLES_DIR, "compute_example.gaia"), "r") as example:
+        agent, service, request = parse_script(example.read(), cache=None).statements
+    assert agent.name == "AnalyticalAgent" and [p.name for p in agent.properties] == ["identity", "type", "specialty"]
+    assert agent.behaviors[0].trigger == GaiaValue(GaiaType.STRING, "market_data")
+    assert (service.name, service.inputs, service.outputs, service.cost) == (
+        "PredictionService", ("historical_data",), ("prediction",), EconomicValue(10))
+    assert service.actions[0].parameters["model"] == GaiaValue(GaiaType.STRING, "PredictionModel")
+    parameters = request.action.parameters
+    assert parameters["service_id"].value == "PredictionService" and parameters["provider"].value == "AnalyticalAgent"
+    assert dict(parameters["constraints"].value) == {"verification": GaiaValue(GaiaType.STRING, "zkML"),
+                                                     "time_limit": GaiaValue(GaiaType.INTEGER, 300)}
+
+def test_economic_example():
+    with open(os.path.join(EXAMPLES_DIR, "economic_example.gaia"), "r") as example:
+        program = parse_script(example.read(), cache=None)
+    assert [type(statement) for statement in program.statements] == [AgentNode, ServiceNode, ActionNode, PaymentNode, IfNode]
+    payment, guarded = program.statements[3:]
+    assert payment.payment == Payment(5, "GAIA", "FinancialAnalyst")
+    [dispute] = guarded.body
+    assert (dispute.initiator, dispute.target, dispute.resolution_method) == (
+        "user_456", "FinancialAnalyst", DisputeResolutionMethod.DAO_VOTE)
@@ -0,0 +1,431 @@
+# gaia-chain/economy/ledger.py
+
+"""
+GAIA Ledger for GaiaChain
+
+This module keeps GAIA balances locally in a double-entry ledger so agents can pay each other
+at memory speed and settle on-chain periodically. Amounts are integer base units (see
+`economic_rules.to_units`); no float ever touches a balance.
+
+Every posting moves an amount from one account to another, so the sum of all balances is always
+zero. Funds entering or leaving the ledger post against the `@chain` account (which therefore goes
+negative by the total deposited). Service agreements are escrowed in per-agreement `@escrow/<id>`
+accounts, and holds reserve part of an account's balance without moving it. Closed escrows are
+dropped from `escrows`; the Escrow returned by the closing call is the final record.
+
+`transfer_many` applies a batch atomically: it validates the net debit of every account in the
+batch against its available balance (balance minus holds), then applies one balance update per
+account and appends the batch to the journal as a single entry. Transfers within a batch are
+netted, so A -> B -> C in one batch only needs A's funds.
+
+Settlement nets everything since the previous settlement into one position per account (escrow
+accounts are pooled under `@escrow`, the settlement contract's escrow balance) and `NettingSettler`
+submits it as one transaction. Only accounts touched since the last settlement are visited, and
+the journal is cleared once a settlement is prepared, so settlement cost and memory follow the
+activity in an interval rather than the number of accounts. A reverted settlement is rolled back
+into the next one.
+"""
+
+import json
+import threading
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from gaia_chain.dsl.rules.economic_rules import ServiceAgreement, to_units
+from gaia_chain.tooling.monitoring.structured_log import get_logger
+from gaia_chain.tooling.rpc.json_rpc_client import JsonRpcClient, JsonRpcError
+
+# Logger setup
+logger = get_logger(__name__)
+
+CHAIN_ACCOUNT = "@chain"
+ESCROW_POOL = "@escrow"
+ESCROW_PREFIX = "@escrow/"
+
+Transfer = Tuple[str, str, int]  # (from account, to account, base units)
+
+class InsufficientFunds(ValueError):
+    """Raised when a batch would overdraw an account's available balance."""
+    def __init__(self, account: str, available: int, required: int):
+        super().__init__(f"Account {account} has {available} units available, {required} required.")
+        self.account = account
+        self.available = available
+        self.required = required
+
+@dataclass
+class Escrow:
+    """Funds locked for one service agreement until released to the payee or refunded."""
+    agreement_id: str
+    payer: str
+    payee: str
+    amount: int
+    released: int = 0
+    status: str = 'open'  # open, released, refunded
+
+    @property
+    def account(self) -> str:
+        return f"{ESCROW_PREFIX}{self.agreement_id}"
+
+    @property
+    def remaining(self) -> int:
+        return self.amount - self.released if self.status == 'open' else 0
+
+@dataclass(frozen=True)
+class Settlement:
+    """Net balance changes since the previous settlement."""
+    sequence: int
+    deltas: Dict[str, int]  # Per ledger account (escrow accounts separately)
+    entries: int  # Journal entries (batches) covered
+    transfers: int
+
+    @property
+    def positions(self) -> List[Tuple[str, int]]:
+        """(account, delta) pairs for on-chain settlement, escrow accounts pooled; sums to zero."""
+        pooled: Dict[str, int] = {}
+        for account, delta in self.deltas.items():
+            if account.startswith(ESCROW_PREFIX):
+                account = ESCROW_POOL
+            pooled[account] = pooled.get(account, 0) + delta
+        return sorted((account, delta) for account, delta in pooled.items() if delta)
+
+# Ledger
+
+class Ledger:
+    """In-memory double-entry GAIA ledger with holds, escrow and netted settlement."""
+    def __init__(self):
+        self.balances: Dict[str, int] = {}
+        self.held: Dict[str, int] = {}
+        self.holds: Dict[str, Tuple[str, int]] = {}
+        self.escrows: Dict[str, Escrow] = {}
+        self.journal: List[Tuple[int, str, Tuple[Transfer, ...]]] = []  # (sequence, memo, transfers)
+        self.sequence = 0
+        self.transfer_count = 0
+        self.unsettled_transfers = 0
+        self.settled: Dict[str, int] = {}  # Balances as of the last settlement (touched accounts only)
+        self.dirty: Set[str] = set()
+        self.settlements = 0
+        self.lock = threading.RLock()
+
+    # Balances
+
+    def balance(self, account: str) -> int:
+        return self.balances.get(account, 0)
+
+    def available(self, account: str) -> int:
+        return self.balances.get(account, 0) - self.held.get(account, 0)
+
+    def total(self) -> int:
+        """Sum of all balances; always zero for a consistent ledger."""
+        return sum(self.balances.values())
+
+    # Transfers
+
+    def transfer(self, source: str, destination: str, amount: int, memo: str = "") -> int:
+        """Move `amount` base units; returns the journal sequence number."""
+        return self.transfer_many(((source, destination, amount),), memo)
+
+    def transfer_many(self, transfers: Iterable[Transfer], memo: str = "") -> int:
+        """Apply a batch of (source, destination, units) transfers atomically.
+
+        Raises ValueError for a non-positive or non-integer amount and InsufficientFunds if the
+        batch's net debit of any account exceeds its available balance; nothing is applied then.
+        """
+        transfers = tuple(transfers)
+        with self.lock:
+            return self._apply(transfers, memo)
+
+    def _apply(self, transfers: Tuple[Transfer, ...], memo: str) -> int:
+        net: Dict[str, int] = {}
+        get = net.get
+        for source, destination, amount in transfers:
+            if amount.__class__ is not int or amount <= 0:
+                raise ValueError(f"Transfer amounts must be positive integer base units, got {amount!r}.")
+            if source == destination:
+                raise ValueError(f"Transfer from {source} to itself.")
+            net[source] = get(source, 0) - amount
+            net[destination] = get(destination, 0) + amount
+        balances = self.balances
+        held = self.held
+        for account, change in net.items():
+            if change < 0 and account != CHAIN_ACCOUNT:
+                available = balances.get(account, 0) - held.get(account, 0)
+                if available + change < 0:
+                    raise InsufficientFunds(account, available, -change)
+        for account, change in net.items():
+            balances[account] = balances.get(account, 0) + change
+        self.dirty.update(net)
+        self.sequence += 1
+        self.transfer_count += len(transfers)
+        self.unsettled_transfers += len(transfers)
+        self.journal.append((self.sequence, memo, transfers))
+        return self.sequence
+
+    def deposit(self, account: str, amount: int, memo: str = "deposit") -> int:
+        """Credit funds that arrived on-chain (excluded from settlement: they are already there)."""
+        with self.lock:
+            sequence = self._apply(((CHAIN_ACCOUNT, account, amount),), memo)
+            self._mark_settled(account, amount)
+            return sequence
+
+    def withdraw(self, account: str, amount: int, memo: str = "withdrawal") -> int:
+        """Debit funds paid out on-chain by a separate withdrawal."""
+        with self.lock:
+            sequence = self._apply(((account, CHAIN_ACCOUNT, amount),), memo)
+            self._mark_settled(account, -amount)
+            return sequence
+
+    def _mark_settled(self, account: str, change: int):
+        # Shift the account's settled baseline so the on-chain movement is not netted again
+        self.settled[account] = self.settled.get(account, 0) + change
+
+    # Holds
+
+    def hold(self, account: str, amount: int, hold_id: str) -> str:
+        """Reserve `amount` of the account's available balance under `hold_id`."""
+        if amount.__class__ is not int or amount <= 0:
+            raise ValueError(f"Hold amounts must be positive integer base units, got {amount!r}.")
+        with self.lock:
+            if hold_id in self.holds:
+                raise ValueError(f"Hold {hold_id} already exists.")
+            available = self.available(account)
+            if available < amount:
+                raise InsufficientFunds(account, available, amount)
+            self.held[account] = self.held.get(account, 0) + amount
+            self.holds[hold_id] = (account, amount)
+            return hold_id
+
+    def release_hold(self, hold_id: str) -> int:
+        """Drop a hold (raises KeyError if unknown); returns the amount it reserved."""
+        with self.lock:
+            account, amount = self.holds.pop(hold_id)
+            remaining = self.held[account] - amount
+            if remaining:
+                self.held[account] = remaining
+            else:
+                del self.held[account]
+            return amount
+
+    def capture_hold(self, hold_id: str, destination: str, amount: Optional[int] = None, memo: str = "") -> int:
+        """Pay `amount` (default: all) of a held sum to `destination` and drop the hold."""
+        with self.lock:
+            account, held = self.holds[hold_id]
+            amount = held if amount is None else amount
+            if amount > held:
+                raise ValueError(f"Capture of {amount} exceeds hold {hold_id} of {held}.")
+            self.release_hold(hold_id)
+            try:
+                return self._apply(((account, destination, amount),), memo or f"capture {hold_id}")
+            except Exception:
+                self.hold(account, held, hold_id)
+                raise
+
+    # Escrow
+
+    def open_escrow(self, agreement_id: str, payer: str, payee: str, amount: int) -> Escrow:
+        """Move `amount` from the payer into the agreement's escrow account."""
+        with self.lock:
+            if agreement_id in self.escrows:
+                raise ValueError(f"Escrow for agreement {agreement_id} already exists.")
+            escrow = Escrow(agreement_id, payer, payee, amount)
+            self._apply(((payer, escrow.account, amount),), f"escrow {agreement_id}")
+            self.escrows[agreement_id] = escrow
+            return escrow
+
+    def escrow_agreement(self, agreement_id: str, agreement: ServiceAgreement, payer: str) -> Escrow:
+        """Escrow a ServiceAgreement's cost from `payer` for its payment recipient."""
+        agreement.cost.validate()
+        return self.open_escrow(agreement_id, payer, agreement.cost.recipient, agreement.cost.units)
+
+    def release_escrow(self, agreement_id: str, amount: Optional[int] = None) -> Escrow:
+        """Pay `amount` (default: everything remaining) from escrow to the payee."""
+        with self.lock:
+            escrow = self._open_escrow(agreement_id)
+            amount = escrow.remaining if amount is None else amount
+            if amount > escrow.remaining:
+                raise ValueError(f"Release of {amount} exceeds escrow {agreement_id} balance of {escrow.remaining}.")
+            self._apply(((escrow.account, escrow.payee, amount),), f"release {agreement_id}")
+            escrow.released += amount
+            if escrow.released == escrow.amount:
+                escrow.status = 'released'
+                del self.escrows[agreement_id]
+            return escrow
+
+    def refund_escrow(self, agreement_id: str) -> Escrow:
+        """Return whatever remains in escrow to the payer and close it."""
+        with self.lock:
+            escrow = self._open_escrow(agreement_id)
+            if escrow.remaining:
+                self._apply(((escrow.account, escrow.payer, escrow.remaining),), f"refund {agreement_id}")
+            escrow.status = 'refunded'
+            del self.escrows[agreement_id]
+            return escrow
+
+    def _open_escrow(self, agreement_id: str) -> Escrow:
+        escrow = self.escrows.get(agreement_id)
+        if escrow is None:
+            raise KeyError(f"No open escrow for agreement {agreement_id}.")
+        return escrow
+
+    # Settlement
+
+    def prepare_settlement(self) -> Optional[Settlement]:
+        """Net all postings since the last settlement; None when nothing changed.
+
+        The journal is cleared and the returned deltas are considered settled; call
+        `abort_settlement` if submitting them fails.
+        """
+        with self.lock:
+            balances = self.balances
+            settled = self.settled
+            deltas = {}
+            for account in self.dirty:
+                if account == CHAIN_ACCOUNT:
+                    continue
+                balance = balances.get(account, 0)
+                delta = balance - settled.get(account, 0)
+                if delta:
+                    deltas[account] = delta
+                if balance:
+                    settled[account] = balance
+                else:
+                    # Emptied accounts (e.g. closed escrows) are forgotten once settled
+                    balances.pop(account, None)
+                    settled.pop(account, None)
+            self.dirty = set()
+            entries, transfers = len(self.journal), self.unsettled_transfers
+            self.journal = []
+            self.unsettled_transfers = 0
+            if not deltas:
+                return None  # Only deposits/withdrawals, or transfers that cancelled out
+            self.settlements += 1
+            return Settlement(self.settlements, deltas, entries, transfers)
+
+    def abort_settlement(self, settlement: Settlement):
+        """Put a settlement's deltas back so the next settlement includes them."""
+        with self.lock:
+            for account, delta in settlement.deltas.items():
+                self.settled[account] = self.settled.get(account, 0) - delta
+                self.dirty.add(account)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self.lock:
+            return {
+                "accounts": len(self.balances),
+                "transfers": self.transfer_count,
+                "journal_entries": len(self.journal),
+                "open_escrows": len(self.escrows),
+                "holds": len(self.holds),
+                "settlements": self.settlements,
+            }
+
+# On-chain Settlement
+
+SettlementEncoder = Callable[[Sequence[Tuple[str, int]]], str]
+
+def contract_settlement_encoder(contract, fn_name: str = "settle") -> SettlementEncoder:
+    """Encode positions as ABI calldata for a web3 contract's `settle(address[], int256[])`."""
+    def encode(positions: Sequence[Tuple[str, int]]) -> str:
+        return contract.encode_abi(abi_element_identifier=fn_name, args=[[account for account, _ in positions], [delta for _, delta in positions]])
+    return encode
+
+def json_settlement_encoder(positions: Sequence[Tuple[str, int]]) -> str:
+    """Encode positions as hex-encoded JSON calldata (amounts as strings to stay exact)."""
+    payload = json.dumps([[account, str(delta)] for account, delta in positions], separators=(",", ":"))
+    return "0x" + payload.encode("utf-8").hex()
+
+class NettingSettler:
+    """Periodically submits a ledger's net positions in one transaction per interval."""
+    def __init__(self, ledger: Ledger, client: JsonRpcClient, contract_address: str, escrow_address: str,
+                 encode: SettlementEncoder = json_settlement_encoder, sender: Optional[str] = None, interval: float = 5.0):
+        self.ledger = ledger
+        self.client = client
+        self.contract_address = contract_address
+        self.escrow_address = escrow_address
+        self.encode = encode
+        self.sender = sender
+        self.interval = interval
+        self.pending: Dict[str, Settlement] = {}  # Transaction hash -> settlement awaiting its receipt
+        self.stop_event = threading.Event()
+        self.thread: Optional[threading.Thread] = None
+
+    def settle_once(self) -> Optional[str]:
+        """Check pending receipts, then submit the current net positions; returns the tx hash."""
+        self.poll_receipts()
+        settlement = self.ledger.prepare_settlement()
+        if settlement is None:
+            return None
+        positions = [(self.escrow_address if account == ESCROW_POOL else account, delta) for account, delta in settlement.positions]
+        if not positions:
+            return None
+        tx = {"to": self.contract_address, "data": self.encode(positions)}
+        if self.sender:
+            tx["from"] = self.sender
+        try:
+            tx_hash = self.client.call("eth_sendTransaction", [tx])
+        except Exception:
+            self.ledger.abort_settlement(settlement)
+            raise
+        self.pending[tx_hash] = settlement
+        logger.info("Submitted settlement", sequence=settlement.sequence, positions=len(positions),
+                    transfers=settlement.transfers, tx_hash=tx_hash)
+        return tx_hash
+
+    def poll_receipts(self):
+        """Roll back settlements whose transactions reverted; forget confirmed ones."""
+        if not self.pending:
+            return
+        hashes = list(self.pending)
+        receipts = self.client.batch([("eth_getTransactionReceipt", [tx_hash]) for tx_hash in hashes])
+        for tx_hash, receipt in zip(hashes, receipts):
+            if receipt is None or isinstance(receipt, JsonRpcError):
+                continue
+            settlement = self.pending.pop(tx_hash)
+            if receipt.get("status") != "0x1":
+                logger.warning("Settlement reverted; it will be resubmitted", sequence=settlement.sequence, tx_hash=tx_hash)
+                self.ledger.abort_settlement(settlement)
+
+    def start(self):
+        if self.thread is not None:
+            return
+        self.stop_event.clear()
+        self.thread = threading.Thread(target=self._run, name="ledger-settler", daemon=True)
+        self.thread.start()
+
+    def stop(self, final: bool = True):
+        """Stop the settlement thread, submitting a last settlement when `final`."""
+        self.stop_event.set()
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+        if final:
+            self.settle_once()
+
+    def _run(self):
+        while not self.stop_event.wait(self.interval):
+            try:
+                self.settle_once()
+            except (JsonRpcError, OSError) as e:
+                logger.warning("Settlement failed", error=repr(e))
+
+# Example usage (for illustration purposes, not part of the module)
+if __name__ == "__main__":
+    from gaia_chain.dsl.rules.economic_rules import Payment, from_units
+    from gaia_chain.testing.rpc.local_node import LocalJsonRpcNode
+
+    ledger = Ledger()
+    ledger.deposit("agent_a", to_units(100))
+    ledger.deposit("agent_b", to_units(50))
+    ledger.transfer_many([("agent_a", "agent_b", to_units("0.05"))] * 1000 + [("agent_b", "agent_c", to_units(10))])
+    agreement = ServiceAgreement("DataAnalysis", {"data": "market_data"}, {"report": "analysis_report"},
+                                 Payment(amount=12, recipient="agent_c"))
+    ledger.escrow_agreement("agreement_001", agreement, "agent_b")
+    ledger.release_escrow("agreement_001", to_units(4))
+    print({account: str(from_units(ledger.balance(account))) for account in ("agent_a", "agent_b", "agent_c")}, ledger.total())
+
+    node = LocalJsonRpcNode()
+    settler = NettingSettler(ledger, JsonRpcClient(node), "0x00000000000000000000000000000000000000cc",
+                             escrow_address="0x00000000000000000000000000000000000000ee")
+    print(settler.settle_once(), ledger.snapshot())
+    node.mine()
+    settler.poll_receipts()
+    print(settler.pending, ledger.prepare_settlement())
@@ -0,0 +1,403 @@
+# gaia-chain/economy/sla_monitor.py
+
+"""
+SLA Monitor for GaiaChain
+
+This module enforces the `sla` terms of open service agreements and opens a `Dispute` when one is
+breached. Recognized SLA keys:
+
+- `deadline_s` (or `time_limit`): seconds from the start of the agreement to `complete()`
+- `latency_ms`: maximum latency of any single request
+- `availability`: minimum fraction of successful requests per `availability_window_s` (default 60)
+- `conditions`: DSL `Condition`s over the bindings `latency_ms`, `availability`, `requests`,
+  `failures` and `elapsed_s`; the agreement is breached when any of them holds
+- `dispute_resolution`: a `DisputeResolutionMethod` (or its value) overriding the default per breach
+
+Each term becomes a breach `Condition` compiled with `core_rules.compile_condition`, and the parsed
+terms are shared by every agreement with the same SLA, so per-agreement state is a small slotted
+record. Deadlines and availability windows live in a hierarchical timer wheel: scheduling and
+cancelling are O(1) dict operations, and `tick()` only touches timers that are due (plus an
+occasional cascade of a coarser slot), so CPU and memory per agreement stay constant however many
+agreements are open. A breached agreement gets one dispute and stops being monitored.
+"""
+
+import time
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any, Callable, Dict, Hashable, List, Mapping, Optional, Tuple
+
+from gaia_chain.dsl.rules.core_rules import Condition, GaiaType, GaiaValue, LogicalOperator, compile_condition
+from gaia_chain.dsl.rules.economic_rules import Dispute, DisputeResolutionMethod, ServiceAgreement
+from gaia_chain.tooling.monitoring import telemetry
+from gaia_chain.tooling.monitoring.structured_log import get_logger
+
+# Logger setup
+logger = get_logger(__name__)
+
+SLA_BREACHES = telemetry.counter("gaia_sla_breaches_total", "SLA breaches that opened a dispute, by term.", ("term",))
+
+# Default resolution per breached term: missed deadlines and custom conditions are objective and
+# go to arbitration; performance shortfalls are mediated first
+BREACH_RESOLUTION = {
+    "deadline": DisputeResolutionMethod.ARBITRATION,
+    "latency": DisputeResolutionMethod.MEDIATION,
+    "availability": DisputeResolutionMethod.MEDIATION,
+    "condition": DisputeResolutionMethod.ARBITRATION,
+}
+
+# Timer Wheel
+
+class TimerWheel:
+    """Hierarchical timing wheel keyed by hashable timer keys.
+
+    Level 0 has one slot per tick; each higher level's slot spans a full turn of the level below.
+    Timers further out than the top level's range are parked in its last slot and re-placed when
+    that slot cascades.
+    """
+    def __init__(self, tick: float = 1.0, slot_bits: int = 8, levels: int = 4, start: float = 0.0):
+        if tick <= 0:
+            raise ValueError("Timer wheel tick must be positive.")
+        self.tick = tick
+        self.bits = slot_bits
+        self.mask = (1 << slot_bits) - 1
+        self.levels = levels
+        self.start = start
+        self.current = 0  # Last processed tick
+        self.buckets: List[List[Dict[Hashable, int]]] = [[{} for _ in range(1 << slot_bits)] for _ in range(levels)]
+        self.locations: Dict[Hashable, Tuple[int, int]] = {}  # key -> (level, slot)
+
+    def __len__(self) -> int:
+        return len(self.locations)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self.locations
+
+    def _tick_of(self, when: float) -> int:
+        ticks = (when - self.start) / self.tick
+        whole = int(ticks)
+        return whole if whole == ticks else whole + 1  # Never fire early
+
+    def schedule(self, key: Hashable, when: float):
+        """Fire `key` at the first tick at or after time `when` (replacing any existing timer)."""
+        if key in self.locations:
+            self.cancel(key)
+        self._place(key, max(self._tick_of(when), self.current + 1))
+
+    def _place(self, key: Hashable, expires: int):
+        delta = expires - self.current
+        for level in range(self.levels):
+            if delta < 1 << (self.bits * (level + 1)):
+                slot = (expires >> (self.bits * level)) & self.mask
+                break
+        else:
+            level = self.levels - 1
+            # Park in the top-level slot that cascades last; it is re-placed from there
+            slot = ((self.current >> (self.bits * level)) - 1) & self.mask
+        self.buckets[level][slot][key] = expires
+        self.locations[key] = (level, slot)
+
+    def cancel(self, key: Hashable) -> bool:
+        location = self.locations.pop(key, None)
+        if location is None:
+            return False
+        level, slot = location
+        del self.buckets[level][slot][key]
+        return True
+
+    def advance(self, now: float) -> List[Hashable]:
+        """Process every tick up to time `now`; return the keys that expired, in order."""
+        target = int((now - self.start) / self.tick)
+        expired: List[Hashable] = []
+        if not self.locations:
+            self.current = max(self.current, target)
+            return expired
+        while self.current < target:
+            self.current += 1
+            tick = self.current
+            for level in range(self.levels - 1, 0, -1):
+                if tick & ((1 << (self.bits * level)) - 1) == 0:
+                    self._cascade(level, (tick >> (self.bits * level)) & self.mask)
+            bucket = self.buckets[0][tick & self.mask]
+            if bucket:
+                self.buckets[0][tick & self.mask] = {}
+                for key in bucket:
+                    del self.locations[key]
+                expired.extend(bucket)
+            if not self.locations:
+                self.current = target
+                break
+        return expired
+
+    def _cascade(self, level: int, slot: int):
+        bucket = self.buckets[level][slot]
+        if not bucket:
+            return
+        self.buckets[level][slot] = {}
+        for key, expires in bucket.items():
+            self._place(key, max(expires, self.current))
+
+# SLA Terms
+
+Breach = Callable[[Mapping[str, Any]], Any]  # Compiled Condition: bindings -> truthy on breach
+
+@dataclass(frozen=True)
+class SLATerms:
+    """Parsed SLA of an agreement; instances are shared between agreements with equal SLAs."""
+    deadline_s: Optional[float] = None
+    latency_ms: Optional[float] = None
+    availability: Optional[float] = None
+    availability_window_s: float = 60.0
+    conditions: Tuple[Condition, ...] = ()
+    resolution: Optional[DisputeResolutionMethod] = None
+    # Compiled breach predicates, built once per distinct SLA
+    latency_breach: Optional[Breach] = field(init=False, default=None, repr=False, compare=False)
+    availability_breach: Optional[Breach] = field(init=False, default=None, repr=False, compare=False)
+    condition_breaches: Tuple[Breach, ...] = field(init=False, default=(), repr=False, compare=False)
+
+    def __post_init__(self):
+        object.__setattr__(self, "latency_breach", _compiled_breach("latency_ms", LogicalOperator.GREATER_THAN, self.latency_ms))
+        object.__setattr__(self, "availability_breach", _compiled_breach("availability", LogicalOperator.LESS_THAN, self.availability))
+        object.__setattr__(self, "condition_breaches", tuple(compile_condition(condition) for condition in self.conditions))
+
+    def resolution_for(self, term: str) -> DisputeResolutionMethod:
+        return self.resolution or BREACH_RESOLUTION[term]
+
+def _compiled_breach(variable: str, op: LogicalOperator, threshold) -> Optional[Breach]:
+    if threshold is None:
+        return None
+    return compile_condition(Condition(GaiaValue(GaiaType.VARIABLE, variable), op, GaiaValue(GaiaType.FLOAT, threshold)))
+
+def parse_sla(sla: Optional[Mapping[str, Any]]) -> SLATerms:
+    """Validate an agreement's `sla` dict and return the (shared) parsed terms."""
+    if not sla:
+        return _EMPTY_TERMS
+    items = []
+    for key, value in sla.items():
+        if isinstance(value, list):
+            value = tuple(value)
+        items.append((key, value))
+    try:
+        return _parse_items(tuple(sorted(items, key=lambda item: item[0])))
+    except TypeError:
+        raise ValueError(f"SLA values must be numbers, strings or Conditions: {sla!r}")
+
+@lru_cache(maxsize=4096)
+def _parse_items(items: Tuple[Tuple[str, Any], ...]) -> SLATerms:
+    sla = dict(items)
+    deadline = sla.get("deadline_s", sla.get("time_limit"))
+    resolution = sla.get("dispute_resolution")
+    conditions = sla.get("conditions", ())
+    if isinstance(conditions, Condition):
+        conditions = (conditions,)
+    for name, value in (("deadline_s", deadline), ("latency_ms", sla.get("latency_ms")),
+                        ("availability_window_s", sla.get("availability_window_s", 60.0))):
+        if value is not None and (not isinstance(value, (int, float)) or isinstance(value, bool) or value <= 0):
+            raise ValueError(f"SLA {name} must be a positive number, got {value!r}.")
+    availability = sla.get("availability")
+    if availability is not None and not (isinstance(availability, (int, float)) and 0 < availability <= 1):
+        raise ValueError(f"SLA availability must be a fraction in (0, 1], got {availability!r}.")
+    if not all(isinstance(condition, Condition) for condition in conditions):
+        raise ValueError("SLA conditions must be DSL Condition objects.")
+    return SLATerms(
+        deadline_s=deadline,
+        latency_ms=sla.get("latency_ms"),
+        availability=availability,
+        availability_window_s=sla.get("availability_window_s", 60.0),
+        conditions=tuple(conditions),
+        resolution=DisputeResolutionMethod(resolution) if resolution is not None else None,
+    )
+
+_EMPTY_TERMS = SLATerms()
+
+# Monitor
+
+class _Tracked:
+    """Monitoring state of one open agreement."""
+    __slots__ = ("agreement_id", "consumer", "provider", "terms", "started_at", "deadline_at",
+                 "window_end", "requests", "failures", "last_latency_ms")
+
+    def __init__(self, agreement_id: str, consumer: str, provider: str, terms: SLATerms, started_at: float):
+        self.agreement_id = agreement_id
+        self.consumer = consumer
+        self.provider = provider
+        self.terms = terms
+        self.started_at = started_at
+        self.deadline_at = started_at + terms.deadline_s if terms.deadline_s else None
+        self.window_end = started_at + terms.availability_window_s if terms.availability is not None or terms.conditions else None
+        self.requests = 0
+        self.failures = 0
+        self.last_latency_ms = 0.0
+
+    def next_due(self) -> Optional[float]:
+        due = [when for when in (self.deadline_at, self.window_end) if when is not None]
+        return min(due) if due else None
+
+    def bindings(self, now: float) -> Dict[str, Any]:
+        return {
+            "latency_ms": self.last_latency_ms,
+            "availability": 1.0 - self.failures / self.requests if self.requests else 1.0,
+            "requests": self.requests,
+            "failures": self.failures,
+            "elapsed_s": now - self.started_at,
+        }
+
+class SLAMonitor:
+    """Tracks open agreements' SLA terms and opens disputes on breach.
+
+    `on_dispute` is called with each new Dispute (e.g. to submit it on-chain). With a `ledger`, the
+    agreement's escrow (see economy/ledger.py) is released to the provider on a clean `complete()`
+    and left in place for the dispute otherwise.
+    """
+    def __init__(self, on_dispute: Optional[Callable[[Dispute], None]] = None, ledger=None,
+                 tick: float = 1.0, clock: Callable[[], float] = time.time):
+        self.on_dispute = on_dispute
+        self.ledger = ledger
+        self.clock = clock
+        self.wheel = TimerWheel(tick=tick, start=clock())
+        self.agreements: Dict[str, _Tracked] = {}
+        self.stats = {"opened": 0, "completed": 0, "breached": 0}
+
+    def __len__(self) -> int:
+        return len(self.agreements)
+
+    def open(self, agreement_id: str, agreement: ServiceAgreement, consumer: str,
+             provider: Optional[str] = None, started_at: Optional[float] = None) -> SLATerms:
+        """Start monitoring an agreement; raises ValueError for an invalid SLA."""
+        if agreement_id in self.agreements:
+            raise ValueError(f"Agreement {agreement_id} is already monitored.")
+        terms = parse_sla(agreement.sla)
+        tracked = _Tracked(agreement_id, consumer, provider or agreement.cost.recipient, terms,
+                           self.clock() if started_at is None else started_at)
+        self.agreements[agreement_id] = tracked
+        due = tracked.next_due()
+        if due is not None:
+            self.wheel.schedule(agreement_id, due)
+        self.stats["opened"] += 1
+        return terms
+
+    def record_request(self, agreement_id: str, latency_ms: float, ok: bool = True) -> Optional[Dispute]:
+        """Account one request served under the agreement; returns a Dispute if it breached the SLA."""
+        tracked = self.agreements.get(agreement_id)
+        if tracked is None:
+            return None
+        tracked.requests += 1
+        if not ok:
+            tracked.failures += 1
+        tracked.last_latency_ms = latency_ms
+        terms = tracked.terms
+        latency_breach = terms.latency_breach
+        if latency_breach is not None and latency_breach({"latency_ms": latency_ms}):
+            return self._breach(tracked, "latency", f"request latency {latency_ms} ms exceeds {terms.latency_ms} ms")
+        if terms.conditions:
+            return self._check_conditions(tracked, self.clock())
+        return None
+
+    def complete(self, agreement_id: str) -> Optional[Dispute]:
+        """Mark the agreement fulfilled: final availability check, then stop monitoring."""
+        tracked = self.agreements.get(agreement_id)
+        if tracked is None:
+            return None
+        now = self.clock()
+        if tracked.deadline_at is not None and now > tracked.deadline_at:
+            return self._breach(tracked, "deadline", f"completed {now - tracked.deadline_at:.1f} s after the deadline")
+        dispute = self._check_window(tracked, now)
+        if dispute is not None:
+            return dispute
+        self._forget(tracked)
+        self.stats["completed"] += 1
+        if self.ledger is not None and agreement_id in self.ledger.escrows:
+            self.ledger.release_escrow(agreement_id)
+        return None
+
+    def cancel(self, agreement_id: str) -> bool:
+        """Stop monitoring without judging the agreement."""
+        tracked = self.agreements.get(agreement_id)
+        if tracked is None:
+            return False
+        self._forget(tracked)
+        return True
+
+    def tick(self, now: Optional[float] = None) -> List[Dispute]:
+        """Process due deadlines and availability windows; returns disputes opened."""
+        now = self.clock() if now is None else now
+        disputes = []
+        for agreement_id in self.wheel.advance(now):
+            tracked = self.agreements.get(agreement_id)
+            if tracked is None:
+                continue
+            if tracked.deadline_at is not None and now >= tracked.deadline_at:
+                disputes.append(self._breach(tracked, "deadline", f"not completed within {tracked.terms.deadline_s} s"))
+                continue
+            if tracked.window_end is not None and now >= tracked.window_end:
+                dispute = self._check_window(tracked, now)
+                if dispute is not None:
+                    disputes.append(dispute)
+                    continue
+                tracked.window_end = now + tracked.terms.availability_window_s
+                tracked.requests = tracked.failures = 0
+            due = tracked.next_due()
+            if due is not None:
+                self.wheel.schedule(agreement_id, due)
+        return disputes
+
+    def _check_window(self, tracked: _Tracked, now: float) -> Optional[Dispute]:
+        terms = tracked.terms
+        availability_breach = terms.availability_breach
+        if availability_breach is not None and tracked.requests:
+            bindings = tracked.bindings(now)
+            if availability_breach(bindings):
+                return self._breach(tracked, "availability", f"availability {bindings['availability']:.4f} below "
+                                                              f"{terms.availability} over {tracked.requests} requests")
+        if terms.conditions:
+            return self._check_conditions(tracked, now)
+        return None
+
+    def _check_conditions(self, tracked: _Tracked, now: float) -> Optional[Dispute]:
+        bindings = tracked.bindings(now)
+        for condition, breach in zip(tracked.terms.conditions, tracked.terms.condition_breaches):
+            try:
+                breached = breach(bindings)
+            except KeyError as e:
+                raise ValueError(f"SLA condition refers to unknown variable {e}.") from None
+            if breached:
+                return self._breach(tracked, "condition", f"SLA condition met: {condition}")
+        return None
+
+    def _breach(self, tracked: _Tracked, term: str, detail: str) -> Dispute:
+        self._forget(tracked)
+        self.stats["breached"] += 1
+        SLA_BREACHES.labels(term).inc()
+        dispute = Dispute(
+            initiator=tracked.consumer,
+            target=tracked.provider,
+            reason=f"SLA breach ({term}) on agreement {tracked.agreement_id}: {detail}",
+            resolution_method=tracked.terms.resolution_for(term),
+        )
+        logger.info("SLA breached; dispute opened", agreement=tracked.agreement_id, term=term,
+                    resolution=dispute.resolution_method.value, detail=detail)
+        if self.on_dispute is not None:
+            self.on_dispute(dispute)
+        return dispute
+
+    def _forget(self, tracked: _Tracked):
+        del self.agreements[tracked.agreement_id]
+        self.wheel.cancel(tracked.agreement_id)
+
+# Example usage (for illustration purposes, not part of the module)
+if __name__ == "__main__":
+    from gaia_chain.dsl.rules.economic_rules import Payment
+
+    now = [0.0]
+    monitor = SLAMonitor(clock=lambda: now[0])
+    payment = Payment(amount=10, recipient="provider_001")
+    for i in range(100000):
+        sla = {"deadline_s": 30 + i % 3 * 30, "latency_ms": 500, "availability": 0.99}
+        monitor.open(f"agreement_{i}", ServiceAgreement("DataAnalysis", {"data": "x"}, {"report": "y"}, payment, sla=sla), f"consumer_{i}")
+    print(monitor.record_request("agreement_1", latency_ms=750))
+    for i in range(2, 50000):
+        monitor.complete(f"agreement_{i}")
+    start = time.perf_counter()
+    now[0] = 45.0
+    disputes = monitor.tick()
+    print(f"{len(disputes)} deadline disputes in {(time.perf_counter() - start) * 1000:.1f} ms; {len(monitor)} still open")
+    print(disputes[0], monitor.stats)
@@ -0,0 +1,141 @@
+# gaia-chain/economy/tests/test_ledger.py
+
+"""
+Tests for the double-entry GAIA ledger, escrow and netted settlement (economy/ledger.py).
+"""
+
+import pytest
+
+from gaia_chain.economy.ledger import (
+    CHAIN_ACCOUNT, ESCROW_POOL, InsufficientFunds, Ledger, NettingSettler, json_settlement_encoder
+)
+from gaia_chain.testing.rpc.local_node import LocalJsonRpcNode
+from gaia_chain.tooling.rpc.json_rpc_client import JsonRpcClient, JsonRpcError
+
+CONTRACT = "0x00000000000000000000000000000000000000cc"
+ESCROW = "0x00000000000000000000000000000000000000ee"
+
+@pytest.fixture
+def ledger():
+    ledger = Ledger()
+    ledger.deposit("a", 100)
+    ledger.deposit("b", 50)
+    return ledger
+
+def balances(ledger, *accounts):
+    return [ledger.balance(account) for account in accounts]
+
+# Atomic Batches
+
+def test_failed_batch_changes_nothing(ledger):
+    sequence, journal = ledger.sequence, list(ledger.journal)
+    with pytest.raises(InsufficientFunds) as error:
+        ledger.transfer_many([("a", "c", 60), ("b", "c", 40), ("a", "d", 41)])
+    assert (error.value.account, error.value.available, error.value.required) == ("a", 100, 101)
+    assert balances(ledger, "a", "b", "c", "d") == [100, 50, 0, 0]
+    assert (ledger.sequence, ledger.journal) == (sequence, journal)
+    assert ledger.transfer_count == 2
+
+@pytest.mark.parametrize("amount", [0, -5, 1.5, True])
+def test_invalid_amount_rejects_the_batch(ledger, amount):
+    with pytest.raises(ValueError, match="positive integer base units"):
+        ledger.transfer_many([("a", "b", 10), ("a", "c", amount)])
+    assert balances(ledger, "a", "b", "c") == [100, 50, 0]
+
+def test_transfers_within_a_batch_are_netted(ledger):
+    # c and d hold nothing beforehand: only a's net debit is checked
+    ledger.transfer_many([("d", "e", 30), ("c", "d", 30), ("a", "c", 30)])
+    assert balances(ledger, "a", "c", "d", "e") == [70, 0, 0, 30]
+    assert ledger.journal[-1][2] == (("d", "e", 30), ("c", "d", 30), ("a", "c", 30))
+    assert ledger.total() == 0
+
+def test_holds_reduce_the_available_balance(ledger):
+    ledger.hold("a", 80, "order-1")
+    with pytest.raises(InsufficientFunds):
+        ledger.transfer("a", "b", 21)
+    ledger.capture_hold("order-1", "c", 60)
+    assert balances(ledger, "a", "c") == [40, 60]
+    assert ledger.available("a") == 40 and not ledger.holds
+
+# Escrow
+
+def test_escrow_release_and_refund(ledger):
+    escrow = ledger.open_escrow("agreement-1", "a", "c", 40)
+    assert ledger.available("a") == 60 and ledger.balance(escrow.account) == 40
+    ledger.release_escrow("agreement-1", 15)
+    with pytest.raises(ValueError, match="exceeds escrow"):
+        ledger.release_escrow("agreement-1", 30)
+    refunded = ledger.refund_escrow("agreement-1")
+    assert (refunded.status, refunded.released) == ("refunded", 15)
+    assert balances(ledger, "a", "c", escrow.account) == [85, 15, 0]
+    assert "agreement-1" not in ledger.escrows
+    with pytest.raises(KeyError):
+        ledger.release_escrow("agreement-1")
+
+# Settlement
+
+def test_settlement_nets_positions_and_pools_escrow(ledger):
+    ledger.transfer_many([("a", "b", 1)] * 30 + [("b", "c", 10)])
+    ledger.open_escrow("agreement-1", "b", "c", 20)
+    ledger.open_escrow("agreement-2", "a", "c", 5)
+    ledger.release_escrow("agreement-2")
+    settlement = ledger.prepare_settlement()
+    assert settlement.positions == [(ESCROW_POOL, 20), ("a", -35), ("c", 15)]  # b nets to zero
+    assert (settlement.entries, settlement.transfers) == (6, 36)  # Including the two deposits
+    assert CHAIN_ACCOUNT not in settlement.deltas  # Deposits are already on-chain
+    assert ledger.journal == [] and ledger.prepare_settlement() is None
+    assert "@escrow/agreement-2" not in ledger.balances  # Emptied escrow is forgotten
+
+def test_transfers_that_cancel_out_settle_nothing(ledger):
+    ledger.transfer("a", "b", 10)
+    ledger.transfer("b", "a", 10)
+    assert ledger.prepare_settlement() is None
+
+def test_aborted_settlement_rolls_into_the_next(ledger):
+    ledger.transfer("a", "b", 10)
+    first = ledger.prepare_settlement()
+    ledger.transfer("b", "c", 4)
+    ledger.abort_settlement(first)
+    second = ledger.prepare_settlement()
+    assert second.deltas == {"a": -10, "b": 6, "c": 4}
+    assert ledger.prepare_settlement() is None
+
+def test_withdrawal_is_not_settled_again(ledger):
+    ledger.transfer("a", "b", 10)
+    ledger.withdraw("b", 60)
+    assert ledger.prepare_settlement().deltas == {"a": -10, "b": 10}
+    assert ledger.balance("b") == 0 and ledger.total() == 0
+
+# On-chain Settlement
+
+def submit(node, ledger):
+    settler = NettingSettler(ledger, JsonRpcClient(node), CONTRACT, escrow_address=ESCROW)
+    return settler, settler.settle_once()
+
+def test_settler_submits_one_transaction(ledger):
+    node = LocalJsonRpcNode()
+    ledger.open_escrow("agreement-1", "a", "c", 5)
+    ledger.transfer("b", "c", 10)
+    settler, tx_hash = submit(node, ledger)
+    assert node.transactions[tx_hash]["data"] == json_settlement_encoder([(ESCROW, 5), ("a", -5), ("b", -10), ("c", 10)])
+    node.mine()
+    settler.poll_receipts()
+    assert settler.pending == {} and ledger.prepare_settlement() is None
+
+def test_reverted_settlement_is_resubmitted(ledger):
+    node = LocalJsonRpcNode()
+    ledger.transfer("a", "b", 10)
+    settler, tx_hash = submit(node, ledger)
+    node.mine()
+    node.receipts[tx_hash]["status"] = "0x0"
+    ledger.transfer("b", "c", 3)
+    retry = settler.settle_once()
+    assert retry != tx_hash and list(settler.pending) == [retry]
+    assert settler.pending[retry].deltas == {"a": -10, "b": 7, "c": 3}
+
+def test_failed_submission_is_aborted(ledger):
+    node = LocalJsonRpcNode(fail_methods={"eth_sendTransaction": "nonce too low"})
+    ledger.transfer("a", "b", 10)
+    with pytest.raises(JsonRpcError):
+        submit(node, ledger)
+    assert ledger.prepare_settlement().deltas == {"a": -10, "b": 10}
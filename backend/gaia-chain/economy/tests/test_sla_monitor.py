@@ -0,0 +1,138 @@
+# gaia-chain/economy/tests/test_sla_monitor.py
+
+"""
+Tests for the timer wheel and SLA breach detection (economy/sla_monitor.py).
+"""
+
+import pytest
+
+from gaia_chain.dsl.rules.core_rules import Condition, GaiaType, GaiaValue, LogicalOperator
+from gaia_chain.dsl.rules.economic_rules import DisputeResolutionMethod, Payment, ServiceAgreement
+from gaia_chain.economy.ledger import Ledger
+from gaia_chain.economy.sla_monitor import SLAMonitor, TimerWheel, parse_sla
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+def agreement(**sla):
+    return ServiceAgreement("DataAnalysis", {"data": "x"}, {"report": "y"}, Payment(amount=10, recipient="provider"), sla=sla)
+
+@pytest.fixture
+def clock():
+    return Clock()
+
+@pytest.fixture
+def disputes():
+    return []
+
+@pytest.fixture
+def monitor(clock, disputes):
+    return SLAMonitor(on_dispute=disputes.append, clock=clock)
+
+# Timer Wheel
+
+def test_timers_fire_at_their_tick_in_order():
+    wheel = TimerWheel(tick=1.0, slot_bits=4, levels=3)
+    for key, when in (("c", 300.0), ("a", 2.5), ("b", 40.0), ("d", 5000.0)):
+        wheel.schedule(key, when)
+    assert wheel.advance(2.9) == []  # Never early: 2.5 rounds up to tick 3
+    assert wheel.advance(3.0) == ["a"]
+    assert wheel.advance(299.0) == ["b"]
+    assert wheel.advance(300.0) == ["c"]
+    assert wheel.advance(4999.0) == [] and "d" in wheel  # Beyond the top level's range: parked
+    assert wheel.advance(6000.0) == ["d"]
+    assert len(wheel) == 0
+
+def test_cancel_and_reschedule():
+    wheel = TimerWheel(tick=0.5)
+    wheel.schedule("a", 10.0)
+    wheel.schedule("b", 10.0)
+    assert wheel.cancel("b") and not wheel.cancel("b")
+    wheel.schedule("a", 20.0)  # Replaces the earlier timer
+    assert wheel.advance(15.0) == []
+    assert wheel.advance(20.0) == ["a"]
+
+# Deadlines
+
+def test_missed_deadline_opens_one_dispute(monitor, clock, disputes):
+    monitor.open("agreement-1", agreement(deadline_s=30), "consumer")
+    clock.now = 29.0
+    assert monitor.tick() == []
+    clock.now = 31.0
+    [dispute] = monitor.tick()
+    assert (dispute.initiator, dispute.target) == ("consumer", "provider")
+    assert dispute.resolution_method == DisputeResolutionMethod.ARBITRATION
+    assert "deadline" in dispute.reason and disputes == [dispute]
+    assert len(monitor) == 0 and monitor.tick(100.0) == []
+    assert monitor.stats == {"opened": 1, "completed": 0, "breached": 1}
+
+def test_late_completion_is_a_breach_before_the_tick(monitor, clock):
+    monitor.open("agreement-1", agreement(time_limit=30), "consumer")
+    clock.now = 31.0
+    assert monitor.complete("agreement-1").resolution_method == DisputeResolutionMethod.ARBITRATION
+
+def test_completion_releases_escrow(clock, disputes):
+    ledger = Ledger()
+    ledger.deposit("consumer", 100)
+    ledger.open_escrow("agreement-1", "consumer", "provider", 40)
+    ledger.open_escrow("agreement-2", "consumer", "provider", 40)
+    monitor = SLAMonitor(on_dispute=disputes.append, ledger=ledger, clock=clock)
+    monitor.open("agreement-1", agreement(deadline_s=30), "consumer")
+    monitor.open("agreement-2", agreement(deadline_s=30), "consumer")
+    clock.now = 10.0
+    assert monitor.complete("agreement-1") is None
+    assert ledger.balance("provider") == 40 and "agreement-1" not in ledger.escrows
+    clock.now = 31.0
+    assert len(monitor.tick()) == 1
+    assert "agreement-2" in ledger.escrows  # Left in place for the dispute
+
+# Performance Terms
+
+def test_latency_breach_on_a_single_request(monitor):
+    monitor.open("agreement-1", agreement(latency_ms=500), "consumer")
+    assert monitor.record_request("agreement-1", 450) is None
+    dispute = monitor.record_request("agreement-1", 750)
+    assert dispute.resolution_method == DisputeResolutionMethod.MEDIATION
+    assert monitor.record_request("agreement-1", 900) is None  # No longer monitored
+
+def test_availability_is_judged_per_window(monitor, clock):
+    monitor.open("agreement-1", agreement(availability=0.9, availability_window_s=10), "consumer")
+    for ok in [True] * 9 + [False]:
+        monitor.record_request("agreement-1", 100, ok)
+    clock.now = 10.0
+    assert monitor.tick() == []  # Exactly 90% in the first window
+    monitor.record_request("agreement-1", 100, True)
+    monitor.record_request("agreement-1", 100, False)
+    clock.now = 19.0
+    assert monitor.tick() == []
+    clock.now = 20.0
+    [dispute] = monitor.tick()
+    assert "availability 0.5000" in dispute.reason
+
+def test_condition_terms_and_resolution_override(monitor):
+    failures = Condition(GaiaValue(GaiaType.VARIABLE, "failures"), LogicalOperator.GREATER_THAN, GaiaValue(GaiaType.INTEGER, 1))
+    monitor.open("agreement-1", agreement(conditions=[failures], dispute_resolution="dao_vote"), "consumer")
+    assert monitor.record_request("agreement-1", 100, ok=False) is None
+    dispute = monitor.record_request("agreement-1", 100, ok=False)
+    assert "SLA condition met" in dispute.reason
+    assert dispute.resolution_method == DisputeResolutionMethod.DAO_VOTE
+
+# Parsing
+
+def test_equal_slas_share_parsed_terms():
+    assert parse_sla(agreement(deadline_s=30, latency_ms=500).sla) is parse_sla({"latency_ms": 500, "deadline_s": 30})
+
+@pytest.mark.parametrize("sla, message", [
+    ({"deadline_s": 0}, "deadline_s must be a positive number"),
+    ({"latency_ms": True}, "latency_ms must be a positive number"),
+    ({"availability": 1.5}, "availability must be a fraction"),
+    ({"conditions": ["failures > 1"]}, "conditions must be DSL Condition objects"),
+])
+def test_invalid_sla_is_rejected(monitor, sla, message):
+    with pytest.raises(ValueError, match=message):
+        monitor.open("agreement-1", agreement(**sla), "consumer")
+    assert len(monitor) == 0
@@ -8,6 +8,7 @@ It includes commands to deploy agents, monitor their status, send instructions,
 """
 
 import argparse
+from gaia_chain.registry.agent_registry import AgentRegistry
 from gaia_chain.tooling.deploy.deploy_agent import AgentDeployer
 from gaia_chain.tooling.monitoring.agent_monitor import AgentMonitor
 
@@ -38,8 +39,14 @@ def send_instruction(args):
 
 def query_agent(args):
     """Query an agent's current state."""
-    monitor = AgentMonitor(args.agent_id, args.contract_address, args.web3_provider, args.log_path)
-    status = monitor.check_status()
+    if args.index_dir:
+        # Answered from the local chain index (see `main.py index-chain`) without contacting the node
+        with AgentRegistry(args.index_dir).open() as registry:
+            record = registry.get(args.agent_id)
+        status = record.state.value if record else "Unknown"
+    else:
+        monitor = AgentMonitor(args.agent_id, args.contract_address, args.web3_provider, args.log_path)
+        status = monitor.check_status()
     print(f"Current status of agent {args.agent_id}: {status}")
 
 def main():
@@ -74,6 +81,7 @@ def main():
     parser_query_agent.add_argument("--contract-address", required=True, help="Smart contract address for agent status and metrics.")
     parser_query_agent.add_argument("--web3-provider", default="http://localhost:8545", help="Web3 provider URL.")
     parser_query_agent.add_argument("--log-path", required=True, help="Path to the directory containing agent logs.")
+    parser_query_agent.add_argument("--index-dir", help="Read the agent's state from this local chain index instead of the contract.")
     parser_query_agent.set_defaults(func=query_agent)
 
     # Parse arguments and call appropriate function
@@ -16,15 +16,32 @@ Usage:
     To monitor an agent:
         python main.py monitor-agent --agent-id <id> --contract-address <address> --web3-provider <provider> --log-path <path>
 
+    To index agent and service events from the contract into a local registry:
+        python main.py index-chain --contract-address <address> --web3-provider <provider> --index-dir <path> [--follow]
+
+    To query the local registry (one JSON line per agent):
+        python main.py query-agents --index-dir <path> [--owner <address>] [--state <state>] [--capability <name>]
+
+    To monitor a fleet of agents (one JSON line per agent):
+        python main.py monitor-fleet --agent-file <path|-> --contract-address <address> --web3-provider <provider> --log-path <path>
+
     To display the CLI version:
         python main.py version
 """
 
 import argparse
+import json
+import os
 import sys
+from gaia_chain.agents.runtime.agent_core import AgentState
+from gaia_chain.registry.agent_registry import AgentRegistry
+from gaia_chain.registry.chain_indexer import ChainIndexer
 from gaia_chain.tooling.deploy.deploy_agent import AgentDeployer
 from gaia_chain.tooling.deploy.deploy_service import ServiceDeployer
 from gaia_chain.tooling.monitoring.agent_monitor import AgentMonitor
+from gaia_chain.tooling.monitoring.fleet_monitor import FleetMonitor, read_agent_ids
+from gaia_chain.tooling.monitoring.structured_log import LOG_LEVEL_ENV, configure_logging
+from gaia_chain.tooling.rpc.provider_registry import configure_providers, get_provider_registry
 
 def deploy_agent(args):
     """Deploy an agent using the deploy_agent.py module."""
@@ -38,16 +55,69 @@ def deploy_service(args):
 
 def monitor_agent(args):
     """Monitor an agent using the agent_monitor.py module."""
-    monitor = AgentMonitor(args.agent_id, args.contract_address, args.web3_provider, args.log_path)
-    status = monitor.check_status()
+    monitor = AgentMonitor(args.agent_id, args.contract_address, args.web3_provider, args.log_path, args.contract_abi)
+    if args.index_dir:
+        # Served from the local chain index instead of a contract call
+        with AgentRegistry(args.index_dir).open() as registry:
+            record = registry.get(args.agent_id)
+        status = record.state.value if record else "Unknown"
+    else:
+        status = monitor.check_status()
     logs = monitor.view_logs()
     metrics = monitor.collect_metrics()
     print(f"Status: {status}")
     print(f"Logs:\n{logs}")
     print(f"Metrics: {metrics}")
+    if args.follow:
+        try:
+            for line in monitor.follow_logs():
+                print(line, end="", flush=True)
+        except KeyboardInterrupt:
+            pass
+
+def monitor_fleet(args):
+    """Monitor many agents concurrently, streaming JSON lines as each agent completes."""
+    if args.agent_ids:
+        agent_ids = [agent_id.strip() for agent_id in args.agent_ids.split(",") if agent_id.strip()]
+    else:
+        agent_ids = read_agent_ids(args.agent_file)
+    fleet = FleetMonitor(args.contract_address, args.web3_provider, args.log_path, args.contract_abi,
+                         concurrency=args.concurrency, tail_lines=args.tail_lines, checks=args.checks.split(","))
+    summary = fleet.stream_json_lines(agent_ids)
+    print(json.dumps(summary), file=sys.stderr)
+
+def index_chain(args):
+    """Sync agent and service registrations from contract logs into the local registry."""
+    indexer = ChainIndexer.open(get_provider_registry().json_rpc(args.web3_provider), args.contract_address, args.index_dir,
+                                start_block=args.start_block, confirmations=args.confirmations)
+    try:
+        if args.follow:
+            try:
+                indexer.run(args.poll_interval)
+            except KeyboardInterrupt:
+                pass
+        else:
+            applied = indexer.sync()
+            print(json.dumps({"events": applied, "last_block": indexer.last_block,
+                              "agents": len(indexer.agents), "services": len(indexer.services)}))
+    finally:
+        indexer.close()
+
+def query_agents(args):
+    """Query the local agent registry, printing one JSON line per matching agent."""
+    criteria = {"owner": args.owner, "capability": args.capability or None}
+    if args.state:
+        criteria["state"] = AgentState(args.state)
+    with AgentRegistry(args.index_dir).open() as registry:
+        for record in registry.find(order_by=args.order_by, reverse=True, limit=args.limit, **criteria):
+            print(json.dumps(dict(zip(registry.fields, registry.encode(record)))))
 
 def main():
     parser = argparse.ArgumentParser(description="GaiaChain CLI")
+    parser.add_argument("--web3-pool-size", type=int, help="Maximum pooled HTTP connections per Web3 provider.")
+    parser.add_argument("--log-level", default=os.environ.get(LOG_LEVEL_ENV, "INFO"), help="Log level (default: $GAIA_LOG_LEVEL or INFO).")
+    parser.add_argument("--log-format", choices=("text", "json"), default="text", help="Log output format (json writes JSON lines).")
+    parser.add_argument("--log-file", help="Write logs to this file instead of stderr.")
     subparsers = parser.add_subparsers(title="subcommands", description="valid subcommands", help="additional help")
 
     # Subcommand for deploying an agent
@@ -72,14 +142,55 @@ def main():
     parser_monitor_agent.add_argument("--contract-address", required=True, help="Smart contract address for agent status and metrics.")
     parser_monitor_agent.add_argument("--web3-provider", default="http://localhost:8545", help="Web3 provider URL.")
     parser_monitor_agent.add_argument("--log-path", required=True, help="Path to the directory containing agent logs.")
+    parser_monitor_agent.add_argument("--contract-abi", help="Path to the agent contract ABI JSON file (enables on-chain status).")
+    parser_monitor_agent.add_argument("--follow", action="store_true", help="Keep streaming new log lines after the report.")
+    parser_monitor_agent.add_argument("--index-dir", help="Read the agent's status from this local chain index (see index-chain).")
     parser_monitor_agent.set_defaults(func=monitor_agent)
 
+    # Subcommand for indexing contract events
+    parser_index_chain = subparsers.add_parser('index-chain', help="Index contract events into the local registry")
+    parser_index_chain.add_argument("--contract-address", required=True, help="Smart contract address emitting agent and service events.")
+    parser_index_chain.add_argument("--web3-provider", default="http://localhost:8545", help="JSON-RPC provider URL.")
+    parser_index_chain.add_argument("--index-dir", required=True, help="Directory holding the registry snapshots, journals and checkpoint.")
+    parser_index_chain.add_argument("--start-block", type=int, default=0, help="First block to index on an empty index.")
+    parser_index_chain.add_argument("--confirmations", type=int, default=0, help="Stay this many blocks behind the head.")
+    parser_index_chain.add_argument("--follow", action="store_true", help="Keep indexing new blocks until interrupted.")
+    parser_index_chain.add_argument("--poll-interval", type=float, default=2.0, help="Seconds between polls with --follow.")
+    parser_index_chain.set_defaults(func=index_chain)
+
+    # Subcommand for querying the local agent registry
+    parser_query_agents = subparsers.add_parser('query-agents', help="Query agents in the local registry")
+    parser_query_agents.add_argument("--index-dir", required=True, help="Directory of the local chain index.")
+    parser_query_agents.add_argument("--owner", help="Only agents owned by this address.")
+    parser_query_agents.add_argument("--state", choices=[state.value for state in AgentState], help="Only agents in this state.")
+    parser_query_agents.add_argument("--capability", action="append", help="Required capability (repeatable).")
+    parser_query_agents.add_argument("--order-by", choices=("stake", "reputation"), default="stake", help="Sort order (descending).")
+    parser_query_agents.add_argument("--limit", type=int, default=100, help="Maximum agents to print.")
+    parser_query_agents.set_defaults(func=query_agents)
+
+    # Subcommand for monitoring a fleet of agents
+    parser_monitor_fleet = subparsers.add_parser('monitor-fleet', help="Monitor many agents concurrently")
+    fleet_source = parser_monitor_fleet.add_mutually_exclusive_group(required=True)
+    fleet_source.add_argument("--agent-ids", help="Comma-separated agent IDs to monitor.")
+    fleet_source.add_argument("--agent-file", help="File with one agent ID per line, or '-' for stdin.")
+    parser_monitor_fleet.add_argument("--contract-address", required=True, help="Smart contract address for agent status and metrics.")
+    parser_monitor_fleet.add_argument("--contract-abi", help="Path to the agent contract ABI JSON file (enables on-chain status).")
+    parser_monitor_fleet.add_argument("--web3-provider", default="http://localhost:8545", help="Web3 provider URL.")
+    parser_monitor_fleet.add_argument("--log-path", required=True, help="Path to the directory containing agent logs.")
+    parser_monitor_fleet.add_argument("--concurrency", type=int, default=64, help="Maximum agents checked in parallel.")
+    parser_monitor_fleet.add_argument("--tail-lines", type=int, default=10, help="Log lines to include per agent.")
+    parser_monitor_fleet.add_argument("--checks", default="status,metrics,tail", help="Comma-separated checks to run: status, metrics, tail.")
+    parser_monitor_fleet.set_defaults(func=monitor_fleet)
+
     # Subcommand for displaying version
     parser_version = subparsers.add_parser('version', help="Display CLI version")
     parser_version.set_defaults(func=lambda args: print("GaiaChain CLI version 1.0"))
 
     # Parse arguments and call appropriate function
     args = parser.parse_args()
+    configure_logging(args.log_level, args.log_format, args.log_file)
+    if args.web3_pool_size:
+        configure_providers(pool_size=args.web3_pool_size)
     if hasattr(args, 'func'):
         args.func(args)
     else:
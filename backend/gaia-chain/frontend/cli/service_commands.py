@@ -8,8 +8,12 @@ It includes commands to deploy services, monitor their status and usage, and int
 """
 
 import argparse
+import json
+import os
+from gaia_chain.registry.service_registry import ServiceRegistry
 from gaia_chain.tooling.deploy.deploy_service import ServiceDeployer
-from web3 import Web3
+from gaia_chain.tooling.monitoring.structured_log import LOG_LEVEL_ENV, configure_logging
+from gaia_chain.tooling.rpc.provider_registry import configure_providers, get_provider_registry
 
 def deploy_service(args):
     """Deploy a service to the network."""
@@ -18,20 +22,30 @@ def deploy_service(args):
 
 def monitor_service(args):
     """Monitor a service's status or usage."""
-    web3 = Web3(Web3.HTTPProvider(args.web3_provider))
-    contract = web3.eth.contract(address=args.contract_address, abi=args.contract_abi)
+    if args.index_dir:
+        # Offerings from the local chain index (see `main.py index-chain`), cheapest first
+        with ServiceRegistry(args.index_dir).open() as services:
+            for record in services.offerings(args.service_id, active=None):
+                print(json.dumps(dict(zip(services.fields, services.encode(record)))))
+        return
+    if not args.contract_abi:
+        raise ValueError("--contract-abi is required unless --index-dir is given.")
+    registry = get_provider_registry()
+    contract = registry.contract(args.web3_provider, args.contract_address, args.contract_abi)
+    view_cache = registry.view_cache(args.web3_provider)
     
-    # Query service status from smart contract (mock implementation)
-    status = contract.functions.getServiceStatus(args.service_id).call()
-    usage_stats = contract.functions.getServiceUsageStats(args.service_id).call()
+    # Query service status from smart contract; repeated polls within a block are served from cache
+    status = view_cache.call(contract, "getServiceStatus", args.service_id)
+    usage_stats = view_cache.call(contract, "getServiceUsageStats", args.service_id)
     
     print(f"Service {args.service_id} status: {status}")
     print(f"Service {args.service_id} usage stats: {usage_stats}")
 
 def request_service(args):
     """Send a request to a deployed service."""
-    web3 = Web3(Web3.HTTPProvider(args.web3_provider))
-    contract = web3.eth.contract(address=args.contract_address, abi=args.contract_abi)
+    registry = get_provider_registry()
+    web3 = registry.web3(args.web3_provider)
+    contract = registry.contract(args.web3_provider, args.contract_address, args.contract_abi)
     
     # Read DSL request from file
     with open(args.dsl_file, 'r') as file:
@@ -45,6 +59,10 @@ def request_service(args):
 
 def main():
     parser = argparse.ArgumentParser(description="GaiaChain CLI - Service Commands")
+    parser.add_argument("--web3-pool-size", type=int, help="Maximum pooled HTTP connections per Web3 provider.")
+    parser.add_argument("--log-level", default=os.environ.get(LOG_LEVEL_ENV, "INFO"), help="Log level (default: $GAIA_LOG_LEVEL or INFO).")
+    parser.add_argument("--log-format", choices=("text", "json"), default="text", help="Log output format (json writes JSON lines).")
+    parser.add_argument("--log-file", help="Write logs to this file instead of stderr.")
     subparsers = parser.add_subparsers(title="subcommands", description="valid subcommands", help="additional help")
 
     # Subcommand for deploying a service
@@ -59,8 +77,9 @@ def main():
     parser_monitor_service = subparsers.add_parser('monitor-service', help="Monitor a service")
     parser_monitor_service.add_argument("--service-id", required=True, help="ID of the service to monitor.")
     parser_monitor_service.add_argument("--contract-address", required=True, help="Smart contract address for service status and metrics.")
-    parser_monitor_service.add_argument("--contract-abi", required=True, help="Path to the contract ABI JSON file.")
+    parser_monitor_service.add_argument("--contract-abi", help="Path to the contract ABI JSON file (required without --index-dir).")
     parser_monitor_service.add_argument("--web3-provider", default="http://localhost:8545", help="Web3 provider URL.")
+    parser_monitor_service.add_argument("--index-dir", help="Read service offerings from this local chain index instead of the contract.")
     parser_monitor_service.set_defaults(func=monitor_service)
 
     # Subcommand for sending requests to a service
@@ -75,6 +94,9 @@ def main():
 
     # Parse arguments and call appropriate function
     args = parser.parse_args()
+    configure_logging(args.log_level, args.log_format, args.log_file)
+    if args.web3_pool_size:
+        configure_providers(pool_size=args.web3_pool_size)
     if hasattr(args, 'func'):
         args.func(args)
     else:
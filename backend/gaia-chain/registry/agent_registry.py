@@ -0,0 +1,117 @@
+# gaia-chain/registry/agent_registry.py
+
+"""
+Agent Registry for GaiaChain
+
+This module keeps a local, indexed view of registered agents so that discovery ("active agents
+owned by X with capability Y") is answered from memory instead of one contract call per agent.
+Records are indexed by owner, lifecycle state and capability, and ordered by stake and reputation.
+With a directory, the registry persists to a snapshot plus journal (see registry/registry_core.py).
+"""
+
+import time
+from dataclasses import dataclass, field, fields, replace
+from typing import Any, Iterable, List, Optional, Tuple
+
+from gaia_chain.agents.runtime.agent_core import AgentCore, AgentState
+from gaia_chain.registry.registry_core import IndexedRegistry
+
+@dataclass(frozen=True)
+class AgentRecord:
+    """Registry entry for one agent."""
+    id: str
+    owner: str
+    state: AgentState = AgentState.PROPOSED
+    capabilities: Tuple[str, ...] = ()
+    stake: int = 0
+    reputation: float = 0.0
+    contract_address: str = ""
+    registered_block: Optional[int] = None
+    updated_at: float = field(default_factory=time.time)
+
+    @classmethod
+    def from_agent(cls, agent: AgentCore, capabilities: Iterable[str] = (), **fields) -> "AgentRecord":
+        """Build a record from a live AgentCore (its id, owner and state)."""
+        return cls(id=agent.id, owner=agent.owner, state=agent.state, capabilities=tuple(capabilities), **fields)
+
+_STATES = {state.value: state for state in AgentState}
+_STATE, _CAPABILITIES = 2, 3  # Positions in the persisted row (AgentRecord field order)
+
+class AgentRegistry(IndexedRegistry):
+    """Indexed in-memory registry of agents."""
+    name = "agents"
+    fields = tuple(item.name for item in fields(AgentRecord))
+
+    def __init__(self, directory: Optional[str] = None, sync: bool = False, compact_every: int = 100000):
+        super().__init__(directory, sync, compact_every)
+        self.add_hash_index("owner", lambda record: record.owner)
+        self.add_hash_index("state", lambda record: record.state)
+        self.add_hash_index("capability", lambda record: record.capabilities, multi=True)
+        self.add_ordered_index("stake", lambda record: record.stake)
+        self.add_ordered_index("reputation", lambda record: record.reputation)
+
+    def key_of(self, record: AgentRecord) -> str:
+        return record.id
+
+    def encode(self, record: AgentRecord) -> list:
+        row = [getattr(record, name) for name in self.fields]
+        row[_STATE] = record.state.value
+        return row
+
+    def decode(self, row: list) -> AgentRecord:
+        row[_STATE] = _STATES[row[_STATE]]
+        row[_CAPABILITIES] = tuple(row[_CAPABILITIES])
+        return AgentRecord(*row)
+
+    # Writes
+
+    def register(self, agent: Any, capabilities: Iterable[str] = (), **fields) -> AgentRecord:
+        """Register (or refresh) an agent from an AgentRecord or a live AgentCore."""
+        record = agent if isinstance(agent, AgentRecord) else AgentRecord.from_agent(agent, capabilities, **fields)
+        self.put(record)
+        return record
+
+    def update(self, agent_id: str, **changes) -> AgentRecord:
+        """Replace fields of an existing record; raises KeyError for unknown agents."""
+        with self.lock:
+            record = replace(self.records[agent_id], updated_at=time.time(), **changes)
+            self.put(record)
+            return record
+
+    def update_state(self, agent_id: str, state: AgentState) -> AgentRecord:
+        return self.update(agent_id, state=state)
+
+    # Queries
+
+    def by_owner(self, owner: str) -> List[AgentRecord]:
+        return self.find(owner=owner)
+
+    def by_state(self, state: AgentState) -> List[AgentRecord]:
+        return self.find(state=state)
+
+    def with_capabilities(self, *capabilities: str, state: Optional[AgentState] = None) -> List[AgentRecord]:
+        """Agents having every listed capability, optionally restricted to one state."""
+        return self.find(capability=capabilities, state=state)
+
+    def top_by_reputation(self, limit: int = 10, **criteria) -> List[AgentRecord]:
+        return self.find(order_by="reputation", reverse=True, limit=limit, **criteria)
+
+# Example usage (for illustration purposes, not part of the module)
+if __name__ == "__main__":
+    import tempfile
+
+    with tempfile.TemporaryDirectory() as directory:
+        registry = AgentRegistry(directory).open()
+        registry.put_many(
+            AgentRecord(id=f"agent_{i:05d}", owner=f"owner_{i % 100}", state=AgentState.ACTIVE if i % 3 else AgentState.PROPOSED,
+                        capabilities=("analysis",) if i % 2 else ("analysis", "forecasting"), stake=i, reputation=(i * 37) % 1000 / 10)
+            for i in range(10000))
+        registry.update_state("agent_00001", AgentState.DEACTIVATED)
+        registry.compact()
+        registry.close()
+
+        reopened = AgentRegistry(directory).open()
+        print(len(reopened), reopened.get("agent_00001").state)
+        print(reopened.count(owner="owner_8", state=AgentState.ACTIVE, capability="forecasting"))
+        print([record.id for record in reopened.top_by_reputation(3, capability="forecasting")])
+        print(len(reopened.find(order_by="stake", low=100, high=199, state=AgentState.ACTIVE)))
@@ -0,0 +1,354 @@
+# gaia-chain/registry/chain_indexer.py
+
+"""
+Chain Indexer for GaiaChain
+
+This module keeps the local agent and service registries in sync with the GaiaChain contract by
+reading its event logs, so discovery queries never need per-ID contract calls. Each sync step
+fetches `eth_getLogs` for a block range together with the header of the range's last block in a
+single batched JSON-RPC round trip, decodes the logs and applies them to the registries.
+
+The block range adapts to the provider: it halves when the provider rejects a query (too many
+results, range too large, timeout) and doubles after a step that returned few logs, but never
+beyond the last range that was accepted after a rejection. Progress is
+checkpointed to `indexer.checkpoint.json` after every step, together with the hash of the last
+indexed block and undo entries for the most recent `reorg_depth` blocks. If the stored hash no
+longer matches the chain, the indexer rolls back `reorg_depth` blocks (restoring the previous
+records from the undo entries) and re-indexes from there. Applying an event is idempotent, so
+re-processing a range after a crash between a registry write and a checkpoint is harmless.
+"""
+
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass, replace
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from web3 import Web3
+
+from gaia_chain.agents.runtime.agent_core import AgentState
+from gaia_chain.registry.agent_registry import AgentRecord, AgentRegistry
+from gaia_chain.registry.service_registry import ServiceRecord, ServiceRegistry
+from gaia_chain.tooling.monitoring.structured_log import get_logger
+from gaia_chain.tooling.rpc.json_rpc_client import JsonRpcClient, JsonRpcError
+
+# Logger setup
+logger = get_logger(__name__)
+
+CHECKPOINT_FILE = "indexer.checkpoint.json"
+
+# Order of AgentState values as encoded (uint8) by the contract
+AGENT_STATES = (AgentState.PROPOSED, AgentState.ACTIVE, AgentState.DEACTIVATED, AgentState.PRUNED)
+
+# Provider error messages that mean "ask for a smaller range"
+_RANGE_ERRORS = ("more than", "limit", "too large", "range", "timeout", "timed out", "too many")
+
+# Event Decoding
+
+@dataclass(frozen=True)
+class EventSpec:
+    """A contract event: name and (name, type, indexed) inputs. Static ABI types and `string`."""
+    name: str
+    inputs: Tuple[Tuple[str, str, bool], ...]
+
+    @property
+    def signature(self) -> str:
+        return f"{self.name}({','.join(kind for _, kind, _ in self.inputs)})"
+
+    @property
+    def topic(self) -> str:
+        return "0x" + bytes(Web3.keccak(text=self.signature)).hex()
+
+AGENT_REGISTERED = EventSpec("AgentRegistered", (("agent", "address", True), ("owner", "address", True), ("stake", "uint256", False)))
+AGENT_STATE_CHANGED = EventSpec("AgentStateChanged", (("agent", "address", True), ("state", "uint8", False)))
+SERVICE_REGISTERED = EventSpec("ServiceRegistered", (("provider", "address", True), ("serviceId", "bytes32", True), ("cost", "uint256", False)))
+SERVICE_UPDATED = EventSpec("ServiceUpdated", (("provider", "address", True), ("serviceId", "bytes32", True), ("cost", "uint256", False), ("active", "bool", False)))
+
+DEFAULT_EVENTS = (AGENT_REGISTERED, AGENT_STATE_CHANGED, SERVICE_REGISTERED, SERVICE_UPDATED)
+
+def _decode_word(word: bytes, kind: str) -> Any:
+    if kind == "address":
+        return "0x" + word[12:].hex()
+    if kind == "bool":
+        return word[-1] != 0
+    if kind.startswith("uint"):
+        return int.from_bytes(word, "big")
+    if kind.startswith("int"):
+        return int.from_bytes(word, "big", signed=True)
+    if kind == "bytes32":
+        return word.rstrip(b"\0").decode("utf-8", errors="replace")
+    raise ValueError(f"Unsupported event input type: {kind}")
+
+def decode_log(spec: EventSpec, log: dict) -> Dict[str, Any]:
+    """Decode a raw log's topics and data into {input name: value} for `spec`."""
+    topics = log["topics"][1:]
+    data = bytes.fromhex(log.get("data", "0x")[2:])
+    values: Dict[str, Any] = {}
+    topic_index = word_index = 0
+    for name, kind, indexed in spec.inputs:
+        if indexed:
+            values[name] = _decode_word(bytes.fromhex(topics[topic_index][2:]), kind)
+            topic_index += 1
+            continue
+        word = data[32 * word_index:32 * (word_index + 1)]
+        word_index += 1
+        if kind == "string":
+            offset = int.from_bytes(word, "big")
+            length = int.from_bytes(data[offset:offset + 32], "big")
+            values[name] = data[offset + 32:offset + 32 + length].decode("utf-8", errors="replace")
+        else:
+            values[name] = _decode_word(word, kind)
+    return values
+
+def encode_log(spec: EventSpec, **values) -> Tuple[List[str], str]:
+    """Encode event values into (topics, data) for static input types (used by tests and tools)."""
+    def word(value, kind) -> bytes:
+        if kind == "address":
+            return bytes.fromhex(value[2:].rjust(64, "0"))
+        if kind == "bytes32":
+            return value.encode("utf-8").ljust(32, b"\0")
+        return int(value).to_bytes(32, "big", signed=kind.startswith("int"))
+    topics = [spec.topic]
+    data = b""
+    for name, kind, indexed in spec.inputs:
+        if indexed:
+            topics.append("0x" + word(values[name], kind).hex())
+        else:
+            data += word(values[name], kind)
+    return topics, "0x" + data.hex()
+
+# Indexer
+
+class ChainIndexer:
+    """Incrementally applies contract events to an AgentRegistry and a ServiceRegistry."""
+    def __init__(self, client: JsonRpcClient, contract_address: str, agents: AgentRegistry, services: ServiceRegistry,
+                 checkpoint_dir: Optional[str] = None, start_block: int = 0, confirmations: int = 0, reorg_depth: int = 12,
+                 initial_range: int = 2000, min_range: int = 1, max_range: int = 100000, target_logs: int = 5000,
+                 events: Sequence[EventSpec] = DEFAULT_EVENTS):
+        if min_range < 1 or max_range < min_range:
+            raise ValueError("Block ranges must satisfy 1 <= min_range <= max_range.")
+        self.client = client
+        self.contract_address = contract_address.lower()
+        self.agents = agents
+        self.services = services
+        self.checkpoint_path = os.path.join(checkpoint_dir, CHECKPOINT_FILE) if checkpoint_dir else None
+        self.confirmations = confirmations
+        self.reorg_depth = reorg_depth
+        self.block_range = min(max(initial_range, min_range), max_range)
+        self.min_range = min_range
+        self.max_range = max_range
+        self.target_logs = target_logs  # Grow the range only while steps return fewer logs than this
+        self.range_ceiling = max_range  # Lowered to the last safe range after a provider rejection
+        self.events = {spec.topic: spec for spec in events}
+        self.last_block = start_block - 1
+        self.last_hash: Optional[str] = None
+        self.undo: List[Tuple[int, str, str, Optional[list]]] = []  # (block, registry, key, previous row)
+        self.stats = {"steps": 0, "logs": 0, "range_errors": 0, "reorgs": 0}
+        self._load_checkpoint()
+
+    @classmethod
+    def open(cls, client: JsonRpcClient, contract_address: str, directory: str, **options) -> "ChainIndexer":
+        """Open (or create) the registries and checkpoint stored in `directory`."""
+        agents = AgentRegistry(directory).open()
+        services = ServiceRegistry(directory).open()
+        return cls(client, contract_address, agents, services, checkpoint_dir=directory, **options)
+
+    def close(self):
+        self.agents.close()
+        self.services.close()
+
+    # Checkpoints
+
+    def _load_checkpoint(self):
+        if self.checkpoint_path is None or not os.path.exists(self.checkpoint_path):
+            return
+        with open(self.checkpoint_path, 'r') as checkpoint_file:
+            checkpoint = json.load(checkpoint_file)
+        if checkpoint["contract_address"] != self.contract_address:
+            raise ValueError(f"Checkpoint {self.checkpoint_path} belongs to contract {checkpoint['contract_address']}.")
+        self.last_block = checkpoint["last_block"]
+        self.last_hash = checkpoint["last_hash"]
+        self.undo = [tuple(entry) for entry in checkpoint["undo"]]
+        logger.info("Resuming chain index", last_block=self.last_block)
+
+    def _save_checkpoint(self):
+        if self.checkpoint_path is None:
+            return
+        checkpoint = {"contract_address": self.contract_address, "last_block": self.last_block,
+                      "last_hash": self.last_hash, "undo": self.undo}
+        temp_path = f"{self.checkpoint_path}.tmp"
+        with open(temp_path, 'w') as checkpoint_file:
+            json.dump(checkpoint, checkpoint_file)
+        os.replace(temp_path, self.checkpoint_path)
+
+    # Syncing
+
+    def head(self) -> int:
+        return int(self.client.call("eth_blockNumber"), 16) - self.confirmations
+
+    def sync(self, until: Optional[int] = None) -> int:
+        """Index up to `until` (default: the confirmed head); return the number of logs applied."""
+        target = self.head() if until is None else until
+        applied = 0
+        if self.last_block >= 0 and self.last_hash is not None and self._reorged():
+            self.rollback(self.reorg_depth)
+        while self.last_block < target:
+            applied += self.step(target)
+        return applied
+
+    def _reorged(self) -> bool:
+        block = self.client.call("eth_getBlockByNumber", [hex(self.last_block), False])
+        return block is None or block["hash"] != self.last_hash
+
+    def step(self, target: int) -> int:
+        """Index one block range ending at or before `target`, shrinking the range on provider errors."""
+        start = self.last_block + 1
+        while True:
+            end = min(start + self.block_range - 1, target)
+            query = {"fromBlock": hex(start), "toBlock": hex(end), "address": self.contract_address,
+                     "topics": [list(self.events)]}
+            logs, block = self.client.batch([("eth_getLogs", [query]), ("eth_getBlockByNumber", [hex(end), False])])
+            if isinstance(logs, JsonRpcError) and self._is_range_error(logs) and self.block_range > self.min_range:
+                self.stats["range_errors"] += 1
+                self.block_range = max(self.min_range, (end - start + 1) // 2)
+                self.range_ceiling = self.block_range
+                logger.info("Provider rejected block range; retrying smaller", blocks=end - start + 1, error=logs.message,
+                            block_range=self.block_range)
+                continue
+            for result in (logs, block):
+                if isinstance(result, JsonRpcError):
+                    raise result
+            break
+        if block is None:
+            raise RuntimeError(f"Block {end} is not available from the provider.")
+        # A log from a block that has since been replaced would carry a different hash than the header
+        if any(log["blockNumber"] == block["number"] and log["blockHash"] != block["hash"] for log in logs):
+            raise RuntimeError(f"Chain reorganized while indexing block {end}; retry.")
+        applied = self.apply_logs(logs)
+        self.last_block = end
+        self.last_hash = block["hash"]
+        self._prune_undo()
+        self._save_checkpoint()
+        self.stats["steps"] += 1
+        self.stats["logs"] += applied
+        if len(logs) < self.target_logs // 2 and end - start + 1 == self.block_range:
+            self.block_range = min(self.range_ceiling, self.block_range * 2)
+        return applied
+
+    @staticmethod
+    def _is_range_error(error: JsonRpcError) -> bool:
+        message = str(error.message).lower()
+        return error.code == -32005 or any(fragment in message for fragment in _RANGE_ERRORS)
+
+    def run(self, poll_interval: float = 2.0, stop: Optional[threading.Event] = None):
+        """Keep syncing until `stop` is set, polling for new blocks every `poll_interval` seconds."""
+        stop = stop or threading.Event()
+        while not stop.is_set():
+            try:
+                applied = self.sync()
+                if applied:
+                    logger.info("Indexed chain events", events=applied, last_block=self.last_block)
+            except (JsonRpcError, RuntimeError, OSError) as e:
+                logger.warning("Chain index sync failed", error=repr(e))
+            stop.wait(poll_interval)
+
+    # Applying Events
+
+    def apply_logs(self, logs: List[dict]) -> int:
+        staged: Dict[str, Dict[str, Any]] = {"agents": {}, "services": {}}
+        applied = 0
+        for log in logs:
+            spec = self.events.get(log["topics"][0]) if log.get("topics") else None
+            if spec is None or log.get("removed"):
+                continue
+            block = int(log["blockNumber"], 16)
+            self._apply(spec, decode_log(spec, log), block, log["address"], staged)
+            applied += 1
+        self.agents.put_many(staged["agents"].values())
+        self.services.put_many(staged["services"].values())
+        return applied
+
+    def _current(self, registry_name: str, key: str, staged: Dict[str, Dict[str, Any]]):
+        pending = staged[registry_name]
+        if key in pending:
+            return pending[key]
+        return getattr(self, registry_name).get(key)
+
+    def _stage(self, registry_name: str, key: str, record, block: int, staged: Dict[str, Dict[str, Any]]):
+        previous = self._current(registry_name, key, staged)
+        registry = getattr(self, registry_name)
+        self.undo.append((block, registry_name, key, None if previous is None else registry.encode(previous)))
+        staged[registry_name][key] = record
+
+    def _apply(self, spec: EventSpec, values: Dict[str, Any], block: int, address: str, staged):
+        if spec.name == "AgentRegistered":
+            record = AgentRecord(id=values["agent"], owner=values["owner"], state=AgentState.PROPOSED,
+                                 stake=values["stake"], contract_address=address, registered_block=block)
+            self._stage("agents", record.id, record, block, staged)
+        elif spec.name == "AgentStateChanged":
+            current = self._current("agents", values["agent"], staged)
+            if current is None:
+                logger.warning("State change for unknown agent", agent=values["agent"], block=block)
+                return
+            state = AGENT_STATES[values["state"]] if values["state"] < len(AGENT_STATES) else current.state
+            self._stage("agents", current.id, _replace(current, state=state), block, staged)
+        elif spec.name in ("ServiceRegistered", "ServiceUpdated"):
+            key = f"{values['provider']}/{values['serviceId']}"
+            current = self._current("services", key, staged)
+            if current is None:
+                record = ServiceRecord(service_id=values["serviceId"], provider=values["provider"], cost=values["cost"],
+                                       active=values.get("active", True), registered_block=block)
+            else:
+                record = _replace(current, cost=values["cost"], active=values.get("active", current.active))
+            self._stage("services", key, record, block, staged)
+
+    # Reorgs
+
+    def rollback(self, blocks: int):
+        """Undo the effects of the last `blocks` indexed blocks and resume indexing before them."""
+        target = max(self.last_block - blocks, -1)
+        self.stats["reorgs"] += 1
+        logger.warning("Chain reorganization detected; rolling back", from_block=self.last_block, to_block=target)
+        restored = {"agents": {}, "services": {}}
+        while self.undo and self.undo[-1][0] > target:
+            _, registry_name, key, previous = self.undo.pop()
+            restored[registry_name][key] = previous  # Earliest change wins: it holds the pre-fork record
+        for registry_name, changes in restored.items():
+            registry = getattr(self, registry_name)
+            registry.put_many(registry.decode(row) for row in changes.values() if row is not None)
+            for key, row in changes.items():
+                if row is None and key in registry:
+                    registry.remove(key)
+        self.last_block = target
+        self.last_hash = None  # Unknown until the next step re-reads the chain
+        self._save_checkpoint()
+
+    def _prune_undo(self):
+        horizon = self.last_block - self.reorg_depth
+        if self.undo and self.undo[0][0] <= horizon:
+            self.undo = [entry for entry in self.undo if entry[0] > horizon]
+
+def _replace(record, **changes):
+    return replace(record, updated_at=time.time(), **changes)
+
+# Example usage (for illustration purposes, not part of the module)
+if __name__ == "__main__":
+    import tempfile
+    from gaia_chain.testing.rpc.local_node import LocalJsonRpcNode
+
+    contract = "0x00000000000000000000000000000000000000cc"
+    node = LocalJsonRpcNode(max_logs_per_query=500)
+    for i in range(2000):
+        agent = f"0x{i + 1:040x}"
+        node.emit_log(contract, *encode_log(AGENT_REGISTERED, agent=agent, owner=f"0x{i % 10 + 1:040x}", stake=100 + i))
+        if i % 2:
+            node.emit_log(contract, *encode_log(AGENT_STATE_CHANGED, agent=agent, state=1))
+        node.mine()
+    with tempfile.TemporaryDirectory() as directory:
+        indexer = ChainIndexer.open(JsonRpcClient(node), contract, directory, initial_range=1000)
+        print(indexer.sync(), len(indexer.agents), indexer.agents.count(state=AgentState.ACTIVE), indexer.stats)
+        node.reorg(3)  # The last three registrations disappear from the chain
+        indexer.sync()
+        print(len(indexer.agents), indexer.stats, node.round_trips)
+        indexer.close()
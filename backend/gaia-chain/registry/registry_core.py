@@ -0,0 +1,556 @@
+# gaia-chain/registry/registry_core.py
+
+"""
+Registry Core for GaiaChain
+
+This module provides the storage engine shared by the agent and service registries. Records are
+immutable values kept in memory by key, with secondary indexes maintained on every write:
+
+- `HashIndex` maps a field value (or each of several values, e.g. capabilities) to the set of keys
+  holding it, so equality filters are set lookups and combined filters are set intersections.
+- `OrderedIndex` keeps (value, key) pairs sorted in blocks, so range queries and
+  "lowest/highest first" scans are a bisect plus a sequential walk, and counting the keys in a
+  range (to estimate how selective a filter is) costs two bisects per bound. The block start
+  offsets behind those counts are rebuilt (O(blocks)) on the first count after a write.
+
+Persistence is a snapshot plus an append-only journal in one directory. Records are encoded as
+positional rows (JSON arrays in the subclass's `fields` order). Every write appends a JSON line
+`[seq, op, row]` to `<name>.journal`; `compact()` writes all rows to `<name>.snapshot`
+(atomically, via a temporary file) and starts a new journal. On open, the snapshot is read with one
+plain sequential read and decoded in one `json.loads` call, and only journal entries newer than the
+snapshot are replayed, so a restart costs one read of the snapshot rather than a replay of the chain.
+A torn final journal line (from a crash mid-write) is dropped.
+"""
+
+import json
+import os
+import threading
+from bisect import bisect_left, insort
+from itertools import accumulate
+from typing import Any, Callable, Dict, Hashable, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
+
+from gaia_chain.tooling.monitoring.structured_log import get_logger
+
+# Logger setup
+logger = get_logger(__name__)
+
+SNAPSHOT_FORMAT = "gaia-registry"
+SNAPSHOT_VERSION = 1
+
+_EMPTY: Set[str] = frozenset()
+
+# Secondary Indexes
+
+class HashIndex:
+    """Maps each value extracted from a record to the keys of the records holding it."""
+    __slots__ = ("extract", "multi", "entries")
+
+    def __init__(self, extract: Callable[[Any], Any], multi: bool = False):
+        self.extract = extract
+        self.multi = multi  # The extractor returns an iterable of values (e.g. capabilities)
+        self.entries: Dict[Hashable, Set[str]] = {}
+
+    def values_of(self, record) -> Iterable[Hashable]:
+        value = self.extract(record)
+        if self.multi:
+            return set(value or ())
+        return () if value is None else (value,)
+
+    def add(self, key: str, record):
+        for value in self.values_of(record):
+            keys = self.entries.get(value)
+            if keys is None:
+                keys = self.entries[value] = set()
+            keys.add(key)
+
+    def remove(self, key: str, record):
+        for value in self.values_of(record):
+            keys = self.entries.get(value)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self.entries[value]
+
+    def lookup(self, value: Hashable) -> Set[str]:
+        return self.entries.get(value, _EMPTY)
+
+    def counts(self) -> Dict[Hashable, int]:
+        return {value: len(keys) for value, keys in self.entries.items()}
+
+class OrderedIndex:
+    """Keeps (value, key) pairs sorted for range queries over a comparable field.
+
+    Pairs are held in sorted blocks of at most `2 * BLOCK_SIZE`, with the last pair of each block
+    in `maxes`, so an insert or delete shifts one block instead of the whole index.
+    """
+    __slots__ = ("extract", "multi", "blocks", "maxes", "size", "offsets")
+    BLOCK_SIZE = 512
+
+    def __init__(self, extract: Callable[[Any], Any], multi: bool = False):
+        self.extract = extract
+        self.multi = multi  # The extractor returns an iterable of values, each indexed separately
+        self.blocks: List[List[Tuple[Any, str]]] = []
+        self.maxes: List[Tuple[Any, str]] = []
+        self.size = 0
+        self.offsets: Optional[List[int]] = None  # Position of each block's first pair; None after a write
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __iter__(self) -> Iterator[Tuple[Any, str]]:
+        for block in self.blocks:
+            yield from block
+
+    def values_of(self, record) -> Iterable[Any]:
+        value = self.extract(record)
+        if self.multi:
+            return value or ()
+        return () if value is None else (value,)
+
+    def add(self, key: str, record):
+        for value in self.values_of(record):
+            self.insert((value, key))
+
+    def remove(self, key: str, record):
+        for value in self.values_of(record):
+            self.discard((value, key))
+
+    def insert(self, pair: Tuple[Any, str]):
+        self.offsets = None
+        if not self.blocks:
+            self.blocks.append([pair])
+            self.maxes.append(pair)
+            self.size = 1
+            return
+        index = min(bisect_left(self.maxes, pair), len(self.maxes) - 1)
+        block = self.blocks[index]
+        insort(block, pair)
+        self.maxes[index] = block[-1]
+        self.size += 1
+        if len(block) > 2 * self.BLOCK_SIZE:
+            half = len(block) // 2
+            self.blocks[index:index + 1] = [block[:half], block[half:]]
+            self.maxes[index:index + 1] = [block[half - 1], block[-1]]
+
+    def discard(self, pair: Tuple[Any, str]) -> bool:
+        index = bisect_left(self.maxes, pair)
+        if index == len(self.maxes):
+            return False
+        block = self.blocks[index]
+        position = bisect_left(block, pair)
+        if position == len(block) or block[position] != pair:
+            return False
+        del block[position]
+        self.size -= 1
+        self.offsets = None
+        if block:
+            self.maxes[index] = block[-1]
+        else:
+            del self.blocks[index]
+            del self.maxes[index]
+        return True
+
+    def bulk_load(self, pairs: List[Tuple[Any, str]]):
+        pairs = sorted(pairs)
+        self.blocks = [pairs[start:start + self.BLOCK_SIZE] for start in range(0, len(pairs), self.BLOCK_SIZE)]
+        self.maxes = [block[-1] for block in self.blocks]
+        self.size = len(pairs)
+        self.offsets = None
+
+    def merge(self, pairs: List[Tuple[Any, str]]):
+        """Add many pairs, re-blocking with one sort when the batch is large relative to the index."""
+        if len(pairs) * 8 < self.size or len(pairs) < 64:
+            for pair in pairs:
+                self.insert(pair)
+        else:
+            self.bulk_load([*self, *pairs])
+
+    def _rank(self, pair: Tuple[Any, ...]) -> int:
+        """Number of stored pairs that sort before `pair`."""
+        index = bisect_left(self.maxes, pair)
+        if index == len(self.maxes):
+            return self.size
+        if self.offsets is None:
+            self.offsets = [0, *accumulate(map(len, self.blocks[:-1]))]
+        return self.offsets[index] + bisect_left(self.blocks[index], pair)
+
+    def count(self, low=None, high=None) -> int:
+        """Number of keys whose value lies in [low, high] (either bound may be None)."""
+        start = 0 if low is None else self._rank((low,))
+        end = self.size if high is None else self._rank((high, "\U0010ffff"))
+        return max(0, end - start)
+
+    def range(self, low=None, high=None, reverse: bool = False) -> Iterator[str]:
+        """Yield keys whose value lies in [low, high] (either bound may be None), in order."""
+        if not self.blocks:
+            return
+        if reverse:
+            if high is None:
+                index, position = len(self.blocks) - 1, len(self.blocks[-1]) - 1
+            else:
+                # (high, chr(0x10FFFF)) sorts after every (high, key) pair for string keys
+                upper = (high, "\U0010ffff")
+                index = min(bisect_left(self.maxes, upper), len(self.maxes) - 1)
+                position = bisect_left(self.blocks[index], upper) - 1
+            while index >= 0:
+                block = self.blocks[index]
+                while position >= 0:
+                    value, key = block[position]
+                    if low is not None and value < low:
+                        return
+                    yield key
+                    position -= 1
+                index -= 1
+                if index >= 0:
+                    position = len(self.blocks[index]) - 1
+        else:
+            if low is None:
+                index, position = 0, 0
+            else:
+                index = bisect_left(self.maxes, (low,))
+                if index == len(self.maxes):
+                    return
+                position = bisect_left(self.blocks[index], (low,))
+            for block in self.blocks[index:]:
+                for value, key in block[position:] if position else block:
+                    if high is not None and value > high:
+                        return
+                    yield key
+                position = 0
+
+# Persistence
+
+class RegistryJournal:
+    """Snapshot and append-only journal files for one registry."""
+    def __init__(self, directory: str, name: str, fields: Sequence[str], sync: bool = False):
+        self.directory = directory
+        self.name = name
+        self.fields = list(fields)
+        self.sync = sync  # fsync after every append (durable across power loss, much slower)
+        self.snapshot_path = os.path.join(directory, f"{name}.snapshot")
+        self.journal_path = os.path.join(directory, f"{name}.journal")
+        self.sequence = 0
+        self.entries_since_snapshot = 0
+        self.journal_file = None
+        os.makedirs(directory, exist_ok=True)
+
+    def load(self) -> Tuple[List[list], List[list]]:
+        """Return (snapshot rows, [seq, op, data] journal entries newer than the snapshot)."""
+        rows, snapshot_sequence = self._read_snapshot()
+        self.sequence = snapshot_sequence
+        entries = []
+        for entry in self._read_journal():
+            if entry[0] > snapshot_sequence:
+                entries.append(entry)
+                self.sequence = entry[0]
+        self.entries_since_snapshot = len(entries)
+        return rows, entries
+
+    def _read_snapshot(self) -> Tuple[List[list], int]:
+        try:
+            snapshot_file = open(self.snapshot_path, 'rb')
+        except FileNotFoundError:
+            return [], 0
+        with snapshot_file:
+            if os.fstat(snapshot_file.fileno()).st_size == 0:
+                return [], 0
+            header = json.loads(snapshot_file.readline())
+            if header.get("format") != SNAPSHOT_FORMAT or header.get("version") != SNAPSHOT_VERSION:
+                raise ValueError(f"Unsupported registry snapshot: {self.snapshot_path}")
+            if header["fields"] != self.fields:
+                raise ValueError(f"Registry snapshot {self.snapshot_path} has fields {header['fields']}, "
+                                 f"expected {self.fields}; rebuild it from the chain.")
+            rows = json.loads(snapshot_file.read())
+        if len(rows) != header["count"]:
+            raise ValueError(f"Registry snapshot {self.snapshot_path} is incomplete.")
+        return rows, header["sequence"]
+
+    def _read_journal(self) -> Iterator[dict]:
+        try:
+            journal_file = open(self.journal_path, 'r+b')
+        except FileNotFoundError:
+            return
+        with journal_file:
+            offset = 0
+            for line in journal_file:
+                if not line.endswith(b"\n"):
+                    # Cut the torn entry so the next append starts on a fresh line
+                    logger.warning("Dropping torn journal entry", path=self.journal_path)
+                    journal_file.truncate(offset)
+                    return
+                offset += len(line)
+                yield json.loads(line)
+
+    def append(self, entries: List[Tuple[str, Any]]):
+        """Append (op, data) entries in one write; op is "put" (record row) or "delete" (key)."""
+        if self.journal_file is None:
+            self.journal_file = open(self.journal_path, 'a', encoding="utf-8")
+        lines = []
+        for op, payload in entries:
+            self.sequence += 1
+            lines.append(json.dumps([self.sequence, op, payload], separators=(",", ":")))
+        self.journal_file.write("\n".join(lines) + "\n")
+        self.journal_file.flush()
+        if self.sync:
+            os.fsync(self.journal_file.fileno())
+        self.entries_since_snapshot += len(entries)
+
+    def write_snapshot(self, rows: Iterable[list], count: int):
+        """Write a complete snapshot atomically, then start an empty journal."""
+        temp_path = f"{self.snapshot_path}.tmp"
+        encoder = json.JSONEncoder(separators=(",", ":"))
+        with open(temp_path, 'w', encoding="utf-8") as snapshot_file:
+            header = {"format": SNAPSHOT_FORMAT, "version": SNAPSHOT_VERSION, "sequence": self.sequence,
+                      "count": count, "fields": self.fields}
+            snapshot_file.write(json.dumps(header) + "\n[")
+            separator = "\n"
+            for row in rows:
+                snapshot_file.write(separator + encoder.encode(row))
+                separator = ",\n"
+            snapshot_file.write("\n]\n")
+            snapshot_file.flush()
+            os.fsync(snapshot_file.fileno())
+        os.replace(temp_path, self.snapshot_path)
+        # Entries up to self.sequence are in the snapshot; a crash before this truncation is
+        # harmless because load() skips them
+        self.close()
+        open(self.journal_path, 'w').close()
+        self.entries_since_snapshot = 0
+
+    def close(self):
+        if self.journal_file is not None:
+            self.journal_file.close()
+            self.journal_file = None
+
+# Indexed Registry
+
+class IndexedRegistry:
+    """In-memory record store with secondary indexes and optional snapshot/journal persistence.
+
+    Subclasses set `fields`, define `key_of`, `encode` (record to row) and `decode` (row to
+    record), and register their indexes in `__init__`. Records must be immutable (frozen
+    dataclasses); updates replace the whole record.
+    """
+    name = "registry"
+    fields: Tuple[str, ...] = ()
+
+    def __init__(self, directory: Optional[str] = None, sync: bool = False, compact_every: int = 100000):
+        self.records: Dict[str, Any] = {}
+        self.hash_indexes: Dict[str, HashIndex] = {}
+        self.ordered_indexes: Dict[str, OrderedIndex] = {}
+        self.lock = threading.RLock()
+        self.compact_every = compact_every
+        self.journal = RegistryJournal(directory, self.name, self.fields, sync) if directory else None
+
+    # Subclass hooks
+
+    def key_of(self, record) -> str:
+        raise NotImplementedError
+
+    def encode(self, record) -> list:
+        raise NotImplementedError
+
+    def decode(self, row: list):
+        raise NotImplementedError
+
+    def add_hash_index(self, name: str, extract: Callable[[Any], Any], multi: bool = False):
+        self.hash_indexes[name] = HashIndex(extract, multi)
+
+    def add_ordered_index(self, name: str, extract: Callable[[Any], Any], multi: bool = False):
+        self.ordered_indexes[name] = OrderedIndex(extract, multi)
+
+    # Loading
+
+    def open(self) -> "IndexedRegistry":
+        """Load the snapshot and replay the journal (no-op without a directory)."""
+        if self.journal is None:
+            return self
+        with self.lock:
+            rows, entries = self.journal.load()
+            self.records = {}
+            for row in rows:
+                record = self.decode(row)
+                self.records[self.key_of(record)] = record
+            for _, op, data in entries:
+                if op == "put":
+                    record = self.decode(data)
+                    self.records[self.key_of(record)] = record
+                else:
+                    self.records.pop(data, None)
+            self._rebuild_indexes()
+        logger.info("Loaded registry", registry=self.name, records=len(self.records), replayed=len(entries))
+        return self
+
+    def _rebuild_indexes(self):
+        for index in self.hash_indexes.values():
+            index.entries = entries = {}
+            for key, record in self.records.items():
+                for value in index.values_of(record):
+                    keys = entries.get(value)
+                    if keys is None:
+                        entries[value] = {key}
+                    else:
+                        keys.add(key)
+        for index in self.ordered_indexes.values():
+            if index.multi:
+                index.bulk_load([(value, key) for key, record in self.records.items() for value in index.values_of(record)])
+            else:
+                index.bulk_load([(value, key) for key, record in self.records.items()
+                                 if (value := index.extract(record)) is not None])
+
+    # Writes
+
+    def put(self, record):
+        """Insert or replace a record."""
+        self.put_many((record,))
+
+    def put_many(self, records: Iterable[Any]) -> int:
+        """Insert or replace records, journaling them in a single append."""
+        with self.lock:
+            count = 0
+            entries = []
+            # Ordered-index entries are collected and merged once at the end of the batch
+            pending: Dict[str, List[Tuple[Any, str]]] = {name: [] for name in self.ordered_indexes}
+            batch_keys = set()
+            for record in records:
+                key = self.key_of(record)
+                if key in batch_keys:
+                    self._merge_pending(pending)  # A repeated key must see its earlier entry
+                    batch_keys.clear()
+                batch_keys.add(key)
+                self._index(record, pending)
+                count += 1
+                if self.journal is not None:
+                    entries.append(("put", self.encode(record)))
+            self._merge_pending(pending)
+            self._journal(entries)
+            return count
+
+    def remove(self, key: str):
+        """Remove a record; raises KeyError if it does not exist."""
+        with self.lock:
+            record = self.records.pop(key)
+            self._unindex(key, record)
+            self._journal([("delete", key)])
+
+    def _index(self, record, pending: Dict[str, List[Tuple[Any, str]]]):
+        key = self.key_of(record)
+        previous = self.records.get(key)
+        if previous is not None:
+            self._unindex(key, previous)
+        self.records[key] = record
+        for index in self.hash_indexes.values():
+            index.add(key, record)
+        for name, index in self.ordered_indexes.items():
+            for value in index.values_of(record):
+                pending[name].append((value, key))
+
+    def _merge_pending(self, pending: Dict[str, List[Tuple[Any, str]]]):
+        for name, pairs in pending.items():
+            if pairs:
+                self.ordered_indexes[name].merge(pairs)
+                pairs.clear()
+
+    def _unindex(self, key: str, record):
+        for index in self.hash_indexes.values():
+            index.remove(key, record)
+        for index in self.ordered_indexes.values():
+            index.remove(key, record)
+
+    def _journal(self, entries: List[Tuple[str, Any]]):
+        if self.journal is None or not entries:
+            return
+        self.journal.append(entries)
+        if self.journal.entries_since_snapshot >= self.compact_every:
+            self.compact()
+
+    def compact(self):
+        """Write a snapshot of all records and truncate the journal."""
+        if self.journal is None:
+            return
+        with self.lock:
+            self.journal.write_snapshot((self.encode(record) for record in self.records.values()), len(self.records))
+        logger.info("Wrote registry snapshot", registry=self.name, records=len(self.records))
+
+    def close(self):
+        if self.journal is not None:
+            self.journal.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+    # Queries
+
+    def get(self, key: str):
+        return self.records.get(key)
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.records
+
+    def keys_where(self, **criteria) -> Optional[Set[str]]:
+        """Intersect hash-index lookups; a list/tuple/set value on a multi index means "all of".
+
+        Returns None when no criteria are given (meaning: every record). The result may be an
+        index's internal set, so treat it as read-only.
+        """
+        lookups = []
+        for name, value in criteria.items():
+            if value is None:
+                continue
+            index = self.hash_indexes.get(name)
+            if index is None:
+                raise ValueError(f"{self.name} has no index named {name}.")
+            if index.multi and isinstance(value, (list, tuple, set, frozenset)):
+                lookups.extend(index.lookup(item) for item in value)
+            else:
+                lookups.append(index.lookup(value))
+        if not lookups:
+            return None
+        if len(lookups) == 1:
+            return lookups[0]  # The index's own set: callers must not modify it
+        lookups.sort(key=len)  # Intersect from the smallest set
+        keys = lookups[0] & lookups[1]
+        for other in lookups[2:]:
+            if not keys:
+                break
+            keys &= other
+        return keys
+
+    def find(self, order_by: Optional[str] = None, low=None, high=None, reverse: bool = False,
+             limit: Optional[int] = None, predicate: Optional[Callable[[Any], bool]] = None, **criteria) -> List[Any]:
+        """Return records matching equality `criteria`, optionally ordered by (and bounded on) an
+        ordered index, filtered by `predicate` and truncated to `limit`.
+        """
+        with self.lock:
+            keys = self.keys_where(**criteria)
+            if order_by is not None:
+                index = self.ordered_indexes.get(order_by)
+                if index is None:
+                    raise ValueError(f"{self.name} has no ordered index named {order_by}.")
+                candidates = index.range(low, high, reverse)
+                if keys is not None:
+                    candidates = (key for key in candidates if key in keys)
+            else:
+                if low is not None or high is not None:
+                    raise ValueError("Range bounds require order_by.")
+                candidates = self.records if keys is None else keys
+            results = []
+            for key in candidates:
+                record = self.records[key]
+                if predicate is None or predicate(record):
+                    results.append(record)
+                    if limit is not None and len(results) >= limit:
+                        break
+            return results
+
+    def count(self, **criteria) -> int:
+        with self.lock:
+            keys = self.keys_where(**criteria)
+            return len(self.records) if keys is None else len(keys)
@@ -0,0 +1,340 @@
+# gaia-chain/registry/service_discovery.py
+
+"""
+Service Discovery for GaiaChain
+
+This module answers "which is the cheapest service satisfying these constraints" from the
+indexes of a ServiceRegistry, so `request_service` can choose a provider instead of requiring the
+caller to know one. Constraints name an attribute, an operator and a value:
+
+- `cost`, `provider`, `service_id`, `active`: fields of the service record
+- `input`, `output`: declared input/output names (`=` means "declares this name")
+- `term.<key>`, `compute.<key>`, `sla.<key>`: a service term, compute requirement or SLA entry
+
+Constraints can be given as `Constraint` objects, `(attribute, operator, value)` tuples, DSL
+`AgentProperty`/`ServiceTerm` objects (equality on `term.<name>`), or a mapping. In a mapping, a
+plain value means equality and an `(operator, value)` tuple a comparison; bare keys refer to terms
+(`{"risk_level": "low", "sla.latency_ms": ("<=", 500)}`) and `max_cost` bounds the cost.
+
+Each query is planned from index statistics. Equality constraints on indexed attributes are hash
+lookups and numeric comparisons are ranges on an ordered index, whose sizes are known without
+touching records. The planner either scans the smallest candidate set and keeps the cheapest
+matches, or walks the cost index from the cheapest service up and stops at the first match,
+whichever it estimates to touch fewer records.
+"""
+
+import heapq
+import operator
+from dataclasses import dataclass
+from typing import Any, Callable, Iterable, List, Mapping, Optional, Sequence, Set, Tuple, Union
+
+from gaia_chain.dsl.rules.core_rules import AgentProperty, GaiaValue, LogicalOperator
+from gaia_chain.dsl.rules.economic_rules import ServiceTerm
+from gaia_chain.registry.service_registry import ATTRIBUTE_NAMESPACES, ServiceRecord, ServiceRegistry
+from gaia_chain.tooling.monitoring.structured_log import get_logger
+
+# Logger setup
+logger = get_logger(__name__)
+
+OPERATORS = {
+    "=": operator.eq,
+    "!=": operator.ne,
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+    "in": lambda value, options: value in options,
+}
+_ALIASES = {"==": "=", LogicalOperator.EQUAL: "=", LogicalOperator.GREATER_THAN: ">", LogicalOperator.LESS_THAN: "<"}
+_RECORD_FIELDS = ("cost", "provider", "service_id", "active")
+_NAME_LISTS = {"input": "inputs", "output": "outputs"}
+
+# Constraints
+
+@dataclass(frozen=True)
+class Constraint:
+    """A requirement on one service attribute, e.g. Constraint("sla.latency_ms", "<=", 500)."""
+    attribute: str
+    op: str
+    value: Any
+
+    def __post_init__(self):
+        op = _ALIASES.get(self.op, self.op)
+        if op not in OPERATORS:
+            raise ValueError(f"Unsupported constraint operator: {self.op}")
+        object.__setattr__(self, "op", op)
+        object.__setattr__(self, "value", _plain(self.value))
+        namespace = self.attribute.split(".", 1)[0]
+        if self.attribute not in _RECORD_FIELDS and self.attribute not in _NAME_LISTS and namespace not in ATTRIBUTE_NAMESPACES:
+            raise ValueError(f"Unknown service attribute: {self.attribute}")
+        if self.attribute in _NAME_LISTS and op not in ("=", "in"):
+            raise ValueError(f"{self.attribute} constraints support '=' and 'in' only.")
+
+    def matches(self, record: ServiceRecord) -> bool:
+        if self.attribute in _NAME_LISTS:
+            names = getattr(record, _NAME_LISTS[self.attribute])
+            return self.value in names if self.op == "=" else any(option in names for option in self.value)
+        value = attribute_value(record, self.attribute)
+        if value is None:
+            return False
+        try:
+            return OPERATORS[self.op](value, self.value)
+        except TypeError:
+            return False  # Incomparable types (e.g. "high" < 3) never match
+
+def _plain(value: Any) -> Any:
+    value = value.value if isinstance(value, GaiaValue) else value
+    return tuple(value) if isinstance(value, (list, set, frozenset)) else value
+
+def attribute_value(record: ServiceRecord, attribute: str) -> Any:
+    """The value a constraint on `attribute` is compared with (None when the record lacks it)."""
+    if attribute in _RECORD_FIELDS:
+        return getattr(record, attribute)
+    namespace, _, key = attribute.partition(".")
+    return getattr(record, ATTRIBUTE_NAMESPACES[namespace]).get(key)
+
+ConstraintSpec = Union[Constraint, AgentProperty, ServiceTerm, Tuple[str, str, Any]]
+
+def parse_constraints(constraints: Union[None, Mapping[str, Any], Iterable[ConstraintSpec]]) -> List[Constraint]:
+    """Normalize the accepted constraint forms (see the module docstring) into Constraints."""
+    if not constraints:
+        return []
+    if isinstance(constraints, Mapping):
+        parsed = []
+        for key, value in constraints.items():
+            if key == "max_cost":
+                parsed.append(Constraint("cost", "<=", value))
+            elif isinstance(value, tuple) and len(value) == 2 and (value[0] in OPERATORS or value[0] in _ALIASES):
+                parsed.append(Constraint(_qualify(key), value[0], value[1]))
+            else:
+                parsed.append(Constraint(_qualify(key), "=", value))
+        return parsed
+    parsed = []
+    for constraint in constraints:
+        if isinstance(constraint, Constraint):
+            parsed.append(constraint)
+        elif isinstance(constraint, AgentProperty):
+            parsed.append(Constraint(_qualify(constraint.name), "=", constraint.value))
+        elif isinstance(constraint, ServiceTerm):
+            parsed.append(Constraint(_qualify(constraint.key), "=", constraint.value))
+        else:
+            parsed.append(Constraint(_qualify(constraint[0]), constraint[1], constraint[2]))
+    return parsed
+
+def _qualify(name: str) -> str:
+    if name in _RECORD_FIELDS or name in _NAME_LISTS or name.split(".", 1)[0] in ATTRIBUTE_NAMESPACES:
+        return name
+    return f"term.{name}"
+
+def request_constraints(constraints: Any) -> Any:
+    """Extract the service constraints from an `AgentCore.request_service` constraints argument.
+
+    Requests issued by DSL actions carry `{"inputs": ..., "constraints": {...}}`; direct callers
+    pass the constraints themselves.
+    """
+    if isinstance(constraints, Mapping) and "inputs" in constraints:
+        nested = constraints.get("constraints")
+        return nested if isinstance(nested, (Mapping, list, tuple)) else None
+    return constraints
+
+def bind_provider(constraints: Any, provider: str) -> Any:
+    """Return request constraints that name `provider`, in a form the request encoders can serialize.
+
+    Mappings gain a "provider" key (inside the nested DSL form); constraint lists are normalized
+    to (attribute, operator, value) triples followed by a provider equality.
+    """
+    if isinstance(constraints, Mapping) and "inputs" in constraints:
+        return {**constraints, "constraints": bind_provider(request_constraints(constraints), provider)}
+    if constraints is None or isinstance(constraints, Mapping):
+        return {**(constraints or {}), "provider": provider}
+    triples = [(constraint.attribute, constraint.op, constraint.value) for constraint in parse_constraints(constraints)]
+    return triples + [("provider", "=", provider)]
+
+def requested_provider(constraints: Any) -> Optional[str]:
+    """The provider a request's constraints pin with an equality, if any."""
+    constraints = request_constraints(constraints)
+    if isinstance(constraints, Mapping):
+        return constraints.get("provider")
+    for constraint in parse_constraints(constraints):
+        if constraint.attribute == "provider" and constraint.op == "=":
+            return constraint.value
+    return None
+
+# Query Planning
+
+class ServiceDiscovery:
+    """Constraint-matching queries over a ServiceRegistry's indexes."""
+    def __init__(self, registry: ServiceRegistry):
+        self.registry = registry
+        self.stats = {"queries": 0, "scans": 0, "cost_walks": 0, "records_checked": 0}
+
+    def find(self, constraints=None, limit: int = 1, include_inactive: bool = False) -> List[ServiceRecord]:
+        """Up to `limit` services satisfying every constraint, cheapest first (ties by key)."""
+        parsed = parse_constraints(constraints)
+        if not include_inactive:
+            parsed.append(Constraint("active", "=", True))
+        registry = self.registry
+        with registry.lock:
+            self.stats["queries"] += 1
+            total = len(registry)
+            if total == 0 or limit <= 0:
+                return []
+            cost_low, cost_high, sets, ranges, checks = self._plan(parsed)
+            if any(not keys for keys in sets):
+                return []
+            # Candidate sources: equality sets (exact) and numeric ranges (sized by count)
+            sources: List[Tuple[int, Any]] = [(len(keys), keys) for keys in sets]
+            sources += [(registry.ordered_indexes["numeric"].count(low, high), (low, high)) for low, high in ranges]
+            cost_span = total
+            if cost_low is not None or cost_high is not None:
+                cost_span = registry.ordered_indexes["cost"].count(cost_low, cost_high)
+                sources.append((cost_span, None))
+            sources.sort(key=lambda source: source[0])
+            # Expected matches assuming independent constraints. Walking the cost range touches
+            # about cost_span / matches records per result; a scan touches the whole smallest source.
+            selectivity = 1.0
+            for size, _ in sources:
+                selectivity *= size / total
+            expected = max(total * selectivity, 1.0)
+            scan_size = sources[0][0] if sources else total
+            if scan_size == 0:
+                return []
+            if sources and scan_size <= min(limit * cost_span / expected, cost_span):
+                self.stats["scans"] += 1
+                return self._scan(sources[0][1], cost_low, cost_high, sets, checks, limit)
+            self.stats["cost_walks"] += 1
+            return self._walk(cost_low, cost_high, sets, checks, limit)
+
+    def cheapest(self, constraints=None) -> Optional[ServiceRecord]:
+        matches = self.find(constraints, limit=1)
+        return matches[0] if matches else None
+
+    def resolve(self, service_id: Optional[str], payment: Optional[float], constraints=None) -> Optional[ServiceRecord]:
+        """Cheapest active offering of `service_id` (any service when None) within `payment`."""
+        parsed = parse_constraints(request_constraints(constraints))
+        if service_id:
+            parsed.append(Constraint("service_id", "=", service_id))
+        if payment is not None:
+            parsed.append(Constraint("cost", "<=", payment))
+        return self.cheapest(parsed)
+
+    def _plan(self, constraints: Sequence[Constraint]):
+        """Split constraints into cost bounds, index key sets, numeric ranges and record checks."""
+        registry = self.registry
+        cost_low = cost_high = None
+        sets: List[Set[str]] = []
+        ranges: List[Tuple[Any, Any]] = []
+        checks: List[Callable[[ServiceRecord], bool]] = []
+        for constraint in constraints:
+            attribute, op, value = constraint.attribute, constraint.op, constraint.value
+            if attribute == "cost" and op in ("<", "<=", ">", ">=", "="):
+                if op in ("<", "<=", "="):
+                    cost_high = value if cost_high is None else min(cost_high, value)
+                if op in (">", ">=", "="):
+                    cost_low = value if cost_low is None else max(cost_low, value)
+                if op in ("<", ">"):
+                    checks.append(constraint.matches)  # The range is inclusive; exclude the bound
+                continue
+            if attribute == "active" and op == "=":
+                checks.append(constraint.matches)  # Nearly every record is active: check, don't index
+                continue
+            index_name, lookup = self._lookup(attribute, value)
+            if index_name is not None and op == "=":
+                sets.append(registry.hash_indexes[index_name].lookup(lookup))
+                continue
+            if index_name is not None and op == "in" and isinstance(value, tuple):
+                index = registry.hash_indexes[index_name]
+                sets.append(set().union(*(index.lookup(self._lookup(attribute, option)[1]) for option in value)))
+                continue
+            if "." in attribute and op in ("<", "<=", ">", ">=") and _is_number(value):
+                low = (attribute, value) if op in (">", ">=") else (attribute, float("-inf"))
+                high = (attribute, value) if op in ("<", "<=") else (attribute, float("inf"))
+                ranges.append((low, high))  # Sizes the query; the check applies it when another source drives
+                checks.append(constraint.matches)
+                continue
+            checks.append(constraint.matches)
+        return cost_low, cost_high, sets, ranges, checks
+
+    @staticmethod
+    def _lookup(attribute: str, value: Any) -> Tuple[Optional[str], Any]:
+        """The hash index (and lookup value) answering `attribute = value` exactly, if any."""
+        if attribute in ("provider", "service_id", "input", "output"):
+            return attribute, value
+        if "." in attribute and isinstance(value, (str, int, float, bool)):
+            return "attribute", (attribute, value)
+        return None, None
+
+    def _accepts(self, key: str, sets: List[Set[str]], checks) -> Optional[ServiceRecord]:
+        for keys in sets:
+            if key not in keys:
+                return None
+        record = self.registry.records[key]
+        for check in checks:
+            if not check(record):
+                return None
+        return record
+
+    def _scan(self, source, cost_low, cost_high, sets, checks, limit) -> List[ServiceRecord]:
+        registry = self.registry
+        if source is None:
+            keys = registry.ordered_indexes["cost"].range(cost_low, cost_high)
+        elif isinstance(source, tuple):
+            keys = registry.ordered_indexes["numeric"].range(*source)
+        else:
+            keys = source
+        matches = []
+        checked = 0
+        for key in keys:
+            checked += 1
+            record = self._accepts(key, sets, checks)
+            if record is None:
+                continue
+            if (cost_low is not None and record.cost < cost_low) or (cost_high is not None and record.cost > cost_high):
+                continue
+            matches.append(record)
+        self.stats["records_checked"] += checked
+        return heapq.nsmallest(limit, matches, key=lambda record: (record.cost, record.key))
+
+    def _walk(self, cost_low, cost_high, sets, checks, limit) -> List[ServiceRecord]:
+        matches = []
+        checked = 0
+        for key in self.registry.ordered_indexes["cost"].range(cost_low, cost_high):
+            checked += 1
+            record = self._accepts(key, sets, checks)
+            if record is not None:
+                matches.append(record)
+                if len(matches) >= limit:
+                    break
+        self.stats["records_checked"] += checked
+        return matches
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+# Example usage (for illustration purposes, not part of the module)
+if __name__ == "__main__":
+    import random
+    import time
+    from gaia_chain.dsl.rules.core_rules import GaiaType
+
+    rng = random.Random(7)
+    registry = ServiceRegistry()
+    registry.put_many(
+        ServiceRecord(service_id=f"svc_{i % 50}", provider=f"provider_{i:06d}", cost=rng.randint(1, 1000),
+                      outputs=(rng.choice(("report", "forecast", "signal")),),
+                      terms={"risk_level": rng.choice(("low", "medium", "high")), "verification": rng.choice(("zkml", "none"))},
+                      compute_requirements={"gpu": rng.randint(0, 4)}, sla={"latency_ms": rng.choice((100, 250, 500, 1000))})
+        for i in range(100000))
+    discovery = ServiceDiscovery(registry)
+    queries = [
+        {"risk_level": "low", "output": "report", "sla.latency_ms": ("<=", 250)},
+        [AgentProperty("verification", GaiaValue(GaiaType.STRING, "zkml")), ("compute.gpu", "<=", 1), ("cost", ">=", 500)],
+        {"service_id": "svc_3", "risk_level": "high", "max_cost": 30},
+    ]
+    for query in queries:
+        start = time.perf_counter()
+        for _ in range(1000):
+            match = discovery.cheapest(query)
+        print(f"{(time.perf_counter() - start) * 1000:.1f}us", match)
+    print(discovery.resolve("svc_3", 20, {"inputs": "[]", "constraints": {"risk_level": "low"}}))
+    print(discovery.stats)
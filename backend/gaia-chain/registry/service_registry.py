@@ -0,0 +1,145 @@
+# gaia-chain/registry/service_registry.py
+
+"""
+Service Registry for GaiaChain
+
+This module keeps a local, indexed view of registered services. Records are indexed by service
+ID, provider, input and output names and term keys (the constraint keys a service declares, e.g.
+`risk_level`), and ordered by cost, so "services producing `report` under 20 GAIA" is answered
+from memory. Term, compute requirement and SLA values are also indexed as named attributes
+(`term.risk_level`, `compute.gpu`, `sla.latency_ms`): scalar values by equality, numeric values
+in order, for constraint matching (see registry/service_discovery.py). With a directory, the registry persists to a snapshot plus journal (see
+registry/registry_core.py).
+"""
+
+import time
+from dataclasses import dataclass, field, fields, replace
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from gaia_chain.dsl.rules.economic_rules import ServiceAgreement, ServiceTerm
+from gaia_chain.registry.registry_core import IndexedRegistry
+
+@dataclass(frozen=True)
+class ServiceRecord:
+    """Registry entry for one service offering.
+
+    `terms`, `compute_requirements` and `sla` are treated as read-only once registered.
+    """
+    service_id: str
+    provider: str
+    cost: float
+    inputs: Tuple[str, ...] = ()
+    outputs: Tuple[str, ...] = ()
+    terms: Dict[str, Any] = field(default_factory=dict)
+    compute_requirements: Dict[str, Any] = field(default_factory=dict)
+    sla: Dict[str, Any] = field(default_factory=dict)
+    active: bool = True
+    registered_block: Optional[int] = None
+    updated_at: float = field(default_factory=time.time)
+
+    @property
+    def key(self) -> str:
+        return f"{self.provider}/{self.service_id}"
+
+    @classmethod
+    def from_agreement(cls, agreement: ServiceAgreement, provider: str, terms: Iterable[ServiceTerm] = (), **fields) -> "ServiceRecord":
+        """Build a record from a DSL ServiceAgreement and the provider's declared terms."""
+        return cls(
+            service_id=agreement.service_id,
+            provider=provider,
+            cost=agreement.cost.amount,
+            inputs=tuple(agreement.inputs or ()),
+            outputs=tuple(agreement.outputs or ()),
+            terms={term.key: term.value for term in terms},
+            compute_requirements=dict(agreement.compute_requirements or {}),
+            sla=dict(agreement.sla or {}),
+            **fields,
+        )
+
+_INPUTS, _OUTPUTS = 3, 4  # Positions in the persisted row (ServiceRecord field order)
+
+# Attribute namespaces: `<namespace>.<key>` names a value in one of the record's mappings
+ATTRIBUTE_NAMESPACES = {"term": "terms", "compute": "compute_requirements", "sla": "sla"}
+
+def attribute_items(record: ServiceRecord) -> Iterator[Tuple[str, Any]]:
+    """Yield (attribute name, value) for every term, compute requirement and SLA entry."""
+    for namespace, field_name in ATTRIBUTE_NAMESPACES.items():
+        for key, value in getattr(record, field_name).items():
+            yield f"{namespace}.{key}", value
+
+def _scalar_attributes(record: ServiceRecord) -> Set[Tuple[str, Any]]:
+    return {(name, value) for name, value in attribute_items(record) if isinstance(value, (str, int, float, bool))}
+
+def _numeric_attributes(record: ServiceRecord) -> List[Tuple[str, Any]]:
+    return [(name, value) for name, value in attribute_items(record)
+            if isinstance(value, (int, float)) and not isinstance(value, bool)]
+
+class ServiceRegistry(IndexedRegistry):
+    """Indexed in-memory registry of service offerings, keyed by provider and service ID."""
+    name = "services"
+    fields = tuple(item.name for item in fields(ServiceRecord))
+
+    def __init__(self, directory: Optional[str] = None, sync: bool = False, compact_every: int = 100000):
+        super().__init__(directory, sync, compact_every)
+        self.add_hash_index("service_id", lambda record: record.service_id)
+        self.add_hash_index("provider", lambda record: record.provider)
+        self.add_hash_index("active", lambda record: record.active)
+        self.add_hash_index("input", lambda record: record.inputs, multi=True)
+        self.add_hash_index("output", lambda record: record.outputs, multi=True)
+        self.add_hash_index("term_key", lambda record: record.terms, multi=True)
+        self.add_hash_index("attribute", _scalar_attributes, multi=True)  # (name, value) pairs
+        self.add_ordered_index("cost", lambda record: record.cost)
+        self.add_ordered_index("numeric", _numeric_attributes, multi=True)  # (name, number), grouped by name
+
+    def key_of(self, record: ServiceRecord) -> str:
+        return record.key
+
+    def encode(self, record: ServiceRecord) -> list:
+        return [getattr(record, name) for name in self.fields]
+
+    def decode(self, row: list) -> ServiceRecord:
+        row[_INPUTS] = tuple(row[_INPUTS])
+        row[_OUTPUTS] = tuple(row[_OUTPUTS])
+        return ServiceRecord(*row)
+
+    # Writes
+
+    def register(self, record: ServiceRecord) -> ServiceRecord:
+        self.put(record)
+        return record
+
+    def update(self, key: str, **changes) -> ServiceRecord:
+        """Replace fields of an existing record; raises KeyError for unknown services."""
+        with self.lock:
+            record = replace(self.records[key], updated_at=time.time(), **changes)
+            self.put(record)
+            return record
+
+    def deactivate(self, key: str) -> ServiceRecord:
+        return self.update(key, active=False)
+
+    # Queries
+
+    def offerings(self, service_id: str, active: Optional[bool] = True) -> List[ServiceRecord]:
+        """All providers' offerings of a service ID, cheapest first."""
+        return self.find(order_by="cost", service_id=service_id, active=active)
+
+    def by_provider(self, provider: str) -> List[ServiceRecord]:
+        return self.find(provider=provider)
+
+    def cheapest(self, limit: int = 1, max_cost: Optional[float] = None, **criteria) -> List[ServiceRecord]:
+        """Cheapest active services matching index `criteria` (e.g. output="report")."""
+        criteria.setdefault("active", True)
+        return self.find(order_by="cost", high=max_cost, limit=limit, **criteria)
+
+# Example usage (for illustration purposes, not part of the module)
+if __name__ == "__main__":
+    from gaia_chain.dsl.rules.economic_rules import Payment
+
+    registry = ServiceRegistry()
+    agreement = ServiceAgreement("DataAnalysis", {"data": "market_data"}, {"report": "analysis_report"},
+                                 Payment(amount=12, recipient="provider_001"), {"gpu": 1}, {"latency_ms": 500})
+    registry.register(ServiceRecord.from_agreement(agreement, "provider_001", [ServiceTerm("risk_level", "low")]))
+    registry.register(ServiceRecord(service_id="DataAnalysis", provider="provider_002", cost=8, outputs=("report",)))
+    print([(record.provider, record.cost) for record in registry.offerings("DataAnalysis")])
+    print(registry.cheapest(output="report", term_key="risk_level"))
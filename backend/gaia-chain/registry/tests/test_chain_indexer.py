@@ -0,0 +1,171 @@
+# gaia-chain/registry/tests/test_chain_indexer.py
+
+"""
+Tests for adaptive log ranges, checkpoints and reorg rollback (registry/chain_indexer.py).
+"""
+
+import pytest
+
+from gaia_chain.agents.runtime.agent_core import AgentState
+from gaia_chain.registry.chain_indexer import (
+    AGENT_REGISTERED, AGENT_STATE_CHANGED, SERVICE_REGISTERED, SERVICE_UPDATED, ChainIndexer, encode_log
+)
+from gaia_chain.testing.rpc.local_node import LocalJsonRpcNode
+from gaia_chain.tooling.rpc.json_rpc_client import JsonRpcClient
+
+CONTRACT = "0x00000000000000000000000000000000000000cc"
+PROVIDER = f"0x{7:040x}"
+
+def agent(i):
+    return f"0x{i:040x}"
+
+class RecordingTransport:
+    """Forwards to a LocalJsonRpcNode, recording the (fromBlock, toBlock) of every eth_getLogs query."""
+    def __init__(self, node):
+        self.node = node
+        self.ranges = []
+
+    def __call__(self, payload):
+        for request in payload if isinstance(payload, list) else [payload]:
+            if request["method"] == "eth_getLogs":
+                query = request["params"][0]
+                self.ranges.append((int(query["fromBlock"], 16), int(query["toBlock"], 16)))
+        return self.node(payload)
+
+def register(node, i, stake=100):
+    node.emit_log(CONTRACT, *encode_log(AGENT_REGISTERED, agent=agent(i), owner=agent(1000), stake=stake))
+
+def change_state(node, i, state):
+    node.emit_log(CONTRACT, *encode_log(AGENT_STATE_CHANGED, agent=agent(i), state=state))
+
+def open_indexer(node, directory, **options):
+    transport = RecordingTransport(node)
+    return ChainIndexer.open(JsonRpcClient(transport), CONTRACT, str(directory), **options), transport
+
+def snapshot(indexer):
+    agents = {record.id: (record.state, record.stake) for record in indexer.agents.find()}
+    services = {key: (record.cost, record.active) for key, record in
+                ((key, indexer.services.get(key)) for key in sorted(indexer.services.records))}
+    return agents, services
+
+@pytest.fixture
+def node():
+    return LocalJsonRpcNode(max_logs_per_query=10)
+
+# Adaptive Block Ranges
+
+def test_range_halves_on_rejection_and_grows_back_to_the_last_safe_range(node, tmp_path):
+    for i in range(1, 61):  # One registration per block
+        register(node, i)
+        node.mine()
+    indexer, transport = open_indexer(node, tmp_path, start_block=1, initial_range=2, target_logs=1000)
+    assert indexer.sync() == 60
+    sizes = [end - start + 1 for start, end in transport.ranges]
+    # Doubles while steps are cheap, halves once 16 blocks exceed the 10-log limit, then never grows past 8
+    assert sizes[:6] == [2, 4, 8, 16, 8, 8]
+    assert all(size <= 8 for size in sizes[5:])
+    assert indexer.stats["range_errors"] == 1
+    assert len(indexer.agents) == 60
+    indexer.close()
+
+def test_range_does_not_grow_after_a_busy_step(node, tmp_path):
+    for i in range(1, 31):
+        register(node, i)
+        node.mine()
+    indexer, transport = open_indexer(node, tmp_path, start_block=1, initial_range=5, target_logs=8)
+    indexer.sync()
+    assert {end - start + 1 for start, end in transport.ranges} == {5}  # 5 logs per step is not below 8 // 2
+
+def test_rejection_at_the_minimum_range_is_raised(tmp_path):
+    node = LocalJsonRpcNode(max_logs_per_query=2)
+    for i in range(1, 4):
+        register(node, i)  # Three logs in one block
+    node.mine()
+    indexer, _ = open_indexer(node, tmp_path, start_block=1, initial_range=4)
+    with pytest.raises(Exception, match="more than 2 results"):
+        indexer.sync()
+    assert indexer.last_block == 0  # Nothing applied or checkpointed
+
+# Checkpoints
+
+def test_resume_from_the_checkpoint(node, tmp_path):
+    for i in range(1, 21):
+        register(node, i)
+        if i % 4 == 0:
+            change_state(node, i, 1)
+        node.mine()
+    indexer, _ = open_indexer(node, tmp_path, start_block=1, initial_range=8)
+    indexer.sync()
+    assert indexer.last_block == 20
+    indexer.close()
+
+    for i in range(21, 31):
+        register(node, i)
+        node.mine()
+    change_state(node, 2, 2)
+    node.mine()
+    resumed, transport = open_indexer(node, tmp_path, start_block=1, initial_range=8)
+    assert resumed.last_block == 20
+    assert resumed.sync() == 11
+    assert transport.ranges[0][0] == 21  # Only the new blocks are queried
+    assert resumed.agents.get(agent(2)).state == AgentState.DEACTIVATED
+    assert resumed.agents.count(state=AgentState.ACTIVE) == 5
+
+    fresh, _ = open_indexer(node, tmp_path / "fresh", start_block=1, initial_range=8)
+    fresh.sync()
+    assert snapshot(resumed) == snapshot(fresh)
+    resumed.close()
+    fresh.close()
+
+def test_checkpoint_belongs_to_one_contract(node, tmp_path):
+    register(node, 1)
+    node.mine()
+    indexer, _ = open_indexer(node, tmp_path)
+    indexer.sync()
+    indexer.close()
+    with pytest.raises(ValueError, match="belongs to contract"):
+        ChainIndexer.open(JsonRpcClient(node), f"0x{0xdd:040x}", str(tmp_path))
+
+# Reorgs
+
+def test_reorg_rolls_back_to_the_fork_point(node, tmp_path):
+    for i in range(1, 11):  # Agent i is registered in block i
+        register(node, i)
+        node.emit_log(CONTRACT, *encode_log(SERVICE_REGISTERED, provider=PROVIDER, serviceId=f"svc{i}", cost=i))
+        node.mine()
+    change_state(node, 3, 1)  # Block 11
+    node.emit_log(CONTRACT, *encode_log(SERVICE_UPDATED, provider=PROVIDER, serviceId="svc2", cost=50, active=False))
+    node.mine()
+    register(node, 12)  # Block 12
+    node.mine()
+    indexer, _ = open_indexer(node, tmp_path, start_block=1, initial_range=4, reorg_depth=5)
+    indexer.sync()
+    assert indexer.agents.get(agent(3)).state == AgentState.ACTIVE
+
+    # Blocks 10-12 are replaced: the fork registers agent 99 instead and a different state change
+    topics, data = encode_log(AGENT_REGISTERED, agent=agent(99), owner=agent(1000), stake=7)
+    fork_topics, fork_data = encode_log(AGENT_STATE_CHANGED, agent=agent(4), state=2)
+    node.reorg(3, {1: [{"address": CONTRACT, "topics": topics, "data": data}],
+                   3: [{"address": CONTRACT, "topics": fork_topics, "data": fork_data}]})
+    indexer.sync()
+    assert indexer.stats["reorgs"] == 1
+    assert agent(10) not in indexer.agents and agent(12) not in indexer.agents
+    assert indexer.agents.get(agent(3)).state == AgentState.PROPOSED
+    assert indexer.agents.get(agent(4)).state == AgentState.DEACTIVATED
+    assert indexer.agents.get(agent(99)).stake == 7
+    assert indexer.services.get(f"{PROVIDER}/svc2").cost == 2
+    assert f"{PROVIDER}/svc10" not in indexer.services
+
+    fresh, _ = open_indexer(node, tmp_path / "fresh", start_block=1, initial_range=4)
+    fresh.sync()
+    assert snapshot(indexer) == snapshot(fresh)
+    indexer.close()
+    fresh.close()
+
+def test_undo_entries_are_pruned_beyond_the_reorg_depth(node, tmp_path):
+    for i in range(1, 41):
+        register(node, i)
+        node.mine()
+    indexer, _ = open_indexer(node, tmp_path, start_block=1, initial_range=4, reorg_depth=6)
+    indexer.sync()
+    assert indexer.undo and min(block for block, *_ in indexer.undo) > 40 - 6
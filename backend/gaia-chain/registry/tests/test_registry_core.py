@@ -0,0 +1,143 @@
+# gaia-chain/registry/tests/test_registry_core.py
+
+"""
+Tests for registry indexes and snapshot + journal persistence (registry/registry_core.py).
+"""
+
+import json
+import os
+import random
+
+import pytest
+
+from gaia_chain.agents.runtime.agent_core import AgentState
+from gaia_chain.registry.agent_registry import AgentRecord, AgentRegistry
+from gaia_chain.registry.registry_core import OrderedIndex
+
+def record(i, **changes):
+    fields = dict(id=f"agent_{i:03d}", owner=f"owner_{i % 3}", state=AgentState.ACTIVE,
+                  capabilities=("analysis",) if i % 2 else ("analysis", "forecasting"), stake=i,
+                  reputation=float(i % 7), updated_at=1.0)
+    fields.update(changes)
+    return AgentRecord(**fields)
+
+def state_of(registry):
+    return {key: registry.get(key) for key in sorted(registry.records)}
+
+def reopen(directory, **options):
+    return AgentRegistry(str(directory), **options).open()
+
+# Journal Replay
+
+def test_writes_survive_a_restart_through_the_journal(tmp_path):
+    with reopen(tmp_path) as registry:
+        registry.put_many(record(i) for i in range(20))
+        registry.update_state("agent_001", AgentState.DEACTIVATED)
+        registry.remove("agent_002")
+        expected = state_of(registry)
+    with reopen(tmp_path) as loaded:
+        assert state_of(loaded) == expected
+        assert loaded.journal.entries_since_snapshot == 22
+        assert loaded.get("agent_001").state == AgentState.DEACTIVATED
+        assert "agent_002" not in loaded
+
+def test_indexes_are_rebuilt_on_open(tmp_path):
+    with reopen(tmp_path) as registry:
+        registry.put_many(record(i) for i in range(20))
+        registry.update("agent_004", owner="owner_x", stake=100)
+    with reopen(tmp_path) as loaded:
+        assert [r.id for r in loaded.by_owner("owner_x")] == ["agent_004"]
+        assert loaded.count(owner="owner_1") == 6  # agent_004 moved out of owner_1
+        assert [r.id for r in loaded.find(order_by="stake", reverse=True, limit=2)] == ["agent_004", "agent_019"]
+        assert loaded.count(capability=["analysis", "forecasting"], state=AgentState.ACTIVE) == 10
+
+def test_torn_final_entry_is_dropped(tmp_path):
+    with reopen(tmp_path) as registry:
+        registry.put_many(record(i) for i in range(3))
+    with open(tmp_path / "agents.journal", "a") as journal:
+        journal.write('[4,"put",["agent_9')  # A crash mid-write
+    with reopen(tmp_path) as loaded:
+        assert len(loaded) == 3
+        loaded.put(record(3))
+    with reopen(tmp_path) as loaded:
+        assert sorted(loaded.records) == [f"agent_{i:03d}" for i in range(4)]
+        assert loaded.journal.sequence == 4
+
+# Snapshots
+
+def test_snapshot_then_journal(tmp_path):
+    with reopen(tmp_path) as registry:
+        registry.put_many(record(i) for i in range(10))
+        registry.compact()
+        assert os.path.getsize(tmp_path / "agents.journal") == 0
+        registry.put(record(10))
+        registry.remove("agent_000")
+        expected = state_of(registry)
+    with reopen(tmp_path) as loaded:
+        assert state_of(loaded) == expected
+        assert loaded.journal.entries_since_snapshot == 2  # Only entries after the snapshot replay
+
+def test_entries_already_in_the_snapshot_are_skipped(tmp_path):
+    with reopen(tmp_path) as registry:
+        registry.put_many(record(i) for i in range(5))
+        with open(tmp_path / "agents.journal", "rb") as journal:
+            stale = journal.read()
+        registry.compact()
+    # Simulate a crash between writing the snapshot and truncating the journal
+    with open(tmp_path / "agents.journal", "wb") as journal:
+        journal.write(stale)
+    with reopen(tmp_path) as loaded:
+        assert len(loaded) == 5
+        assert loaded.journal.entries_since_snapshot == 0
+        loaded.put(record(5))
+        assert loaded.journal.sequence == 6
+
+def test_automatic_compaction(tmp_path):
+    with reopen(tmp_path, compact_every=4) as registry:
+        for i in range(5):
+            registry.put(record(i))
+        assert registry.journal.entries_since_snapshot == 1
+    with open(tmp_path / "agents.snapshot", "rb") as snapshot:
+        header = json.loads(snapshot.readline())
+    assert (header["sequence"], header["count"]) == (4, 4)
+    with reopen(tmp_path) as loaded:
+        assert len(loaded) == 5
+
+def test_snapshot_with_other_fields_is_rejected(tmp_path):
+    with reopen(tmp_path) as registry:
+        registry.put(record(0))
+        registry.compact()
+    class RenamedRegistry(AgentRegistry):
+        fields = AgentRegistry.fields[:-1] + ("modified_at",)
+    with pytest.raises(ValueError, match="rebuild it from the chain"):
+        RenamedRegistry(str(tmp_path)).open()
+
+# Ordered Index
+
+def test_ordered_index_ranges_across_blocks(monkeypatch):
+    monkeypatch.setattr(OrderedIndex, "BLOCK_SIZE", 4)
+    index = OrderedIndex(lambda value: value)
+    for i in reversed(range(50)):
+        index.add(f"k{i:02d}", i)
+    index.remove("k10", 10)
+    assert len(index.blocks) > 1
+    assert list(index.range(8, 12)) == ["k08", "k09", "k11", "k12"]
+    assert list(index.range(8, 12, reverse=True)) == ["k12", "k11", "k09", "k08"]
+    assert index.count(8, 12) == 4
+    assert index.count() == 49
+
+def test_ordered_index_counts_stay_exact_between_writes(monkeypatch):
+    monkeypatch.setattr(OrderedIndex, "BLOCK_SIZE", 4)
+    rng = random.Random(3)
+    index = OrderedIndex(lambda value: value)
+    stored = {}
+    for step in range(400):
+        key = f"k{rng.randrange(120):03d}"
+        if key in stored and rng.random() < 0.4:
+            index.remove(key, stored.pop(key))
+        elif key not in stored:
+            stored[key] = rng.randrange(60)
+            index.add(key, stored[key])
+        low, high = sorted(rng.sample(range(-5, 65), 2))
+        assert index.count(low, high) == sum(low <= value <= high for value in stored.values())
+        assert index.count(low=low) == sum(value >= low for value in stored.values())
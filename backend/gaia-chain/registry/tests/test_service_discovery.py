@@ -0,0 +1,154 @@
+# gaia-chain/registry/tests/test_service_discovery.py
+
+"""
+Tests for constraint planning and matching against a brute-force filter (registry/service_discovery.py).
+"""
+
+import json
+import random
+
+import pytest
+
+from gaia_chain.agents.runtime.agent_core import AgentCore
+from gaia_chain.dsl.rules.core_rules import AgentProperty, GaiaType, GaiaValue
+from gaia_chain.registry.service_discovery import (
+    Constraint, ServiceDiscovery, bind_provider, parse_constraints, request_constraints, requested_provider
+)
+from gaia_chain.registry.service_registry import ServiceRecord, ServiceRegistry
+
+def random_registry(count=600, seed=11):
+    rng = random.Random(seed)
+    registry = ServiceRegistry()
+    registry.put_many(
+        ServiceRecord(service_id=f"svc_{i % 12}", provider=f"provider_{i:04d}", cost=rng.randint(1, 100),
+                      inputs=tuple(rng.sample(("data", "model", "prices"), rng.randint(0, 2))),
+                      outputs=(rng.choice(("report", "forecast", "signal")),),
+                      terms={"risk_level": rng.choice(("low", "medium", "high")),
+                             "verification": rng.choice(("zkml", "none"))},
+                      compute_requirements={"gpu": rng.randint(0, 4)},
+                      sla={"latency_ms": rng.choice((100, 250, 500, 1000))},
+                      active=rng.random() > 0.1)
+        for i in range(count))
+    return registry
+
+def brute_force(registry, constraints, limit, include_inactive=False):
+    parsed = parse_constraints(constraints)
+    matches = [record for record in registry.records.values()
+               if (include_inactive or record.active) and all(constraint.matches(record) for constraint in parsed)]
+    return sorted(matches, key=lambda record: (record.cost, record.key))[:limit]
+
+@pytest.fixture(scope="module")
+def registry():
+    return random_registry()
+
+QUERIES = [
+    {},
+    {"risk_level": "low", "output": "report", "sla.latency_ms": ("<=", 250)},
+    {"service_id": "svc_3", "max_cost": 40},
+    {"provider": "provider_0042"},
+    [("cost", ">", 30), ("cost", "<", 70)],
+    [("cost", ">=", 20), ("cost", "<=", 80), ("cost", ">", 25), ("cost", "<", 75), ("cost", "<=", 90)],
+    [("cost", "=", 50)],
+    [("cost", ">", 99)],
+    [("compute.gpu", ">", 2)],
+    [("compute.gpu", "<", 1), ("sla.latency_ms", ">=", 500)],
+    [("sla.latency_ms", "!=", 100), ("verification", "=", "zkml")],
+    [("provider", "in", ["provider_0001", "provider_0100", "provider_0599", "nobody"])],
+    [("output", "in", ["report", "signal"]), ("input", "=", "model")],
+    [("term.risk_level", "in", ("low", "high")), ("cost", "<", 10)],
+    [Constraint("service_id", "in", ("svc_1", "svc_2")), Constraint("compute.gpu", ">=", 3)],
+    [AgentProperty("risk_level", GaiaValue(GaiaType.STRING, "medium")), ("cost", ">=", 60)],
+    [("term.risk_level", "=", "extreme")],
+]
+
+# Planner vs Brute Force
+
+@pytest.mark.parametrize("limit", [1, 5, 1000])
+@pytest.mark.parametrize("query", QUERIES, ids=[str(index) for index in range(len(QUERIES))])
+def test_find_matches_brute_force(registry, query, limit):
+    discovery = ServiceDiscovery(registry)
+    assert discovery.find(query, limit=limit) == brute_force(registry, query, limit)
+    assert discovery.find(query, limit=limit, include_inactive=True) == brute_force(registry, query, limit, True)
+
+def test_both_plans_are_used_and_agree(registry):
+    discovery = ServiceDiscovery(registry)
+    for query in QUERIES:
+        for limit in (1, 1000):
+            discovery.find(query, limit=limit)
+    assert discovery.stats["scans"] > 0 and discovery.stats["cost_walks"] > 0
+    scan = ServiceDiscovery(registry)
+    assert scan.find({"provider": "provider_0042"}) == brute_force(registry, {"provider": "provider_0042"}, 1)
+    assert scan.stats["scans"] == 1  # One candidate: scanning beats walking the cost index
+    walk = ServiceDiscovery(registry)
+    assert walk.find({}) == brute_force(registry, {}, 1)
+    assert walk.stats["cost_walks"] == 1 and walk.stats["records_checked"] <= 5
+
+def test_random_queries_match_brute_force():
+    rng = random.Random(5)
+    registry = random_registry(count=300, seed=rng.randrange(1000))
+    discovery = ServiceDiscovery(registry)
+    attributes = [("cost", lambda: rng.randint(0, 101)), ("compute.gpu", lambda: rng.randint(0, 4)),
+                  ("sla.latency_ms", lambda: rng.choice((100, 250, 500, 1000))),
+                  ("term.risk_level", lambda: rng.choice(("low", "medium", "high")))]
+    for _ in range(300):
+        query = []
+        for _ in range(rng.randint(1, 3)):
+            attribute, value = rng.choice(attributes)
+            op = rng.choice(("=", "!=", "<", "<=", ">", ">=")) if attribute != "term.risk_level" else rng.choice(("=", "!=", "in"))
+            query.append((attribute, op, (value(), value()) if op == "in" else value()))
+        limit = rng.choice((1, 3, 50))
+        assert discovery.find(query, limit=limit) == brute_force(registry, query, limit), query
+
+# Resolution
+
+def test_resolve_with_the_nested_dsl_form(registry):
+    discovery = ServiceDiscovery(registry)
+    nested = {"inputs": "[]", "constraints": {"risk_level": "low", "compute.gpu": ("<=", 1)}}
+    expected = brute_force(registry, [*parse_constraints(nested["constraints"]), ("service_id", "=", "svc_4"),
+                                      ("cost", "<=", 60)], 1)
+    assert [discovery.resolve("svc_4", 60, nested)] == expected
+    assert discovery.resolve("svc_4", 60, {"inputs": "[]", "constraints": None}) == \
+        brute_force(registry, [("service_id", "=", "svc_4"), ("cost", "<=", 60)], 1)[0]
+    assert request_constraints({"inputs": "[]"}) is None
+
+def test_resolve_within_payment(registry):
+    discovery = ServiceDiscovery(registry)
+    cheapest = brute_force(registry, [("service_id", "=", "svc_7")], 1)[0]
+    assert discovery.resolve("svc_7", cheapest.cost, [("output", "in", [cheapest.outputs[0]])]) == cheapest
+    assert discovery.resolve("svc_7", cheapest.cost - 1, None) is None
+
+# Requests
+
+def test_bind_provider_keeps_every_form_serializable():
+    constraints = [Constraint("sla.latency_ms", "<=", 250), ("output", "in", ["report"]),
+                   AgentProperty("risk_level", GaiaValue(GaiaType.STRING, "low"))]
+    bound = bind_provider(constraints, "provider_1")
+    assert json.loads(json.dumps(bound))[-1] == ["provider", "=", "provider_1"]
+    assert parse_constraints(bound)[:3] == parse_constraints(constraints)
+    assert bind_provider({"risk_level": "low"}, "p") == {"risk_level": "low", "provider": "p"}
+    nested = bind_provider({"inputs": "[]", "constraints": {"risk_level": "low"}}, "p")
+    assert nested == {"inputs": "[]", "constraints": {"risk_level": "low", "provider": "p"}}
+    assert all(requested_provider(form) == "p" for form in (bind_provider(constraints, "p"), nested, {"provider": "p"}))
+
+@pytest.mark.parametrize("constraints", [
+    [("risk_level", "=", "low")],
+    [Constraint("term.risk_level", "=", "low")],
+    {"risk_level": "low"},
+    {"inputs": "[]", "constraints": {"risk_level": "low"}},
+])
+def test_agent_requests_with_any_constraint_form(registry, constraints):
+    class Pipeline:
+        contract_address = "0x00000000000000000000000000000000000000aa"
+
+        def __init__(self):
+            self.requests = []
+
+        def submit(self, agent, service_id, payment, constraints, dispatch=None):
+            self.requests.append((service_id, json.dumps(constraints)))
+
+    agent = AgentCore(id="agent_1", owner="owner_1", service_discovery=ServiceDiscovery(registry), service_pipeline=Pipeline())
+    agent.request_service("svc_5", 50, constraints)
+    [(service_id, encoded)] = agent.service_pipeline.requests
+    expected = brute_force(registry, [("risk_level", "=", "low"), ("service_id", "=", "svc_5"), ("cost", "<=", 50)], 1)[0]
+    assert service_id == expected.service_id and requested_provider(json.loads(encoded)) == expected.provider
+    assert agent.metrics.errors == 0
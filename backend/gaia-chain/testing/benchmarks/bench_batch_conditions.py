@@ -0,0 +1,50 @@
+# gaia-chain/testing/benchmarks/bench_batch_conditions.py
+
+"""
+Batch Condition Benchmark
+
+This module compares the scalar compiled evaluator (`compile_condition`, one call per row) with
+the column-wise evaluator in `batch_rules` for a risk screen of the form
+`price > 100 and volatility < 0.3` over a synthetic instrument universe.
+
+Usage:
+    python -m gaia_chain.testing.benchmarks.bench_batch_conditions --rows 500000
+"""
+
+import time
+import numpy as np
+from argparse import ArgumentParser
+from gaia_chain.dsl.rules.core_rules import Condition, GaiaType, GaiaValue, LogicalOperator, compile_condition
+from gaia_chain.dsl.rules.batch_rules import evaluate_condition_batch
+
+def risk_screen() -> Condition:
+    return Condition(
+        left=Condition(GaiaValue(GaiaType.VARIABLE, "price"), LogicalOperator.GREATER_THAN, GaiaValue(GaiaType.FLOAT, 100.0)),
+        operator=LogicalOperator.AND,
+        right=Condition(GaiaValue(GaiaType.VARIABLE, "volatility"), LogicalOperator.LESS_THAN, GaiaValue(GaiaType.FLOAT, 0.3))
+    )
+
+def run(rows: int):
+    rng = np.random.default_rng(42)
+    columns = {"price": rng.uniform(50, 150, rows), "volatility": rng.uniform(0, 0.6, rows)}
+    condition = risk_screen()
+
+    scalar = compile_condition(condition)
+    records = [{"price": p, "volatility": v} for p, v in zip(columns["price"].tolist(), columns["volatility"].tolist())]
+    start = time.perf_counter()
+    expected = [bool(scalar(record)) for record in records]
+    scalar_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    mask = evaluate_condition_batch(condition, columns)
+    batch_time = time.perf_counter() - start
+
+    assert mask.tolist() == expected
+    print(f"{rows} rows  scalar {scalar_time:.4f}s  batch {batch_time:.4f}s  speedup {scalar_time / batch_time:.1f}x")
+    return scalar_time, batch_time
+
+if __name__ == "__main__":
+    parser = ArgumentParser(description="Benchmark scalar vs batch condition evaluation.")
+    parser.add_argument("--rows", type=int, default=500000, help="Number of instruments to screen.")
+    args = parser.parse_args()
+    run(args.rows)
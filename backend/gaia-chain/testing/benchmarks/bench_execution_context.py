@@ -0,0 +1,55 @@
+# gaia-chain/testing/benchmarks/bench_execution_context.py
+
+"""
+Execution Context Benchmark
+
+This module measures how many `AgentCore` instances fit in a gigabyte when hosted by
+`ExecutionContext` (traced with `tracemalloc`), and the sustained events per second when commands
+are spread across all hosted agents. Agent logging is disabled so the figures reflect the
+scheduler rather than log formatting.
+
+Usage:
+    python -m gaia_chain.testing.benchmarks.bench_execution_context --agents 10000 --events 200000
+"""
+
+import asyncio
+import logging
+import time
+import tracemalloc
+from argparse import ArgumentParser
+from gaia_chain.agents.runtime.agent_core import AgentCore
+from gaia_chain.agents.runtime.execution_context import ExecutionContext
+
+def measure_agents_per_gb(count: int) -> float:
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    context = ExecutionContext()
+    context.register_many(AgentCore(id=f"agent_{i}", owner="owner") for i in range(count))
+    per_agent = (tracemalloc.get_traced_memory()[0] - before) / count
+    tracemalloc.stop()
+    print(f"{count} agents  {per_agent:.0f} bytes/agent  {2**30 / per_agent:,.0f} agents/GB")
+    return 2**30 / per_agent
+
+async def measure_events_per_second(agents: int, events: int, workers: int) -> float:
+    context = ExecutionContext(workers=workers)
+    context.register_many(AgentCore(id=f"agent_{i}", owner="owner") for i in range(agents))
+    agent_ids = list(context.slots)
+    async with context:
+        start = time.perf_counter()
+        futures = [context.submit(agent_ids[i % agents], context.slots[agent_ids[i % agents]].agent.update_state, "tick", i) for i in range(events)]
+        await asyncio.gather(*futures)
+        elapsed = time.perf_counter() - start
+    rate = events / elapsed
+    print(f"{events} events over {agents} agents ({workers} workers)  {elapsed:.3f}s  {rate:,.0f} events/s")
+    return rate
+
+if __name__ == "__main__":
+    parser = ArgumentParser(description="Benchmark agent density and event throughput of ExecutionContext.")
+    parser.add_argument("--agents", type=int, default=10000, help="Number of hosted agents.")
+    parser.add_argument("--events", type=int, default=200000, help="Number of events to dispatch.")
+    parser.add_argument("--workers", type=int, default=4, help="Scheduler workers.")
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    measure_agents_per_gb(args.agents)
+    asyncio.run(measure_events_per_second(args.agents, args.events, args.workers))
@@ -0,0 +1,57 @@
+# gaia-chain/testing/benchmarks/bench_worker_pool.py
+
+"""
+Worker Pool Scaling Benchmark
+
+This module measures the throughput of `AgentWorkerPool` for CPU-bound agent calls at different
+worker counts. Each call builds and chains a small rule base in the agent's symbolic reasoner,
+standing in for `ReasoningEngine.infer` work. Ideal scaling is linear up to the number of cores.
+
+Usage:
+    python -m gaia_chain.testing.benchmarks.bench_worker_pool --workers 1 2 4 8 --agents 64 --calls 2000
+"""
+
+import logging
+import os
+import time
+from argparse import ArgumentParser
+from gaia_chain.agents.runtime.agent_core import AgentCore
+from gaia_chain.agents.runtime.worker_pool import AgentWorkerPool
+from gaia_chain.agents.neuro_symbolic.symbolic_reasoner import SymbolicReasoner, Fact, Rule
+
+class ReasoningAgent(AgentCore):
+    """Agent whose `reason` call is a CPU-bound forward-chaining workload."""
+    def reason(self, depth: int) -> int:
+        reasoner = SymbolicReasoner()
+        reasoner.load_knowledge(
+            facts=[Fact("p0")],
+            rules=(Rule([f"p{i}"], f"p{i + 1}") for i in range(depth)),
+        )
+        return len(reasoner.engine.infer())
+
+def run(worker_counts, agents: int, calls: int, depth: int):
+    results = {}
+    for workers in worker_counts:
+        with AgentWorkerPool(workers=workers) as pool:
+            pool.register_many(ReasoningAgent(id=f"agent_{i}", owner="owner") for i in range(agents))
+            agent_ids = list(pool.placement)
+            start = time.perf_counter()
+            futures = [pool.submit(agent_ids[i % agents], "reason", depth) for i in range(calls)]
+            for future in futures:
+                future.result()
+            elapsed = time.perf_counter() - start
+        results[workers] = calls / elapsed
+        print(f"{workers} workers  {calls / elapsed:10,.0f} calls/s  speedup {results[workers] / results[worker_counts[0]]:4.2f}x")
+    return results
+
+if __name__ == "__main__":
+    parser = ArgumentParser(description="Benchmark AgentWorkerPool scaling across worker counts.")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8], help="Worker counts to benchmark.")
+    parser.add_argument("--agents", type=int, default=64, help="Number of agents to shard.")
+    parser.add_argument("--calls", type=int, default=2000, help="Number of reasoning calls per run.")
+    parser.add_argument("--depth", type=int, default=500, help="Rule chain length per call.")
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    print(f"{os.cpu_count()} CPUs available")
+    run(args.workers, args.agents, args.calls, args.depth)
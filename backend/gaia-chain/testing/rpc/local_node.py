@@ -0,0 +1,241 @@
+# gaia-chain/testing/rpc/local_node.py
+
+"""
+Local JSON-RPC Node for GaiaChain Tests
+
+This module provides an in-process stand-in for an Ethereum JSON-RPC endpoint. It is a plain
+callable that takes a JSON-RPC payload (a single request or a batch) and returns the response, so
+it can be passed anywhere a `JsonRpcClient` transport is expected. Transactions stay pending until
+a block is mined, either explicitly with `mine()` or by a background miner started with
+`start_mining(block_time)`. Round trips and individual requests are counted so tests can assert
+that callers batch their traffic.
+
+Contract event logs can be queued with `emit_log` and are included in the next mined block; they
+are served by `eth_getLogs`, which (like hosted providers) rejects queries matching more than
+`max_logs_per_query` logs. `reorg(depth)` replaces the last blocks with a fork so indexers can be
+tested against chain reorganizations.
+"""
+
+import hashlib
+import itertools
+import threading
+from typing import Any, Callable, Dict, List, Optional
+
+def _hex(value: int) -> str:
+    return hex(value)
+
+class LocalJsonRpcNode:
+    """In-process JSON-RPC endpoint with manual or timed block production."""
+    def __init__(self, chain_id: int = 1337, fail_methods: Optional[Dict[str, str]] = None,
+                 max_logs_per_query: int = 10000):
+        self.chain_id = chain_id
+        self.block_number = 0
+        self.block_hashes: List[str] = [self._block_hash(0, 0)]
+        self.fork = 0
+        self.logs: Dict[int, List[dict]] = {}
+        self.pending_logs: List[dict] = []
+        self.max_logs_per_query = max_logs_per_query
+        self.pending: List[str] = []
+        self.transactions: Dict[str, dict] = {}
+        self.receipts: Dict[str, dict] = {}
+        self.call_handlers: Dict[str, Callable[[dict], Any]] = {}
+        self.fail_methods = dict(fail_methods or {})
+        self.round_trips = 0
+        self.requests = 0
+        self.lock = threading.RLock()
+        self.nonces = itertools.count()
+        self.miner: Optional[threading.Thread] = None
+        self.miner_stop = threading.Event()
+
+    # Transport Interface
+
+    def __call__(self, payload):
+        with self.lock:
+            self.round_trips += 1
+            if isinstance(payload, list):
+                return [self._handle(request) for request in payload]
+            return self._handle(payload)
+
+    def _handle(self, request: dict) -> dict:
+        self.requests += 1
+        response = {"jsonrpc": "2.0", "id": request.get("id")}
+        method = request.get("method")
+        handler = getattr(self, f"_rpc_{method}", None)
+        if method in self.fail_methods:
+            response["error"] = {"code": -32000, "message": self.fail_methods[method]}
+        elif handler is None:
+            response["error"] = {"code": -32601, "message": f"Method not found: {method}"}
+        else:
+            try:
+                response["result"] = handler(*request.get("params", []))
+            except Exception as e:
+                response["error"] = {"code": -32000, "message": str(e)}
+        return response
+
+    # Block Production
+
+    @staticmethod
+    def _block_hash(number: int, fork: int) -> str:
+        return "0x" + hashlib.sha256(f"block:{number}:{fork}".encode("utf-8")).hexdigest()
+
+    def mine(self, blocks: int = 1) -> int:
+        """Mine `blocks` blocks; pending transactions and logs are included in the first one."""
+        with self.lock:
+            for _ in range(blocks):
+                self.block_number += 1
+                block_hash = self._block_hash(self.block_number, self.fork)
+                self.block_hashes.append(block_hash)
+                if self.pending_logs:
+                    self.logs[self.block_number] = [
+                        {**log, "blockNumber": _hex(self.block_number), "blockHash": block_hash, "logIndex": _hex(index)}
+                        for index, log in enumerate(self.pending_logs)
+                    ]
+                    self.pending_logs = []
+                for index, tx_hash in enumerate(self.pending):
+                    tx = self.transactions[tx_hash]
+                    self.receipts[tx_hash] = {
+                        "transactionHash": tx_hash,
+                        "transactionIndex": _hex(index),
+                        "blockNumber": _hex(self.block_number),
+                        "from": tx.get("from"),
+                        "to": tx.get("to"),
+                        "gasUsed": _hex(21000),
+                        "status": "0x1",
+                        "logs": [],
+                    }
+                self.pending = []
+            return self.block_number
+
+    def start_mining(self, block_time: float = 0.05):
+        """Mine a block every `block_time` seconds on a background thread."""
+        if self.miner is not None:
+            return
+        self.miner_stop.clear()
+
+        def run():
+            while not self.miner_stop.wait(block_time):
+                self.mine()
+        self.miner = threading.Thread(target=run, name="local-node-miner", daemon=True)
+        self.miner.start()
+
+    def stop_mining(self):
+        self.miner_stop.set()
+        if self.miner is not None:
+            self.miner.join()
+            self.miner = None
+
+    def emit_log(self, address: str, topics: List[str], data: str = "0x"):
+        """Queue a contract event log for the next mined block."""
+        with self.lock:
+            seed = f"log:{address}:{topics}:{data}:{next(self.nonces)}".encode("utf-8")
+            self.pending_logs.append({
+                "address": address.lower(),
+                "topics": list(topics),
+                "data": data,
+                "transactionHash": "0x" + hashlib.sha256(seed).hexdigest(),
+                "removed": False,
+            })
+
+    def reorg(self, depth: int, replacement_logs: Optional[Dict[int, List[dict]]] = None) -> int:
+        """Replace the last `depth` blocks with a fork of the same height.
+
+        Logs in the replaced blocks are dropped unless given again in `replacement_logs`
+        ({offset from the fork point (1-based): [{"address", "topics", "data"}, ...]}).
+        """
+        with self.lock:
+            depth = min(depth, self.block_number)
+            height = self.block_number
+            self.block_number -= depth
+            del self.block_hashes[self.block_number + 1:]
+            for number in range(self.block_number + 1, height + 1):
+                self.logs.pop(number, None)
+            self.fork += 1
+            for offset in range(1, depth + 1):
+                for log in (replacement_logs or {}).get(offset, ()):
+                    self.emit_log(log["address"], log["topics"], log.get("data", "0x"))
+                self.mine()
+            return self.block_number
+
+    def register_call(self, address: str, handler: Callable[[dict], Any]):
+        """Answer `eth_call` requests to `address` with `handler(call_object)`."""
+        self.call_handlers[address.lower()] = handler
+
+    # JSON-RPC Methods
+
+    def _rpc_eth_chainId(self):
+        return _hex(self.chain_id)
+
+    def _rpc_net_version(self):
+        return str(self.chain_id)
+
+    def _rpc_eth_blockNumber(self):
+        return _hex(self.block_number)
+
+    def _rpc_eth_sendTransaction(self, tx: dict):
+        if not tx.get("to"):
+            raise ValueError("Transaction has no recipient.")
+        seed = f"{tx.get('from')}:{tx.get('to')}:{tx.get('data')}:{next(self.nonces)}".encode("utf-8")
+        tx_hash = "0x" + hashlib.sha256(seed).hexdigest()
+        self.transactions[tx_hash] = dict(tx)
+        self.pending.append(tx_hash)
+        return tx_hash
+
+    def _rpc_eth_getTransactionReceipt(self, tx_hash: str):
+        return self.receipts.get(tx_hash)
+
+    def _rpc_eth_call(self, call: dict, block: str = "latest"):
+        handler = self.call_handlers.get(str(call.get("to", "")).lower())
+        if handler is None:
+            return "0x"
+        return handler(call)
+
+    def _block_param(self, value, default: int) -> int:
+        if value is None:
+            return default
+        if value in ("latest", "pending", "safe", "finalized"):
+            return self.block_number
+        if value == "earliest":
+            return 0
+        return int(value, 16)
+
+    def _rpc_eth_getBlockByNumber(self, number, full_transactions: bool = False):
+        number = self._block_param(number, self.block_number)
+        if number > self.block_number:
+            return None
+        return {
+            "number": _hex(number),
+            "hash": self.block_hashes[number],
+            "parentHash": self.block_hashes[number - 1] if number else "0x" + "00" * 32,
+            "timestamp": _hex(1700000000 + number),
+            "transactions": [],
+        }
+
+    def _rpc_eth_getLogs(self, query: dict):
+        start = self._block_param(query.get("fromBlock"), self.block_number)
+        end = min(self._block_param(query.get("toBlock"), self.block_number), self.block_number)
+        addresses = query.get("address")
+        if isinstance(addresses, str):
+            addresses = [addresses]
+        addresses = {address.lower() for address in addresses} if addresses else None
+        first_topics = (query.get("topics") or [None])[0]
+        if isinstance(first_topics, str):
+            first_topics = [first_topics]
+        matches = []
+        for number in sorted(number for number in self.logs if start <= number <= end):
+            for log in self.logs[number]:
+                if addresses is not None and log["address"] not in addresses:
+                    continue
+                if first_topics and log["topics"][:1] and log["topics"][0] not in first_topics:
+                    continue
+                matches.append(log)
+                if len(matches) > self.max_logs_per_query:
+                    raise ValueError(f"query returned more than {self.max_logs_per_query} results")
+        return matches
+
+# Example usage (for illustration purposes, not part of the module)
+if __name__ == "__main__":
+    node = LocalJsonRpcNode()
+    tx_hash = node({"jsonrpc": "2.0", "id": 1, "method": "eth_sendTransaction", "params": [{"to": "0xabc", "data": "0x"}]})["result"]
+    node.mine()
+    print(node([{"jsonrpc": "2.0", "id": 2, "method": "eth_blockNumber", "params": []},
+                {"jsonrpc": "2.0", "id": 3, "method": "eth_getTransactionReceipt", "params": [tx_hash]}]))
@@ -13,11 +13,10 @@ import tarfile
 import json
 import logging
 import subprocess
-from web3 import Web3
+from gaia_chain.tooling.rpc.provider_registry import get_provider_registry
 from argparse import ArgumentParser
 
 # Logger setup
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 class AgentDeployer:
@@ -25,7 +24,8 @@ class AgentDeployer:
         self.agent_path = agent_path
         self.contract_address = contract_address
         self.stake_amount = stake_amount
-        self.web3 = Web3(Web3.HTTPProvider(web3_provider))
+        self.web3_provider = web3_provider
+        self.web3 = get_provider_registry().web3(web3_provider)  # Shared, pooled connection
         self.contract = None  # Placeholder for smart contract instance
 
     def package_agent(self):
@@ -58,7 +58,7 @@ class AgentDeployer:
                 contract_bytecode = bytecode_file.read()
 
             # Initialize the contract instance
-            self.contract = self.web3.eth.contract(address=self.contract_address, abi=contract_abi, bytecode=contract_bytecode)
+            self.contract = get_provider_registry().contract(self.web3_provider, self.contract_address, contract_abi, contract_bytecode)
 
             # Register the agent (mock implementation, replace with actual registration logic)
             tx_hash = self.contract.functions.registerAgent(self.web3.eth.defaultAccount, self.stake_amount).transact()
@@ -12,11 +12,10 @@ import tarfile
 import json
 import logging
 import subprocess
-from web3 import Web3
+from gaia_chain.tooling.rpc.provider_registry import get_provider_registry
 from argparse import ArgumentParser
 
 # Logger setup
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 class ServiceDeployer:
@@ -24,7 +23,8 @@ class ServiceDeployer:
         self.service_path = service_path
         self.contract_address = contract_address
         self.gaia_cost = gaia_cost
-        self.web3 = Web3(Web3.HTTPProvider(web3_provider))
+        self.web3_provider = web3_provider
+        self.web3 = get_provider_registry().web3(web3_provider)  # Shared, pooled connection
         self.contract = None  # Placeholder for smart contract instance
 
     def package_service(self):
@@ -46,7 +46,7 @@ class ServiceDeployer:
             contract_bytecode = bytecode_file.read()
 
         # Initialize the contract instance
-        self.contract = self.web3.eth.contract(address=self.contract_address, abi=contract_abi, bytecode=contract_bytecode)
+        self.contract = get_provider_registry().contract(self.web3_provider, self.contract_address, contract_abi, contract_bytecode)
 
         # Register the service (mock implementation, replace with actual registration logic)
         tx_hash = self.contract.functions.registerService(self.web3.eth.defaultAccount, self.gaia_cost).transact()
@@ -8,46 +8,76 @@ It includes methods to check an agent's status, view logs or events, and collect
 """
 
 import os
+import json
 import logging
 import requests
-from web3 import Web3
+from gaia_chain.tooling.rpc.provider_registry import get_provider_registry
+from gaia_chain.tooling.monitoring.log_index import open_log_index
+from gaia_chain.tooling.monitoring.log_reader import DEFAULT_PAGE_BYTES, follow, read_page, tail_lines
 import psutil
 from argparse import ArgumentParser
 
 # Logger setup
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 class AgentMonitor:
-    def __init__(self, agent_id, contract_address, web3_provider, log_path):
+    def __init__(self, agent_id, contract_address, web3_provider, log_path, contract_abi=None, agent=None):
         self.agent_id = agent_id
+        self.agent = agent  # In-process AgentCore, if the monitor runs alongside the agent
         self.contract_address = contract_address
-        self.web3 = Web3(Web3.HTTPProvider(web3_provider))
+        self.web3_provider = web3_provider
+        registry = get_provider_registry()
+        self.web3 = registry.web3(web3_provider)  # Shared, pooled connection
+        self.view_cache = registry.view_cache(web3_provider)
         self.log_path = log_path
-        self.contract = None  # Placeholder for smart contract instance
+        self.contract = registry.contract(web3_provider, contract_address, contract_abi) if contract_abi else None
 
     def check_status(self):
         """Check the agent's current status."""
         logger.info(f"Checking status for agent {self.agent_id}...")
-        if not self.web3.isConnected():
+        if self.contract is not None:
+            # Served from the view-call cache until the chain head advances
+            try:
+                status = self.view_cache.call(self.contract, "getAgentStatus", self.agent_id)
+            except Exception as e:
+                logger.exception(f"Failed to query status for agent {self.agent_id}: {e!r}")
+                return f"Status query failed: {e!r}"
+            logger.info(f"Agent {self.agent_id} status: {status}")
+            return status
+        if not self.web3.is_connected():
             logger.error("Web3 provider is not connected.")
             return "Web3 provider not connected"
         
-        # Smart contract interaction to get agent status (mock implementation)
+        # No contract ABI configured: fall back to the status file written by the agent runtime
         with open(os.path.join(self.log_path, 'status.log'), 'r') as status_file:
             status = status_file.read().strip()
         logger.info(f"Agent {self.agent_id} status: {status}")
         return status
 
-    def view_logs(self):
-        """Retrieve and display logs for the agent."""
-        logger.info(f"Retrieving logs for agent {self.agent_id}...")
-        log_file_path = os.path.join(self.log_path, f"{self.agent_id}.log")
+    def log_file_path(self):
+        return os.path.join(self.log_path, f"{self.agent_id}.log")
+
+    def view_logs(self, offset=0, max_bytes=DEFAULT_PAGE_BYTES, since=None, until=None, level=None, contains=None, limit=1000):
+        """Retrieve one page of the agent's logs starting at byte `offset`.
+
+        Returns a LogPage (prints as its text); pass `page.next_offset` to read the next page.
+        With any of `since`, `until`, `level` or `contains`, the log is indexed incrementally and
+        the matching LogRecords (at most `limit`) are returned instead.
+        """
+        log_file_path = self.log_file_path()
+        if any(value is not None for value in (since, until, level, contains)):
+            logger.info(f"Querying logs for agent {self.agent_id}...")
+            if not os.path.exists(log_file_path):
+                logger.error(f"No logs found for agent {self.agent_id}.")
+                return []
+            index = open_log_index(self.log_path)
+            index.index_file(log_file_path, self.agent_id)
+            return index.query(self.agent_id, since=since, until=until, level=level, contains=contains, limit=limit)
+        logger.info(f"Retrieving logs for agent {self.agent_id} from offset {offset}...")
         if os.path.exists(log_file_path):
-            with open(log_file_path, 'r') as log_file:
-                logs = log_file.read()
-            logger.info(f"Logs for agent {self.agent_id}:\n{logs}")
-            return logs
+            page = read_page(log_file_path, offset, max_bytes)
+            logger.info(f"Read {page.next_offset - page.offset} bytes of logs for agent {self.agent_id}.")
+            return page
         else:
             logger.error(f"No logs found for agent {self.agent_id}.")
             return "No logs found."
@@ -55,34 +85,53 @@ class AgentMonitor:
     def tail_logs(self, lines=10):
         """Tail the last 'lines' number of log entries for the agent."""
         logger.info(f"Tailing the last {lines} lines of logs for agent {self.agent_id}...")
-        log_file_path = os.path.join(self.log_path, f"{self.agent_id}.log")
+        log_file_path = self.log_file_path()
         if os.path.exists(log_file_path):
-            with open(log_file_path, 'r') as log_file:
-                logs = log_file.readlines()
-            tail_logs = logs[-lines:]
-            logger.info(f"Last {lines} lines of logs for agent {self.agent_id}:\n{''.join(tail_logs)}")
-            return ''.join(tail_logs)
+            # Reads backward from EOF in blocks, so memory does not grow with the log size
+            return ''.join(tail_lines(log_file_path, lines))
         else:
             logger.error(f"No logs found for agent {self.agent_id}.")
             return "No logs found."
 
+    def follow_logs(self, from_end=True, poll_interval=0.5, stop=None):
+        """Yield new log lines for the agent as they are written (until `stop` is set)."""
+        logger.info(f"Following logs for agent {self.agent_id}...")
+        return follow(self.log_file_path(), from_end=from_end, poll_interval=poll_interval, stop=stop)
+
+    def read_agent_metrics(self):
+        """Per-agent accounting from the runtime: the hosted agent, or its exported metrics file."""
+        if self.agent is not None:
+            return self.agent.report_metrics()
+        metrics_path = os.path.join(self.log_path, f"{self.agent_id}.metrics.json")
+        if os.path.exists(metrics_path):
+            with open(metrics_path, 'r') as metrics_file:
+                return json.load(metrics_file)
+        return None
+
     def collect_metrics(self):
         """Collect and display performance metrics for the agent."""
         logger.info(f"Collecting performance metrics for agent {self.agent_id}...")
-        metrics = {
+        agent_metrics = self.read_agent_metrics()
+        if agent_metrics is None:
+            logger.warning(f"No runtime metrics reported for agent {self.agent_id}.")
+        metrics = dict(agent_metrics or {})
+        metrics["task_completion_rate"] = self.get_task_completion_rate(agent_metrics)
+        # Host-wide figures are kept for context only; they are shared by every agent on the host
+        metrics["host"] = {
             "cpu_usage": psutil.cpu_percent(),
             "memory_usage": psutil.virtual_memory().percent,
             "disk_usage": psutil.disk_usage('/').percent,
             "network_stats": psutil.net_io_counters(),
-            "task_completion_rate": self.get_task_completion_rate()  # Mock function
         }
-        logger.info(f"Performance metrics for agent {self.agent_id}: {metrics}")
+        logger.info(f"Performance metrics for agent {self.agent_id}: {metrics.get('events', 0)} events, "
+                    f"{metrics.get('cpu_seconds', 0.0):.3f}s CPU, completion rate {metrics['task_completion_rate']}")
         return metrics
 
-    def get_task_completion_rate(self):
-        """Mock function to get task completion rate."""
-        # Placeholder for actual implementation
-        return 95.0
+    def get_task_completion_rate(self, agent_metrics=None):
+        """Percentage of the agent's finished tasks that completed (None if nothing finished yet)."""
+        if agent_metrics is None:
+            agent_metrics = self.read_agent_metrics()
+        return agent_metrics.get("task_completion_rate") if agent_metrics else None
 
 if __name__ == "__main__":
     parser = ArgumentParser(description="Monitor a decentralized AI agent in GaiaChain.")
@@ -90,10 +139,11 @@ if __name__ == "__main__":
     parser.add_argument("--contract-address", required=True, help="Smart contract address for agent status and metrics.")
     parser.add_argument("--web3-provider", default="http://localhost:8545", help="Web3 provider URL.")
     parser.add_argument("--log-path", required=True, help="Path to the directory containing agent logs.")
+    parser.add_argument("--contract-abi", help="Path to the agent contract ABI JSON file (enables on-chain status).")
 
     args = parser.parse_args()
 
-    monitor = AgentMonitor(args.agent_id, args.contract_address, args.web3_provider, args.log_path)
+    monitor = AgentMonitor(args.agent_id, args.contract_address, args.web3_provider, args.log_path, args.contract_abi)
     status = monitor.check_status()
     logs = monitor.view_logs()
     metrics = monitor.collect_metrics()
@@ -0,0 +1,115 @@
+# gaia-chain/tooling/monitoring/fleet_monitor.py
+
+"""
+Fleet Monitor for GaiaChain
+
+This module runs `AgentMonitor` checks (status, metrics and log tail) across many agents at
+once. Checks run on a bounded thread pool and at most `concurrency` agents are in flight, so a
+10k-agent sweep neither serializes on network round trips nor queues 10k futures up front.
+Results are yielded as each agent completes, ready to be streamed as JSON lines.
+"""
+
+import json
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Dict, Iterable, Iterator, Optional, Sequence
+
+from gaia_chain.tooling.monitoring.agent_monitor import AgentMonitor
+from gaia_chain.tooling.monitoring.structured_log import get_logger
+
+# Logger setup
+logger = get_logger(__name__)
+
+FLEET_CHECKS = ("status", "metrics", "tail")
+
+def _json_safe(value: Any) -> Any:
+    """Convert metric values (e.g. psutil named tuples) into JSON-serializable data."""
+    if hasattr(value, "_asdict"):
+        return {key: _json_safe(item) for key, item in value._asdict().items()}
+    if isinstance(value, dict):
+        return {key: _json_safe(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_json_safe(item) for item in value]
+    return value
+
+def read_agent_ids(source: str) -> Iterator[str]:
+    """Read agent IDs, one per line, from a file path or '-' for stdin."""
+    stream = sys.stdin if source == "-" else open(source, 'r')
+    try:
+        for line in stream:
+            agent_id = line.strip()
+            if agent_id and not agent_id.startswith("#"):
+                yield agent_id
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+
+class FleetMonitor:
+    """Runs AgentMonitor checks over a fleet of agents with bounded parallelism."""
+    def __init__(self, contract_address, web3_provider, log_path, contract_abi=None,
+                 concurrency: int = 64, tail_lines: int = 10, checks: Sequence[str] = FLEET_CHECKS):
+        unknown = set(checks) - set(FLEET_CHECKS)
+        if unknown:
+            raise ValueError(f"Unknown fleet checks: {', '.join(sorted(unknown))}")
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1.")
+        self.contract_address = contract_address
+        self.web3_provider = web3_provider
+        self.log_path = log_path
+        self.contract_abi = contract_abi
+        self.concurrency = concurrency
+        self.tail_lines = tail_lines
+        self.checks = tuple(checks)
+
+    def check_agent(self, agent_id: str) -> Dict[str, Any]:
+        """Run the configured checks for one agent; failures are reported, not raised."""
+        started = time.perf_counter()
+        result: Dict[str, Any] = {"agent_id": agent_id}
+        try:
+            monitor = AgentMonitor(agent_id, self.contract_address, self.web3_provider, self.log_path, self.contract_abi)
+            if "status" in self.checks:
+                result["status"] = monitor.check_status()
+            if "metrics" in self.checks:
+                result["metrics"] = _json_safe(monitor.collect_metrics())
+            if "tail" in self.checks:
+                result["tail"] = monitor.tail_logs(self.tail_lines)
+        except Exception as e:
+            result["error"] = str(e)
+        result["elapsed_ms"] = round((time.perf_counter() - started) * 1000, 3)
+        return result
+
+    def sweep(self, agent_ids: Iterable[str]) -> Iterator[Dict[str, Any]]:
+        """Check every agent, yielding each result as soon as it completes."""
+        agent_ids = iter(agent_ids)
+        with ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="gaia-fleet") as executor:
+            in_flight = set()
+            for agent_id in agent_ids:
+                in_flight.add(executor.submit(self.check_agent, agent_id))
+                if len(in_flight) >= self.concurrency:
+                    break
+            while in_flight:
+                done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+                    next_id = next(agent_ids, None)
+                    if next_id is not None:
+                        in_flight.add(executor.submit(self.check_agent, next_id))
+
+    def stream_json_lines(self, agent_ids: Iterable[str], output=None) -> Dict[str, Any]:
+        """Write one JSON object per agent to `output` as results arrive; return a sweep summary."""
+        output = output or sys.stdout
+        started = time.perf_counter()
+        summary = {"agents": 0, "errors": 0}
+        for result in self.sweep(agent_ids):
+            output.write(json.dumps(result, default=str) + "\n")
+            output.flush()
+            summary["agents"] += 1
+            summary["errors"] += "error" in result
+        summary["elapsed_s"] = round(time.perf_counter() - started, 3)
+        return summary
+
+# Example usage (for illustration purposes, not part of the module)
+if __name__ == "__main__":
+    fleet = FleetMonitor("0x0000000000000000000000000000000000000000", "http://localhost:8545", "./logs", checks=("tail",))
+    print(fleet.stream_json_lines(f"agent_{i:03d}" for i in range(5)))
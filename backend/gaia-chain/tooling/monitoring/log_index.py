@@ -0,0 +1,362 @@
+# gaia-chain/tooling/monitoring/log_index.py
+
+"""
+Log Index for GaiaChain Monitoring
+
+This module ingests agent log files into an SQLite index so logs can be queried by agent, time
+range, level and message text without scanning the files. It parses the output of Python's
+`logging` module in the shapes GaiaChain uses: JSON lines from `configure_logging` (see
+tooling/monitoring/structured_log.py), the `basicConfig` default (`LEVEL:logger:message`) and
+timestamped formats such as `2024-05-01 12:00:00,123 - logger - LEVEL - message`. Lines without a
+recognizable header (tracebacks, multi-line messages) are folded into the preceding record.
+Event fields of JSON records are kept in the message as `key=value` pairs, so text search
+matches them.
+
+Indexing is incremental: the byte offset reached in each file is stored, so re-indexing a
+growing log only parses the new tail. Every record remembers the file it came from. A file that
+was rotated away (renamed, with a new file in its place) keeps its records; if the rotated file is
+indexed under its new name, it is recognised by inode and leading bytes and continues from where it
+left off. A file truncated or rewritten in place has only its own records dropped and re-indexed.
+Records from formats without timestamps are stamped with the file's modification time when they
+are indexed, which is accurate when indexing keeps up with the writer.
+"""
+
+import json
+import os
+import re
+import sqlite3
+import threading
+from dataclasses import dataclass
+from datetime import datetime
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+from gaia_chain.tooling.monitoring.structured_log import get_logger
+
+# Logger setup
+logger = get_logger(__name__)
+
+LEVELS = {"DEBUG": 10, "INFO": 20, "WARNING": 30, "WARN": 30, "ERROR": 40, "CRITICAL": 50, "FATAL": 50}
+LEVEL_NAMES = {10: "DEBUG", 20: "INFO", 30: "WARNING", 40: "ERROR", 50: "CRITICAL"}
+
+_STANDARD_FORMAT = re.compile(r"^(\d{4}-\d\d-\d\d[ T]\d\d:\d\d:\d\d),(\d{3}) - (.*?) - (DEBUG|INFO|WARNING|ERROR|CRITICAL) - (.*)$")
+_DEFAULT_FORMAT = re.compile(r"^(DEBUG|INFO|WARNING|ERROR|CRITICAL):([^:]*):(.*)$")
+_TIMESTAMPED_FORMAT = re.compile(r"^(\d{4}-\d{2}-\d{2}[ T]\d{2}:\d{2}:\d{2})(?:[,.](\d{1,6}))?\s*(.*)$")
+_LEVEL_TOKEN = re.compile(r"\b(DEBUG|INFO|WARNING|WARN|ERROR|CRITICAL|FATAL)\b")
+_SEPARATORS = " -|:[]"
+
+# Bump when the schema changes; an index built with another version is dropped and rebuilt
+SCHEMA_VERSION = 2
+HEAD_BYTES = 1024  # Leading bytes kept per file to recognise it after a rename
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS log_files (
+    id INTEGER PRIMARY KEY,
+    path TEXT UNIQUE,
+    agent_id TEXT NOT NULL,
+    device INTEGER NOT NULL,
+    inode INTEGER NOT NULL,
+    head BLOB NOT NULL,
+    offset INTEGER NOT NULL,
+    last_ts REAL,
+    last_level INTEGER
+);
+CREATE TABLE IF NOT EXISTS log_names (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS log_records (
+    id INTEGER PRIMARY KEY,
+    file INTEGER NOT NULL,
+    agent INTEGER NOT NULL,
+    ts REAL NOT NULL,
+    level INTEGER NOT NULL,
+    logger INTEGER NOT NULL,
+    message TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS log_records_agent_ts ON log_records (agent, ts);
+CREATE INDEX IF NOT EXISTS log_records_agent_level_ts ON log_records (agent, level, ts);
+CREATE INDEX IF NOT EXISTS log_records_file ON log_records (file);
+"""
+
+TimeBound = Union[None, float, datetime]
+
+@dataclass
+class LogRecord:
+    agent_id: str
+    ts: float
+    level: int
+    logger: str
+    message: str
+
+    @property
+    def level_name(self) -> str:
+        return LEVEL_NAMES.get(self.level, str(self.level))
+
+    def __str__(self):
+        timestamp = datetime.fromtimestamp(self.ts).isoformat(sep=" ", timespec="milliseconds")
+        return f"{timestamp} {self.level_name} {self.logger}: {self.message}"
+
+@lru_cache(maxsize=4096)
+def _parse_seconds(value: str) -> float:
+    # Consecutive records mostly share the same second, so this is usually a cache hit
+    return datetime.strptime(value.replace("T", " "), "%Y-%m-%d %H:%M:%S").timestamp()
+
+def parse_line(line: str) -> Optional[Tuple[Optional[float], int, str, str]]:
+    """Parse a log header line into (timestamp or None, level, logger, message).
+
+    Returns None for lines that do not start a new record (continuations).
+    """
+    if line.startswith("{"):
+        parsed = _parse_json_line(line)
+        if parsed is not None:
+            return parsed
+    match = _STANDARD_FORMAT.match(line)
+    if match:
+        # Fast path for "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+        seconds, millis, name, level, message = match.groups()
+        return _parse_seconds(seconds) + int(millis) / 1000, LEVELS[level], name, message
+    match = _DEFAULT_FORMAT.match(line)
+    if match:
+        return None, LEVELS[match.group(1)], match.group(2), match.group(3)
+    match = _TIMESTAMPED_FORMAT.match(line)
+    if match:
+        ts = _parse_seconds(match.group(1))
+        if match.group(2):
+            ts += int(match.group(2)) / 10 ** len(match.group(2))
+        rest = match.group(3)
+        level_match = _LEVEL_TOKEN.search(rest)
+        if level_match is None:
+            return ts, LEVELS["INFO"], "", rest
+        name = rest[:level_match.start()].strip(_SEPARATORS)
+        message = rest[level_match.end():].lstrip(_SEPARATORS)
+        return ts, LEVELS[level_match.group(1)], name, message
+    return None
+
+_JSON_KEYS = ("ts", "level", "logger", "message", "exc")
+
+def _parse_json_line(line: str) -> Optional[Tuple[Optional[float], int, str, str]]:
+    try:
+        entry = json.loads(line)
+    except ValueError:
+        return None
+    if not isinstance(entry, dict) or "message" not in entry:
+        return None
+    ts = entry.get("ts")
+    message = str(entry["message"])
+    fields = " ".join(f"{key}={value}" for key, value in entry.items() if key not in _JSON_KEYS)
+    if fields:
+        message = f"{message} {fields}"
+    if "exc" in entry:
+        message = f"{message}\n{entry['exc']}"
+    return (float(ts) if isinstance(ts, (int, float)) else None,
+            LEVELS.get(str(entry.get("level", "INFO")).upper(), LEVELS["INFO"]), str(entry.get("logger", "")), message)
+
+def _to_epoch(bound: TimeBound) -> Optional[float]:
+    if isinstance(bound, datetime):
+        return bound.timestamp()
+    return bound
+
+class LogIndex:
+    """SQLite-backed index of agent log records, updated incrementally as files grow."""
+    def __init__(self, db_path: str = ":memory:", batch_size: int = 5000):
+        self.db_path = db_path
+        self.batch_size = batch_size
+        self.connection = sqlite3.connect(db_path, check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        if self.connection.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+            # The index is derived from the log files, so an outdated one is simply rebuilt
+            self.connection.executescript("DROP TABLE IF EXISTS log_records; DROP TABLE IF EXISTS log_files; "
+                                          "DROP TABLE IF EXISTS log_names;")
+            self.connection.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        self.connection.executescript(SCHEMA)
+        # Agent IDs and logger names are stored once and referenced by integer ID
+        self.name_ids: Dict[str, int] = dict(self.connection.execute("SELECT name, id FROM log_names"))
+        self.names: Dict[int, str] = {name_id: name for name, name_id in self.name_ids.items()}
+        self.lock = threading.Lock()
+
+    def _name_id(self, name: str) -> int:
+        name_id = self.name_ids.get(name)
+        if name_id is None:
+            name_id = self.connection.execute("INSERT INTO log_names (name) VALUES (?)", (name,)).lastrowid
+            self.name_ids[name] = name_id
+            self.names[name_id] = name
+        return name_id
+
+    # Ingestion
+
+    def _file_state(self, path: str, stat: os.stat_result, head: bytes) -> Tuple[Optional[int], int, Optional[float], int]:
+        """Resolve `path` to (file id or None for a new file, offset, last_ts, last_level)."""
+        fresh = (None, 0, None, LEVELS["INFO"])
+        row = self.connection.execute(
+            "SELECT id, device, inode, head, offset, last_ts, last_level FROM log_files WHERE path = ?", (path,)).fetchone()
+        if row is not None:
+            file_id, device, inode, known_head, offset, last_ts, last_level = row
+            same_file = (device, inode) == (stat.st_dev, stat.st_ino)
+            if same_file and head.startswith(known_head) and stat.st_size >= offset:
+                return file_id, offset, last_ts, last_level
+            if same_file:
+                # Truncated or rewritten in place: this file's earlier records no longer exist
+                logger.info("Log file was truncated; re-indexing it", path=path)
+                self.connection.execute("DELETE FROM log_records WHERE file = ?", (file_id,))
+                return (file_id, *fresh[1:])
+            # Rotated: the old file keeps its records under its file id and leaves this path
+            logger.info("Log file was rotated; indexing the new file", path=path)
+            self.connection.execute("UPDATE log_files SET path = NULL WHERE id = ?", (file_id,))
+        # A rotated file indexed under its new name picks up where it left off
+        for file_id, known_head, offset, last_ts, last_level in self.connection.execute(
+                "SELECT id, head, offset, last_ts, last_level FROM log_files WHERE path IS NULL AND device = ? AND inode = ?",
+                (stat.st_dev, stat.st_ino)).fetchall():
+            if head.startswith(known_head) and stat.st_size >= offset:
+                self.connection.execute("UPDATE log_files SET path = ? WHERE id = ?", (path, file_id))
+                return file_id, offset, last_ts, last_level
+        return fresh
+
+    def index_file(self, path: str, agent_id: Optional[str] = None) -> int:
+        """Index new lines appended to `path` since the last call; returns records added."""
+        agent_id = agent_id or os.path.splitext(os.path.basename(path))[0]
+        with open(path, 'rb') as log_file:
+            stat = os.fstat(log_file.fileno())
+            head = log_file.read(HEAD_BYTES)
+        with self.lock, self.connection:
+            file_id, offset, last_ts, last_level = self._file_state(path, stat, head)
+            if file_id is None:
+                file_id = self.connection.execute(
+                    "INSERT INTO log_files (path, agent_id, device, inode, head, offset, last_level) VALUES (?, ?, ?, ?, ?, 0, ?)",
+                    (path, agent_id, stat.st_dev, stat.st_ino, head, last_level)).lastrowid
+            if stat.st_size == offset:
+                return 0
+            fallback_ts = stat.st_mtime
+            added = 0
+            batch: List[Tuple] = []
+            current: Optional[List] = None
+            agent = self._name_id(agent_id)
+            with open(path, 'rb') as log_file:
+                log_file.seek(offset)
+                for raw in log_file:
+                    if not raw.endswith(b"\n"):
+                        break  # Partial line still being written; pick it up next time
+                    offset += len(raw)
+                    line = raw.decode("utf-8", errors="replace").rstrip("\r\n")
+                    parsed = parse_line(line)
+                    if parsed is None:
+                        if current is not None:
+                            current[5] += "\n" + line
+                        elif line:
+                            # Continuation of a record indexed in an earlier pass
+                            current = [file_id, agent, last_ts or fallback_ts, last_level, self._name_id(""), line]
+                        continue
+                    if current is not None:
+                        batch.append(tuple(current))
+                    ts, level, name, message = parsed
+                    ts = ts if ts is not None else fallback_ts
+                    last_ts, last_level = ts, level
+                    current = [file_id, agent, ts, level, self._name_id(name), message]
+                    if len(batch) >= self.batch_size:
+                        added += self._insert(batch)
+                if current is not None:
+                    batch.append(tuple(current))
+                added += self._insert(batch)
+                self.connection.execute(
+                    "UPDATE log_files SET agent_id = ?, head = ?, offset = ?, last_ts = ?, last_level = ? WHERE id = ?",
+                    (agent_id, head, offset, last_ts, last_level, file_id))
+        if added:
+            logger.info("Indexed log records", agent=agent_id, records=added)
+        return added
+
+    def _insert(self, batch: List[Tuple]) -> int:
+        self.connection.executemany(
+            "INSERT INTO log_records (file, agent, ts, level, logger, message) VALUES (?, ?, ?, ?, ?, ?)", batch)
+        count = len(batch)
+        batch.clear()
+        return count
+
+    def index_directory(self, log_path: str, agent_ids: Optional[Iterable[str]] = None) -> Dict[str, int]:
+        """Index `<agent_id>.log` files in a directory (all of them, or only `agent_ids`)."""
+        if agent_ids is None:
+            names = [name for name in os.listdir(log_path) if name.endswith(".log") and name != "status.log"]
+        else:
+            names = [f"{agent_id}.log" for agent_id in agent_ids]
+        return {os.path.splitext(name)[0]: self.index_file(os.path.join(log_path, name))
+                for name in names if os.path.exists(os.path.join(log_path, name))}
+
+    # Queries
+
+    def query(self, agent_id: str, since: TimeBound = None, until: TimeBound = None,
+              level: Union[None, int, str] = None, contains: Optional[str] = None,
+              limit: Optional[int] = 1000, newest_first: bool = False) -> List[LogRecord]:
+        """Return an agent's records in [since, until) at or above `level` whose message contains `contains`."""
+        with self.lock:
+            agent = self.name_ids.get(agent_id)
+        if agent is None:
+            return []
+        clauses = ["agent = ?"]
+        params: List = [agent]
+        if isinstance(level, str):
+            if level.upper() not in LEVELS:
+                raise ValueError(f"Unknown log level: {level}")
+            level = LEVELS[level.upper()]
+        if level is not None:
+            clauses.append("level >= ?")
+            params.append(level)
+        if since is not None:
+            clauses.append("ts >= ?")
+            params.append(_to_epoch(since))
+        if until is not None:
+            clauses.append("ts < ?")
+            params.append(_to_epoch(until))
+        if contains:
+            escaped = contains.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+            clauses.append("message LIKE ? ESCAPE '\\'")
+            params.append(f"%{escaped}%")
+        sql = (f"SELECT ts, level, logger, message FROM log_records WHERE {' AND '.join(clauses)} "
+               f"ORDER BY ts {'DESC' if newest_first else 'ASC'}, id {'DESC' if newest_first else 'ASC'}")
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        with self.lock:
+            rows = self.connection.execute(sql, params).fetchall()
+            return [LogRecord(agent_id, ts, level, self.names[logger_id], message) for ts, level, logger_id, message in rows]
+
+    def count(self, agent_id: Optional[str] = None) -> int:
+        with self.lock:
+            if agent_id is None:
+                return self.connection.execute("SELECT COUNT(*) FROM log_records").fetchone()[0]
+            agent = self.name_ids.get(agent_id)
+            if agent is None:
+                return 0
+            return self.connection.execute("SELECT COUNT(*) FROM log_records WHERE agent = ?", (agent,)).fetchone()[0]
+
+    def close(self):
+        with self.lock:
+            self.connection.close()
+
+# Shared Indexes
+
+_indexes: Dict[str, LogIndex] = {}
+_indexes_lock = threading.Lock()
+
+def open_log_index(log_path: str) -> LogIndex:
+    """Return the shared index stored alongside the logs in `log_path`."""
+    db_path = os.path.join(log_path, ".gaia_log_index.sqlite")
+    with _indexes_lock:
+        index = _indexes.get(db_path)
+        if index is None:
+            index = _indexes[db_path] = LogIndex(db_path)
+        return index
+
+# Example usage (for illustration purposes, not part of the module)
+if __name__ == "__main__":
+    import tempfile
+
+    log_dir = tempfile.mkdtemp()
+    with open(os.path.join(log_dir, "agent_001.log"), 'w') as log_file:
+        log_file.write("2024-05-01 12:00:00,000 - agent_core - INFO - Activating agent...\n")
+        log_file.write("2024-05-01 12:00:01,500 - agent_core - ERROR - Error encountered: timeout\n")
+        log_file.write("Traceback (most recent call last):\n  ...\n")
+        log_file.write("INFO:agent_core:Error handled.\n")
+    index = LogIndex()
+    print(index.index_directory(log_dir))
+    for record in index.query("agent_001", level="ERROR", contains="timeout"):
+        print(record)
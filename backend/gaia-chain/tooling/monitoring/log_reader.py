@@ -0,0 +1,137 @@
+# gaia-chain/tooling/monitoring/log_reader.py
+
+"""
+Log Reader for GaiaChain Monitoring
+
+This module reads agent log files without loading them into memory. `tail_lines` seeks backward
+from the end of the file in fixed-size blocks until it has seen enough newlines, `read_page`
+returns a byte range snapped to line boundaries for paginated viewing, and `follow` polls a file
+for appended lines (surviving truncation and rotation) and yields them as they arrive. Memory use
+is bounded by the block or page size plus the lines returned, regardless of file size.
+"""
+
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Iterator, List, Optional
+
+from gaia_chain.tooling.monitoring.structured_log import get_logger
+
+# Logger setup
+logger = get_logger(__name__)
+
+BLOCK_SIZE = 64 * 1024
+DEFAULT_PAGE_BYTES = 1024 * 1024
+
+@dataclass
+class LogPage:
+    text: str
+    offset: int
+    next_offset: int
+    eof: bool
+
+    def __str__(self):
+        return self.text
+
+def tail_lines(path: str, lines: int = 10, block_size: int = BLOCK_SIZE) -> List[str]:
+    """Return the last `lines` lines of a file by reading backward from EOF in blocks."""
+    if lines <= 0:
+        return []
+    with open(path, 'rb') as log_file:
+        position = log_file.seek(0, os.SEEK_END)
+        blocks: List[bytes] = []
+        newlines = 0
+        # A trailing newline terminates the last line rather than starting a new one
+        if position:
+            log_file.seek(position - 1)
+            newlines -= log_file.read(1) == b"\n"
+        while position > 0 and newlines < lines:
+            read_size = min(block_size, position)
+            position -= read_size
+            log_file.seek(position)
+            block = log_file.read(read_size)
+            newlines += block.count(b"\n")
+            blocks.append(block)
+    data = b"".join(reversed(blocks))
+    return [line.decode("utf-8", errors="replace") for line in data.splitlines(keepends=True)[-lines:]]
+
+def read_page(path: str, offset: int = 0, max_bytes: int = DEFAULT_PAGE_BYTES) -> LogPage:
+    """Read up to `max_bytes` starting at `offset`, ending on a line boundary when possible."""
+    with open(path, 'rb') as log_file:
+        size = log_file.seek(0, os.SEEK_END)
+        log_file.seek(offset)
+        data = log_file.read(max_bytes)
+    end = offset + len(data)
+    if end < size:
+        cut = data.rfind(b"\n")
+        if cut >= 0:
+            data = data[:cut + 1]  # Otherwise a single line is longer than a page; return it split
+            end = offset + len(data)
+    return LogPage(data.decode("utf-8", errors="replace"), offset, end, end >= size)
+
+def iter_pages(path: str, offset: int = 0, max_bytes: int = DEFAULT_PAGE_BYTES) -> Iterator[LogPage]:
+    """Stream a file page by page from `offset`."""
+    while True:
+        page = read_page(path, offset, max_bytes)
+        if page.text:
+            yield page
+        if page.eof or page.next_offset == offset:
+            return
+        offset = page.next_offset
+
+def follow(path: str, from_end: bool = True, poll_interval: float = 0.5,
+           stop: Optional[threading.Event] = None) -> Iterator[str]:
+    """Yield lines appended to a file, polling for growth until `stop` is set.
+
+    If the file is truncated or replaced (log rotation), reading restarts from the beginning of
+    the new file. Partial lines are held back until their newline is written.
+    """
+    stop = stop or threading.Event()
+    log_file = None
+    inode = None
+    pending = b""
+    try:
+        while not stop.is_set():
+            if log_file is None:
+                try:
+                    log_file = open(path, 'rb')
+                except FileNotFoundError:
+                    stop.wait(poll_interval)
+                    continue
+                inode = os.fstat(log_file.fileno()).st_ino
+                if from_end:
+                    log_file.seek(0, os.SEEK_END)
+                from_end = False  # Files that appear later are read from the start
+            chunk = log_file.read(BLOCK_SIZE)
+            if chunk:
+                lines = (pending + chunk).split(b"\n")
+                pending = lines.pop()
+                for line in lines:
+                    yield line.decode("utf-8", errors="replace") + "\n"
+                continue
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                stat = None
+            if stat is None or stat.st_ino != inode or stat.st_size < log_file.tell():
+                logger.info("Log file was rotated or truncated; reopening", path=path)
+                log_file.close()
+                log_file = None
+                pending = b""
+                continue
+            stop.wait(poll_interval)
+    finally:
+        if log_file is not None:
+            log_file.close()
+
+# Example usage (for illustration purposes, not part of the module)
+if __name__ == "__main__":
+    import tempfile
+
+    with tempfile.NamedTemporaryFile('w', suffix=".log", delete=False) as sample:
+        sample.writelines(f"line {i}\n" for i in range(100000))
+    print(tail_lines(sample.name, 3))
+    first = read_page(sample.name, 0, 64)
+    print(repr(first.text), first.next_offset)
+    os.unlink(sample.name)
@@ -0,0 +1,187 @@
+# gaia-chain/tooling/monitoring/structured_log.py
+
+"""
+Structured Logging for GaiaChain
+
+This module provides the logging setup shared by the runtime, tooling and CLI. Library modules
+only create loggers and never configure handlers; entry points call `configure_logging` once.
+
+`get_logger` returns an `EventLogger`, a drop-in for `logging.Logger` whose methods take a
+message plus keyword fields (`logger.info("State updated", key=key)`). The level check happens
+before anything else, so a disabled event costs one method call: no f-string, no `LogRecord`. Enabled
+records are put on an in-memory queue by `DeferredQueueHandler` without being formatted, and a
+`QueueListener` thread renders them as JSON lines and does the file or stream I/O, so the calling
+thread never blocks on a write.
+
+Fields are rendered on the listener thread, so pass values that are not mutated afterwards
+(strings, numbers, tuples). The default level is WARNING, or `GAIA_LOG_LEVEL` when set.
+"""
+
+import atexit
+import json
+import logging
+import os
+import queue
+import sys
+from logging.handlers import QueueHandler, QueueListener
+from typing import IO, Optional
+
+DEFAULT_LEVEL = "WARNING"
+LOG_LEVEL_ENV = "GAIA_LOG_LEVEL"
+TEXT_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+
+_listener: Optional[QueueListener] = None
+
+# Formatting
+
+class JsonLineFormatter(logging.Formatter):
+    """Render a record as one JSON object: ts, level, logger, message and any event fields."""
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": round(record.created, 6),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        fields = getattr(record, "fields", None)
+        if fields:
+            for key, value in fields.items():
+                entry.setdefault(key, value)
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exc"] = record.exc_text
+        return json.dumps(entry, default=str, separators=(",", ":"))
+
+class TextFormatter(logging.Formatter):
+    """Human-readable format; event fields are appended as key=value pairs."""
+    def __init__(self):
+        super().__init__(TEXT_FORMAT)
+
+    def formatMessage(self, record: logging.LogRecord) -> str:
+        text = super().formatMessage(record)
+        fields = getattr(record, "fields", None)
+        if fields:
+            text += " " + " ".join(f"{key}={value}" for key, value in fields.items())
+        return text
+
+# Non-blocking Handler
+
+class DeferredQueueHandler(QueueHandler):
+    """QueueHandler that leaves formatting to the listener thread.
+
+    The standard `QueueHandler.prepare` formats the message in the calling thread (so records can
+    be pickled); records here stay in-process, so only the traceback is rendered eagerly.
+    """
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+# Event Logger
+
+class EventLogger:
+    """Level-guarded structured logger wrapping a `logging.Logger`."""
+    __slots__ = ("logger",)
+
+    def __init__(self, name: str):
+        self.logger = logging.getLogger(name)
+
+    @property
+    def name(self) -> str:
+        return self.logger.name
+
+    def isEnabledFor(self, level: int) -> bool:
+        return self.logger.isEnabledFor(level)
+
+    def log(self, level: int, msg: str, *args, exc_info=None, **fields):
+        if self.logger.isEnabledFor(level):
+            self.logger.log(level, msg, *args, exc_info=exc_info, extra={"fields": fields}, stacklevel=2)
+
+    def debug(self, msg: str, *args, **fields):
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.log(logging.DEBUG, msg, *args, extra={"fields": fields}, stacklevel=2)
+
+    def info(self, msg: str, *args, **fields):
+        if self.logger.isEnabledFor(logging.INFO):
+            self.logger.log(logging.INFO, msg, *args, extra={"fields": fields}, stacklevel=2)
+
+    def warning(self, msg: str, *args, **fields):
+        if self.logger.isEnabledFor(logging.WARNING):
+            self.logger.log(logging.WARNING, msg, *args, extra={"fields": fields}, stacklevel=2)
+
+    def error(self, msg: str, *args, exc_info=None, **fields):
+        if self.logger.isEnabledFor(logging.ERROR):
+            self.logger.log(logging.ERROR, msg, *args, exc_info=exc_info, extra={"fields": fields}, stacklevel=2)
+
+    def exception(self, msg: str, *args, **fields):
+        if self.logger.isEnabledFor(logging.ERROR):
+            self.logger.log(logging.ERROR, msg, *args, exc_info=True, extra={"fields": fields}, stacklevel=2)
+
+    def critical(self, msg: str, *args, **fields):
+        if self.logger.isEnabledFor(logging.CRITICAL):
+            self.logger.log(logging.CRITICAL, msg, *args, extra={"fields": fields}, stacklevel=2)
+
+def get_logger(name: str) -> EventLogger:
+    return EventLogger(name)
+
+# Configuration
+
+def resolve_level(level=None) -> int:
+    """Resolve a level name or number, falling back to GAIA_LOG_LEVEL and then WARNING."""
+    level = level if level is not None else os.environ.get(LOG_LEVEL_ENV, DEFAULT_LEVEL)
+    if isinstance(level, int):
+        return level
+    resolved = logging.getLevelName(str(level).upper())
+    if not isinstance(resolved, int):
+        raise ValueError(f"Unknown log level: {level}")
+    return resolved
+
+def configure_logging(level=None, fmt: str = "json", path: Optional[str] = None,
+                      stream: Optional[IO[str]] = None) -> QueueListener:
+    """Route all logging through a background queue listener writing JSON lines (or text).
+
+    Records go to `path` when given, otherwise to `stream` (default stderr). Calling this again
+    replaces the previous configuration.
+    """
+    global _listener
+    if fmt not in ("json", "text"):
+        raise ValueError(f"Unknown log format: {fmt}")
+    shutdown_logging()
+    if path is not None:
+        output: logging.Handler = logging.FileHandler(path, encoding="utf-8")
+    else:
+        output = logging.StreamHandler(stream or sys.stderr)
+    output.setFormatter(JsonLineFormatter() if fmt == "json" else TextFormatter())
+
+    records: queue.SimpleQueue = queue.SimpleQueue()
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(DeferredQueueHandler(records))
+    root.setLevel(resolve_level(level))
+
+    _listener = QueueListener(records, output, respect_handler_level=True)
+    _listener.start()
+    return _listener
+
+def shutdown_logging():
+    """Flush queued records and stop the listener thread (registered to run at exit)."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+
+atexit.register(shutdown_logging)
+
+# Example usage (for illustration purposes, not part of the module)
+if __name__ == "__main__":
+    configure_logging("INFO")
+    logger = get_logger("gaia_chain.example")
+    logger.debug("Not rendered", reason="below the configured level")
+    logger.info("State updated", agent="agent_001", key="price", value=101.5)
+    logger.warning("Plain %s messages still work", "printf-style")
+    shutdown_logging()
@@ -0,0 +1,338 @@
+# gaia-chain/tooling/monitoring/telemetry.py
+
+"""
+Telemetry for GaiaChain
+
+This module provides counters, gauges and histograms for the agent runtime, DSL and tooling, and
+renders them in the Prometheus text exposition format. Metrics live in the process that updates
+them, so each process hosting agents serves its own `/metrics` with `start_metrics_server` (see
+`ExecutionContext(metrics_port=...)` and `AgentWorkerPool(metrics_port=...)`).
+
+Updates never take a lock: each thread writes into its own shard (a plain dict held in a
+`threading.local`), and a scrape sums the shards. Shard creation is the only locked step and
+happens once per thread per metric. Values that already live elsewhere, such as cache hit
+counters, are exported through callbacks evaluated at scrape time instead of being mirrored.
+"""
+
+import math
+import threading
+from bisect import bisect_left
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from time import perf_counter
+from typing import Callable, Dict, Iterable, List, Sequence, Tuple
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Latency bucket upper bounds in seconds (the last bucket is +Inf)
+DEFAULT_BUCKETS = (0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005,
+                   0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+LabelValues = Tuple[str, ...]
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)) + "}"
+
+class _ShardedMetric:
+    """Base for metrics whose per-thread shards are summed at scrape time."""
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._local = threading.local()
+        self._shards: List[dict] = []
+        self._shards_lock = threading.Lock()
+        self._children: Dict[LabelValues, object] = {}
+
+    def _shard(self) -> dict:
+        try:
+            return self._local.shard
+        except AttributeError:
+            shard = self._local.shard = {}
+            with self._shards_lock:
+                self._shards.append(shard)
+            return shard
+
+    def _snapshot(self) -> List[dict]:
+        with self._shards_lock:
+            shards = list(self._shards)
+        return [shard.copy() for shard in shards]  # dict.copy is atomic under the GIL
+
+    def reset(self):
+        """Zero every series, keeping shards and children in place."""
+        with self._shards_lock:
+            for shard in self._shards:
+                shard.clear()
+
+    def labels(self, *values) -> object:
+        """Return the child for one combination of label values (cached)."""
+        values = tuple(str(value) for value in values)
+        child = self._children.get(values)
+        if child is None:
+            if len(values) != len(self.labelnames):
+                raise ValueError(f"{self.name} expects labels {self.labelnames}, got {values}")
+            child = self._children.setdefault(values, self._make_child(values))
+        return child
+
+    def _make_child(self, values: LabelValues):
+        raise NotImplementedError
+
+    def samples(self) -> Iterable[Tuple[str, str, float]]:
+        raise NotImplementedError
+
+class _CounterChild:
+    __slots__ = ("metric", "key")
+
+    def __init__(self, metric: "Counter", key: LabelValues):
+        self.metric = metric
+        self.key = key
+
+    def inc(self, amount: float = 1):
+        shard = self.metric._shard()
+        shard[self.key] = shard.get(self.key, 0) + amount
+
+class Counter(_ShardedMetric):
+    """Monotonically increasing count."""
+    kind = "counter"
+
+    def _make_child(self, values: LabelValues):
+        return _CounterChild(self, values)
+
+    def inc(self, amount: float = 1):
+        self.labels().inc(amount)
+
+    def samples(self):
+        totals: Dict[LabelValues, float] = {}
+        for shard in self._snapshot():
+            for key, value in shard.items():
+                totals[key] = totals.get(key, 0) + value
+        for key, value in sorted(totals.items()):
+            yield self.name, _format_labels(self.labelnames, key), value
+
+class Gauge(Counter):
+    """Value that can go up and down (each thread's increments and decrements are summed)."""
+    kind = "gauge"
+
+    def dec(self, amount: float = 1):
+        self.labels().inc(-amount)
+
+class _HistogramChild:
+    __slots__ = ("metric", "key")
+
+    def __init__(self, metric: "Histogram", key: LabelValues):
+        self.metric = metric
+        self.key = key
+
+    def observe(self, value: float):
+        metric = self.metric
+        shard = metric._shard()
+        state = shard.get(self.key)
+        if state is None:
+            state = shard[self.key] = [[0] * (len(metric.buckets) + 1), 0.0, 0]
+        state[0][bisect_left(metric.buckets, value)] += 1
+        state[1] += value
+        state[2] += 1
+
+class Histogram(_ShardedMetric):
+    """Distribution of observations over fixed buckets."""
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(buckets)
+
+    def _make_child(self, values: LabelValues):
+        return _HistogramChild(self, values)
+
+    def observe(self, value: float):
+        self.labels().observe(value)
+
+    def time(self):
+        """Context manager observing the elapsed wall time of its block."""
+        return _Timer(self.labels())
+
+    def samples(self):
+        totals: Dict[LabelValues, list] = {}
+        for shard in self._snapshot():
+            for key, (counts, total, count) in shard.items():
+                merged = totals.setdefault(key, [[0] * (len(self.buckets) + 1), 0.0, 0])
+                merged[0] = [a + b for a, b in zip(merged[0], counts)]
+                merged[1] += total
+                merged[2] += count
+        for key, (counts, total, count) in sorted(totals.items()):
+            cumulative = 0
+            for bound, bucket_count in zip((*self.buckets, math.inf), counts):
+                cumulative += bucket_count
+                labels = _format_labels((*self.labelnames, "le"), (*key, _format_value(bound)))
+                yield f"{self.name}_bucket", labels, cumulative
+            labels = _format_labels(self.labelnames, key)
+            yield f"{self.name}_sum", labels, total
+            yield f"{self.name}_count", labels, count
+
+class _Timer:
+    __slots__ = ("child", "start")
+
+    def __init__(self, child: _HistogramChild):
+        self.child = child
+
+    def __enter__(self):
+        self.start = perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.child.observe(perf_counter() - self.start)
+        return False
+
+class CallbackMetric:
+    """Metric whose samples are produced by callbacks at scrape time.
+
+    Each callback returns a mapping of label values to numbers, so several modules can
+    contribute series to the same metric (e.g. one `cache` label value each).
+    """
+    def __init__(self, name: str, documentation: str, kind: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.kind = kind
+        self.labelnames = tuple(labelnames)
+        self.callbacks: List[Callable[[], Dict[LabelValues, float]]] = []
+
+    def add_callback(self, callback: Callable[[], Dict[LabelValues, float]]):
+        self.callbacks.append(callback)
+
+    def samples(self):
+        for callback in list(self.callbacks):
+            for key, value in sorted(callback().items()):
+                yield self.name, _format_labels(self.labelnames, key), value
+
+# Registry
+
+class MetricsRegistry:
+    """Holds every metric in the process and renders the exposition text."""
+    def __init__(self):
+        self.metrics: Dict[str, object] = {}
+        self.lock = threading.Lock()
+
+    def _register(self, name: str, factory: Callable[[], object], kind: str):
+        with self.lock:
+            metric = self.metrics.get(name)
+            if metric is None:
+                metric = self.metrics[name] = factory()
+            elif metric.kind != kind:
+                raise ValueError(f"Metric {name} is already registered as a {metric.kind}.")
+            return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(name, lambda: Counter(name, documentation, labelnames), "counter")
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._register(name, lambda: Gauge(name, documentation, labelnames), "gauge")
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._register(name, lambda: Histogram(name, documentation, labelnames, buckets), "histogram")
+
+    def callback(self, name: str, documentation: str, kind: str, labelnames: Sequence[str],
+                 callback: Callable[[], Dict[LabelValues, float]]) -> CallbackMetric:
+        metric = self._register(name, lambda: CallbackMetric(name, documentation, kind, labelnames), kind)
+        metric.add_callback(callback)
+        return metric
+
+    def reset(self):
+        """Zero all counters, gauges and histograms (callback metrics read live state).
+
+        A forked process inherits its parent's values; resetting keeps it from re-exporting them.
+        """
+        with self.lock:
+            metrics = list(self.metrics.values())
+        for metric in metrics:
+            if isinstance(metric, _ShardedMetric):
+                metric.reset()
+
+    def render(self) -> str:
+        """Render all metrics in the Prometheus text exposition format."""
+        with self.lock:
+            metrics = sorted(self.metrics.values(), key=lambda metric: metric.name)
+        lines = []
+        for metric in metrics:
+            lines.append(f"# HELP {metric.name} {_escape(metric.documentation)}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            for name, labels, value in metric.samples():
+                lines.append(f"{name}{labels} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+REGISTRY = MetricsRegistry()
+
+def counter(name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+    return REGISTRY.counter(name, documentation, labelnames)
+
+def gauge(name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+    return REGISTRY.gauge(name, documentation, labelnames)
+
+def histogram(name: str, documentation: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+    return REGISTRY.histogram(name, documentation, labelnames, buckets)
+
+def register_callback(name: str, documentation: str, kind: str, labelnames: Sequence[str],
+                      callback: Callable[[], Dict[LabelValues, float]]) -> CallbackMetric:
+    return REGISTRY.callback(name, documentation, kind, labelnames, callback)
+
+# Shared cache metrics: modules with caches register one `cache` label value each
+def register_cache(cache_name: str, stats: Callable[[], Tuple[float, float]]):
+    """Export a cache's (hits, misses) as gaia_cache_hits_total / gaia_cache_misses_total."""
+    register_callback("gaia_cache_hits_total", "Cache lookups served from cache.", "counter", ("cache",),
+                      lambda: {(cache_name,): stats()[0]})
+    register_callback("gaia_cache_misses_total", "Cache lookups that missed.", "counter", ("cache",),
+                      lambda: {(cache_name,): stats()[1]})
+
+# HTTP Exposition
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?", 1)[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = self.server.registry.render().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass  # No access log line per scrape
+
+def start_metrics_server(port: int, host: str = "0.0.0.0", registry: MetricsRegistry = REGISTRY) -> ThreadingHTTPServer:
+    """Serve `registry` at http://host:port/metrics from a daemon thread.
+
+    Pass port 0 to bind any free port (read it back from `server.server_address`); stop the server
+    with `server.shutdown()` followed by `server.server_close()`.
+    """
+    server = ThreadingHTTPServer((host, port), _MetricsHandler)
+    server.daemon_threads = True
+    server.registry = registry
+    threading.Thread(target=server.serve_forever, name="gaia-metrics", daemon=True).start()
+    return server
+
+# Example usage (for illustration purposes, not part of the module)
+if __name__ == "__main__":
+    requests_total = counter("example_requests_total", "Requests handled.", ("route",))
+    latency = histogram("example_latency_seconds", "Request latency.", buckets=(0.01, 0.1, 1.0))
+    workers = [threading.Thread(target=lambda: [requests_total.labels("/").inc() for _ in range(1000)]) for _ in range(4)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    latency.observe(0.05)
+    print(REGISTRY.render())
@@ -0,0 +1,94 @@
+# gaia-chain/tooling/rpc/json_rpc_client.py
+
+"""
+JSON-RPC Client for GaiaChain
+
+This module provides a minimal Ethereum JSON-RPC client that supports batched calls: many
+requests are sent as one JSON array in a single HTTP round trip. The transport is pluggable, so
+the same client runs against a node over HTTP or against an in-process stand-in in tests.
+"""
+
+import itertools
+import threading
+from typing import Any, Callable, List, Sequence, Tuple, Union
+
+import requests
+
+from gaia_chain.tooling.monitoring.structured_log import get_logger
+
+# Logger setup
+logger = get_logger(__name__)
+
+Payload = Union[dict, list]
+Transport = Callable[[Payload], Payload]
+
+class JsonRpcError(RuntimeError):
+    """Raised for a JSON-RPC error response."""
+    def __init__(self, code: int, message: str, data: Any = None):
+        super().__init__(f"JSON-RPC error {code}: {message}")
+        self.code = code
+        self.message = message
+        self.data = data
+
+class HttpTransport:
+    """Posts JSON-RPC payloads over a keep-alive HTTP session."""
+    def __init__(self, url: str, session: requests.Session = None, timeout: float = 10.0):
+        self.url = url
+        self.session = session if session is not None else requests.Session()
+        self.timeout = timeout
+
+    def __call__(self, payload: Payload) -> Payload:
+        response = self.session.post(self.url, json=payload, timeout=self.timeout)
+        response.raise_for_status()
+        return response.json()
+
+class JsonRpcClient:
+    """Issues single or batched JSON-RPC calls through a transport."""
+    def __init__(self, transport: Union[str, Transport]):
+        self.transport = HttpTransport(transport) if isinstance(transport, str) else transport
+        self.ids = itertools.count(1)
+        self.id_lock = threading.Lock()
+
+    def _next_id(self) -> int:
+        with self.id_lock:
+            return next(self.ids)
+
+    def call(self, method: str, params: Sequence = ()) -> Any:
+        """Make one JSON-RPC call and return its result, raising JsonRpcError on failure."""
+        response = self.transport({"jsonrpc": "2.0", "id": self._next_id(), "method": method, "params": list(params)})
+        return self._result(response)
+
+    def batch(self, calls: Sequence[Tuple[str, Sequence]]) -> List[Any]:
+        """Make several calls in one round trip.
+
+        Returns one entry per call, in order: the result, or a JsonRpcError instance for calls
+        that failed (the batch itself does not raise for individual errors).
+        """
+        if not calls:
+            return []
+        requests_by_id = {}
+        payload = []
+        for method, params in calls:
+            request_id = self._next_id()
+            requests_by_id[request_id] = len(payload)
+            payload.append({"jsonrpc": "2.0", "id": request_id, "method": method, "params": list(params)})
+        responses = self.transport(payload)
+        if isinstance(responses, dict):
+            # Some nodes answer a whole batch with a single error object
+            raise self._error(responses)
+        results: List[Any] = [JsonRpcError(-32603, "Missing response")] * len(payload)
+        for response in responses:
+            index = requests_by_id.get(response.get("id"))
+            if index is not None:
+                results[index] = self._error(response) if "error" in response else response.get("result")
+        return results
+
+    def _result(self, response: dict) -> Any:
+        if "error" in response:
+            raise self._error(response)
+        return response.get("result")
+
+    @staticmethod
+    def _error(response: dict) -> JsonRpcError:
+        error = response.get("error") or {}
+        return JsonRpcError(error.get("code", -32603), error.get("message", "Unknown error"), error.get("data"))
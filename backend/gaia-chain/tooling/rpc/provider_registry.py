@@ -0,0 +1,150 @@
+# gaia-chain/tooling/rpc/provider_registry.py
+
+"""
+Provider Registry for GaiaChain
+
+This module provides a process-wide registry of Web3 providers so deployers, monitors and CLI
+commands share connections instead of building a new `Web3(HTTPProvider(url))` per object or per
+call. Each endpoint URL gets one `requests.Session` with a keep-alive connection pool, one `Web3`
+instance and one batched `JsonRpcClient` on top of that session. Contract objects are cached by
+(endpoint, address, ABI hash), so repeated lookups skip ABI parsing and contract construction,
+and each endpoint has a shared `ViewCallCache` for read-only contract calls.
+
+The pool size defaults to the `GAIA_WEB3_POOL_SIZE` environment variable (or 32) and can be
+changed with `configure_providers` before first use.
+"""
+
+import hashlib
+import json
+import os
+import threading
+from typing import Any, Dict, Optional, Tuple, Union
+
+import requests
+from requests.adapters import HTTPAdapter
+from web3 import Web3
+
+from gaia_chain.tooling.monitoring.telemetry import register_cache
+from gaia_chain.tooling.rpc.json_rpc_client import HttpTransport, JsonRpcClient
+from gaia_chain.tooling.rpc.view_cache import ViewCallCache
+from gaia_chain.tooling.monitoring.structured_log import get_logger
+
+# Logger setup
+logger = get_logger(__name__)
+
+DEFAULT_POOL_SIZE = int(os.environ.get("GAIA_WEB3_POOL_SIZE", "32"))
+
+def load_abi(abi: Union[str, list]) -> list:
+    """Accept an ABI as a parsed list, a JSON string or a path to a JSON file."""
+    if isinstance(abi, str):
+        if os.path.exists(abi):
+            with open(abi, 'r') as abi_file:
+                return json.load(abi_file)
+        return json.loads(abi)
+    return abi
+
+def abi_hash(abi: list) -> str:
+    return hashlib.sha256(json.dumps(abi, sort_keys=True).encode("utf-8")).hexdigest()
+
+class ProviderRegistry:
+    """Shares pooled HTTP sessions, Web3 instances and contract objects per endpoint."""
+    def __init__(self, pool_size: int = DEFAULT_POOL_SIZE, timeout: float = 10.0):
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self.sessions: Dict[str, requests.Session] = {}
+        self.providers: Dict[str, Web3] = {}
+        self.clients: Dict[str, JsonRpcClient] = {}
+        self.contracts: Dict[Tuple[str, str, str, str], Any] = {}
+        self.view_caches: Dict[str, ViewCallCache] = {}
+        self.lock = threading.RLock()
+
+    def configure(self, pool_size: Optional[int] = None, timeout: Optional[float] = None):
+        """Change pool settings; existing sessions are closed and rebuilt on next use."""
+        with self.lock:
+            if pool_size is not None:
+                self.pool_size = pool_size
+            if timeout is not None:
+                self.timeout = timeout
+            self.clear()
+
+    def session(self, url: str) -> requests.Session:
+        with self.lock:
+            session = self.sessions.get(url)
+            if session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_size)
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                self.sessions[url] = session
+                logger.info("Opened connection pool", url=url, size=self.pool_size)
+            return session
+
+    def web3(self, url: str) -> Web3:
+        """Return the shared Web3 instance for an endpoint."""
+        with self.lock:
+            web3 = self.providers.get(url)
+            if web3 is None:
+                provider = Web3.HTTPProvider(url, request_kwargs={"timeout": self.timeout}, session=self.session(url))
+                web3 = self.providers[url] = Web3(provider)
+            return web3
+
+    def json_rpc(self, url: str) -> JsonRpcClient:
+        """Return the shared batching JSON-RPC client for an endpoint."""
+        with self.lock:
+            client = self.clients.get(url)
+            if client is None:
+                client = self.clients[url] = JsonRpcClient(HttpTransport(url, self.session(url), self.timeout))
+            return client
+
+    def contract(self, url: str, address: str, abi: Union[str, list], bytecode: Optional[str] = None):
+        """Return a cached contract object for (endpoint, address, ABI, bytecode)."""
+        abi = load_abi(abi)
+        key = (url, address, abi_hash(abi), bytecode or "")
+        with self.lock:
+            contract = self.contracts.get(key)
+            if contract is None:
+                kwargs = {"bytecode": bytecode} if bytecode else {}
+                contract = self.contracts[key] = self.web3(url).eth.contract(address=address, abi=abi, **kwargs)
+            return contract
+
+    def view_cache(self, url: str) -> ViewCallCache:
+        """Return the shared view-call cache for an endpoint, invalidated by its chain head."""
+        with self.lock:
+            cache = self.view_caches.get(url)
+            if cache is None:
+                cache = self.view_caches[url] = ViewCallCache(head_source=lambda: self.web3(url).eth.block_number)
+            return cache
+
+    def clear(self):
+        """Close every pooled session and drop cached providers and contracts."""
+        with self.lock:
+            for session in self.sessions.values():
+                session.close()
+            self.sessions.clear()
+            self.providers.clear()
+            self.clients.clear()
+            self.contracts.clear()
+            self.view_caches.clear()
+
+# Process-wide Registry
+
+_registry = ProviderRegistry()
+
+def _view_cache_totals() -> Tuple[int, int]:
+    stats = [cache.stats() for cache in list(_registry.view_caches.values())]
+    return sum(s["hits"] for s in stats), sum(s["misses"] for s in stats)
+
+register_cache("view_call", _view_cache_totals)
+
+def get_provider_registry() -> ProviderRegistry:
+    return _registry
+
+def configure_providers(pool_size: Optional[int] = None, timeout: Optional[float] = None):
+    _registry.configure(pool_size, timeout)
+
+# Example usage (for illustration purposes, not part of the module)
+if __name__ == "__main__":
+    registry = get_provider_registry()
+    web3 = registry.web3("http://localhost:8545")
+    print(web3 is registry.web3("http://localhost:8545"))
+    print(registry.session("http://localhost:8545").get_adapter("http://localhost:8545"))
@@ -0,0 +1,133 @@
+# gaia-chain/tooling/rpc/view_cache.py
+
+"""
+View Call Cache for GaiaChain
+
+This module provides a read-through cache for read-only contract calls such as
+`getServiceStatus` or `getAgentStatus`. Results are keyed by (contract address, function, args),
+evicted least-recently-used beyond `maxsize`, and expire after `ttl` seconds. Every entry is also
+stamped with the chain head it was read at: once the head advances, entries from older blocks are
+treated as stale. The head is looked up at most once per `head_check_interval`, so thousands of
+dashboard polls per block cost one `eth_blockNumber` and one call per distinct view.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+from gaia_chain.tooling.monitoring.structured_log import get_logger
+
+# Logger setup
+logger = get_logger(__name__)
+
+def _freeze(value) -> Hashable:
+    """Make call arguments usable as part of a cache key."""
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    if isinstance(value, dict):
+        return tuple(sorted((key, _freeze(item)) for key, item in value.items()))
+    if isinstance(value, (bytes, bytearray)):
+        return bytes(value)
+    return value
+
+class ViewCallCache:
+    """LRU + TTL cache for contract view calls, invalidated when the chain head advances."""
+    def __init__(self, head_source: Optional[Callable[[], int]] = None, maxsize: int = 4096,
+                 ttl: float = 15.0, head_check_interval: float = 1.0):
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1.")
+        self.head_source = head_source
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.head_check_interval = head_check_interval
+        self.entries: "OrderedDict[Tuple, Tuple[Any, float, Optional[int]]]" = OrderedDict()  # key -> (value, expires_at, block)
+        self.head: Optional[int] = None
+        self.head_checked_at = float("-inf")
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    # Chain Head Tracking
+
+    def current_head(self) -> Optional[int]:
+        """Return the chain head, refreshing it from `head_source` at most once per interval."""
+        if self.head_source is None:
+            return self.head
+        now = time.monotonic()
+        if now - self.head_checked_at >= self.head_check_interval:
+            self.on_new_block(self.head_source())
+            self.head_checked_at = now
+        return self.head
+
+    def on_new_block(self, block_number: int):
+        """Advance the chain head; entries read at older blocks become stale."""
+        with self.lock:
+            if self.head is None or block_number > self.head:
+                self.head = block_number
+            elif block_number < self.head:
+                # Reorg or a lagging node: drop everything rather than serve reads from another fork
+                self.head = block_number
+                self.entries.clear()
+
+    # Cached Calls
+
+    def call(self, contract, function_name: str, *args) -> Any:
+        """Return `contract.functions.<function_name>(*args).call()`, served from cache when fresh."""
+        return self.get_or_load((contract.address, function_name, _freeze(args)),
+                                lambda: getattr(contract.functions, function_name)(*args).call())
+
+    def get_or_load(self, key: Tuple, load: Callable[[], Any]) -> Any:
+        head = self.current_head()
+        now = time.monotonic()
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                value, expires_at, block = entry
+                if expires_at > now and block == head:
+                    self.entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self.entries[key]
+            self.misses += 1
+        value = load()
+        with self.lock:
+            self.entries[key] = (value, now + self.ttl, head)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+        return value
+
+    def invalidate(self, address: Optional[str] = None):
+        """Drop cached entries, either all of them or those for one contract address."""
+        with self.lock:
+            if address is None:
+                self.entries.clear()
+            else:
+                for key in [key for key in self.entries if key[0] == address]:
+                    del self.entries[key]
+
+    def stats(self) -> Dict[str, Any]:
+        with self.lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "size": len(self.entries),
+                "head": self.head,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+# Example usage (for illustration purposes, not part of the module)
+if __name__ == "__main__":
+    chain = {"head": 100}
+    cache = ViewCallCache(head_source=lambda: chain["head"], head_check_interval=0)
+    reads = []
+    for _ in range(3):
+        cache.get_or_load(("0xservice", "getServiceStatus", ("svc_001",)), lambda: reads.append(1) or "active")
+    chain["head"] = 101
+    cache.get_or_load(("0xservice", "getServiceStatus", ("svc_001",)), lambda: reads.append(1) or "active")
+    print(f"Contract reads: {len(reads)}, stats: {cache.stats()}")